@@ -2,9 +2,14 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import hashlib
 import json
+import os
 import re
+import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -14,14 +19,25 @@ REPO_ROOT = WORKFLOW_ROOT.parents[2]
 if str(WORKFLOW_ROOT) not in sys.path:
     sys.path.insert(0, str(WORKFLOW_ROOT))
 
-from core.confidence import calculate_confidence, detect_reference_type  # type: ignore
-from core.finding import Edge, Finding, Severity  # type: ignore
+from core.cache import AnalysisCache  # type: ignore
+from core.confidence import ReferenceType, calculate_confidence, detect_reference_type  # type: ignore
+from core.finding import Edge, Finding, ParseError, Severity  # type: ignore
 from rules.cycle_dependency import detect_cycle_dependency  # type: ignore
 from rules.dangling_reference import detect_dangling_reference  # type: ignore
-from rules.invalid_yaml_json import detect_invalid_yaml_json, parse_file  # type: ignore
+from rules.invalid_yaml_json import HAS_YAML, parse_error_finding, parse_text  # type: ignore
 from rules.path_escape import detect_path_escape, resolve_reference  # type: ignore
 from rules.schema_mismatch import detect_schema_mismatch  # type: ignore
 
+# 抽出ロジックを変えたら上げる（キャッシュ全体が無効になる）
+ANALYZER_VERSION = f"1:yaml={int(HAS_YAML)}"
+CACHE_PATH = REPO_ROOT / "_outputs" / "check" / "_cache" / "analysis_cache.sqlite"
+# これ未満の解析対象ならプロセスプールを起動しない（起動コストの方が大きい）
+PARALLEL_MIN_FILES = 64
+
+_IMPORT_PATTERN = re.compile(r"^\s*(?:from\s+([a-zA-Z0-9_\.]+)\s+import|import\s+([a-zA-Z0-9_\.]+))", re.MULTILINE)
+_PATH_REFERENCE_PATTERN = re.compile(r"\]\(([^)#\s]+)\)|['\"]([^'\"]+\.(?:md|py|json|yaml|yml))['\"]")
+_PARSE_SUFFIXES = (".json", ".yml", ".yaml", ".md")
+
 
 def _outputs_dir() -> Path:
     day = datetime.now().strftime("%Y%m%d")
@@ -64,6 +80,15 @@ def _line_from_index(text: str, index: int) -> int:
     return text.count("\n", 0, index) + 1
 
 
+def _newline_offsets(text: str) -> list[int]:
+    return [m.start() for m in re.finditer("\n", text)]
+
+
+def _line_at(newlines: list[int], index: int) -> int:
+    """_line_from_index と同じ値を改行位置の二分探索で求める"""
+    return bisect.bisect_left(newlines, index) + 1
+
+
 def _module_to_path(module: str) -> Path | None:
     cleaned = module.strip()
     if not cleaned or cleaned.startswith("."):
@@ -84,73 +109,157 @@ def _module_to_path(module: str) -> Path | None:
     return None
 
 
-def _extract_python_import_edges(path: Path, content: str) -> list[Edge]:
-    edges: list[Edge] = []
-    pattern = re.compile(r"^\s*(?:from\s+([a-zA-Z0-9_\.]+)\s+import|import\s+([a-zA-Z0-9_\.]+))", re.MULTILINE)
-    for match in pattern.finditer(content):
+def _scan_python_imports(content: str, newlines: list[int]) -> list[list[Any]]:
+    """import 文の生の参照候補: [module, line, snippet, ref_type]（内容だけに依存するのでキャッシュ可能）"""
+    refs: list[list[Any]] = []
+    for match in _IMPORT_PATTERN.finditer(content):
         module_name = match.group(1) or match.group(2) or ""
-        target_path = _module_to_path(module_name)
-        if target_path is None:
-            continue
-        line = _line_from_index(content, match.start())
-        confidence = calculate_confidence(
-            ref_type=detect_reference_type(match.group(0), module_name),
-            target_exists=target_path.exists(),
+        refs.append(
+            [
+                module_name,
+                _line_at(newlines, match.start()),
+                match.group(0).strip(),
+                detect_reference_type(match.group(0), module_name).value,
+            ]
         )
-        edges.append(
-            Edge(
-                src_file=str(path),
-                dst_file=str(target_path),
-                edge_type="import",
-                raw_target=module_name,
-                confidence=confidence,
-                line_range=(line, line),
-                snippet=match.group(0).strip(),
-            )
-        )
-    return edges
+    return refs
 
 
-def _extract_path_reference_edges(path: Path, content: str) -> list[Edge]:
-    edges: list[Edge] = []
-    pattern = re.compile(r"\]\(([^)#\s]+)\)|['\"]([^'\"]+\.(?:md|py|json|yaml|yml))['\"]")
-    for match in pattern.finditer(content):
+def _scan_path_references(content: str, newlines: list[int]) -> list[list[Any]]:
+    """パス参照の生の候補: [raw_target, line, snippet, ref_type, edge_type]"""
+    refs: list[list[Any]] = []
+    for match in _PATH_REFERENCE_PATTERN.finditer(content):
         raw_target = (match.group(1) or match.group(2) or "").strip()
         if not raw_target:
             continue
-        line = _line_from_index(content, match.start())
-        resolved = resolve_reference(base_file=str(path), raw_ref=raw_target, root=str(REPO_ROOT))
-        destination = resolved.normalized if resolved.normalized else raw_target
-        confidence = calculate_confidence(
-            ref_type=detect_reference_type(match.group(0), raw_target),
-            target_exists=Path(destination).exists() if Path(destination).is_absolute() else False,
-        )
         edge_type = "markdown_link" if raw_target in (match.group(1) or "") else "path_literal"
-        edges.append(
-            Edge(
-                src_file=str(path),
-                dst_file=str(destination),
-                edge_type=edge_type,
-                raw_target=raw_target,
-                confidence=confidence,
-                line_range=(line, line),
-                snippet=match.group(0),
-            )
+        refs.append(
+            [
+                raw_target,
+                _line_at(newlines, match.start()),
+                match.group(0),
+                detect_reference_type(match.group(0), raw_target).value,
+                edge_type,
+            ]
         )
-    return edges
+    return refs
+
+
+def _analyze_content(path_str: str, content: str | None, read_error: str | None = None) -> dict[str, Any]:
+    """1ファイル分の解析結果（参照候補 + invalid_yaml_json / schema_mismatch の Finding）"""
+    if content is None:
+        parse_findings = []
+        if path_str.endswith(_PARSE_SUFFIXES):
+            err = ParseError(path=path_str, msg=read_error or "")
+            parse_findings.append(parse_error_finding(path_str, "read_error", err).to_dict())
+        return {"imports": [], "references": [], "parse_findings": parse_findings, "schema_findings": []}
+
+    newlines = _newline_offsets(content)
+    parser_type, parsed, error = parse_text(path_str, content)
+    parse_findings = []
+    schema_findings = []
+    if error is not None:
+        if path_str.endswith(_PARSE_SUFFIXES):
+            parse_findings.append(parse_error_finding(path_str, parser_type, error).to_dict())
+    elif isinstance(parsed, dict):
+        objects = [{"file_path": path_str, "obj": parsed, "parser_type": parser_type}]
+        schema_findings = [finding.to_dict() for finding in detect_schema_mismatch(objects)]
+    return {
+        "imports": _scan_python_imports(content, newlines) if path_str.lower().endswith(".py") else [],
+        "references": _scan_path_references(content, newlines),
+        "parse_findings": parse_findings,
+        "schema_findings": schema_findings,
+    }
 
 
-def _extract_edges(files: list[Path]) -> list[Edge]:
-    edges: list[Edge] = []
-    for path in files:
-        try:
-            content = path.read_text(encoding="utf-8")
-        except Exception:
-            continue
-        if path.suffix.lower() == ".py":
-            edges.extend(_extract_python_import_edges(path=path, content=content))
-        edges.extend(_extract_path_reference_edges(path=path, content=content))
-    return edges
+def _analyze_file(job: tuple[str, str | None]) -> tuple[str, int, int, str, dict[str, Any] | None]:
+    """プロセスプールのワーカー。内容ハッシュが既知の値と同じなら payload=None を返す"""
+    path_str, known_sha = job
+    try:
+        st = os.stat(path_str)
+        data = Path(path_str).read_bytes()
+    except OSError as exc:
+        return path_str, 0, -1, "", _analyze_content(path_str, None, read_error=str(exc))
+    sha = hashlib.sha256(data).hexdigest()
+    if known_sha == sha:
+        return path_str, st.st_mtime_ns, st.st_size, sha, None
+    try:
+        # read_text と同じく改行を \n に揃える
+        content = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    except UnicodeDecodeError as exc:
+        return path_str, st.st_mtime_ns, st.st_size, sha, _analyze_content(path_str, None, read_error=str(exc))
+    return path_str, st.st_mtime_ns, st.st_size, sha, _analyze_content(path_str, content)
+
+
+class _EdgeResolver:
+    """参照候補をエッジに解決する（1回の run_check 内で存在確認・パス解決をメモ化）"""
+
+    def __init__(self) -> None:
+        self._modules: dict[str, Path | None] = {}
+        self._references: dict[tuple[str, str], Any] = {}
+        self._exists: dict[str, bool] = {}
+
+    def module(self, name: str) -> Path | None:
+        if name not in self._modules:
+            self._modules[name] = _module_to_path(name)
+        return self._modules[name]
+
+    def reference(self, base_file: str, raw_target: str):
+        key = (os.path.dirname(base_file), raw_target)
+        if key not in self._references:
+            self._references[key] = resolve_reference(base_file=base_file, raw_ref=raw_target, root=str(REPO_ROOT))
+        return self._references[key]
+
+    def exists(self, destination: str) -> bool:
+        if destination not in self._exists:
+            self._exists[destination] = Path(destination).exists() if Path(destination).is_absolute() else False
+        return self._exists[destination]
+
+    def edges(self, path_str: str, payload: dict[str, Any]) -> list[Edge]:
+        edges: list[Edge] = []
+        for module_name, line, snippet, ref_type in payload["imports"]:
+            target_path = self.module(module_name)
+            if target_path is None:
+                continue
+            edges.append(
+                Edge(
+                    src_file=path_str,
+                    dst_file=str(target_path),
+                    edge_type="import",
+                    raw_target=module_name,
+                    # _module_to_path は存在するパスだけ返す
+                    confidence=calculate_confidence(ref_type=ReferenceType(ref_type), target_exists=True),
+                    line_range=(line, line),
+                    snippet=snippet,
+                )
+            )
+        for raw_target, line, snippet, ref_type, edge_type in payload["references"]:
+            resolved = self.reference(path_str, raw_target)
+            destination = resolved.normalized if resolved.normalized else raw_target
+            edges.append(
+                Edge(
+                    src_file=path_str,
+                    dst_file=str(destination),
+                    edge_type=edge_type,
+                    raw_target=raw_target,
+                    confidence=calculate_confidence(
+                        ref_type=ReferenceType(ref_type), target_exists=self.exists(destination)
+                    ),
+                    line_range=(line, line),
+                    snippet=snippet,
+                )
+            )
+        return edges
+
+
+def _extract_python_import_edges(path: Path, content: str) -> list[Edge]:
+    payload = {"imports": _scan_python_imports(content, _newline_offsets(content)), "references": []}
+    return _EdgeResolver().edges(str(path), payload)
+
+
+def _extract_path_reference_edges(path: Path, content: str) -> list[Edge]:
+    payload = {"imports": [], "references": _scan_path_references(content, _newline_offsets(content))}
+    return _EdgeResolver().edges(str(path), payload)
 
 
 def _build_graph(edges: list[Edge], known_files: set[str]) -> dict[str, list[tuple[str, Edge]]]:
@@ -162,15 +271,98 @@ def _build_graph(edges: list[Edge], known_files: set[str]) -> dict[str, list[tup
     return graph
 
 
-def _parsed_objects(files: list[Path]) -> list[dict[str, Any]]:
-    objects: list[dict[str, Any]] = []
-    for path in files:
-        parser_type, parsed, error = parse_file(str(path))
-        if error is not None:
-            continue
-        if isinstance(parsed, dict):
-            objects.append({"file_path": str(path), "obj": parsed, "parser_type": parser_type})
-    return objects
+def _run_analysis(jobs: list[tuple[str, str | None]], workers: int) -> list[tuple]:
+    if workers > 1 and len(jobs) >= PARALLEL_MIN_FILES:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(_analyze_file, jobs, chunksize=chunksize))
+        except (OSError, RuntimeError):
+            pass  # プロセスを作れない環境では直列にフォールバック
+    return [_analyze_file(job) for job in jobs]
+
+
+def _analyze_files(
+    files: list[Path],
+    *,
+    use_cache: bool,
+    workers: int,
+    changed: set[str] | None,
+    cache_prefix: str,
+) -> tuple[dict[str, dict[str, Any]], dict[str, Any]]:
+    """全ファイルの解析結果を返す。キャッシュに無い/変わったファイルだけ解析する"""
+    cache = AnalysisCache(CACHE_PATH, ANALYZER_VERSION) if use_cache else None
+    payloads: dict[str, dict[str, Any]] = {}
+    jobs: list[tuple[str, str | None]] = []
+    try:
+        if cache is not None:
+            cache.load(prefix=cache_prefix)
+        for path in files:
+            key = str(path)
+            if cache is not None:
+                if changed is not None and os.path.abspath(key) not in changed:
+                    cached = cache.get(key)  # --changed-only: 差分外は stat も確認しない
+                else:
+                    try:
+                        st = os.stat(key)
+                        cached = cache.get(key, st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        cached = None
+                if cached is not None:
+                    payloads[key] = cached
+                    continue
+            jobs.append((key, cache.sha256(key) if cache is not None else None))
+
+        results = _run_analysis(jobs, workers)
+        unchanged = 0
+        for path_str, _mtime_ns, _size, _sha, payload in results:
+            if payload is None:
+                unchanged += 1
+                payload = cache.get(path_str)
+            payloads[path_str] = payload
+        if cache is not None:
+            cache.store([row for row in results if row[2] >= 0])
+            scanned = set(payloads)
+            cache.prune([p for p in cache.known_paths() if p not in scanned])
+    finally:
+        if cache is not None:
+            cache.close()
+
+    stats = {
+        "enabled": use_cache,
+        "reused": len(files) - len(jobs) + unchanged,
+        "analyzed": len(jobs) - unchanged,
+        "workers": workers if len(jobs) >= PARALLEL_MIN_FILES else 1,
+    }
+    return payloads, stats
+
+
+def _git_changed_files(base: str) -> set[str] | None:
+    """base との差分（作業ツリー + ステージ）と未追跡ファイルの絶対パス。git が使えなければ None"""
+    try:
+        top = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        # -z: 非ASCIIパス（エージェント/...）を C 形式でクォートさせず、そのままのバイト列で受け取る
+        diff = subprocess.run(
+            ["git", "diff", "--name-only", "-z", base], cwd=top, capture_output=True, check=True
+        ).stdout
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard", "-z"], cwd=top, capture_output=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    names = [os.fsdecode(name) for name in (diff + untracked).split(b"\0") if name]
+    return {os.path.abspath(os.path.join(top, name)) for name in names}
+
+
+def _touches_changed(finding: Finding, changed: set[str]) -> bool:
+    if os.path.abspath(finding.location.file) in changed:
+        return True
+    if finding.rule_id == "cycle_dependency":
+        nodes = str(finding.evidence.get("cycle_path", "")).split(" → ")
+        return any(os.path.abspath(node) in changed for node in nodes)
+    return False
 
 
 def _summarize(findings: list[Finding]) -> dict[str, Any]:
@@ -182,28 +374,74 @@ def _summarize(findings: list[Finding]) -> dict[str, Any]:
     return {"total": len(findings), "by_severity": by_severity, "by_rule": by_rule}
 
 
-def run_check(root: Path) -> dict[str, Any]:
+def run_check(
+    root: Path,
+    *,
+    use_cache: bool = True,
+    workers: int | None = None,
+    changed_only: str | None = None,
+) -> dict[str, Any]:
+    """ワークスペースを検査する。
+
+    ファイル単位の解析（参照候補・パースエラー・スキーマ違反）は内容ハッシュでキャッシュし、
+    変わったファイルだけをプロセスプールで解析する。path_escape / dangling_reference /
+    cycle_dependency はマージしたエッジ全体に対して毎回実行する。
+    changed_only に git の ref を渡すと、差分ファイルだけを再解析して差分に関わる Finding だけを返す。
+    """
+    # キャッシュのキーを cwd に依存させないため絶対パスで走査する
+    root = Path(os.path.abspath(root))
     files = _scan_files(root=root)
     file_strings = [str(item) for item in files]
     known_files = set(file_strings)
-    edges = _extract_edges(files=files)
+
+    changed: set[str] | None = None
+    if changed_only is not None:
+        changed = _git_changed_files(changed_only)
+
+    payloads, cache_stats = _analyze_files(
+        files,
+        use_cache=use_cache,
+        workers=workers or os.cpu_count() or 1,
+        changed=changed,
+        cache_prefix=os.path.join(str(root), ""),
+    )
+
+    resolver = _EdgeResolver()
+    edges: list[Edge] = []
+    parse_findings: list[Finding] = []
+    schema_findings: list[Finding] = []
+    for key in file_strings:
+        payload = payloads[key]
+        edges.extend(resolver.edges(key, payload))
+        parse_findings.extend(Finding.from_dict(item) for item in payload["parse_findings"])
+        schema_findings.extend(Finding.from_dict(item) for item in payload["schema_findings"])
     graph = _build_graph(edges=edges, known_files=known_files)
 
     findings: list[Finding] = []
-    findings.extend(detect_invalid_yaml_json(file_strings))
-    findings.extend(detect_schema_mismatch(_parsed_objects(files)))
+    findings.extend(parse_findings)
+    findings.extend(schema_findings)
     findings.extend(detect_path_escape(edges=edges, root=str(root)))
     findings.extend(detect_dangling_reference(edges=edges, existing_files=file_strings))
     findings.extend(detect_cycle_dependency(graph))
+    if changed is not None:
+        findings = [finding for finding in findings if _touches_changed(finding, changed)]
 
     summary = _summarize(findings=findings)
+    stats: dict[str, Any] = {
+        "files_scanned": len(files),
+        "edges_detected": len(edges),
+        "cache": cache_stats,
+    }
+    if changed_only is not None:
+        stats["changed_only"] = {
+            "base": changed_only,
+            "git_available": changed is not None,
+            "changed_files": len(changed) if changed is not None else None,
+        }
     payload = {
         "generated_at": datetime.now().isoformat(),
         "root": str(root),
-        "stats": {
-            "files_scanned": len(files),
-            "edges_detected": len(edges),
-        },
+        "stats": stats,
         "summary": summary,
         "findings": [finding.to_dict() for finding in findings],
     }
@@ -232,12 +470,27 @@ def main() -> int:
     parser.add_argument("--root", default=str(REPO_ROOT / ".agent" / "workflows"), help="Root path to scan")
     parser.add_argument("--print-json", action="store_true", help="Print full json report")
     parser.add_argument("--fail-on", choices=["high", "medium", "none"], default="high", help="Failure threshold")
+    parser.add_argument(
+        "--changed-only",
+        nargs="?",
+        const="HEAD",
+        default=None,
+        metavar="GIT_REF",
+        help="Re-analyze only files changed vs GIT_REF (default HEAD) and report findings touching them",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the analysis cache")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
     args = parser.parse_args()
 
     info, warn, error = _try_setup_logger()
     info("check_start", root=args.root, fail_on=args.fail_on)
     try:
-        payload = run_check(Path(args.root))
+        payload = run_check(
+            Path(args.root),
+            use_cache=not args.no_cache,
+            workers=args.workers,
+            changed_only=args.changed_only,
+        )
     except Exception as exc:
         error("check_failed", err=exc, root=args.root)
         raise
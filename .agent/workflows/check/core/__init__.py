@@ -10,6 +10,7 @@ from .confidence import (
     is_actionable
 )
 from .verifier import verify_after_execute, diff_resolved, diff_regressed
+from .cache import AnalysisCache
 
 __all__ = [
     "Finding",
@@ -25,5 +26,6 @@ __all__ = [
     "is_actionable",
     "verify_after_execute",
     "diff_resolved",
-    "diff_regressed"
+    "diff_regressed",
+    "AnalysisCache"
 ]
@@ -0,0 +1,112 @@
+# /check エージェント - 解析キャッシュ
+"""ファイル単位の解析結果（参照候補・パース由来Finding）の永続キャッシュ
+
+ファイルごとに (mtime_ns, size, sha256) と解析結果JSONを sqlite に保持する。
+- stat が一致すれば読み込みもハッシュ計算もせずに再利用
+- stat が変わっても sha256 が一致すれば再利用（touch や git checkout）
+- analyzer_version が変わったらキャッシュ全体を破棄
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+BUSY_TIMEOUT_S = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+  path TEXT PRIMARY KEY,
+  mtime_ns INTEGER NOT NULL,
+  size INTEGER NOT NULL,
+  sha256 TEXT NOT NULL,
+  payload_json TEXT NOT NULL
+);
+"""
+
+
+class AnalysisCache:
+    """ファイル単位の解析キャッシュ（sqlite）"""
+
+    def __init__(self, path: Path, analyzer_version: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT_S, isolation_level=None)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.executescript(_SCHEMA)
+        row = self._con.execute("SELECT value FROM meta WHERE key='analyzer_version'").fetchone()
+        if row is None or row[0] != analyzer_version:
+            self._con.execute("BEGIN IMMEDIATE")
+            self._con.execute("DELETE FROM files")
+            self._con.execute(
+                "INSERT INTO meta(key, value) VALUES('analyzer_version', ?)"
+                " ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                (analyzer_version,)
+            )
+            self._con.execute("COMMIT")
+        self._rows: Dict[str, Tuple[int, int, str, str]] = {}
+
+    def load(self, prefix: str = "") -> None:
+        """prefix 配下の行をメモリに読み込む（1クエリで全件）"""
+        query = "SELECT path, mtime_ns, size, sha256, payload_json FROM files"
+        if prefix:
+            rows = self._con.execute(query + " WHERE path >= ? AND path < ?", (prefix, prefix + "\U0010ffff"))
+        else:
+            rows = self._con.execute(query)
+        self._rows = {r[0]: (r[1], r[2], r[3], r[4]) for r in rows}
+
+    def get(self, path: str, mtime_ns: Optional[int] = None, size: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """stat 一致時の解析結果。mtime_ns/size を省略すると stat を確認せずに返す"""
+        row = self._rows.get(path)
+        if row is None:
+            return None
+        if mtime_ns is not None and (row[0] != mtime_ns or row[1] != size):
+            return None
+        return json.loads(row[3])
+
+    def sha256(self, path: str) -> Optional[str]:
+        row = self._rows.get(path)
+        return row[2] if row else None
+
+    def known_paths(self) -> Iterable[str]:
+        return self._rows.keys()
+
+    def store(self, rows: List[Tuple[str, int, int, str, Optional[Dict[str, Any]]]]) -> None:
+        """(path, mtime_ns, size, sha256, payload) を保存。payload=None は内容不変（stat だけ更新）"""
+        if not rows:
+            return
+        self._con.execute("BEGIN IMMEDIATE")
+        try:
+            for path, mtime_ns, size, sha, payload in rows:
+                if payload is None:
+                    self._con.execute(
+                        "UPDATE files SET mtime_ns=?, size=? WHERE path=?", (mtime_ns, size, path)
+                    )
+                    continue
+                self._con.execute(
+                    "INSERT INTO files(path, mtime_ns, size, sha256, payload_json) VALUES(?, ?, ?, ?, ?)"
+                    " ON CONFLICT(path) DO UPDATE SET mtime_ns=excluded.mtime_ns, size=excluded.size,"
+                    " sha256=excluded.sha256, payload_json=excluded.payload_json",
+                    (path, mtime_ns, size, sha, json.dumps(payload, ensure_ascii=False))
+                )
+            self._con.execute("COMMIT")
+        except BaseException:
+            self._con.execute("ROLLBACK")
+            raise
+
+    def prune(self, paths: Iterable[str]) -> None:
+        """存在しなくなったファイルの行を削除"""
+        paths = list(paths)
+        if not paths:
+            return
+        self._con.execute("BEGIN IMMEDIATE")
+        self._con.executemany("DELETE FROM files WHERE path=?", [(p,) for p in paths])
+        self._con.execute("COMMIT")
+
+    def close(self) -> None:
+        self._con.close()
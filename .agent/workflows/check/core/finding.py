@@ -68,6 +68,26 @@ class Finding:
             "autofix_allowed": self.autofix_allowed,
             "confidence": self.confidence
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Finding":
+        """to_dict() の逆変換（キャッシュからの復元用）"""
+        loc = data.get("location") or {}
+        line_range = loc.get("line_range")
+        return cls(
+            rule_id=data["rule_id"],
+            severity=data["severity"],
+            location=Location(
+                file=loc.get("file", ""),
+                line=loc.get("line"),
+                line_range=tuple(line_range) if line_range is not None else None
+            ),
+            evidence=data.get("evidence", {}),
+            message=data.get("message", ""),
+            suggestion=data.get("suggestion", ""),
+            autofix_allowed=data.get("autofix_allowed", False),
+            confidence=data.get("confidence", 1.0)
+        )
 
 
 @dataclass
@@ -3,10 +3,10 @@
 
 from .dangerous_autofix import detect_dangerous_autofix
 from .path_escape import detect_path_escape, resolve_reference
-from .invalid_yaml_json import detect_invalid_yaml_json, parse_file
+from .invalid_yaml_json import detect_invalid_yaml_json, parse_error_finding, parse_file, parse_text
 from .schema_mismatch import detect_schema_mismatch, validate_schema
-from .cycle_dependency import detect_cycle_dependency, find_cycles
-from .dangling_reference import detect_dangling_reference
+from .cycle_dependency import detect_cycle_dependency, find_cycles, strongly_connected_components
+from .dangling_reference import SimilarPathIndex, detect_dangling_reference
 
 __all__ = [
     "detect_dangerous_autofix",
@@ -14,9 +14,13 @@ __all__ = [
     "resolve_reference",
     "detect_invalid_yaml_json",
     "parse_file",
+    "parse_text",
+    "parse_error_finding",
     "detect_schema_mismatch",
     "validate_schema",
     "detect_cycle_dependency",
     "find_cycles",
-    "detect_dangling_reference"
+    "strongly_connected_components",
+    "detect_dangling_reference",
+    "SimilarPathIndex"
 ]
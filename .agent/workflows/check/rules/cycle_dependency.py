@@ -12,56 +12,118 @@ from core.finding import Finding, Location, Severity, Edge
 CRITICAL_EDGE_TYPES = {"import", "extends", "include"}
 
 
-def find_cycles(graph: Dict[str, List[Tuple[str, Edge]]]) -> List[List[Tuple[str, str, Edge]]]:
-    """DFSでサイクルを検出
+def strongly_connected_components(graph: Dict[str, List[Tuple[str, Edge]]]) -> List[List[str]]:
+    """Tarjan法で強連結成分を求める（再帰なし、O(V+E)）
     
     Args:
         graph: {node: [(neighbor, edge), ...]} 形式の隣接リスト
     
     Returns:
-        検出されたサイクルのリスト
+        強連結成分のリスト。各成分の先頭は成分内で最初に訪問したノード
     """
-    visited: Set[str] = set()
-    stack: Set[str] = set()
-    cycles: List[List[Tuple[str, str, Edge]]] = []
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[Tuple[int, List[str]]] = []
     
-    def dfs(node: str, path: List[Tuple[str, str, Edge]]):
-        visited.add(node)
-        stack.add(node)
-        
-        for neighbor, edge in graph.get(node, []):
-            if neighbor not in visited:
-                dfs(neighbor, path + [(node, neighbor, edge)])
-            elif neighbor in stack:
-                # サイクル検出
-                cycle = _extract_cycle(path + [(node, neighbor, edge)], neighbor)
-                if cycle:
-                    cycles.append(cycle)
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work: List[Tuple[str, int]] = [(root, 0)]  # (ノード, 次に見る隣接インデックス)
         
-        stack.remove(node)
-    
-    for node in graph:
-        if node not in visited:
-            dfs(node, [])
+        while work:
+            node, i = work[-1]
+            neighbors = graph.get(node, [])
+            if i < len(neighbors):
+                work[-1] = (node, i + 1)
+                nxt = neighbors[i][0]
+                if nxt not in index:
+                    index[nxt] = low[nxt] = len(index)
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, 0))
+                elif nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+                continue
+            
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                component.reverse()  # 先頭 = 成分の根（最初に訪問したノード）
+                components.append((index[node], component))
     
-    return cycles
+    # 発見順に並べる（出力順を入力順に対して安定させる）
+    components.sort(key=lambda item: item[0])
+    return [component for _, component in components]
 
 
-def _extract_cycle(
-    path: List[Tuple[str, str, Edge]],
-    start: str
+def _representative_cycle(
+    graph: Dict[str, List[Tuple[str, Edge]]],
+    component: List[str]
 ) -> List[Tuple[str, str, Edge]]:
-    """パスからサイクル部分を抽出"""
-    cycle = []
-    in_cycle = False
+    """成分の根から根へ戻る最短サイクルを成分内のBFSで1本求める"""
+    start = component[0]
+    members = set(component)
+    parent: Dict[str, Tuple[str, Edge]] = {}
+    queue = [start]
+    seen = {start}
+    
+    for node in queue:  # queue は走査中に伸びる（BFS）
+        for neighbor, edge in graph.get(node, []):
+            if neighbor == start:
+                cycle = [(node, start, edge)]
+                while node != start:
+                    prev, prev_edge = parent[node]
+                    cycle.append((prev, node, prev_edge))
+                    node = prev
+                cycle.reverse()
+                return cycle
+            if neighbor in members and neighbor not in seen:
+                seen.add(neighbor)
+                parent[neighbor] = (node, edge)
+                queue.append(neighbor)
+    return []
+
+
+def _component_cycles(
+    graph: Dict[str, List[Tuple[str, Edge]]]
+) -> List[Tuple[List[str], List[Tuple[str, str, Edge]]]]:
+    """循環を含む強連結成分と、その代表サイクルの組"""
+    results = []
+    for component in strongly_connected_components(graph):
+        if len(component) == 1:
+            node = component[0]
+            if not any(neighbor == node for neighbor, _ in graph.get(node, [])):
+                continue  # 自己ループの無い単独ノードは循環ではない
+        cycle = _representative_cycle(graph, component)
+        if cycle:
+            results.append((component, cycle))
+    return results
+
+
+def find_cycles(graph: Dict[str, List[Tuple[str, Edge]]]) -> List[List[Tuple[str, str, Edge]]]:
+    """循環を強連結成分ごとに1本ずつ検出
     
-    for src, dst, edge in path:
-        if src == start:
-            in_cycle = True
-        if in_cycle:
-            cycle.append((src, dst, edge))
+    Args:
+        graph: {node: [(neighbor, edge), ...]} 形式の隣接リスト
     
-    return cycle
+    Returns:
+        検出されたサイクルのリスト（成分あたり代表1本）
+    """
+    return [cycle for _, cycle in _component_cycles(graph)]
 
 
 def detect_cycle_dependency(
@@ -76,9 +138,8 @@ def detect_cycle_dependency(
         検出されたFindingリスト
     """
     findings = []
-    cycles = find_cycles(graph)
     
-    for cyc in cycles:
+    for component, cyc in _component_cycles(graph):
         edge_types = [e.edge_type for (_, _, e) in cyc]
         
         # 実行順序に影響する循環は HIGH
@@ -101,7 +162,8 @@ def detect_cycle_dependency(
                 "cycle_path": cycle_path,
                 "edge_types": edge_types,
                 "confidence_min": min_conf,
-                "cycle_length": len(cyc)
+                "cycle_length": len(cyc),
+                "scc_size": len(component)  # 同じ成分内の他の循環はこの1件にまとめる
             },
             message=f"循環依存を検出: {len(cyc)}ノード",
             suggestion="循環を解消するためにどのエッジを切るか検討",
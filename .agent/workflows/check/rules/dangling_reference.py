@@ -1,7 +1,7 @@
 # /check エージェント - dangling_reference ルール
 """参照解決失敗の検出"""
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -25,13 +25,16 @@ def detect_dangling_reference(
     
     # 正規化されたファイルパスのセット
     normalized_files = {_normalize_path(f) for f in existing_files}
+    index: Optional[SimilarPathIndex] = None
     
     for edge in edges:
         target_normalized = _normalize_path(edge.dst_file)
         
         if target_normalized not in normalized_files:
-            # 類似ファイルを検索（大小文字違い等）
-            similar = _find_similar(edge.dst_file, existing_files)
+            # 類似ファイルを検索（大小文字違い等）。索引は最初の参照切れで1回だけ作る
+            if index is None:
+                index = SimilarPathIndex(existing_files)
+            similar = index.find(edge.dst_file)
             
             findings.append(Finding(
                 rule_id="dangling_reference",
@@ -61,24 +64,79 @@ def _normalize_path(path: str) -> str:
     return Path(path).as_posix().lower()
 
 
-def _find_similar(target: str, candidates: List[str]) -> List[str]:
-    """類似ファイルを検索"""
-    target_name = Path(target).name.lower()
-    target_stem = Path(target).stem.lower()
+def _name_and_stem(path: str) -> Tuple[str, str]:
+    """Path(path).name / .stem の小文字版"""
+    name = Path(path).name.lower()
+    dot = name.rfind(".")
+    stem = name[:dot] if 0 < dot < len(name) - 1 else name
+    return name, stem
+
+
+class SimilarPathIndex:
+    """類似ファイル検索の索引（basename / stem の辞書 + basename のトライグラム）
     
-    similar = []
-    for c in candidates:
-        c_name = Path(c).name.lower()
-        c_stem = Path(c).stem.lower()
-        
-        # 完全一致（大小文字違い）
-        if c_name == target_name:
-            similar.insert(0, c)
-        # 拡張子違い
-        elif c_stem == target_stem:
-            similar.append(c)
-        # 部分一致
-        elif target_stem in c_name or c_stem in target_name:
-            similar.append(c)
+    _find_similar の線形走査と同じ結果を、候補を索引から絞り込んで返す。
+    """
+    
+    def __init__(self, candidates: List[str]):
+        self.candidates = list(candidates)
+        self._by_name: Dict[str, List[int]] = {}
+        self._by_stem: Dict[str, List[int]] = {}
+        self._trigrams: Dict[str, List[int]] = {}
+        self._names: List[str] = []
+        self._memo: Dict[Tuple[str, str], List[str]] = {}
+        for i, c in enumerate(self.candidates):
+            name, stem = _name_and_stem(c)
+            self._names.append(name)
+            self._by_name.setdefault(name, []).append(i)
+            self._by_stem.setdefault(stem, []).append(i)
+            for gram in {name[j:j + 3] for j in range(len(name) - 2)}:
+                self._trigrams.setdefault(gram, []).append(i)
     
-    return similar
+    def _names_containing(self, part: str) -> Set[int]:
+        """basename に part を含む候補"""
+        if len(part) < 3:
+            return {i for i, name in enumerate(self._names) if part in name}
+        postings = []
+        for gram in {part[j:j + 3] for j in range(len(part) - 2)}:
+            posting = self._trigrams.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        hits = set(postings[0])
+        for posting in postings[1:]:
+            hits.intersection_update(posting)
+            if not hits:
+                return hits
+        return {i for i in hits if part in self._names[i]}
+    
+    def _stems_within(self, target_name: str) -> Set[int]:
+        """stem が target_name の部分文字列になっている候補"""
+        hits: Set[int] = set()
+        n = len(target_name)
+        for start in range(n):
+            for end in range(start + 1, n + 1):
+                hits.update(self._by_stem.get(target_name[start:end], ()))
+        hits.update(self._by_stem.get("", ()))
+        return hits
+    
+    def find(self, target: str) -> List[str]:
+        target_name, target_stem = _name_and_stem(target)
+        key = (target_name, target_stem)
+        if key not in self._memo:
+            exact = self._by_name.get(target_name, [])
+            others = set(self._by_stem.get(target_stem, ()))
+            others |= self._names_containing(target_stem)
+            others |= self._stems_within(target_name)
+            others.difference_update(exact)
+            # 線形版の順序: 完全一致は先頭に insert(0)（逆順）、それ以外は候補順
+            similar = [self.candidates[i] for i in reversed(exact)]
+            similar.extend(self.candidates[i] for i in sorted(others))
+            self._memo[key] = similar
+        return list(self._memo[key])
+
+
+def _find_similar(target: str, candidates: List[str]) -> List[str]:
+    """類似ファイルを検索"""
+    return SimilarPathIndex(candidates).find(target)
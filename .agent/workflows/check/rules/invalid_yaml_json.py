@@ -26,7 +26,15 @@ def parse_file(path: str) -> Tuple[str, Optional[Any], Optional[ParseError]]:
         text = Path(path).read_text(encoding="utf-8")
     except Exception as e:
         return ("read_error", None, ParseError(path=path, msg=str(e)))
+    return parse_text(path, text)
+
+
+def parse_text(path: str, text: str) -> Tuple[str, Optional[Any], Optional[ParseError]]:
+    """読み込み済みテキストをパース（parse_file の本体。キャッシュ付き解析から直接呼ぶ）
     
+    Returns:
+        (parser_type, parsed_obj, error)
+    """
     try:
         # JSON
         if path.endswith(".json"):
@@ -83,24 +91,29 @@ def detect_invalid_yaml_json(files: List[str]) -> List[Finding]:
         ptype, obj, err = parse_file(f)
         
         if err:
-            findings.append(Finding(
-                rule_id="invalid_yaml_json",
-                severity=Severity.HIGH,
-                location=Location(file=f, line=err.line),
-                evidence={
-                    "parser_type": ptype,
-                    "error_message": err.msg[:200],
-                    "error_line": err.line,
-                    "snippet": err.snippet[:100] if err.snippet else ""
-                },
-                message=f"パースエラー: {err.msg[:50]}",
-                suggestion="構文を修正してください",
-                autofix_allowed=False
-            ))
+            findings.append(parse_error_finding(f, ptype, err))
     
     return findings
 
 
+def parse_error_finding(file_path: str, parser_type: str, err: ParseError) -> Finding:
+    """パースエラー1件を Finding に変換"""
+    return Finding(
+        rule_id="invalid_yaml_json",
+        severity=Severity.HIGH,
+        location=Location(file=file_path, line=err.line),
+        evidence={
+            "parser_type": parser_type,
+            "error_message": err.msg[:200],
+            "error_line": err.line,
+            "snippet": err.snippet[:100] if err.snippet else ""
+        },
+        message=f"パースエラー: {err.msg[:50]}",
+        suggestion="構文を修正してください",
+        autofix_allowed=False
+    )
+
+
 def _split_frontmatter(text: str) -> Tuple[Optional[str], str]:
     """Markdown frontmatterを分離"""
     if not text.startswith("---"):
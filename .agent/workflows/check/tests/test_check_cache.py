@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+CHECK_ROOT = Path(__file__).resolve().parents[1]
+if str(CHECK_ROOT) not in sys.path:
+    sys.path.insert(0, str(CHECK_ROOT))
+
+import check  # noqa: E402
+
+
+def _workspace(tmp_path: Path) -> Path:
+    root = tmp_path / "ws"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "SKILL.md").write_text("---\nname: demo\n---\n[guide](GUIDE.md)\n", encoding="utf-8")
+    (root / "pkg" / "broken.json").write_text('{"a": 1,,}', encoding="utf-8")
+    (root / "pkg" / "tool.py").write_text('import os\nCONFIG = "settings.yaml"\n', encoding="utf-8")
+    for i in range(5):
+        (root / "pkg" / f"note_{i}.md").write_text(f"see [next](note_{i + 1}.md)\n", encoding="utf-8")
+    return root
+
+
+def _findings(payload: dict) -> list:
+    return payload["findings"]
+
+
+def test_warm_run_reuses_cache_and_matches_uncached(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(check, "CACHE_PATH", tmp_path / "cache.sqlite")
+    root = _workspace(tmp_path)
+
+    baseline = check.run_check(root, use_cache=False)
+    cold = check.run_check(root)
+    warm = check.run_check(root)
+    assert cold["stats"]["cache"]["analyzed"] == cold["stats"]["files_scanned"]
+    assert warm["stats"]["cache"] == {"enabled": True, "reused": 8, "analyzed": 0, "workers": 1}
+    assert _findings(baseline) == _findings(cold) == _findings(warm)
+    assert {f["rule_id"] for f in _findings(warm)} >= {"invalid_yaml_json", "schema_mismatch", "dangling_reference"}
+
+    # 内容が同じなら mtime が変わっても再解析しない
+    tool = root / "pkg" / "tool.py"
+    os.utime(tool, ns=(tool.stat().st_atime_ns, tool.stat().st_mtime_ns + 10**9))
+    assert check.run_check(root)["stats"]["cache"]["analyzed"] == 0
+
+    (root / "pkg" / "broken.json").write_text('{"a": 1}', encoding="utf-8")
+    fixed = check.run_check(root)
+    assert fixed["stats"]["cache"]["analyzed"] == 1
+    assert "invalid_yaml_json" not in fixed["summary"]["by_rule"]
+    assert _findings(fixed) == _findings(check.run_check(root, use_cache=False))
+
+
+def test_process_pool_matches_serial(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(check, "CACHE_PATH", tmp_path / "cache.sqlite")
+    monkeypatch.setattr(check, "PARALLEL_MIN_FILES", 1)
+    root = _workspace(tmp_path)
+
+    parallel = check.run_check(root, use_cache=False, workers=2)
+    serial = check.run_check(root, use_cache=False, workers=1)
+    assert parallel["stats"]["cache"]["workers"] == 2
+    assert _findings(parallel) == _findings(serial)
+
+
+def test_changed_only_reports_findings_for_diff(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(check, "CACHE_PATH", tmp_path / "cache.sqlite")
+    root = _workspace(tmp_path)
+    check.run_check(root)
+
+    changed = {str(root / "pkg" / "note_4.md")}
+    monkeypatch.setattr(check, "_git_changed_files", lambda base: changed)
+    payload = check.run_check(root, changed_only="HEAD")
+    assert payload["stats"]["changed_only"] == {"base": "HEAD", "git_available": True, "changed_files": 1}
+    assert payload["findings"]
+    assert {f["location"]["file"] for f in payload["findings"]} == changed
+
+
+def test_git_changed_files_keeps_non_ascii_paths(tmp_path: Path, monkeypatch) -> None:
+    import shutil
+    import subprocess
+
+    import pytest
+
+    if shutil.which("git") is None:
+        pytest.skip("git is not available")
+    repo = tmp_path / "repo"
+    agent_dir = repo / "エージェント" / "動画"
+    agent_dir.mkdir(parents=True)
+    tracked = agent_dir / "SKILL.md"
+    tracked.write_text("v1\n", encoding="utf-8")
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@example.com"]
+    subprocess.run(git + ["init", "-q"], cwd=repo, check=True)
+    subprocess.run(git + ["add", "."], cwd=repo, check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "init"], cwd=repo, check=True)
+    tracked.write_text("v2\n", encoding="utf-8")
+    (agent_dir / "新規 メモ.md").write_text("new\n", encoding="utf-8")
+
+    monkeypatch.setattr(check, "REPO_ROOT", repo)
+    changed = check._git_changed_files("HEAD")
+    top = subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"], cwd=repo, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    expected_dir = os.path.join(top, "エージェント", "動画")
+    assert changed == {os.path.join(expected_dir, "SKILL.md"), os.path.join(expected_dir, "新規 メモ.md")}
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+CHECK_ROOT = Path(__file__).resolve().parents[1]
+if str(CHECK_ROOT) not in sys.path:
+    sys.path.insert(0, str(CHECK_ROOT))
+
+from core.finding import Edge  # noqa: E402
+from rules.cycle_dependency import detect_cycle_dependency, find_cycles, strongly_connected_components  # noqa: E402
+from rules.dangling_reference import SimilarPathIndex  # noqa: E402
+
+
+def _edge(src: str, dst: str, edge_type: str = "import") -> Edge:
+    return Edge(src_file=src, dst_file=dst, edge_type=edge_type, raw_target=dst, confidence=0.9)
+
+
+def _graph(pairs: list[tuple[str, str]]) -> dict:
+    graph: dict = {}
+    for src, dst in pairs:
+        graph.setdefault(src, []).append((dst, _edge(src, dst)))
+    return graph
+
+
+def test_one_cycle_per_scc_and_self_loops() -> None:
+    graph = _graph(
+        [("a", "b"), ("b", "c"), ("c", "a"), ("b", "a"), ("c", "d"), ("d", "e"), ("e", "e"), ("e", "e"), ("f", "g")]
+    )
+    assert strongly_connected_components(graph)[0] == ["a", "b", "c"]
+    cycles = find_cycles(graph)
+    assert [[(s, d) for s, d, _ in cyc] for cyc in cycles] == [[("a", "b"), ("b", "a")], [("e", "e")]]
+
+    findings = detect_cycle_dependency(graph)
+    assert [f.evidence["scc_size"] for f in findings] == [3, 1]
+    assert findings[0].evidence["cycle_path"] == "a → b → a"
+
+
+def test_deep_chain_does_not_recurse() -> None:
+    n = 50_000
+    pairs = [(f"n{i}", f"n{i + 1}") for i in range(n)] + [(f"n{n}", "n0")]
+    cycles = find_cycles(_graph(pairs))
+    assert len(cycles) == 1 and len(cycles[0]) == n + 1
+
+
+def _linear_similar(target: str, candidates: list[str]) -> list[str]:
+    """旧 _find_similar（候補の線形走査）"""
+    target_name, target_stem = Path(target).name.lower(), Path(target).stem.lower()
+    similar: list[str] = []
+    for c in candidates:
+        c_name, c_stem = Path(c).name.lower(), Path(c).stem.lower()
+        if c_name == target_name:
+            similar.insert(0, c)
+        elif c_stem == target_stem or target_stem in c_name or c_stem in target_name:
+            similar.append(c)
+    return similar
+
+
+def test_similar_path_index_matches_linear_scan() -> None:
+    rng = random.Random(3)
+    words = ["a", "ab", "readme", "README", "skill", "config", "cfg", ".gitignore", "x.y", "tool_v2"]
+    suffixes = ["", ".md", ".py", ".json", "."]
+    candidates = [f"/ws/{rng.choice(words)}/{rng.choice(words)}{rng.choice(suffixes)}" for _ in range(300)]
+    index = SimilarPathIndex(candidates)
+    for _ in range(500):
+        target = f"/ws/missing/{rng.choice(words)}{rng.choice(words)}{rng.choice(suffixes)}"
+        assert index.find(target) == _linear_similar(target, candidates)
+    for target in ["", "/", "a/..", "README.MD"]:
+        assert index.find(target) == _linear_similar(target, candidates)
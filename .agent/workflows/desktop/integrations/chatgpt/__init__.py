@@ -1,5 +1,5 @@
 # ChatGPT Integration v5.0.0
 from .generation_fsm import (
-    GenState, GenFSM, ChatGPTSignals, ChatGPTWaitConfig,
+    GenState, GenFSM, ChatGPTSignals, ChatGPTWaitConfig, PollStats,
     update_gen_fsm, get_poll_interval, is_generation_complete
 )
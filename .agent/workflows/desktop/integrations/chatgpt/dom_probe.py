@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Desktop Control v5.1.0 - ChatGPT DOM Probe
+生成シグナルを1回の page.evaluate でまとめて取得する注入スクリプト
+
+ロケータ経由の観測（count / is_visible / is_disabled / inner_text ...）は1ポーリングで
+約10回のCDP往復になり、完了検知の速さを頭打ちにする。DOM Probe は
+- 全シグナル（入力欄・停止/送信ボタン・最新アシスタント発言・エラー表示）を1往復で返す
+- 停止/送信ボタンのセレクタを window 上にキャッシュし、一致しなくなったときだけ再探索する
+- 最新発言のハッシュ（FNV-1a 32bit, UTF-16）と長さ（コードポイント数）を
+  前回テキストの続きなら追記分だけで更新する（ストリーミング中は追記が大半）
+ページ遷移で window が作り直されると状態も自動で作り直す。
+
+判定は AdaptiveSelector / ロケータ版と同じ:
+- 可視: 幅・高さが 0 でなく visibility:hidden でない（Playwright is_visible 相当）
+- 無効: :disabled か aria-disabled="true" の祖先がある（Playwright is_disabled 相当）
+- rate limit: script/style/noscript を除いた div のテキストに "You've reached"（大小・空白を正規化）
+"""
+
+from typing import Any, Dict, List, TYPE_CHECKING
+import sys
+import time
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page
+    from playwright.async_api import Page as AsyncPage
+
+PROBE_VERSION = 1
+
+# AdaptiveSelector.discover_stop_button / discover_send_button と同じ優先順（フォールバックのセレクタを含む）
+STOP_BUTTON_CANDIDATES: List[str] = [
+    *(f"button[aria-label='{label}']" for label in ["Stop streaming", "Stop", "停止", "Cancel"]),
+    *(f"button[data-testid='{testid}']" for testid in ["stop-button", "stop-streaming-button", "abort-button"]),
+]
+SEND_BUTTON_CANDIDATES: List[str] = [
+    "button[data-testid='send-button']",
+    *(f"button[aria-label='{label}']" for label in ["Send", "送信", "Send message", "Send prompt"]),
+]
+
+PROBE_CONFIG: Dict[str, Any] = {
+    "version": PROBE_VERSION,
+    "textbox": "#prompt-textarea, textarea[placeholder*='Message']",
+    "assistant": "div[data-message-author-role='assistant']",
+    "alert": "div[role='alert']",
+    "rate_limit_phrase": "you've reached",
+    "stop": STOP_BUTTON_CANDIDATES,
+    "send": SEND_BUTTON_CANDIDATES,
+}
+
+FNV_OFFSET = 0x811C9DC5
+FNV_PRIME = 0x01000193
+
+PROBE_JS = r"""
+(cfg) => {
+  const t0 = performance.now();
+  let st = window.__cgptProbe;
+  if (!st || st.version !== cfg.version) {
+    st = window.__cgptProbe = { version: cfg.version, selectors: {}, msg: null, polls: 0, discoveries: 0 };
+  }
+  st.polls += 1;
+
+  const q = (sel) => { try { return document.querySelector(sel); } catch (e) { return null; } };
+  const find = (key, candidates) => {
+    const cached = st.selectors[key];
+    if (cached) {
+      const el = q(cached);
+      if (el) return el;
+    }
+    st.discoveries += 1;
+    for (const sel of candidates) {
+      const el = q(sel);
+      if (el) { st.selectors[key] = sel; return el; }
+    }
+    delete st.selectors[key];
+    return null;
+  };
+  const visible = (el) => {
+    const r = el.getBoundingClientRect();
+    return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+  };
+  const disabled = (el) => el.matches(':disabled') || !!el.closest('[aria-disabled="true"]');
+  const fnv = (h, s) => {
+    for (let i = 0; i < s.length; i++) { h ^= s.charCodeAt(i); h = Math.imul(h, 0x01000193) >>> 0; }
+    return h;
+  };
+  const codePoints = (s) => {
+    let n = s.length;
+    for (let i = 0; i < s.length; i++) {
+      const c = s.charCodeAt(i);
+      if (c >= 0xDC00 && c <= 0xDFFF && i > 0) {
+        const p = s.charCodeAt(i - 1);
+        if (p >= 0xD800 && p <= 0xDBFF) n -= 1;
+      }
+    }
+    return n;
+  };
+
+  const stop = find('stop', cfg.stop);
+  const send = find('send', cfg.send);
+
+  let msgLen = null, msgHash = null;
+  const msgs = document.querySelectorAll(cfg.assistant);
+  const last = msgs.length ? msgs[msgs.length - 1] : null;
+  if (last) {
+    const text = last.innerText;
+    let m = st.msg;
+    if (m && m.el === last && text.length >= m.text.length && text.startsWith(m.text)) {
+      const added = text.slice(m.text.length);
+      // 前回末尾と追記先頭でサロゲートペアが分かれていても、全体を数え直した値と一致させる
+      m.len += codePoints(m.text.slice(-1) + added) - codePoints(m.text.slice(-1));
+      m.hash = fnv(m.hash, added);
+      m.text = text;
+    } else {
+      m = st.msg = { el: last, text: text, hash: fnv(0x811c9dc5, text), len: codePoints(text) };
+    }
+    msgLen = m.len;
+    msgHash = m.hash.toString(16).padStart(8, '0');
+  } else {
+    st.msg = null;
+  }
+
+  const SKIP = { SCRIPT: 1, STYLE: 1, NOSCRIPT: 1 };
+  const textOf = (root) => {
+    const parts = [];
+    const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT, {
+      acceptNode: (n) => (n.nodeType === 1 && SKIP[n.nodeName]) ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT,
+    });
+    for (let n = walker.nextNode(); n; n = walker.nextNode()) {
+      if (n.nodeType === 3) parts.push(n.data);
+    }
+    return parts.join('').replace(/\u200b/g, '').replace(/\s+/g, ' ').toLowerCase();
+  };
+  let rateLimited = false;
+  if (document.body && textOf(document.body).includes(cfg.rate_limit_phrase)) {
+    rateLimited = Array.from(document.querySelectorAll('div')).some((d) => textOf(d).includes(cfg.rate_limit_phrase));
+  }
+
+  return {
+    has_textbox: !!q(cfg.textbox),
+    stop_button_visible: !!stop && visible(stop),
+    send_enabled: send ? (visible(send) && !disabled(send)) : null,
+    last_msg_len: msgLen,
+    last_msg_hash: msgHash,
+    rate_limited: rateLimited,
+    error_banner: !!q(cfg.alert),
+    selectors: Object.assign({}, st.selectors),
+    polls: st.polls,
+    discoveries: st.discoveries,
+    page_ms: performance.now() - t0,
+  };
+}
+"""
+
+
+def fnv1a32_utf16(text: str, h: int = FNV_OFFSET) -> int:
+    """PROBE_JS と同じ FNV-1a 32bit（UTF-16 コード単位）。h に前回値を渡すと追記分だけ更新できる"""
+    data = text.encode("utf-16-le" if sys.byteorder == "little" else "utf-16-be", "surrogatepass")
+    for unit in memoryview(data).cast("H"):
+        h = ((h ^ unit) * FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+
+def text_hash(text: str) -> str:
+    """最新発言のハッシュ（8桁hex）。DOM Probe とロケータ版で同じ値になる"""
+    return format(fnv1a32_utf16(text), "08x")
+
+
+def probe_sync(page: "Page") -> Dict[str, Any]:
+    """PROBE_JS を1回評価して生の結果を返す（round_trip_ms を付ける）"""
+    started = time.perf_counter()
+    raw = page.evaluate(PROBE_JS, PROBE_CONFIG)
+    raw["round_trip_ms"] = (time.perf_counter() - started) * 1000
+    return raw
+
+
+async def probe_async(page: "AsyncPage") -> Dict[str, Any]:
+    """PROBE_JS を1回評価して生の結果を返す（非同期版）"""
+    started = time.perf_counter()
+    raw = await page.evaluate(PROBE_JS, PROBE_CONFIG)
+    raw["round_trip_ms"] = (time.perf_counter() - started) * 1000
+    return raw
+
+
+def reset_probe_state_sync(page: "Page") -> None:
+    """ページ上のセレクタ/ハッシュのキャッシュを捨てる（テスト・UI更新後の再探索用）"""
+    page.evaluate("() => { delete window.__cgptProbe; }")
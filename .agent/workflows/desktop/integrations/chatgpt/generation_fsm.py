@@ -4,13 +4,15 @@ Desktop Control v5.1.0 - ChatGPT Generation FSM
 生成状態の合議判定（stopボタン + テキスト変化 + 安定化）
 
 v5.1.0: AdaptiveSelector統合、ポーリングループ追加
+v5.1.1: シグナル観測を DOM Probe（1回の evaluate）に置き換え、ポーリングの所要時間を記録
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional, TYPE_CHECKING
+from typing import Any, Dict, Optional, TYPE_CHECKING
 import time
-import hashlib
+
+from .dom_probe import probe_async, probe_sync, text_hash
 
 if TYPE_CHECKING:
     from playwright.sync_api import Page
@@ -39,6 +41,37 @@ class ChatGPTSignals:
     last_msg_hash: Optional[str] = None
     rate_limited: bool = False
     error_banner: bool = False
+    probe_ms: Optional[float] = None  # 観測1回の所要時間（CDP往復込み）
+    observed_by: Optional[str] = None  # "dom_probe" / "locators"
+
+
+@dataclass
+class PollStats:
+    """ポーリングごとの観測時間の集計"""
+    polls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+    fallbacks: int = 0  # DOM Probe が失敗してロケータ版で観測した回数
+
+    def record(self, sig: "ChatGPTSignals") -> None:
+        if sig.probe_ms is None:
+            return
+        self.polls += 1
+        self.total_ms += sig.probe_ms
+        self.max_ms = max(self.max_ms, sig.probe_ms)
+        self.last_ms = sig.probe_ms
+        if sig.observed_by == "locators":
+            self.fallbacks += 1
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "polls": self.polls,
+            "avg_ms": round(self.total_ms / self.polls, 2) if self.polls else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "last_ms": round(self.last_ms, 2),
+            "fallbacks": self.fallbacks,
+        }
 
 
 @dataclass
@@ -50,6 +83,7 @@ class GenFSM:
     stable_since_ms: int = 0
     last_hash: str = ""
     start_ms: int = 0
+    poll_stats: PollStats = field(default_factory=PollStats)
     
     def reset(self) -> None:
         """リセット"""
@@ -59,6 +93,7 @@ class GenFSM:
         self.stable_since_ms = 0
         self.last_hash = ""
         self.start_ms = 0
+        self.poll_stats = PollStats()
 
 
 @dataclass(frozen=True)
@@ -185,14 +220,46 @@ def is_generation_complete(fsm: GenFSM) -> bool:
 
 # === v5.1.0: シグナル観測とポーリングループ ===
 
+def _signals_from_probe(now_ms: int, url: str, raw: Dict[str, Any]) -> ChatGPTSignals:
+    return ChatGPTSignals(
+        ts_ms=now_ms,
+        url=url,
+        has_textbox=bool(raw.get("has_textbox")),
+        send_enabled=raw.get("send_enabled"),
+        stop_button_visible=bool(raw.get("stop_button_visible")),
+        last_msg_len=raw.get("last_msg_len"),
+        last_msg_hash=raw.get("last_msg_hash"),
+        rate_limited=bool(raw.get("rate_limited")),
+        error_banner=bool(raw.get("error_banner")),
+        probe_ms=raw.get("round_trip_ms"),
+        observed_by="dom_probe",
+    )
+
+
 def observe_signals_sync(page: "Page") -> ChatGPTSignals:
     """
     ページからシグナルを観測（同期版）
     
+    DOM Probe で1回の evaluate にまとめて取得する。evaluate が失敗したら
+    （遷移中でコンテキストが無い等）ロケータ版で観測する。
+    """
+    now_ms = int(time.time() * 1000)
+    try:
+        return _signals_from_probe(now_ms, page.url, probe_sync(page))
+    except Exception:
+        return observe_signals_locators_sync(page)
+
+
+def observe_signals_locators_sync(page: "Page") -> ChatGPTSignals:
+    """
+    ページからシグナルを観測（同期版・ロケータ版）
+    
     AdaptiveSelectorを使って動的にボタンを発見し、状態を取得。
+    1回の観測で約10回のCDP往復になる（DOM Probe のフォールバック・比較用）。
     """
     from .adaptive_selector import AdaptiveSelector, FALLBACK_SELECTORS
     
+    started = time.perf_counter()
     now_ms = int(time.time() * 1000)
     selector = AdaptiveSelector(page)
     
@@ -225,7 +292,7 @@ def observe_signals_sync(page: "Page") -> ChatGPTSignals:
         if assistant_msg.count() > 0:
             text = assistant_msg.inner_text()
             msg_len = len(text)
-            msg_hash = hashlib.md5(text.encode()).hexdigest()[:8]
+            msg_hash = text_hash(text)
     except Exception:
         pass  # セレクタエラー時はスキップ
     
@@ -243,15 +310,31 @@ def observe_signals_sync(page: "Page") -> ChatGPTSignals:
         last_msg_hash=msg_hash,
         rate_limited=rate_limited,
         error_banner=error_banner,
+        probe_ms=(time.perf_counter() - started) * 1000,
+        observed_by="locators",
     )
 
 
 async def observe_signals_async(page: "AsyncPage") -> ChatGPTSignals:
     """
     ページからシグナルを観測（非同期版）
+    
+    DOM Probe で1回の evaluate にまとめて取得し、失敗したらロケータ版で観測する。
+    """
+    now_ms = int(time.time() * 1000)
+    try:
+        return _signals_from_probe(now_ms, page.url, await probe_async(page))
+    except Exception:
+        return await observe_signals_locators_async(page)
+
+
+async def observe_signals_locators_async(page: "AsyncPage") -> ChatGPTSignals:
+    """
+    ページからシグナルを観測（非同期版・ロケータ版）
     """
     from .adaptive_selector import AsyncAdaptiveSelector, FALLBACK_SELECTORS
     
+    started = time.perf_counter()
     now_ms = int(time.time() * 1000)
     selector = AsyncAdaptiveSelector(page)
     
@@ -290,7 +373,7 @@ async def observe_signals_async(page: "AsyncPage") -> ChatGPTSignals:
         if await assistant_msg.count() > 0:
             text = await assistant_msg.inner_text()
             msg_len = len(text)
-            msg_hash = hashlib.md5(text.encode()).hexdigest()[:8]
+            msg_hash = text_hash(text)
     except Exception:
         pass  # セレクタエラー時はスキップ
     
@@ -308,6 +391,8 @@ async def observe_signals_async(page: "AsyncPage") -> ChatGPTSignals:
         last_msg_hash=msg_hash,
         rate_limited=rate_limited,
         error_banner=error_banner,
+        probe_ms=(time.perf_counter() - started) * 1000,
+        observed_by="locators",
     )
 
 
@@ -319,7 +404,7 @@ def wait_for_generation_sync(
     生成完了をFSMで待機（同期版）
     
     Returns:
-        (success, fsm): 成功時True、FSMの最終状態
+        (success, fsm): 成功時True、FSMの最終状態（fsm.poll_stats に観測時間）
     """
     if cfg is None:
         cfg = ChatGPTWaitConfig()
@@ -336,6 +421,7 @@ def wait_for_generation_sync(
         
         # シグナル観測
         sig = observe_signals_sync(page)
+        fsm.poll_stats.record(sig)
         
         # FSM更新
         fsm = update_gen_fsm(fsm, sig, cfg)
@@ -357,7 +443,7 @@ async def wait_for_generation_async(
     生成完了をFSMで待機（非同期版）
     
     Returns:
-        (success, fsm): 成功時True、FSMの最終状態
+        (success, fsm): 成功時True、FSMの最終状態（fsm.poll_stats に観測時間）
     """
     import asyncio
     
@@ -376,6 +462,7 @@ async def wait_for_generation_async(
         
         # シグナル観測
         sig = await observe_signals_async(page)
+        fsm.poll_stats.record(sig)
         
         # FSM更新
         fsm = update_gen_fsm(fsm, sig, cfg)
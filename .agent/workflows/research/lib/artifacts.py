@@ -184,5 +184,11 @@ class ArtifactWriter:
             json.dump(audit_pack, f, ensure_ascii=False, indent=2)
         return self.output_dir
     
+    def save_run_stats(self, run_stats: Dict[str, Any]) -> Path:
+        """実行統計（再開元・所要時間・ツールメモのヒット率）を保存"""
+        with open(self.output_dir / "run_stats.json", "w", encoding="utf-8") as f:
+            json.dump(run_stats, f, ensure_ascii=False, indent=2)
+        return self.output_dir
+    
     def get_output_path(self) -> Path:
         return self.output_dir
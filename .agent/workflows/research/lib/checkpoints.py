@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Research Agent v4.3.3 - Checkpoints Module
+Phase ごとの ResearchRunContext チェックポイント（内容アドレス）と再開
+
+Orchestrator が各Phase（Phase 3 はラウンドごと）の遷移後に保存し、
+--resume では最後のチェックポイントの状態を復元して次のPhaseから続ける。
+
+保存先（run の出力先の checkpoints/）:
+- objects/<sha256>.json: Context の状態（JSON）。同じ状態は同じファイルになる
+- log.jsonl: 保存履歴（seq, phase, signal, next_phase, sha256, created_at）
+- HEAD.json: 最新の履歴行（置き換えで更新するので途中で落ちても壊れない）
+
+保存しないもの: evidence_graph（evidence から作り直す）、workflow_logger、tool_memo、
+サーキットブレーカーの失敗カウント（再開後は新しいブレーカーで数え直す）
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .context import ResearchRunContext
+from .failure_detector import FailureEvent
+from .termination import ClaimSnapshot, RoundSnapshot, TerminationState
+
+CHECKPOINT_DIRNAME = "checkpoints"
+CHECKPOINT_SCHEMA_VERSION = 1
+
+# そのまま JSON にする Context のフィールド
+_PLAIN_FIELDS = (
+    "session_id",
+    "query",
+    "raw_claims",
+    "search_log",
+    "normalized_claims",
+    "gaps",
+    "sub_questions",
+    "evidence",
+    "coverage_map",
+    "deep_round",
+    "verified_claims",
+    "counterevidence_log",
+    "required_actions",
+    "final_report",
+    "report_data",
+    "phase_results",
+    "verify_rollback_count",
+    "max_verify_rollbacks",
+)
+
+
+def context_to_state(context: ResearchRunContext) -> Dict[str, Any]:
+    """Context → JSON にできる dict"""
+    state: Dict[str, Any] = {"schema_version": CHECKPOINT_SCHEMA_VERSION}
+    for name in _PLAIN_FIELDS:
+        state[name] = getattr(context, name)
+    state["seen_urls"] = sorted(context.seen_urls)
+    state["failures"] = [e.to_dict() for e in context.failures]
+    state["termination_state"] = {
+        "history": [asdict(r) for r in context.termination_state.history],
+        "low_mu_streak": context.termination_state.low_mu_streak,
+    }
+    return state
+
+
+def restore_context(context: ResearchRunContext, state: Dict[str, Any]) -> ResearchRunContext:
+    """context_to_state の逆。context を上書きして返す"""
+    version = state.get("schema_version")
+    if version != CHECKPOINT_SCHEMA_VERSION:
+        raise ValueError(f"unsupported checkpoint schema_version: {version}")
+    for name in _PLAIN_FIELDS:
+        if name in state:
+            setattr(context, name, state[name])
+    context.seen_urls = set(state.get("seen_urls") or [])
+    context.failures = [FailureEvent.from_dict(d) for d in state.get("failures") or []]
+    term = state.get("termination_state") or {}
+    history: List[RoundSnapshot] = []
+    for r in term.get("history") or []:
+        claims = {cid: ClaimSnapshot(**c) for cid, c in (r.get("claims") or {}).items()}
+        history.append(RoundSnapshot(**{**r, "claims": claims}))
+    context.termination_state = TerminationState(history=history, low_mu_streak=int(term.get("low_mu_streak", 0)))
+    return context
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class CheckpointStore:
+    """
+    run 出力先の checkpoints/ を読み書きする
+
+    使用例:
+        store = CheckpointStore(output_dir / CHECKPOINT_DIRNAME)
+        store.save(context, phase="deep", signal="continue", next_phase="deep")
+        head = store.head()
+        restore_context(ResearchRunContext(), store.load(head))
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+
+    def save(self, context: ResearchRunContext, *, phase: str, signal: str, next_phase: str) -> Dict[str, Any]:
+        """Context を保存して HEAD を進める。保存した履歴行を返す"""
+        payload = json.dumps(
+            context_to_state(context), ensure_ascii=False, sort_keys=True, default=str
+        ).encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        obj = self.objects_dir / f"{digest}.json"
+        reused = obj.exists()
+        if not reused:
+            _write_atomic(obj, payload)
+        head = self.head()
+        entry = {
+            "seq": (head["seq"] + 1) if head else 1,
+            "phase": phase,
+            "signal": signal,
+            "next_phase": next_phase,
+            "sha256": digest,
+            "bytes": len(payload),
+            "reused_object": reused,
+            "created_at": datetime.now().isoformat(),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with open(self.root / "log.jsonl", "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        _write_atomic(self.root / "HEAD.json", line.encode("utf-8"))
+        return entry
+
+    def head(self) -> Optional[Dict[str, Any]]:
+        """最新の履歴行（無ければ None）"""
+        path = self.root / "HEAD.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def load(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """履歴行が指す状態を読む（内容ハッシュを検証する）"""
+        payload = (self.objects_dir / f"{entry['sha256']}.json").read_bytes()
+        if hashlib.sha256(payload).hexdigest() != entry["sha256"]:
+            raise ValueError(f"checkpoint object is corrupted: {entry['sha256']}")
+        return json.loads(payload.decode("utf-8"))
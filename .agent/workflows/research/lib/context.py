@@ -13,6 +13,7 @@ from typing import List, Dict, Any, Optional
 
 from .termination import TerminationConfig, TerminationState
 from .failure_detector import FailureEvent
+from .evidence_graph import EvidenceGraph
 
 
 @dataclass
@@ -38,6 +39,7 @@ class ResearchRunContext:
     
     # Phase 3 出力
     evidence: List[Dict[str, Any]] = field(default_factory=list)
+    evidence_graph: EvidenceGraph = field(default_factory=EvidenceGraph)  # Claim⇄Evidence索引（evidenceから同期）
     coverage_map: Dict[str, Any] = field(default_factory=dict)
     deep_round: int = 0  # Phase 3のラウンド番号
     
@@ -72,6 +74,16 @@ class ResearchRunContext:
     circuit_breaker: Optional[Any] = None
     seen_urls: set = field(default_factory=set)  # 同run内URL重複fetch防止
     
+    # 再開・メモ（checkpoints / tool_memo）
+    tool_memo: Optional[Any] = None  # ToolMemo（call_tool(memo=...) が参照）
+    run_stats: Dict[str, Any] = field(default_factory=dict)  # 再開元・所要時間・メモのヒット率
+    
+    def sync_evidence_graph(self, evidence: Optional[List[Dict[str, Any]]] = None) -> EvidenceGraph:
+        """evidence（省略時は self.evidence）と gaps の追加分を索引に反映して返す"""
+        self.evidence_graph.sync(self.evidence if evidence is None else evidence)
+        self.evidence_graph.sync_gaps(self.gaps)
+        return self.evidence_graph
+    
     def add_failure(self, event: FailureEvent):
         """失敗イベントを追加"""
         self.failures.append(event)
@@ -112,4 +124,7 @@ class ResearchRunContext:
             "blocked_urls_count": breaker_stats.get("blocked_urls", 0),
             "blocked_hosts_count": breaker_stats.get("blocked_hosts", 0),
             "max_same_url_attempts": breaker_stats.get("max_same_url_attempts", 0),
+            # 再開・メモ
+            "resumed_from_phase": (self.run_stats.get("resumed_from") or {}).get("next_phase"),
+            "tool_memo_hit_ratio": self.tool_memo.stats()["hit_ratio"] if self.tool_memo else None,
         }
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Research Agent v4.3.3 - Evidence Graph Module
+Claim ⇄ Evidence / Gap ⇄ Claim の索引と Claim ごとの集計（ResearchRunContext が保持）
+
+各Phaseが「Claimごとに全Evidenceを走査する」とラウンドごとに Claim数 × Evidence数 かかる。
+EvidenceGraph は Evidence が届いた時点で1件ずつ索引・集計を更新するので、
+ラウンドごとの問い合わせは Claim数（+ 新着Evidence数）に比例する。
+
+- sync(evidence): 前回からの追記分だけを取り込む（リストが置き換わっていれば作り直す）
+- sync_gaps(gaps): gap_id → related_claims / claim_id → gap_id
+- aggregate(claim_id): Evidence数・引用可能数・一次ソース有無・
+  scoring.aggregate_confidence 相当の支持/反証/中立の重み（tier + cluster減衰）
+- evidence_by_ref(): evidence_id/source_id/url → Evidence（後勝ち。quality_gate / Phase 4 用）
+
+取り込んだ Evidence は以後変更しない前提（変更した場合は rebuild() を呼ぶ）。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from math import sqrt
+from typing import Any, Dict, List, Optional
+
+from .models import stance_to_int
+from .scoring import EPS, Evidence as ScoringEvidence, evidence_weight
+
+# 後方互換: tier1/tier2/tier3 → S/B/C
+_TIER_ALIASES = {"tier1": "S", "tier2": "B", "tier3": "C"}
+
+
+def evidence_ref(e: Dict[str, Any]) -> str:
+    """Evidence の参照キー（verified_claims の *_evidence_ids と同じ規則）"""
+    return str(e.get("evidence_id") or e.get("source_id") or e.get("url") or "")
+
+
+def _scoring_evidence(claim_id: str, e: Dict[str, Any]) -> ScoringEvidence:
+    tier = str(e.get("tier", "C"))
+    tier = _TIER_ALIASES.get(tier, tier)
+    stance = e.get("stance") if e.get("stance") in ("supports", "refutes", "neutral") else "neutral"
+    return ScoringEvidence(
+        claim_id=claim_id,
+        url=str(e.get("url", e.get("source_id", ""))),
+        tier=tier,
+        published_at=None,
+        stance=stance,
+        bias_flags=set(e.get("bias_flags") or []),
+        citations_to_high_tier=0,
+        cluster_key=str(e.get("cluster_key", "")) if e.get("cluster_key") else "",
+    )
+
+
+@dataclass
+class ClaimAggregate:
+    """1 Claim の集計（Evidence 追加ごとに更新）"""
+    claim_id: str
+    evidence_count: int = 0
+    citeable_count: int = 0  # quote と locator がある件数
+    has_primary: bool = False  # tier S / tier1 を含む
+    # scoring.aggregate_confidence と同じ重み（Evidence の追加順に cluster 減衰）
+    pos_weight: float = 0.0
+    neg_weight: float = 0.0
+    neutral_weight: float = 0.0
+    cluster_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def confidence(self) -> float:
+        """-1〜+1（Evidence が無ければ 0.0）"""
+        if not self.evidence_count:
+            return 0.0
+        return (self.pos_weight - self.neg_weight) / (self.pos_weight + self.neg_weight + EPS)
+
+    @property
+    def evidence_mass(self) -> float:
+        return self.pos_weight + self.neg_weight if self.evidence_count else 0.0
+
+    def add(self, e: Dict[str, Any], now: datetime) -> None:
+        self.evidence_count += 1
+        if e.get("quote") and e.get("locator"):
+            self.citeable_count += 1
+        if str(e.get("tier")) in ("S", "tier1"):
+            self.has_primary = True
+
+        ev = _scoring_evidence(self.claim_id, e)
+        w = evidence_weight(ev, now, "MEDIUM").evidence_weight
+        if ev.cluster_key:
+            k = self.cluster_counts.get(ev.cluster_key, 0) + 1
+            self.cluster_counts[ev.cluster_key] = k
+            w *= 1.0 / sqrt(k)
+        stance_val = stance_to_int(ev.stance)
+        if stance_val > 0:
+            self.pos_weight += w
+        elif stance_val < 0:
+            self.neg_weight += w
+        else:
+            self.neutral_weight += w
+
+
+class EvidenceGraph:
+    """
+    Claim ⇄ Evidence / Gap ⇄ Claim の索引
+
+    使用例:
+        graph = context.sync_evidence_graph()
+        graph.related("c1", limit=8)
+        graph.aggregate("c1").confidence
+    """
+
+    def __init__(self) -> None:
+        self._claim_evidence: Dict[str, List[Dict[str, Any]]] = {}
+        self._aggregates: Dict[str, ClaimAggregate] = {}
+        self._by_ref: Dict[str, Dict[str, Any]] = {}
+        self._count = 0  # 取り込み済みの件数
+        self._first: Optional[Any] = None  # 取り込み済み範囲の先頭/末尾（置き換え検出用）
+        self._last: Optional[Any] = None
+        self._gap_claims: Dict[str, List[str]] = {}
+        self._claim_gaps: Dict[str, List[str]] = {}
+        self._gaps_key: Optional[tuple] = None
+
+    # --- 取り込み ---
+
+    def sync(self, evidence: List[Any]) -> "EvidenceGraph":
+        """evidence の未取り込み分を反映（先頭側が変わっていれば作り直す）"""
+        n = self._count
+        if len(evidence) < n or (n and (evidence[0] is not self._first or evidence[n - 1] is not self._last)):
+            self.rebuild(evidence)
+            return self
+        if len(evidence) > n:
+            self.add_many(evidence[n:])
+        return self
+
+    def rebuild(self, evidence: List[Any]) -> None:
+        """索引を作り直す"""
+        self._claim_evidence.clear()
+        self._aggregates.clear()
+        self._by_ref.clear()
+        self._count = 0
+        self._first = self._last = None
+        self.add_many(evidence)
+
+    def add_many(self, items: List[Any]) -> None:
+        now = datetime.now()
+        for e in items:
+            self._add(e, now)
+
+    def add(self, e: Any) -> None:
+        """Evidence を1件取り込む"""
+        self._add(e, datetime.now())
+
+    def _add(self, e: Any, now: datetime) -> None:
+        if self._count == 0:
+            self._first = e
+        self._count += 1
+        self._last = e
+        if not isinstance(e, dict):
+            return
+        ref = evidence_ref(e)
+        if ref:
+            self._by_ref[ref] = e
+        claim_ids = e.get("claim_ids") or []
+        if isinstance(claim_ids, str):
+            claim_ids = [claim_ids]
+        for claim_id in dict.fromkeys(claim_ids):
+            if not claim_id:
+                continue
+            self._claim_evidence.setdefault(claim_id, []).append(e)
+            agg = self._aggregates.get(claim_id)
+            if agg is None:
+                agg = self._aggregates[claim_id] = ClaimAggregate(claim_id)
+            agg.add(e, now)
+
+    def sync_gaps(self, gaps: List[Any]) -> "EvidenceGraph":
+        """Gap ⇄ Claim の索引を更新（gaps が変わったときだけ作り直す）"""
+        key = (id(gaps), len(gaps))
+        if key == self._gaps_key:
+            return self
+        self._gaps_key = key
+        self._gap_claims.clear()
+        self._claim_gaps.clear()
+        for i, g in enumerate(gaps):
+            if not isinstance(g, dict):
+                continue
+            gap_id = g.get("gap_id", f"gap_{i}")
+            related = g.get("related_claims") or []
+            if not isinstance(related, list):
+                related = []
+            self._gap_claims[gap_id] = list(related)
+            for cid in related:
+                self._claim_gaps.setdefault(cid, []).append(gap_id)
+        return self
+
+    # --- 問い合わせ ---
+
+    def __len__(self) -> int:
+        return self._count
+
+    def related(self, claim_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Claim に紐づく Evidence（取り込み順）"""
+        rows = self._claim_evidence.get(claim_id) or []
+        return list(rows[:limit] if limit is not None else rows)
+
+    def evidence_count(self, claim_id: str) -> int:
+        agg = self._aggregates.get(claim_id)
+        return agg.evidence_count if agg else 0
+
+    def aggregate(self, claim_id: str) -> ClaimAggregate:
+        """Claim の集計（Evidence が無ければ空の集計）"""
+        return self._aggregates.get(claim_id) or ClaimAggregate(claim_id)
+
+    def is_covered(self, claim_id: str) -> bool:
+        return self.evidence_count(claim_id) > 0
+
+    def coverage_map(self, claims: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Claim → Evidence のカバレッジマップ（claims の順）"""
+        coverage = {}
+        for claim in claims:
+            claim_id = claim.get("claim_id", "")
+            agg = self.aggregate(claim_id) if claim_id else ClaimAggregate("")
+            coverage[claim_id] = {
+                "evidence_count": agg.evidence_count,
+                "citeable_count": agg.citeable_count,
+                "covered": agg.evidence_count > 0,
+            }
+        return coverage
+
+    def claims_for_gap(self, gap_id: str) -> List[str]:
+        return list(self._gap_claims.get(gap_id) or [])
+
+    def gaps_for_claim(self, claim_id: str) -> List[str]:
+        return list(self._claim_gaps.get(claim_id) or [])
+
+    def evidence_by_ref(self) -> Dict[str, Dict[str, Any]]:
+        """参照キー → Evidence（読み取り専用として扱う）"""
+        return self._by_ref
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Research Agent v4.3.3 - Fan-out Module
+Phase 3 / 3.5 の検索・取得を並行実行するための有界エグゼキュータ
+
+- 全体の同時実行数（max_workers）とホストごとの同時実行数（per_host_limit）を制限
+- ラウンド単位の時間予算（round_budget_sec）: 超過後に開始するタスクは実行せず、
+  待ちきれなかったタスクは budget_exceeded として扱う
+- 結果の取り出しは呼び出し側が投入順に行う（完了順に依存しない = 成果物が再現可能）
+
+ツール呼び出しの TOOL_CALL / TOOL_RESULT は各タスク内の call_tool が記録する。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+
+@dataclass
+class FanOutConfig:
+    """並行実行の設定"""
+    max_workers: int = 8
+    per_host_limit: int = 2
+    round_budget_sec: Optional[float] = None  # None = 時間予算なし
+
+    @classmethod
+    def from_dict(cls, cfg: Optional[Dict[str, Any]]) -> "FanOutConfig":
+        """handler_config から生成（fanout_max_workers / fanout_per_host_limit / round_budget_sec）"""
+        cfg = cfg or {}
+        budget = cfg.get("round_budget_sec")
+        return cls(
+            max_workers=max(1, int(cfg.get("fanout_max_workers", cls.max_workers))),
+            per_host_limit=max(1, int(cfg.get("fanout_per_host_limit", cls.per_host_limit))),
+            round_budget_sec=float(budget) if budget is not None else None,
+        )
+
+
+@dataclass
+class TaskOutcome:
+    """1タスクの結果（status: ok / error / budget_exceeded）"""
+    status: str
+    value: Any = None
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+BUDGET_EXCEEDED = "budget_exceeded"
+
+
+def host_of(url: str) -> str:
+    """URLのホスト名（小文字）。解析できなければ空文字"""
+    try:
+        return (urlparse(url).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+class FanOut:
+    """
+    有界の並行エグゼキュータ（1ラウンド = 1インスタンス）
+
+    使用例:
+        with FanOut(FanOutConfig(max_workers=8, round_budget_sec=60)) as fanout:
+            futures = [fanout.submit(lambda u=u: fetch(u), host=host_of(u)) for u in urls]
+            outcomes = [fanout.result(f) for f in futures]  # 投入順
+    """
+
+    def __init__(self, config: Optional[FanOutConfig] = None):
+        self.config = config or FanOutConfig()
+        budget = self.config.round_budget_sec
+        self._deadline = time.monotonic() + budget if budget is not None else None
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, self.config.max_workers),
+            thread_name_prefix="research_fanout",
+        )
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "FanOut":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def remaining(self) -> Optional[float]:
+        """時間予算の残り秒（予算なしは None）"""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(max(1, self.config.per_host_limit))
+                self._host_slots[host] = slot
+            return slot
+
+    def _run(self, fn: Callable[[], Any], host: str) -> TaskOutcome:
+        if self.expired():
+            return TaskOutcome(BUDGET_EXCEEDED)
+        slot = self._host_slot(host) if host else None
+        if slot is not None and not slot.acquire(timeout=self.remaining()):
+            return TaskOutcome(BUDGET_EXCEEDED)
+        try:
+            if self.expired():
+                return TaskOutcome(BUDGET_EXCEEDED)
+            return TaskOutcome("ok", value=fn())
+        except Exception as exc:
+            return TaskOutcome("error", error=str(exc))
+        finally:
+            if slot is not None:
+                slot.release()
+
+    def submit(self, fn: Callable[[], Any], *, host: str = "") -> "Future[TaskOutcome]":
+        """タスクを投入（host を指定するとホストごとの同時実行数を制限）。ワーカー内からも呼べる"""
+        return self._pool.submit(self._run, fn, host)
+
+    def result(self, future: "Future[TaskOutcome]") -> TaskOutcome:
+        """タスクの結果を待つ（時間予算の残りまで）"""
+        try:
+            return future.result(timeout=self.remaining())
+        except FutureTimeoutError:
+            future.cancel()
+            return TaskOutcome(BUDGET_EXCEEDED)
+
+    def map(
+        self,
+        fn: Callable[[Any], Any],
+        items: List[Any],
+        *,
+        host: Optional[Callable[[Any], str]] = None,
+    ) -> List[TaskOutcome]:
+        """items を並行に処理し、items と同じ順で結果を返す"""
+        futures = [
+            self.submit(lambda item=item: fn(item), host=host(item) if host else "")
+            for item in items
+        ]
+        return [self.result(f) for f in futures]
+
+    def close(self) -> None:
+        """未開始のタスクを取り消して終了（実行中のタスクは待たない）"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
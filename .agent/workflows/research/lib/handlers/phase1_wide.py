@@ -20,6 +20,7 @@ from hashlib import sha256
 from ..context import ResearchRunContext
 from ..phase_runner import Phase, PhaseResult, PhaseSignal
 from ..tool_trace import call_tool
+from ..tool_memo import content_digest
 
 
 # 7視点テンプレート
@@ -75,6 +76,7 @@ def make_wide_handler(
                     call=lambda: llm.generate_queries(query, SEVEN_PERSPECTIVES),
                     args={"query": query, "perspectives_count": len(SEVEN_PERSPECTIVES)},
                     result_summary=lambda items: {"queries_count": len(items or [])},
+                    memo=True,
                 )
             else:
                 search_queries = _generate_search_queries(query, llm=None)
@@ -90,6 +92,8 @@ def make_wide_handler(
                         call=lambda sq=sq: tools.search_web(sq),
                         args={"query": sq},
                         result_summary=lambda rows: {"results_count": len(rows or [])},
+                        memo=True,
+                        storable=bool,
                     )
                     search_log.append({
                         "query": sq,
@@ -150,6 +154,8 @@ def make_wide_handler(
                         call=lambda url=url: tools.read_url_content(url),
                         args={"url": url},
                         result_summary=lambda text: {"chars": len(text or "")},
+                        memo=True,
+                        storable=bool,
                     )
                     if content:
                         context.seen_urls.add(url)
@@ -163,6 +169,7 @@ def make_wide_handler(
                             call=lambda: llm.extract_claims(content, query),
                             args={"query": query, "content_chars": len(content)},
                             result_summary=lambda rows: {"claims_count": len(rows or [])},
+                            memo={"query": query, "url": url, "content": content_digest(content)},
                         )
                         for claim in claims:
                             raw_claims.append({
@@ -11,6 +11,8 @@ LLM責務:
 - 主要Claim選定（top-k）
 - status判定（verification.determine_status）
 - ROLLBACK条件判定
+
+反証探索は Claim 単位・クエリ単位で FanOut により並行実行し、結果は Claim 順に組み立てる。
 """
 
 from datetime import datetime
@@ -21,7 +23,9 @@ from ..phase_runner import Phase, PhaseResult, PhaseSignal
 from ..verification import determine_status, is_contested
 from ..quality_gate import validate_phase35
 from ..locator import is_strong_locator
+from ..evidence_graph import EvidenceGraph
 from ..tool_trace import call_tool
+from ..fanout import FanOut, FanOutConfig
 
 
 def make_verify_handler(
@@ -36,6 +40,7 @@ def make_verify_handler(
     top_k_claims = cfg.get("top_k_claims", 10)
     min_evidence_for_verify = cfg.get("min_evidence_for_verify", 1)
     max_counter_queries = cfg.get("max_counter_queries", 4)
+    fanout_config = FanOutConfig.from_dict(cfg)
     
     def handler(context: ResearchRunContext) -> PhaseResult:
         """Phase 3.5: 検証"""
@@ -57,15 +62,17 @@ def make_verify_handler(
             required_actions: List[Dict] = []
             
             # 1. 主要Claim選定（上位k件）
-            top_claims = _select_top_claims(normalized_claims, evidence, top_k_claims)
+            graph = context.sync_evidence_graph()
+            top_claims = _select_top_claims(normalized_claims, graph, top_k_claims)
             
-            # 2. 各Claimを検証
+            # 2. 各Claimを検証（Evidence不足は差し戻し候補、それ以外は反証探索へ）
+            candidates: List[tuple] = []
             for claim in top_claims:
                 claim_id = claim.get("claim_id", "")
                 claim_text = claim.get("statement", "")
                 
                 # 関連Evidenceを取得
-                related_evidence = _get_related_evidence(claim_id, evidence)
+                related_evidence = _get_related_evidence(claim_id, graph)
                 # locator無しEvidenceは採用不可（監査可能性優先）
                 related_evidence = [
                     e for e in related_evidence
@@ -81,16 +88,25 @@ def make_verify_handler(
                         "reason": "Evidence不足"
                     })
                     continue
-                
-                # 反証探索
-                counter_result = _search_counterevidence(
-                    context,
-                    claim_id,
-                    claim_text,
-                    tools,
-                    llm,
-                    max_counter_queries=max_counter_queries,
+                candidates.append((claim_id, claim_text, related_evidence))
+            
+            # 反証探索（Claim単位で並行。各Claimのクエリは query_pool で並行）
+            with FanOut(fanout_config) as claim_pool, FanOut(fanout_config) as query_pool:
+                counter_outcomes = claim_pool.map(
+                    lambda item: _search_counterevidence(
+                        context,
+                        item[0],
+                        item[1],
+                        tools,
+                        llm,
+                        max_counter_queries=max_counter_queries,
+                        fanout=query_pool,
+                    ),
+                    candidates,
                 )
+            
+            for (claim_id, claim_text, related_evidence), outcome in zip(candidates, counter_outcomes):
+                counter_result = outcome.value if outcome.ok else _empty_counter_result(claim_id, outcome.status)
                 counterevidence_log.append(counter_result)
                 
                 # ステータス判定
@@ -129,7 +145,8 @@ def make_verify_handler(
             errors, warnings = validate_phase35(
                 verified_claims=verified_claims,
                 counterevidence_log=counterevidence_log,
-                evidence=evidence
+                evidence=evidence,
+                evidence_by_ref=graph.evidence_by_ref(),
             )
             for err in errors:
                 required_actions.append({
@@ -180,40 +197,27 @@ def make_verify_handler(
 
 def _select_top_claims(
     claims: List[Dict],
-    evidence: List[Dict],
+    graph: EvidenceGraph,
     k: int
 ) -> List[Dict]:
     """上位k件のClaimを選定（Evidence数でソート）"""
     def evidence_count(claim):
         claim_id = claim.get("claim_id", "")
-        return sum(
-            1 for e in evidence
-            if isinstance(e, dict) and claim_id and claim_id in (e.get("claim_ids") or [])
-        )
+        return graph.evidence_count(claim_id) if claim_id else 0
     
     sorted_claims = sorted(claims, key=evidence_count, reverse=True)
     return sorted_claims[:k]
 
 
-def _get_related_evidence(claim_id: str, evidence: List[Dict]) -> List[Dict]:
+def _get_related_evidence(claim_id: str, graph: EvidenceGraph) -> List[Dict]:
     """ClaimIDに関連するEvidenceを取得"""
-    related = [
-        e for e in evidence
-        if isinstance(e, dict) and claim_id and claim_id in (e.get("claim_ids") or [])
-    ]
-    return related[:8]
+    if not claim_id:
+        return []
+    return graph.related(claim_id, limit=8)
 
 
-def _search_counterevidence(
-    context: ResearchRunContext,
-    claim_id: str,
-    claim_text: str,
-    tools: Optional[Any],
-    llm: Optional[Any]
-    ,
-    max_counter_queries: int = 3
-) -> Dict:
-    """反証探索"""
+def _empty_counter_result(claim_id: str, skipped_reason: Optional[str] = None) -> Dict:
+    """反証探索結果の雛形（skipped_reason: 探索できなかった理由。例: budget_exceeded）"""
     result = {
         "claim_id": claim_id,
         "search_queries": [],
@@ -222,6 +226,23 @@ def _search_counterevidence(
         "impact_on_status": None,
         "searched_at": datetime.now().isoformat()
     }
+    if skipped_reason:
+        result["skipped_reason"] = skipped_reason
+    return result
+
+
+def _search_counterevidence(
+    context: ResearchRunContext,
+    claim_id: str,
+    claim_text: str,
+    tools: Optional[Any],
+    llm: Optional[Any]
+    ,
+    max_counter_queries: int = 3,
+    fanout: Optional[FanOut] = None,
+) -> Dict:
+    """反証探索（fanout 指定時はクエリを並行実行し、結果はクエリ順に集計）"""
+    result = _empty_counter_result(claim_id)
     
     if not tools:
         return result
@@ -243,6 +264,7 @@ def _search_counterevidence(
                 call=lambda: llm.generate_counter_queries(claim_text),
                 args={"claim_id": claim_id},
                 result_summary=lambda rows: {"queries_count": len(rows or [])},
+                memo={"claim_text": claim_text},
             )[:max_counter_queries]
         except Exception:
             queries = default_queries[:max_counter_queries]
@@ -254,6 +276,7 @@ def _search_counterevidence(
                 call=lambda: llm.generate_counter_query(claim_text),
                 args={"claim_id": claim_id},
                 result_summary=lambda row: {"query_length": len(str(row or ""))},
+                memo={"claim_text": claim_text},
             )
             queries = [one_query]
         except Exception:
@@ -261,27 +284,37 @@ def _search_counterevidence(
     
     result["search_queries"] = [q for q in queries if q]
     
+    def run_query(q: str) -> Any:
+        return call_tool(
+            context,
+            tool_name="tools.search_web",
+            call=lambda: tools.search_web(q),
+            args={"query": q, "mode": "counterevidence"},
+            result_summary=lambda rows: {"results_count": len(rows or [])},
+            memo={"query": q},
+            storable=bool,
+        )
+    
+    local_fanout = fanout or FanOut(FanOutConfig(max_workers=1))
     try:
-        found_any = False
-        total_hits = 0
-        for q in result["search_queries"]:
-            results = call_tool(
-                context,
-                tool_name="tools.search_web",
-                call=lambda q=q: tools.search_web(q),
-                args={"query": q, "mode": "counterevidence"},
-                result_summary=lambda rows: {"results_count": len(rows or [])},
-            )
-            n = len(results) if results else 0
-            total_hits += n
-            if n:
-                found_any = True
-        result["found_counterevidence"] = found_any
-        # 雑だが、反証の「ありそう度」をstatus影響に変換
-        if total_hits >= 6:
-            result["impact_on_status"] = "CONTESTED"
-    except Exception:
-        pass
+        outcomes = local_fanout.map(run_query, result["search_queries"])
+    finally:
+        if fanout is None:
+            local_fanout.close()
+    
+    if not all(outcome.ok for outcome in outcomes):
+        return result  # 1件でも失敗したら集計しない（逐次実行時と同じ）
+    found_any = False
+    total_hits = 0
+    for outcome in outcomes:
+        n = len(outcome.value) if outcome.value else 0
+        total_hits += n
+        if n:
+            found_any = True
+    result["found_counterevidence"] = found_any
+    # 雑だが、反証の「ありそう度」をstatus影響に変換
+    if total_hits >= 6:
+        result["impact_on_status"] = "CONTESTED"
     
     return result
 
@@ -8,21 +8,28 @@ LLM責務:
 - 本文 → Evidence抽出（quote/stance/quality）
 
 純粋ロジック:
-- Evidence → scoring.aggregate_confidence
+- Evidence → EvidenceGraph（scoring.aggregate_confidence 相当の集計を追加分だけ更新）
 - RoundSnapshot組み立て
 - termination.should_stop判定
+
+検索・取得（+Evidence抽出）は FanOut で並行実行し、結果は
+クエリ順 → 検索結果順で組み立てる（完了順に依存しない）。
 """
 
+import threading
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 
 from ..context import ResearchRunContext
 from ..phase_runner import Phase, PhaseResult, PhaseSignal
 from ..termination import should_stop, RoundSnapshot, ClaimSnapshot
-from ..scoring import Evidence as ScoringEvidence, aggregate_confidence
+from ..evidence_graph import ClaimAggregate, EvidenceGraph
 from ..models import generate_evidence_id, Stance
-from ..locator import build_locator, is_strong_locator
+from ..locator import LocatorIndex, build_locator, is_strong_locator
 from ..tool_trace import call_tool
+from ..tool_memo import content_digest
+from ..fanout import FanOut, FanOutConfig, TaskOutcome, BUDGET_EXCEEDED, host_of
 
 
 def make_deep_handler(
@@ -39,6 +46,7 @@ def make_deep_handler(
     max_rounds = cfg.get("max_deep_rounds", 12)
     max_queries = cfg.get("max_deep_queries_per_round", 10)
     max_results_per_query = cfg.get("max_results_per_query", 5)
+    fanout_config = FanOutConfig.from_dict(cfg)
     
     def handler(context: ResearchRunContext) -> PhaseResult:
         """Phase 3: 深層調査"""
@@ -66,93 +74,37 @@ def make_deep_handler(
             evidence: List[Dict] = context.evidence.copy()  # 既存を継承
             searches_performed = 0
             
-            # 1. サブ質問に基づく追加検索
+            # 1. サブ質問に基づく追加検索（検索・取得は並行、組み立ては投入順）
+            round_stats: Dict[str, int] = {}
             if tools:
-                for q in queries[:max_queries]:
-                    query_text = q.get("query", q) if isinstance(q, dict) else str(q)
-                    try:
-                        results = call_tool(
-                            context,
-                            tool_name="tools.search_web",
-                            call=lambda query_text=query_text: tools.search_web(query_text),
-                            args={"query": query_text},
-                            result_summary=lambda rows: {"results_count": len(rows or [])},
-                        )
-                        searches_performed += 1
-                        if results:
-                            for r in results[:max_results_per_query]:
-                                url = r.get("url", "")
-                                content = ""
-                                if not url:
-                                    continue
-
-                                # ガード: 同run内で既にfetch済みのURLはスキップ
-                                if url in context.seen_urls:
-                                    continue
-
-                                # ガード: サーキットブレーカーによる遮断チェック
-                                breaker = context.circuit_breaker
-                                if breaker:
-                                    skip, reason = breaker.should_skip(url)
-                                    if skip:
-                                        # skippedをログに記録
-                                        call_tool(
-                                            context,
-                                            tool_name="tools.read_url_content",
-                                            call=lambda: None,
-                                            args={"url": url, "skipped": True, "reason": reason},
-                                            result_summary=lambda _: {"status": "skipped", "reason": reason},
-                                        )
-                                        continue
+                query_texts = [
+                    q.get("query", q) if isinstance(q, dict) else str(q)
+                    for q in queries[:max_queries]
+                ]
+                new_evidence, round_stats = _run_deep_round(
+                    context,
+                    tools,
+                    llm,
+                    query_texts,
+                    normalized_claims,
+                    fanout_config,
+                    max_results_per_query=max_results_per_query,
+                    max_evidence_per_claim=max_evidence_per_claim,
+                )
+                evidence.extend(new_evidence)
+                searches_performed = round_stats["searches_performed"]
 
-                                try:
-                                    content = call_tool(
-                                        context,
-                                        tool_name="tools.read_url_content",
-                                        call=lambda url=url: tools.read_url_content(url),
-                                        args={"url": url},
-                                        result_summary=lambda text: {"chars": len(text or "")},
-                                    )
-                                except Exception as fetch_err:
-                                    # 失敗をサーキットブレーカーに記録
-                                    error_text = str(fetch_err)
-                                    error_code = None
-                                    if "403" in error_text:
-                                        error_code = 403
-                                    elif "401" in error_text:
-                                        error_code = 401
-                                    elif "404" in error_text:
-                                        error_code = 404
-                                    if breaker:
-                                        breaker.record_failure(url, error_code, error_text)
-                                    content = ""
-
-                                if content:
-                                    context.seen_urls.add(url)
-                                    if breaker:
-                                        breaker.record_success(url)
-                                    # Evidence抽出
-                                    extracted = _extract_evidence(
-                                        context, content, url, normalized_claims, llm
-                                    )
-                                    extracted = _coerce_evidence(extracted, url, normalized_claims, content)
-                                    # locatorが弱いEvidenceは保存しない（監査可能性優先）
-                                    extracted = [e for e in extracted if is_strong_locator(e.get("locator"))]
-                                    evidence.extend(extracted[:max_evidence_per_claim])
-                    except Exception:
-                        pass  # 個別エラーは無視（search_web失敗等）
-            
-            # 2. coverage_map更新
-            coverage_map = _build_coverage_map(normalized_claims, evidence)
-            _update_gap_states_in_context(context, coverage_map)
+            # 2. coverage_map更新（新着Evidenceだけを索引に追加）
+            graph = context.sync_evidence_graph(evidence)
+            coverage_map = graph.coverage_map(normalized_claims)
+            _update_gap_states_in_context(context, graph)
             
             # 3. 終了条件判定
             snapshot = _build_round_snapshot(
                 context,
                 current_round,
                 normalized_claims,
-                evidence,
-                coverage_map,
+                graph,
                 searches_performed=searches_performed
             )
             
@@ -184,7 +136,8 @@ def make_deep_handler(
                     "evidence_count": len(evidence),
                     "coverage": termination_result.coverage,
                     "should_stop": termination_result.should_stop,
-                    "reason": termination_result.reason
+                    "reason": termination_result.reason,
+                    **round_stats,
                 },
                 notes=notes
             )
@@ -200,6 +153,162 @@ def make_deep_handler(
     return handler
 
 
+def _fetch_error_code(error_text: str) -> Optional[int]:
+    """取得エラー文言からHTTPステータスを推定"""
+    for code in (403, 401, 404):
+        if str(code) in error_text:
+            return code
+    return None
+
+
+def _run_deep_round(
+    context: ResearchRunContext,
+    tools: Any,
+    llm: Optional[Any],
+    query_texts: List[str],
+    claims: List[Dict],
+    fanout_config: FanOutConfig,
+    *,
+    max_results_per_query: int,
+    max_evidence_per_claim: int,
+) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    1ラウンド分の検索 → 取得 → Evidence抽出
+
+    検索が返った時点でその結果URLの取得を投入する（ラウンドの所要時間 ≒ 最も遅い検索 + 最も遅い取得）。
+    組み立てはクエリ順 → 検索結果順で行い、逐次実行と同じ判定をする:
+    - 同run内で取得済みのURL・同ラウンドで処理済みのURLはスキップ
+    - サーキットブレーカーは取得タスク内で取得の直前に判定し、失敗も取得直後に記録する
+      （ラウンド途中で遮断されたURL/ホストには、投入済みのタスクでもリクエストを送らない）
+    - 抽出で例外が出たクエリは残りの結果を捨てる
+    """
+    breaker = context.circuit_breaker
+    breaker_lock = threading.Lock()
+    fetches: Dict[str, "Future[TaskOutcome]"] = {}
+    fetches_lock = threading.Lock()
+    stats = {"searches_performed": 0, "fetches": 0, "fetch_errors": 0, "budget_exceeded": 0}
+
+    def log_skipped(url: str, reason: str) -> None:
+        call_tool(
+            context,
+            tool_name="tools.read_url_content",
+            call=lambda: None,
+            args={"url": url, "skipped": True, "reason": reason},
+            result_summary=lambda _: {"status": "skipped", "reason": reason},
+        )
+
+    def fetch_and_extract(url: str) -> Tuple[str, List[Dict], Optional[str], str]:
+        """(content, evidence, extract_error, skip_reason)"""
+        if breaker:
+            with breaker_lock:
+                skip, reason = breaker.should_skip(url)
+            if skip:
+                return "", [], None, reason
+        try:
+            content = call_tool(
+                context,
+                tool_name="tools.read_url_content",
+                call=lambda: tools.read_url_content(url),
+                args={"url": url},
+                result_summary=lambda text: {"chars": len(text or "")},
+                memo=True,
+                storable=bool,
+            )
+        except Exception as exc:
+            # 失敗をサーキットブレーカーに記録（同ホストの後続タスクが取得前に参照する）
+            if breaker:
+                with breaker_lock:
+                    breaker.record_failure(url, _fetch_error_code(str(exc)), str(exc))
+            raise
+        if not content:
+            return "", [], None, ""
+        try:
+            extracted = _extract_evidence(context, content, url, claims, llm)
+            extracted = _coerce_evidence(extracted, url, claims, content)
+        except Exception as exc:
+            return content, [], str(exc), ""
+        # locatorが弱いEvidenceは保存しない（監査可能性優先）
+        extracted = [e for e in extracted if is_strong_locator(e.get("locator"))]
+        return content, extracted[:max_evidence_per_claim], None, ""
+
+    def search(fanout: FanOut, query_text: str) -> List[Dict]:
+        results = call_tool(
+            context,
+            tool_name="tools.search_web",
+            call=lambda: tools.search_web(query_text),
+            args={"query": query_text},
+            result_summary=lambda rows: {"results_count": len(rows or [])},
+            memo=True,
+            storable=bool,
+        )
+        rows = list(results or [])[:max_results_per_query]
+        for r in rows:
+            url = r.get("url", "") if isinstance(r, dict) else ""
+            if not url or url in context.seen_urls:
+                continue
+            if breaker:
+                with breaker_lock:
+                    if breaker.should_skip(url)[0]:
+                        continue
+            with fetches_lock:
+                if url not in fetches:
+                    fetches[url] = fanout.submit(lambda url=url: fetch_and_extract(url), host=host_of(url))
+        return rows
+
+    evidence: List[Dict] = []
+    handled: set = set()
+    with FanOut(fanout_config) as fanout:
+        searches = [fanout.submit(lambda q=q: search(fanout, q)) for q in query_texts]
+        for search_future in searches:
+            searched = fanout.result(search_future)
+            if searched.status == BUDGET_EXCEEDED:
+                stats["budget_exceeded"] += 1
+            if not searched.ok:
+                continue  # 個別エラーは無視（search_web失敗等）
+            stats["searches_performed"] += 1
+            for r in searched.value:
+                url = r.get("url", "") if isinstance(r, dict) else ""
+                # ガード: 同run内で既にfetch済みのURL・同ラウンドで処理済みのURLはスキップ
+                if not url or url in context.seen_urls or url in handled:
+                    continue
+
+                with fetches_lock:
+                    fetch_future = fetches.get(url)
+                if fetch_future is None:
+                    # ガード: 検索時点でサーキットブレーカーに遮断されていたURL
+                    if breaker:
+                        with breaker_lock:
+                            skip, reason = breaker.should_skip(url)
+                        if skip:
+                            log_skipped(url, reason)
+                    continue
+                handled.add(url)
+                fetched = fanout.result(fetch_future)
+                if fetched.ok and fetched.value[3]:
+                    # ガード: 取得直前にサーキットブレーカーに遮断された（リクエストは送っていない）
+                    log_skipped(url, fetched.value[3])
+                    continue
+                stats["fetches"] += 1
+                if fetched.status == BUDGET_EXCEEDED:
+                    stats["budget_exceeded"] += 1
+                    continue
+                if not fetched.ok:
+                    # 失敗はタスク内でサーキットブレーカーに記録済み
+                    stats["fetch_errors"] += 1
+                    continue
+
+                content, extracted, extract_error, _ = fetched.value
+                if not content:
+                    continue
+                context.seen_urls.add(url)
+                if breaker:
+                    breaker.record_success(url)
+                if extract_error is not None:
+                    break
+                evidence.extend(extracted)
+    return evidence, stats
+
+
 def _extract_evidence(
     context: ResearchRunContext,
     content: str,
@@ -219,6 +328,11 @@ def _extract_evidence(
                 "claims_count": len(claims),
             },
             result_summary=lambda rows: {"evidence_count": len(rows or [])},
+            memo={
+                "url": url,
+                "content": content_digest(content),
+                "claim_ids": [c.get("claim_id") for c in claims],
+            },
         )
     
     # スタブ: コンテンツ先頭を引用として
@@ -251,6 +365,7 @@ def _coerce_evidence(extracted: Any, url: str, claims: List[Dict], content: str)
     primary_claim_id = claim_ids[0] if claim_ids else None
     
     coerced: List[Dict] = []
+    needs_locator: List[Dict] = []
     for item in extracted:
         if not isinstance(item, dict):
             continue
@@ -275,11 +390,10 @@ def _coerce_evidence(extracted: Any, url: str, claims: List[Dict], content: str)
         d.setdefault("tier", "C")
         d.setdefault("bias_flags", [])
         d.setdefault("freshness", None)
-        loc = d.get("locator") or None
-        # locator未指定なら本文から生成を試す
-        if not loc and d["quote"]:
-            loc = build_locator(url=url, content=content, quote=d["quote"])
-        d.setdefault("locator", loc)
+        # locator未指定なら本文から生成を試す（ループ後に1つの索引でまとめて解決）
+        if "locator" not in d and d["quote"]:
+            needs_locator.append(d)
+        d.setdefault("locator", None)
         d.setdefault("extracted_at", datetime.now().isoformat())
         
         # claim_ids: LLMが付けていなければ最低1つ紐づける
@@ -296,40 +410,29 @@ def _coerce_evidence(extracted: Any, url: str, claims: List[Dict], content: str)
         
         coerced.append(d)
     
+    if needs_locator:
+        index = LocatorIndex(content)
+        locators = index.locate_many(url=url, quotes=[d["quote"] for d in needs_locator])
+        for d, loc in zip(needs_locator, locators):
+            d["locator"] = loc
+    
     return coerced
 
 
-def _build_coverage_map(claims: List[Dict], evidence: List[Dict]) -> Dict:
-    """Claim → Evidence のカバレッジマップ"""
-    coverage = {}
-    for claim in claims:
-        claim_id = claim.get("claim_id", "")
-        related = [
-            e for e in evidence
-            if isinstance(e, dict) and claim_id and claim_id in (e.get("claim_ids") or [])
-        ]
-        citeable = [e for e in related if e.get("quote") and e.get("locator")]
-        coverage[claim_id] = {
-            "evidence_count": len(related),
-            "citeable_count": len(citeable),
-            "covered": len(related) > 0
-        }
-    return coverage
-
-def _update_gap_states_in_context(context: ResearchRunContext, coverage_map: Dict[str, Any]) -> None:
+def _update_gap_states_in_context(context: ResearchRunContext, graph: EvidenceGraph) -> None:
     """
     gaps[].state を Evidence カバレッジに基づいて更新。
     Gapは Phase2で作られ、Phase3で閉じる想定なので、ここで状態を進める。
     """
     if not context.gaps:
         return
-    for gap in context.gaps:
+    for i, gap in enumerate(context.gaps):
         if not isinstance(gap, dict):
             continue
-        related = gap.get("related_claims") or []
-        if not isinstance(related, list) or not related:
+        related = graph.claims_for_gap(gap.get("gap_id", f"gap_{i}"))
+        if not related:
             continue
-        covered = all(coverage_map.get(cid, {}).get("covered") for cid in related)
+        covered = all(graph.is_covered(cid) for cid in related)
         gap["state"] = "CLOSED" if covered else gap.get("state", "OPEN") or "OPEN"
 
 
@@ -337,11 +440,10 @@ def _build_round_snapshot(
     context: ResearchRunContext,
     round_idx: int,
     claims: List[Dict],
-    evidence: List[Dict],
-    coverage_map: Dict,
+    graph: EvidenceGraph,
     searches_performed: int = 1
 ) -> RoundSnapshot:
-    """RoundSnapshotを構築"""
+    """RoundSnapshotを構築（Claimごとの集計は EvidenceGraph が保持）"""
     # Gap状態
     gaps = {
         g.get("gap_id", f"gap_{i}"): g.get("state", "OPEN")
@@ -352,51 +454,14 @@ def _build_round_snapshot(
     claim_snapshots = {}
     for claim in claims:
         claim_id = claim.get("claim_id", "")
-        related = [
-            e for e in evidence
-            if isinstance(e, dict) and claim_id and claim_id in (e.get("claim_ids") or [])
-        ]
-        scoring_evs: List[ScoringEvidence] = []
-        for e in related:
-            tier = str(e.get("tier", "C"))
-            # 後方互換: tier1/tier2/tier3 → S/B/C
-            if tier == "tier1":
-                tier = "S"
-            elif tier == "tier2":
-                tier = "B"
-            elif tier == "tier3":
-                tier = "C"
-            stance = e.get("stance") if e.get("stance") in ("supports", "refutes", "neutral") else "neutral"
-            try:
-                qs = float(e.get("quality_score", 0.5))
-            except Exception:
-                qs = 0.5
-            scoring_evs.append(ScoringEvidence(
-                claim_id=claim_id,
-                url=str(e.get("url", e.get("source_id", ""))),
-                tier=tier,
-                published_at=None,
-                stance=stance,
-                bias_flags=set(e.get("bias_flags") or []),
-                citations_to_high_tier=0,
-                cluster_key=str(e.get("cluster_key", "")) if e.get("cluster_key") else ""
-            ))
-        
-        conf = 0.0
-        evidence_mass = 0.0
-        if scoring_evs:
-            conf_res = aggregate_confidence(scoring_evs, now=datetime.now(), time_sensitivity="MEDIUM")
-            conf = conf_res.confidence
-            evidence_mass = conf_res.evidence_mass
-        
-        has_primary = any(str(e.get("tier")) in ("S", "tier1") for e in related)
+        agg = graph.aggregate(claim_id) if claim_id else ClaimAggregate("")
         # 簡易: 一次ソースがあるほどtelephoneリスクは下がる
-        telephone_risk = 0.25 if has_primary else 0.6
+        telephone_risk = 0.25 if agg.has_primary else 0.6
         claim_snapshots[claim_id] = ClaimSnapshot(
             claim_id=claim_id,
             status="UNSUPPORTED",  # デフォルト
-            confidence=conf,
-            evidence_mass=evidence_mass,
+            confidence=agg.confidence,
+            evidence_mass=agg.evidence_mass,
             telephone_risk=telephone_risk
         )
     
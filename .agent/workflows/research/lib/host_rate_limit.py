@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Research Agent v4.3.3 - Host Rate Limit Module
+StealthFetcher のホスト単位トークンバケット
+
+- ホストごとに rate_per_min トークン/分で補充、最大 burst 個まで貯まる
+- reserve() は待ち時間を計算してトークンを先に予約する（await を挟まないので
+  同じイベントループ上の並行フェッチ同士で取り合いにならない）
+- 別ホストへのアクセスは互いに待たない（旧: 全体で直近60秒のリスト1本）
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Callable, Dict, Tuple
+
+try:
+    # FanOut のホスト別同時実行数と同じキーでバケットを分ける
+    from .fanout import host_of  # noqa: F401
+except ImportError:
+    # lib/ を sys.path に入れて直接 import された場合
+    from fanout import host_of  # noqa: F401
+
+
+class HostTokenBucket:
+    """
+    ホスト単位のトークンバケット
+
+    使用例:
+        bucket = HostTokenBucket(rate_per_min=20, burst=2)
+        await bucket.acquire("example.com")  # 必要なら待ってから戻る
+    """
+
+    def __init__(
+        self,
+        rate_per_min: float,
+        burst: int = 1,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate_per_sec = max(0.0, rate_per_min) / 60.0
+        self.burst = max(1, int(burst))
+        self._clock = clock
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # host -> (tokens, 更新時刻)
+
+    def reserve(self, host: str) -> float:
+        """
+        トークンを1つ予約し、送信まで待つべき秒数を返す
+
+        トークンが足りない場合は残高をマイナスにして予約し、
+        後続の呼び出しはその分だけ後ろに並ぶ。rate_per_min <= 0 は無制限。
+        """
+        if self.rate_per_sec <= 0:
+            return 0.0
+        now = self._clock()
+        tokens, updated = self._buckets.get(host, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate_per_sec)
+        tokens -= 1.0
+        self._buckets[host] = (tokens, now)
+        return 0.0 if tokens >= 0 else -tokens / self.rate_per_sec
+
+    async def acquire(self, host: str) -> float:
+        """トークンを取得（待った秒数を返す）"""
+        wait = self.reserve(host)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+Research Agent v4.3.3 - HTML Extract Module
+StealthFetcher / LocalWebTools のHTML→テキスト抽出（イベントループ外で実行）
+
+- extract_text(): 抽出本体（純関数。プロファイルで対象タグ・除外タグを切り替え）
+    - プレーンテキスト: タグ解析をせず空白を整理して返す
+    - 通常サイズ: BeautifulSoup で解析し、max_chars 分のテキストが集まった時点で打ち切る
+    - 巨大な文書（full_parse_max_chars 超）: ツリーを作らずストリーミング解析し、
+      max_chars 分が集まった時点で残りの入力を読まない
+- extract_text_async(): 小さい文書はその場で、大きい文書はプロセスプールで抽出
+  （BeautifulSoup の解析がイベントループを止めて他のページ遷移が詰まるのを防ぐ）
+- extract_text_offloaded(): 同期版（FanOut のワーカースレッドから使う。GILを奪い合わない）
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import html as html_lib
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+
+@dataclass(frozen=True)
+class ExtractProfile:
+    """抽出ルール（プロセス間で受け渡すので frozen dataclass）"""
+    drop_tags: Tuple[str, ...]
+    block_tags: Tuple[str, ...]
+    title_prefix: str = ""
+    min_chunk_chars: int = 1  # これより短いブロックは捨てる
+
+
+# StealthFetcher 用（ナビゲーション等を除き、表・定義リストも拾う）
+STEALTH_PROFILE = ExtractProfile(
+    drop_tags=("script", "style", "noscript", "svg", "canvas", "iframe", "nav", "footer", "header"),
+    block_tags=("h1", "h2", "h3", "h4", "p", "li", "td", "th", "dt", "dd", "article", "section"),
+    title_prefix="# ",
+    min_chunk_chars=11,
+)
+
+# LocalWebTools 用
+LOCAL_PROFILE = ExtractProfile(
+    drop_tags=("script", "style", "noscript", "svg", "canvas", "iframe"),
+    block_tags=("h1", "h2", "h3", "p", "li"),
+)
+
+INLINE_MAX_CHARS = 5_000  # これ以下の文書はプロセスプールに送らずその場で抽出（往復のコストの方が大きい）
+FULL_PARSE_MAX_CHARS = 200_000  # これを超える文書はストリーミング解析
+_FEED_CHUNK = 65_536
+_VOID_TAGS = frozenset((
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr",
+))
+
+_HTML_HINT = re.compile(r"<(?:!doctype|html|head|body|div|p|span|a|title|meta|table|ul|h[1-6])\b", re.IGNORECASE)
+# Chromium が text/plain 等を表示するときのラッパー
+_PRE_WRAPPER = re.compile(r"^\s*<html><head>.*?</head><body><pre[^>]*>(.*)</pre></body></html>\s*$", re.DOTALL)
+
+
+def _normalize(text: str) -> str:
+    text = re.sub(r"[ \t]+", " ", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _is_plain_text(document: str, content_type: str) -> bool:
+    ctype = (content_type or "").lower()
+    if ctype and "html" not in ctype and "xml" not in ctype:
+        return True
+    return not ctype and _HTML_HINT.search(document[:4096]) is None
+
+
+def extract_text(
+    document: str,
+    *,
+    profile: ExtractProfile = STEALTH_PROFILE,
+    max_chars: Optional[int] = None,
+    content_type: str = "",
+    full_parse_max_chars: int = FULL_PARSE_MAX_CHARS,
+) -> str:
+    """
+    HTMLから本文テキストを抽出する（先頭 max_chars 文字まで）
+
+    タイトル（title_prefix 付き）→ block_tags のテキストを文書順に改行で連結する。
+    max_chars 指定時は打ち切っても先頭 max_chars 文字は全量解析の結果と同じになる
+    （ストリーミング解析の場合は入れ子のブロックの扱いが BeautifulSoup と僅かに異なる）。
+    """
+    if not document:
+        return ""
+    limit = max_chars if max_chars is not None and max_chars >= 0 else None
+
+    wrapped = _PRE_WRAPPER.match(document)
+    if wrapped:
+        document, content_type = html_lib.unescape(wrapped.group(1)), "text/plain"
+    if _is_plain_text(document, content_type):
+        if limit is not None and len(document) > limit * 4:
+            head = _normalize(document[: limit * 4])
+            if len(head) >= limit:
+                return head[:limit]
+        return _normalize(document)[:limit]
+
+    if len(document) > full_parse_max_chars:
+        chunks = _stream_chunks(document, profile, limit)
+    else:
+        chunks = _soup_chunks(document, profile, limit)
+    merged = "\n".join(chunks).strip()
+    return merged[:limit] if limit is not None else merged
+
+
+def _collect(chunks: List[str], text: str, total: int) -> int:
+    """正規化したブロックを追加し、連結後の長さを返す"""
+    text = _normalize(text)
+    if not text:
+        return total
+    chunks.append(text)
+    return total + len(text) + (1 if total else 0)
+
+
+def _soup_chunks(document: str, profile: ExtractProfile, limit: Optional[int]) -> List[str]:
+    soup = BeautifulSoup(document, "html.parser")
+    for tag in soup(list(profile.drop_tags)):
+        tag.decompose()
+
+    chunks: List[str] = []
+    total = 0
+    title = soup.title.string.strip() if soup.title and soup.title.string else ""
+    if title:
+        total = _collect(chunks, profile.title_prefix + title, total)
+    for node in soup.find_all(list(profile.block_tags)):
+        if limit is not None and total >= limit:
+            break  # 以降のブロックは先頭 max_chars に入らない
+        t = node.get_text(" ", strip=True)
+        if t and len(t) >= profile.min_chunk_chars:
+            total = _collect(chunks, t, total)
+    return chunks
+
+
+class _StreamingExtractor(HTMLParser):
+    """
+    ツリーを作らずに block_tags のテキストを集める（巨大な文書用）
+
+    ブロックは開始タグの順に枠を確保し、終了タグで埋める。
+    先頭から連続して埋まった分が limit に達したら enough を立てる。
+    """
+
+    def __init__(self, profile: ExtractProfile, limit: Optional[int]):
+        super().__init__(convert_charrefs=True)
+        self.profile = profile
+        self.limit = limit
+        self._drop = set(profile.drop_tags)
+        self._blocks = set(profile.block_tags)
+        self._stack: List[Tuple[str, int]] = []  # (tag, 枠番号 / -1 = ブロック以外)
+        self._open: List[int] = []  # 開いているブロックの枠番号
+        self._slots: List[Optional[List[str]]] = []  # 埋まる前は None
+        self._buffers: dict = {}  # 枠番号 -> 収集中のテキスト片
+        self._pending: List[str] = []  # 次のタグまでのテキスト（feed の境目で分割されることがある）
+        self._skip = 0  # drop_tags の中にいる深さ
+        self._title: List[str] = []
+        self._in_title = False
+        self._filled = 0  # 先頭から連続して埋まった枠の数
+        self._total = 0
+        self.chunks: List[str] = []
+        self.enough = False
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if tag == "title":
+            self._in_title = True
+            return
+        if tag in _VOID_TAGS:
+            return
+        slot = -1
+        if tag in self._drop:
+            self._skip += 1
+        elif tag in self._blocks and not self._skip:
+            slot = len(self._slots)
+            self._slots.append(None)
+            self._buffers[slot] = []
+            self._open.append(slot)
+        self._stack.append((tag, slot))
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if tag == "title":
+            self._in_title = False
+            return
+        if not any(t == tag for t, _ in self._stack):
+            return  # 対応する開始タグがない終了タグは無視
+        while self._stack:
+            t, slot = self._stack.pop()
+            self._close(t, slot)
+            if t == tag:
+                break
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title.append(data)
+            return
+        if not self._skip and self._open:
+            self._pending.append(data)
+
+    def _flush_text(self) -> None:
+        if not self._pending:
+            return
+        piece = "".join(self._pending).strip()
+        self._pending = []
+        if piece:
+            for slot in self._open:
+                self._buffers[slot].append(piece)
+
+    def _close(self, tag: str, slot: int) -> None:
+        if tag in self._drop:
+            self._skip -= 1
+        if slot < 0:
+            return
+        self._open.pop()
+        self._slots[slot] = self._buffers.pop(slot)
+        self._advance()
+
+    def _advance(self) -> None:
+        if not self.chunks and not self._filled:
+            title = "".join(self._title).strip()
+            if title:
+                self._total = _collect(self.chunks, self.profile.title_prefix + title, self._total)
+        while self._filled < len(self._slots) and self._slots[self._filled] is not None:
+            text = " ".join(self._slots[self._filled])
+            self._slots[self._filled] = []  # 使い終わった枠は空にしてメモリを返す
+            self._filled += 1
+            if text and len(text) >= self.profile.min_chunk_chars:
+                self._total = _collect(self.chunks, text, self._total)
+            if self.limit is not None and self._total >= self.limit:
+                self.enough = True
+                return
+
+    def finish(self) -> List[str]:
+        if not self.enough:
+            self.close()  # バッファに残った入力を処理
+        self._flush_text()
+        while self._stack and not self.enough:
+            self._close(*self._stack.pop())
+        if not self._slots:
+            self._advance()  # タイトルだけの文書
+        return self.chunks
+
+
+def _stream_chunks(document: str, profile: ExtractProfile, limit: Optional[int]) -> List[str]:
+    parser = _StreamingExtractor(profile, limit)
+    for start in range(0, len(document), _FEED_CHUNK):
+        parser.feed(document[start:start + _FEED_CHUNK])
+        if parser.enough:
+            break
+    return parser.finish()
+
+
+# --- プロセスプール ---
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_extract_pool() -> ProcessPoolExecutor:
+    """抽出用のプロセスプール（遅延生成・プロセス内で共有）"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: ブラウザのイベントループスレッドを持つ親プロセスを fork しない
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, min(4, (os.cpu_count() or 2) - 1)),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_extract_pool() -> None:
+    """プロセスプールを終了（次回の呼び出しで作り直す）"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_extract_pool)
+
+
+def _needs_pool(document: str, inline_max_chars: int) -> bool:
+    return len(document) > inline_max_chars
+
+
+def extract_text_offloaded(
+    document: str,
+    *,
+    profile: ExtractProfile = STEALTH_PROFILE,
+    max_chars: Optional[int] = None,
+    content_type: str = "",
+    inline_max_chars: int = INLINE_MAX_CHARS,
+) -> str:
+    """同期版: 大きい文書はプロセスプールで抽出して待つ（プールが壊れていればその場で抽出）"""
+    kwargs = dict(profile=profile, max_chars=max_chars, content_type=content_type)
+    if not _needs_pool(document, inline_max_chars):
+        return extract_text(document, **kwargs)
+    try:
+        return get_extract_pool().submit(extract_text, document, **kwargs).result()
+    except BrokenProcessPool:
+        shutdown_extract_pool()
+        return extract_text(document, **kwargs)
+
+
+async def extract_text_async(
+    document: str,
+    *,
+    profile: ExtractProfile = STEALTH_PROFILE,
+    max_chars: Optional[int] = None,
+    content_type: str = "",
+    inline_max_chars: int = INLINE_MAX_CHARS,
+) -> str:
+    """非同期版: 大きい文書はプロセスプールで抽出し、その間イベントループを止めない"""
+    kwargs = dict(profile=profile, max_chars=max_chars, content_type=content_type)
+    if not _needs_pool(document, inline_max_chars):
+        return extract_text(document, **kwargs)
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wrap_future(get_extract_pool().submit(extract_text, document, **kwargs), loop=loop)
+    except BrokenProcessPool:
+        shutdown_extract_pool()
+        return await asyncio.to_thread(extract_text, document, **kwargs)
@@ -7,12 +7,12 @@ LLMを使わずに `search_web` / `read_url_content` を提供する最小アダ
 
 from __future__ import annotations
 
-import re
 import xml.etree.ElementTree as ET
 from typing import Any, Dict, List
 
 import requests
-from bs4 import BeautifulSoup
+
+from .html_extract import LOCAL_PROFILE, extract_text_offloaded
 
 
 _UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AntigravityResearch/1.0"
@@ -75,21 +75,6 @@ class LocalWebTools:
         if "text/html" not in ctype:
             return text[: self.max_chars]
 
-        soup = BeautifulSoup(text, "html.parser")
-        for tag in soup(["script", "style", "noscript", "svg", "canvas", "iframe"]):
-            tag.decompose()
-
-        chunks: List[str] = []
-        title = soup.title.string.strip() if soup.title and soup.title.string else ""
-        if title:
-            chunks.append(title)
-        for node in soup.select("h1,h2,h3,p,li"):
-            t = node.get_text(" ", strip=True)
-            if t:
-                chunks.append(t)
-
-        merged = "\n".join(chunks)
-        merged = re.sub(r"[ \t]+", " ", merged)
-        merged = re.sub(r"\n{3,}", "\n\n", merged).strip()
-        return merged[: self.max_chars]
+        # 大きいページはプロセスプールで抽出（FanOut の他スレッドとGILを奪い合わない）
+        return extract_text_offloaded(text, profile=LOCAL_PROFILE, max_chars=self.max_chars, content_type=ctype)
 
@@ -10,10 +10,11 @@ Evidence を「URL + 見出し + 段落 + 引用範囲」で追跡できるよ
 from __future__ import annotations
 
 import json
+from bisect import bisect_right
 from dataclasses import dataclass
 from hashlib import sha256
 from html.parser import HTMLParser
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 
 @dataclass(frozen=True)
@@ -157,59 +158,97 @@ def _extract_blocks(content: str) -> list[dict[str, Any]]:
     return blocks
 
 
+_BLOCK_SEP = "\x00"  # 連結文字列上のブロック境界
+
+
+class LocatorIndex:
+    """
+    1文書分のブロック索引（quote ごとに content を再解析しない）
+
+    _extract_blocks を1回だけ実行し、全ブロックを区切り文字で連結した1本の文字列で
+    quote を探す（str.find）。見つかった位置はブロック開始オフセット表で
+    ブロック内の位置に戻す。結果は build_locator と同じ。
+    """
+
+    def __init__(self, content: str):
+        self.content = content or ""
+        self.blocks = _extract_blocks(self.content) if self.content.strip() else []
+        self._texts = [str(b.get("text") or "") for b in self.blocks]
+        self._starts: list[int] = []  # 各ブロックの連結文字列上の開始位置
+        pos = 0
+        for txt in self._texts:
+            self._starts.append(pos)
+            pos += len(txt) + len(_BLOCK_SEP)
+        self._joined = _BLOCK_SEP.join(self._texts)
+        self._found: dict[str, Optional[tuple[int, int, int]]] = {}
+
+    def _find(self, needle: str) -> Optional[tuple[int, int, int]]:
+        """needle を最初に含むブロックとブロック内の位置 (block_index, start, end)"""
+        if needle in self._found:
+            return self._found[needle]
+        hit: Optional[tuple[int, int, int]] = None
+        if _BLOCK_SEP in needle:
+            # 区切り文字を含む quote は境界を跨いで一致しうるのでブロックごとに探す
+            for i, txt in enumerate(self._texts):
+                idx = txt.find(needle)
+                if idx >= 0:
+                    hit = (i, idx, idx + len(needle))
+                    break
+        else:
+            idx = self._joined.find(needle)
+            if idx >= 0:
+                i = bisect_right(self._starts, idx) - 1
+                start = idx - self._starts[i]
+                hit = (i, start, start + len(needle))
+        self._found[needle] = hit
+        return hit
+
+    def locate(self, *, url: str, quote: str) -> Optional[str]:
+        """
+        quote の Locator（JSON）を返す。
+        - exact match が最優先
+        - 失敗したら whitespace 正規化後に normalized match を試す
+        """
+        if not url or not (quote or "").strip() or not self.content.strip():
+            return None
+
+        match_type = "exact"
+        hit = self._find(quote)
+        if hit is None:
+            norm_quote = _normalize_ws(quote)
+            # ブロック本文は正規化済みなので、quote が正規化済みなら結果は exact と同じ
+            hit = self._find(norm_quote) if norm_quote != quote else None
+            match_type = "normalized"
+        if hit is None:
+            return None
+
+        i, start, end = hit
+        return Locator(
+            url=url,
+            heading=str(self.blocks[i].get("heading") or ""),
+            paragraph_index=i,
+            char_start=int(start),
+            char_end=int(end),
+            match_type=match_type,
+            quote_hash=_quote_hash(quote),
+        ).to_json()
+
+    def locate_many(self, *, url: str, quotes: Iterable[str]) -> list[Optional[str]]:
+        """複数の quote をまとめて解決（quotes と同じ順）"""
+        return [self.locate(url=url, quote=q) for q in quotes]
+
+
 def build_locator(*, url: str, content: str, quote: str) -> Optional[str]:
     """
     content と quote から Locator を生成。
     - exact match が最優先
     - 失敗したら whitespace 正規化後に normalized match を試す
+
+    同じ content に複数の quote を当てる場合は LocatorIndex を使う。
     """
     if not url or not (quote or "").strip() or not (content or "").strip():
         return None
-
-    qh = _quote_hash(quote)
-
-    blocks = _extract_blocks(content)
-
-    def find_in_text(text: str, needle: str) -> Optional[tuple[int, int]]:
-        idx = text.find(needle)
-        if idx < 0:
-            return None
-        return idx, idx + len(needle)
-
-    # 1) exact match within paragraph blocks
-    for i, b in enumerate(blocks):
-        txt = str(b.get("text") or "")
-        found = find_in_text(txt, quote)
-        if found:
-            start, end = found
-            return Locator(
-                url=url,
-                heading=str(b.get("heading") or ""),
-                paragraph_index=i,
-                char_start=int(start),
-                char_end=int(end),
-                match_type="exact",
-                quote_hash=qh,
-            ).to_json()
-
-    # 2) normalized whitespace match within blocks
-    norm_quote = _normalize_ws(quote)
-    for i, b in enumerate(blocks):
-        txt = _normalize_ws(str(b.get("text") or ""))
-        found2 = find_in_text(txt, norm_quote)
-        if found2:
-            start, end = found2
-            return Locator(
-                url=url,
-                heading=str(b.get("heading") or ""),
-                paragraph_index=i,
-                char_start=int(start),
-                char_end=int(end),
-                match_type="normalized",
-                quote_hash=qh,
-            ).to_json()
-
-    return None
+    return LocatorIndex(content).locate(url=url, quote=quote)
 
 
 def parse_locator(locator: Any) -> Optional[dict[str, Any]]:
@@ -9,6 +9,7 @@ GPT-5.2設計: ArtifactWriter + FailureDetector + Termination を束ねる
 - 失敗検知・ログ
 - 終了条件判定
 - 差し戻しループ制御
+- Phaseごとのチェックポイントと --resume による再開、ツール結果のメモ
 """
 
 from dataclasses import dataclass
@@ -18,6 +19,7 @@ from contextlib import nullcontext
 from typing import Optional, Callable, Dict, Any
 import sys
 import os
+import time
 
 from .context import ResearchRunContext
 from .phase_runner import PhaseRunner, Phase, PhaseSignal, PhaseResult, stub_handler
@@ -28,6 +30,8 @@ from .models import generate_evidence_id
 from .capsules import build_capsule, append_capsule
 from .tool_trace import call_tool
 from .circuit_breaker import ResearchUrlCircuitBreaker
+from .checkpoints import CHECKPOINT_DIRNAME, CheckpointStore, restore_context
+from .tool_memo import DEFAULT_TTL_SEC, ToolMemo
 
 try:
     from knowledge.learning import AgentEvent, get_client, make_signature_key
@@ -48,6 +52,10 @@ class OrchestratorConfig:
     tools: Optional[Any] = None
     llm: Optional[Any] = None
     handler_config: Optional[Dict[str, Any]] = None
+    checkpoint: bool = True  # Phase遷移ごとに output_dir/checkpoints/ へ Context を保存
+    resume: bool = False  # output_dir の最新チェックポイントから再開
+    memo_path: Optional[Path] = None  # ツール結果メモ（sqlite）。None ならメモしない
+    memo_ttl_sec: float = DEFAULT_TTL_SEC
 
 
 class ResearchOrchestrator:
@@ -69,11 +77,28 @@ class ResearchOrchestrator:
         self.config = config or OrchestratorConfig()
         self._event_info, self._event_warn, self._event_error = self._try_setup_logger()
         
+        # 再開: 前回の出力先の最新チェックポイントを読む
+        resume_head = None
+        resume_state = None
+        if self.config.resume:
+            if self.config.output_dir is None:
+                raise ValueError("resume requires output_dir (the previous run's output directory)")
+            store = CheckpointStore(Path(self.config.output_dir) / CHECKPOINT_DIRNAME)
+            resume_head = store.head()
+            if resume_head is None:
+                raise FileNotFoundError(f"no checkpoint found under {store.root}")
+            resume_state = store.load(resume_head)
+            if query and query != resume_state.get("query"):
+                raise ValueError(f"resume query mismatch: {query!r} != {resume_state.get('query')!r}")
+        
         # コンテキスト初期化
         self.context = ResearchRunContext(
             query=query,
             max_verify_rollbacks=self.config.max_verify_rollbacks
         )
+        if resume_state is not None:
+            restore_context(self.context, resume_state)
+            self.context.max_verify_rollbacks = self.config.max_verify_rollbacks
         
         # ArtifactWriter
         self.writer = ArtifactWriter(
@@ -81,6 +106,15 @@ class ResearchOrchestrator:
             output_dir=self.config.output_dir
         )
         self.context.output_dir = self.writer.get_output_path()
+        self.checkpoints = (
+            CheckpointStore(self.context.output_dir / CHECKPOINT_DIRNAME) if self.config.checkpoint else None
+        )
+        
+        # ツール結果メモ
+        self._owns_memo = False
+        if self.config.memo_path is not None:
+            self.context.tool_memo = ToolMemo(Path(self.config.memo_path), ttl_sec=self.config.memo_ttl_sec)
+            self._owns_memo = True
         
         # FailureDetector
         self.detector = FailureDetector(
@@ -91,6 +125,19 @@ class ResearchOrchestrator:
         self.runner = PhaseRunner()
         self._register_handlers(custom_handlers)
         self._logged_main, self._phase_scope = self._try_setup_workflow_logging()
+        if resume_head is not None:
+            self.runner.current_phase = Phase(resume_head["next_phase"])
+            self.context.run_stats["resumed_from"] = {
+                "seq": resume_head["seq"],
+                "phase": resume_head["phase"],
+                "next_phase": resume_head["next_phase"],
+                "sha256": resume_head["sha256"],
+                "completed_phases": [r.get("phase") for r in self.context.phase_results],
+                # 再開前に済んでいたPhaseの所要時間（再開で省けた時間の目安）
+                "completed_elapsed_sec": round(
+                    sum(float(r.get("elapsed_sec") or 0.0) for r in self.context.phase_results), 3
+                ),
+            }
         
         # サーキットブレーカー（403再試行ループ抑止）
         self.context.circuit_breaker = ResearchUrlCircuitBreaker()
@@ -164,6 +211,11 @@ class ResearchOrchestrator:
         self._log(f"🚀 リサーチ開始: {self.context.query}")
         self._log(f"   セッションID: {self.context.session_id}")
         self._log(f"   出力先: {self.context.output_dir}")
+        resumed_from = self.context.run_stats.get("resumed_from")
+        if resumed_from:
+            self._log(f"   再開: {self.runner.get_phase_name()} から（checkpoint #{resumed_from['seq']}）")
+        run_started = time.perf_counter()
+        phase_elapsed: Dict[str, float] = {}
         if wf_logger is not None:
             wf_logger.set_input("query", self.context.query)
             wf_logger.set_input("session_id", self.context.session_id)
@@ -195,6 +247,7 @@ class ResearchOrchestrator:
                 else nullcontext()
             )
 
+            phase_started = time.perf_counter()
             with phase_cm as phase_logger:
                 result = self.runner.run_current(self.context)
                 if phase_logger is not None:
@@ -247,15 +300,23 @@ class ResearchOrchestrator:
                 self._log(f"  → {self.runner.get_phase_name()}")
             
             # Phase結果を記録
+            elapsed = time.perf_counter() - phase_started
+            phase_elapsed[result.phase.value] = phase_elapsed.get(result.phase.value, 0.0) + elapsed
             self.context.phase_results.append({
                 "phase": result.phase.value,
                 "success": result.success,
                 "signal": result.signal.value,
+                "elapsed_sec": round(elapsed, 3),
                 "timestamp": datetime.now().isoformat()
             })
+            
+            # チェックポイント（中止時は保存しない＝次の再開は中止したPhaseからやり直す）
+            if self.checkpoints is not None and result.signal != PhaseSignal.ABORT:
+                self._save_checkpoint(result)
         
         self._log(f"\n🏁 リサーチ完了")
         self._validate_output_integrity()
+        self._finish_run_stats(time.perf_counter() - run_started, phase_elapsed)
         summary = self.context.get_summary()
         self._log(f"   サマリ: {summary}")
         if wf_logger is not None:
@@ -305,6 +366,42 @@ class ResearchOrchestrator:
         
         return self.context
 
+    def _save_checkpoint(self, result: PhaseResult) -> None:
+        try:
+            entry = self.checkpoints.save(
+                self.context,
+                phase=result.phase.value,
+                signal=result.signal.value,
+                next_phase=self.runner.current_phase.value,
+            )
+            self.context.run_stats["checkpoints_saved"] = self.context.run_stats.get("checkpoints_saved", 0) + 1
+            self.context.run_stats["last_checkpoint"] = entry["sha256"]
+        except Exception as e:
+            # チェックポイントの失敗で研究本体を落とさない
+            self._log(f"  ⚠ チェックポイント保存エラー: {e}")
+            self._event_warn("research_checkpoint_error", phase=result.phase.value, error_message=str(e))
+
+    def _finish_run_stats(self, elapsed_sec: float, phase_elapsed: Dict[str, float]) -> None:
+        """今回の実行時間・Phase別時間・メモのヒット率を run_stats.json に残す"""
+        stats = self.context.run_stats
+        stats["elapsed_sec"] = round(elapsed_sec, 3)
+        stats["phase_elapsed_sec"] = {k: round(v, 3) for k, v in phase_elapsed.items()}
+        stats["resumed"] = bool(stats.get("resumed_from"))
+        if self.context.tool_memo is not None:
+            stats["tool_memo"] = self.context.tool_memo.stats()
+            if self._owns_memo:
+                self.context.tool_memo.close()
+        try:
+            self.writer.save_run_stats(stats)
+        except Exception as e:
+            self._event_warn("research_run_stats_save_error", error_message=str(e))
+        self._event_info(
+            "research_run_stats",
+            session_id=self.context.session_id,
+            elapsed_sec=stats["elapsed_sec"],
+            resumed=stats["resumed"],
+        )
+
     def _validate_output_integrity(self) -> None:
         """最終成果物の整合性を検証し、コンテキストへ反映する。"""
         output_dir = self.context.output_dir
@@ -8,7 +8,7 @@ Antigravity（LLM）が推論・抽出する前提でも、Artifactsのスキー
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from .locator import is_strong_locator
 
@@ -18,23 +18,28 @@ def validate_phase35(
     verified_claims: List[Dict[str, Any]],
     counterevidence_log: List[Dict[str, Any]],
     evidence: List[Dict[str, Any]],
+    evidence_by_ref: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> Tuple[List[str], List[str]]:
     """
     Phase 3.5の出力を検査。
 
+    Args:
+        evidence_by_ref: 参照キー → Evidence（EvidenceGraph.evidence_by_ref()）。省略時は evidence から作る
+
     Returns:
         (errors, warnings)
     """
     errors: List[str] = []
     warnings: List[str] = []
 
-    evidence_by_ref: Dict[str, Dict[str, Any]] = {}
-    for ev in evidence:
-        if not isinstance(ev, dict):
-            continue
-        ref = str(ev.get("evidence_id") or ev.get("source_id") or ev.get("url") or "")
-        if ref:
-            evidence_by_ref[ref] = ev
+    if evidence_by_ref is None:
+        evidence_by_ref = {}
+        for ev in evidence:
+            if not isinstance(ev, dict):
+                continue
+            ref = str(ev.get("evidence_id") or ev.get("source_id") or ev.get("url") or "")
+            if ref:
+                evidence_by_ref[ref] = ev
 
     vc_by_id = {}
     for vc in verified_claims:
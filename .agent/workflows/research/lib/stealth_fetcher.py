@@ -8,27 +8,39 @@ Playwright + playwright-stealth を使用し、以下のカモフラージュ技
   3. ヒューマンシミュレーション（ランダム遅延、スクロール）
   4. Cookie/セッション永続化
   5. Viewport ランダム化
-  6. レートリミッティング
+  6. レートリミッティング（ホスト単位のトークンバケット）
   7. 全アクセスのログ記録
 
+フェッチャープール:
+  ブラウザは1つだけ起動し、pool_size 個のコンテキスト/ページを温めておく。
+  fetch() は空いているページを共有キューから取り出して使うため、
+  並行に呼べば最大 pool_size 件が同時に進む。
+  recycle_after 回の遷移、またはBOT検出でそのコンテキストを作り直す（UA/Viewportも入れ替え）。
+
 使用例:
-    async with StealthFetcher() as fetcher:
+    async with StealthFetcher(pool_size=4) as fetcher:
         html = await fetcher.fetch("https://example.com")
         text = await fetcher.fetch_as_text("https://example.com")
+        results = await fetcher.fetch_many(urls)
+
+    # 同期（スレッドから）: 専用イベントループでプールを保持し続ける
+    with SyncStealthFetcher(pool_size=4) as fetcher:
+        result = fetcher.fetch("https://example.com")
 """
 
 from __future__ import annotations
 
 import asyncio
+import atexit
 import json
 import logging
 import random
+import threading
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
 
-from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 
 # playwright-stealth（BOT検出回避）
@@ -39,6 +51,14 @@ except ImportError:
     async def stealth_async(page):  # type: ignore
         pass
 
+try:
+    from .host_rate_limit import HostTokenBucket, host_of
+    from .html_extract import STEALTH_PROFILE, extract_text, extract_text_async
+except ImportError:
+    # lib/ を sys.path に入れて直接 import された場合
+    from host_rate_limit import HostTokenBucket, host_of
+    from html_extract import STEALTH_PROFILE, extract_text, extract_text_async
+
 logger = logging.getLogger(__name__)
 
 # --- User-Agent プール ---
@@ -89,16 +109,29 @@ class AccessLog:
     error: Optional[str] = None
 
 
+@dataclass
+class _PageSlot:
+    """プールの1枠（コンテキスト + ページ + そのUA/Viewport）"""
+    context: BrowserContext
+    page: Page
+    user_agent: str
+    viewport: Dict[str, int]
+    generation: int
+    navigations: int = 0
+
+
 class StealthFetcher:
     """
     BOT判定回避機能付きWebフェッチャー
 
     カモフラージュ機能:
     - Playwright stealth plugin による自動検出回避
-    - UA/Viewport ランダム化
+    - UA/Viewport ランダム化（コンテキストごと）
     - ヒューマンシミュレーション（遅延、スクロール）
-    - レートリミッティング
+    - レートリミッティング（ホスト単位）
     - アクセスログ自動記録
+
+    1つのブラウザ上に pool_size 個のページを持ち、fetch() を並行に処理する。
     """
 
     def __init__(
@@ -111,24 +144,31 @@ class StealthFetcher:
         max_delay_sec: float = 3.0,
         rate_limit_per_min: int = 20,
         log_dir: Optional[Path] = None,
+        pool_size: int = 1,
+        recycle_after: int = 50,
+        host_burst: int = 2,
+        human_scroll: bool = True,
     ):
         self.headless = headless
         self.timeout_ms = timeout_ms
         self.max_chars = max_chars
         self.min_delay_sec = min_delay_sec
         self.max_delay_sec = max_delay_sec
-        self.rate_limit_per_min = rate_limit_per_min
+        self.rate_limit_per_min = rate_limit_per_min  # ホストごとの上限（0以下で無制限）
         self.log_dir = log_dir
+        self.pool_size = max(1, pool_size)
+        self.recycle_after = max(1, recycle_after)
+        self.human_scroll = human_scroll
 
         # 内部状態
         self._playwright = None
         self._browser: Optional[Browser] = None
-        self._context: Optional[BrowserContext] = None
-        self._page: Optional[Page] = None
+        self._idle: Optional[asyncio.Queue] = None  # 空いている _PageSlot
+        self._generation = 0  # rotate_identity() ごとに +1
+        self._recycled = 0
+        self._navigations = 0
         self._access_log: List[AccessLog] = []
-        self._request_times: List[float] = []
-        self._ua: str = random.choice(_UA_POOL)
-        self._viewport: Dict[str, int] = random.choice(_VIEWPORT_POOL)
+        self._rate_limiter = HostTokenBucket(rate_limit_per_min, host_burst)
 
     async def __aenter__(self):
         await self.start()
@@ -152,24 +192,15 @@ class StealthFetcher:
             ],
         )
 
-        # コンテキスト作成（UA/Viewport設定）
-        self._context = await self._browser.new_context(
-            user_agent=self._ua,
-            viewport=self._viewport,
-            locale="ja-JP",
-            timezone_id="Asia/Tokyo",
-            # Cookie永続化用
-            java_script_enabled=True,
-            ignore_https_errors=True,
-        )
-
-        # ページ作成 + stealth適用
-        self._page = await self._context.new_page()
-        await stealth_async(self._page)
+        # コンテキスト/ページを pool_size 個まとめて作成
+        slots = await asyncio.gather(*(self._new_slot() for _ in range(self.pool_size)))
+        self._idle = asyncio.Queue()
+        for slot in slots:
+            self._idle.put_nowait(slot)
 
         logger.info(
-            "StealthFetcher起動: UA=%s, viewport=%s, headless=%s",
-            self._ua, self._viewport, self.headless
+            "StealthFetcher起動: pool_size=%d, UA=%s, headless=%s",
+            self.pool_size, [s.user_agent[:40] for s in slots], self.headless
         )
 
     async def close(self) -> None:
@@ -190,8 +221,7 @@ class StealthFetcher:
             pass  # Event loop closed等は無視
 
         self._browser = None
-        self._context = None
-        self._page = None
+        self._idle = None
         self._playwright = None
 
     # --- パブリックAPI ---
@@ -203,16 +233,36 @@ class StealthFetcher:
         Returns:
             FetchResult: 取得結果（HTML, テキスト, ステータス等）
         """
-        if not self._page:
+        if self._idle is None:
             raise RuntimeError("StealthFetcherが未起動。start()を先に呼ぶか async with を使用")
 
-        # レートリミッティング
-        await self._rate_limit()
+        # レートリミッティング（ホスト単位）
+        waited = await self._rate_limiter.acquire(host_of(url))
+        if waited > 0:
+            logger.info("レートリミット: %s %.1f秒待機", host_of(url), waited)
 
         # ヒューマンシミュレーション: ランダム遅延
         delay = random.uniform(self.min_delay_sec, self.max_delay_sec)
         await asyncio.sleep(delay)
 
+        idle = self._idle
+        if idle is None:
+            raise RuntimeError("StealthFetcherは終了済み")
+        slot: _PageSlot = await idle.get()
+        try:
+            return await self._fetch_with(slot, url)
+        finally:
+            if self._idle is idle:  # 途中で close() された場合は返却しない
+                if slot.navigations >= self.recycle_after or slot.generation != self._generation:
+                    slot = await self._recycle(slot)
+                idle.put_nowait(slot)
+
+    async def fetch_many(self, urls: List[str]) -> List[FetchResult]:
+        """複数URLを並行にフェッチ（同時実行数は pool_size、結果は urls と同じ順）"""
+        return list(await asyncio.gather(*(self.fetch(url) for url in urls)))
+
+    async def _fetch_with(self, slot: _PageSlot, url: str) -> FetchResult:
+        """プールの1枠でページ遷移して結果を組み立てる"""
         start = time.monotonic()
         error_msg = None
         status = 0
@@ -223,7 +273,9 @@ class StealthFetcher:
 
         try:
             # ページ遷移
-            response = await self._page.goto(
+            slot.navigations += 1
+            self._navigations += 1
+            response = await slot.page.goto(
                 url,
                 wait_until="domcontentloaded",
                 timeout=self.timeout_ms,
@@ -234,16 +286,21 @@ class StealthFetcher:
                 content_type = response.headers.get("content-type", "")
 
             # ヒューマンシミュレーション: スクロール
-            await self._human_scroll()
+            if self.human_scroll:
+                await self._human_scroll(slot.page)
 
             # HTML取得
-            html = await self._page.content()
+            html = await slot.page.content()
 
-            # BOT検出チェック
+            # BOT検出チェック（検出したコンテキストは返却時に作り直す）
             bot_detected = self._check_bot_detection(html, status)
+            if bot_detected:
+                slot.navigations = self.recycle_after
 
-            # テキスト抽出
-            text = self._extract_text(html)
+            # テキスト抽出（大きいページはプロセスプールで。ループを止めない）
+            text = await extract_text_async(
+                html, profile=STEALTH_PROFILE, max_chars=self.max_chars, content_type=content_type
+            )
 
         except Exception as e:
             error_msg = f"{type(e).__name__}: {str(e)[:200]}"
@@ -259,7 +316,7 @@ class StealthFetcher:
             content_type=content_type,
             bytes_fetched=len(html),
             elapsed_ms=elapsed_ms,
-            user_agent=self._ua,
+            user_agent=slot.user_agent,
             bot_detected=bot_detected,
             error=error_msg,
         )
@@ -272,7 +329,7 @@ class StealthFetcher:
             html=html,
             text=text[:self.max_chars],
             elapsed_ms=elapsed_ms,
-            user_agent=self._ua,
+            user_agent=slot.user_agent,
             bot_detected=bot_detected,
             error=error_msg,
         )
@@ -283,27 +340,24 @@ class StealthFetcher:
         return result.text
 
     async def rotate_identity(self) -> None:
-        """UA/Viewportを変更して新しいコンテキストを作成"""
-        self._ua = random.choice(_UA_POOL)
-        self._viewport = random.choice(_VIEWPORT_POOL)
-
-        if self._page:
-            await self._page.close()
-        if self._context:
-            await self._context.close()
-
-        self._context = await self._browser.new_context(
-            user_agent=self._ua,
-            viewport=self._viewport,
-            locale="ja-JP",
-            timezone_id="Asia/Tokyo",
-            java_script_enabled=True,
-            ignore_https_errors=True,
-        )
-        self._page = await self._context.new_page()
-        await stealth_async(self._page)
-
-        logger.info("ID回転: UA=%s, viewport=%s", self._ua, self._viewport)
+        """全コンテキストのUA/Viewportを入れ替える（使用中の枠は返却時に入れ替え）"""
+        if self._idle is None:
+            return
+        self._generation += 1
+        idle: List[_PageSlot] = []
+        while not self._idle.empty():
+            idle.append(self._idle.get_nowait())
+        for slot in await asyncio.gather(*(self._recycle(s) for s in idle)):
+            self._idle.put_nowait(slot)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """プールの状態（ベンチマーク・監査用）"""
+        return {
+            "pool_size": self.pool_size,
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "navigations": self._navigations,
+            "recycled": self._recycled,
+        }
 
     def get_access_log(self) -> List[Dict[str, Any]]:
         """アクセスログをdict形式で取得"""
@@ -324,28 +378,49 @@ class StealthFetcher:
 
     # --- プライベートメソッド ---
 
-    async def _rate_limit(self) -> None:
-        """レートリミッティング: 1分あたりのリクエスト数を制限"""
-        now = time.monotonic()
-        # 1分以上前のタイムスタンプを削除
-        self._request_times = [t for t in self._request_times if now - t < 60]
-
-        if len(self._request_times) >= self.rate_limit_per_min:
-            wait = 60 - (now - self._request_times[0])
-            if wait > 0:
-                logger.info("レートリミット: %.1f秒待機", wait)
-                await asyncio.sleep(wait)
+    async def _new_slot(self) -> _PageSlot:
+        """UA/Viewportをランダムに選んでコンテキスト + ページを作成"""
+        ua = random.choice(_UA_POOL)
+        viewport = random.choice(_VIEWPORT_POOL)
+        context = await self._browser.new_context(
+            user_agent=ua,
+            viewport=viewport,
+            locale="ja-JP",
+            timezone_id="Asia/Tokyo",
+            # Cookie永続化用
+            java_script_enabled=True,
+            ignore_https_errors=True,
+        )
+        # ページ作成 + stealth適用
+        page = await context.new_page()
+        await stealth_async(page)
+        return _PageSlot(context, page, ua, viewport, self._generation)
 
-        self._request_times.append(time.monotonic())
+    async def _recycle(self, slot: _PageSlot) -> _PageSlot:
+        """コンテキストを作り直す（作れなければ古い枠をそのまま使い続ける）"""
+        try:
+            fresh = await self._new_slot()
+        except Exception as e:
+            logger.warning("コンテキスト再作成失敗（既存を継続使用）: %s", e)
+            slot.navigations = 0
+            return slot
+        try:
+            await slot.context.close()
+        except Exception:
+            pass  # 既に閉じている等は無視
+        self._recycled += 1
+        logger.info("コンテキスト再作成: %d回遷移後 → UA=%s, viewport=%s",
+                    slot.navigations, fresh.user_agent, fresh.viewport)
+        return fresh
 
-    async def _human_scroll(self) -> None:
+    async def _human_scroll(self, page: Page) -> None:
         """ヒューマンシミュレーション: 自然なスクロール"""
         try:
             # ランダムに2-4回スクロール
             scroll_count = random.randint(2, 4)
             for _ in range(scroll_count):
                 scroll_y = random.randint(100, 400)
-                await self._page.mouse.wheel(0, scroll_y)
+                await page.mouse.wheel(0, scroll_y)
                 await asyncio.sleep(random.uniform(0.2, 0.6))
         except Exception:
             pass  # スクロール失敗は無視
@@ -384,35 +459,8 @@ class StealthFetcher:
         return False
 
     def _extract_text(self, html: str) -> str:
-        """HTMLからテキストを抽出"""
-        if not html:
-            return ""
-
-        soup = BeautifulSoup(html, "html.parser")
-
-        # 不要なタグを削除
-        for tag in soup(["script", "style", "noscript", "svg", "canvas", "iframe", "nav", "footer", "header"]):
-            tag.decompose()
-
-        chunks: List[str] = []
-
-        # タイトル
-        title = soup.title.string.strip() if soup.title and soup.title.string else ""
-        if title:
-            chunks.append(f"# {title}")
-
-        # メインコンテンツ
-        for node in soup.select("h1, h2, h3, h4, p, li, td, th, dt, dd, article, section"):
-            t = node.get_text(" ", strip=True)
-            if t and len(t) > 10:  # 短すぎるテキストは除外
-                chunks.append(t)
-
-        merged = "\n".join(chunks)
-        # 連続空白・改行を整理
-        import re
-        merged = re.sub(r"[ \t]+", " ", merged)
-        merged = re.sub(r"\n{3,}", "\n\n", merged).strip()
-        return merged
+        """HTMLからテキストを抽出（同期。fetch() は extract_text_async を使う）"""
+        return extract_text(html, profile=STEALTH_PROFILE, max_chars=self.max_chars)
 
     def _save_access_log(self) -> None:
         """アクセスログをJSONLに保存"""
@@ -443,11 +491,142 @@ class StealthFetcher:
         logger.info("アクセスログ保存: %s (%d件)", log_file, len(self._access_log))
 
 
-# --- 同期ラッパー（便利関数）---
+# --- 同期ラッパー ---
+
+T = TypeVar("T")
+
+
+class LoopThread:
+    """
+    専用スレッドで回し続けるイベントループ
+
+    同期コードの任意のスレッドから run() でコルーチンを投げ込める。
+    ブラウザ（Playwright）はこのループに紐づくので、呼び出し元スレッドが
+    複数あっても1つのプールを共有できる。
+    """
+
+    def __init__(self, name: str = "stealth_fetcher"):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """コルーチンをループで実行し、結果を待つ"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def stop(self) -> None:
+        """ループを止めてスレッドを終了"""
+        if self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+class SyncStealthFetcher:
+    """
+    長寿命の同期ファサード（スクリプト・FanOut のワーカースレッド用）
+
+    初回の fetch() でブラウザとプールを起動し、close() まで使い回す。
+    複数スレッドから同時に fetch() すると、プールの空きページで並行に処理される。
+    """
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._lock = threading.Lock()
+        self._runner: Optional[LoopThread] = None
+        self._fetcher: Optional[StealthFetcher] = None
+
+    def __enter__(self) -> "SyncStealthFetcher":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """ブラウザとプールを起動（起動済みなら何もしない）"""
+        with self._lock:
+            if self._fetcher is not None:
+                return
+            runner = LoopThread()
+            fetcher = StealthFetcher(**self._kwargs)
+            try:
+                runner.run(fetcher.start())
+            except Exception:
+                try:
+                    runner.run(fetcher.close())
+                finally:
+                    runner.stop()
+                raise
+            self._runner, self._fetcher = runner, fetcher
+
+    def close(self) -> None:
+        """ブラウザを終了（アクセスログの保存を含む）"""
+        with self._lock:
+            runner, fetcher = self._runner, self._fetcher
+            self._runner = self._fetcher = None
+        if runner is None:
+            return
+        try:
+            runner.run(fetcher.close())
+        finally:
+            runner.stop()
+
+    def _started(self) -> Tuple[LoopThread, StealthFetcher]:
+        self.start()
+        return self._runner, self._fetcher
+
+    def fetch(self, url: str) -> FetchResult:
+        runner, fetcher = self._started()
+        return runner.run(fetcher.fetch(url))
+
+    def fetch_many(self, urls: List[str]) -> List[FetchResult]:
+        runner, fetcher = self._started()
+        return runner.run(fetcher.fetch_many(urls))
+
+    def fetch_as_text(self, url: str) -> str:
+        return self.fetch(url).text
+
+    def rotate_identity(self) -> None:
+        runner, fetcher = self._started()
+        runner.run(fetcher.rotate_identity())
+
+    def get_access_log(self) -> List[Dict[str, Any]]:
+        return self._fetcher.get_access_log() if self._fetcher else []
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        return self._fetcher.get_pool_stats() if self._fetcher else {}
+
+
+_shared_fetchers: Dict[Tuple[Tuple[str, Any], ...], SyncStealthFetcher] = {}
+_shared_lock = threading.Lock()
+
+
+def _close_shared_fetchers() -> None:
+    with _shared_lock:
+        fetchers = list(_shared_fetchers.values())
+        _shared_fetchers.clear()
+    for fetcher in fetchers:
+        try:
+            fetcher.close()
+        except Exception:
+            pass  # 終了処理中のエラーは無視
+
+
+atexit.register(_close_shared_fetchers)
+
 
 def fetch_sync(url: str, **kwargs) -> FetchResult:
-    """同期的にフェッチ（スクリプト用）"""
-    async def _run():
-        async with StealthFetcher(**kwargs) as fetcher:
-            return await fetcher.fetch(url)
-    return asyncio.run(_run())
+    """
+    同期的にフェッチ（スクリプト用）
+
+    同じ kwargs の呼び出しはプロセス内で1つの SyncStealthFetcher を共有する
+    （旧実装は1URLごとにChromiumを起動・終了していた）。プロセス終了時に自動で閉じる。
+    """
+    key = tuple(sorted(kwargs.items()))
+    with _shared_lock:
+        fetcher = _shared_fetchers.get(key)
+        if fetcher is None:
+            fetcher = _shared_fetchers[key] = SyncStealthFetcher(**kwargs)
+    return fetcher.fetch(url)
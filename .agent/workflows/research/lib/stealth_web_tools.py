@@ -11,6 +11,7 @@ search_web() / read_url_content() を提供する。
   - Google/Bing 検索結果の構造化パース
   - 全アクセスのログ記録（監査用）
   - ヒューマンシミュレーション
+  - フェッチャープール（pool_size 個のページで並行取得）
 
 使用例:
     async with StealthWebTools() as tools:
@@ -20,7 +21,6 @@ search_web() / read_url_content() を提供する。
 
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
 import time
@@ -31,7 +31,7 @@ import sys as _sys
 from pathlib import Path as _Path
 _sys.path.insert(0, str(_Path(__file__).resolve().parent))
 
-from stealth_fetcher import StealthFetcher, FetchResult, AccessLog
+from stealth_fetcher import StealthFetcher, FetchResult, AccessLog, LoopThread
 from search_adapter import SearchAdapter, SearchResult
 
 logger = logging.getLogger(__name__)
@@ -65,6 +65,8 @@ class StealthWebTools:
         max_delay_sec: float = 3.0,
         rate_limit_per_min: int = 20,
         log_dir: Optional[Path] = None,
+        pool_size: int = 1,
+        recycle_after: int = 50,
     ):
         self._fetcher_kwargs = {
             "headless": headless,
@@ -74,6 +76,8 @@ class StealthWebTools:
             "max_delay_sec": max_delay_sec,
             "rate_limit_per_min": rate_limit_per_min,
             "log_dir": log_dir,
+            "pool_size": pool_size,
+            "recycle_after": recycle_after,
         }
         self._search_engine = search_engine
         self._max_search_results = max_search_results
@@ -163,8 +167,8 @@ class StealthWebTools:
         result = await self._fetcher.fetch(url)
 
         if result.bot_detected:
-            logger.warning("BOT検出: %s → IDローテーション後にリトライ", url)
-            await self._fetcher.rotate_identity()
+            # 検出したコンテキストはプール側で作り直し済み（別のUA/Viewportで再取得）
+            logger.warning("BOT検出: %s → 新しいコンテキストでリトライ", url)
             result = await self._fetcher.fetch(url)
 
         return result.text
@@ -172,12 +176,8 @@ class StealthWebTools:
     # --- 拡張API ---
 
     async def fetch_multiple(self, urls: List[str]) -> List[FetchResult]:
-        """複数URLを順次フェッチ（レートリミッティング付き）"""
-        results = []
-        for url in urls:
-            result = await self._fetcher.fetch(url)
-            results.append(result)
-        return results
+        """複数URLを並行フェッチ（同時実行数は pool_size、ホスト単位のレートリミッティング付き）"""
+        return await self._fetcher.fetch_many(urls)
 
     async def rotate_identity(self) -> None:
         """UA/Viewport を変更"""
@@ -236,30 +236,37 @@ def create_sync_tools(**kwargs) -> "SyncStealthWebTools":
 
 
 class SyncStealthWebTools:
-    """同期版StealthWebTools（スクリプトから使いやすい）"""
+    """
+    同期版StealthWebTools（スクリプトから使いやすい）
+
+    専用スレッドのイベントループ上でブラウザを保持するため、
+    Phase 3 の FanOut ワーカーなど複数スレッドから同時に呼べる。
+    """
 
     def __init__(self, **kwargs):
         self._kwargs = kwargs
         self._tools: Optional[StealthWebTools] = None
-        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[LoopThread] = None
 
     def __enter__(self):
-        self._loop = asyncio.new_event_loop()
+        self._runner = LoopThread(name="stealth_web_tools")
         self._tools = StealthWebTools(**self._kwargs)
-        self._loop.run_until_complete(self._tools.start())
+        self._runner.run(self._tools.start())
         return self
 
     def __exit__(self, *args):
-        if self._tools:
-            self._loop.run_until_complete(self._tools.close())
-        if self._loop:
-            self._loop.close()
+        try:
+            if self._tools:
+                self._runner.run(self._tools.close())
+        finally:
+            if self._runner:
+                self._runner.stop()
 
     def search_web(self, query: str) -> List[Dict[str, Any]]:
-        return self._loop.run_until_complete(self._tools.search_web(query))
+        return self._runner.run(self._tools.search_web(query))
 
     def read_url_content(self, url: str) -> str:
-        return self._loop.run_until_complete(self._tools.read_url_content(url))
+        return self._runner.run(self._tools.read_url_content(url))
 
     def get_audit_summary(self) -> Dict[str, Any]:
         return self._tools.get_audit_summary()
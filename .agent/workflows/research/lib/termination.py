@@ -170,28 +170,21 @@ def compute_round_utility(
     cov_cur = coverage_rate(cur.gaps)
     d_cov = max(0.0, cov_cur - cov_prev)
     
-    # Δevidence_mass
+    # Δevidence_mass / Δtelephone_risk（減少は良い）/ Δstatus（向上）を共通Claimの1パスで集計
     common = set(prev.claims.keys()) & set(cur.claims.keys())
     d_mass = 0.0
-    for cid in common:
-        d_mass += max(0.0, cur.claims[cid].evidence_mass - prev.claims[cid].evidence_mass)
-    denom = max(1, len(common))
-    d_mass = d_mass / denom
-    
-    # Δtelephone_risk（減少は良い）
     d_tel = 0.0
+    d_status = 0.0
     for cid in common:
-        drop = max(0.0, prev.claims[cid].telephone_risk - cur.claims[cid].telephone_risk)
+        p, c = prev.claims[cid], cur.claims[cid]
+        d_mass += max(0.0, c.evidence_mass - p.evidence_mass)
+        drop = max(0.0, p.telephone_risk - c.telephone_risk)
         if drop >= cfg.tel_improve_threshold:
             d_tel += drop
+        d_status += max(0, status_score(c.status) - status_score(p.status))
+    denom = max(1, len(common))
+    d_mass = d_mass / denom
     d_tel = d_tel / denom
-    
-    # Δstatus（向上）
-    d_status = 0.0
-    for cid in common:
-        s_prev = status_score(prev.claims[cid].status)
-        s_cur = status_score(cur.claims[cid].status)
-        d_status += max(0, s_cur - s_prev)
     d_status = d_status / denom
     
     # 重み付き合計
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+EvidenceGraph（Claim⇄Evidence索引）テスト
+全件走査の旧集計・aggregate_confidence と一致すること、追記同期が作り直しと同じ結果になることを検証
+"""
+
+from datetime import datetime
+
+from . import __init__  # noqa: F401
+
+from ..evidence_graph import EvidenceGraph, _scoring_evidence
+from ..scoring import aggregate_confidence
+
+
+def _evidence(n):
+    tiers = ["S", "A", "B", "C", "tier1", "tier3"]
+    stances = ["supports", "refutes", "neutral", "unknown"]
+    rows = []
+    for i in range(n):
+        rows.append({
+            "evidence_id": f"ev_{i}",
+            "url": f"https://example.com/{i % 7}",
+            "claim_ids": [f"c{i % 3}", f"c{(i + 1) % 5}"] if i % 4 else [f"c{i % 3}"],
+            "tier": tiers[i % len(tiers)],
+            "stance": stances[i % len(stances)],
+            "cluster_key": f"k{i % 2}" if i % 3 else "",
+            "quote": "q" if i % 2 else "",
+            "locator": "loc" if i % 5 else None,
+        })
+    return rows
+
+
+def _scan(claim_id, evidence):
+    """旧 Phase 3 の全件走査"""
+    return [e for e in evidence if isinstance(e, dict) and claim_id in (e.get("claim_ids") or [])]
+
+
+def test_aggregates_match_full_scan():
+    evidence = _evidence(40)
+    graph = EvidenceGraph().sync(evidence)
+    claims = [{"claim_id": f"c{i}"} for i in range(6)]
+    coverage = graph.coverage_map(claims)
+    for claim in claims:
+        cid = claim["claim_id"]
+        related = _scan(cid, evidence)
+        assert graph.related(cid) == related
+        assert graph.related(cid, limit=3) == related[:3]
+        assert coverage[cid] == {
+            "evidence_count": len(related),
+            "citeable_count": sum(1 for e in related if e["quote"] and e["locator"]),
+            "covered": bool(related),
+        }
+        agg = graph.aggregate(cid)
+        assert agg.has_primary == any(e["tier"] in ("S", "tier1") for e in related)
+        if related:
+            res = aggregate_confidence([_scoring_evidence(cid, e) for e in related], now=datetime.now())
+            assert abs(agg.confidence - res.confidence) < 1e-12
+            assert abs(agg.evidence_mass - res.evidence_mass) < 1e-12
+        else:
+            assert (agg.confidence, agg.evidence_mass) == (0.0, 0.0)
+
+
+def test_incremental_sync_equals_rebuild():
+    evidence = _evidence(10)
+    graph = EvidenceGraph().sync(evidence)
+    evidence.extend(_evidence(25)[10:])
+    evidence.append("not a dict")
+    graph.sync(evidence)
+    fresh = EvidenceGraph().sync(evidence)
+    assert len(graph) == len(fresh) == 26
+    for cid in ("c0", "c1", "c4"):
+        assert graph.related(cid) == fresh.related(cid)
+        assert graph.aggregate(cid) == fresh.aggregate(cid)
+    assert graph.evidence_by_ref() == fresh.evidence_by_ref()
+
+    # リストが置き換わったら作り直す
+    replaced = _evidence(3)
+    graph.sync(replaced)
+    assert len(graph) == 3 and graph.related("c0") == _scan("c0", replaced)
+
+
+def test_gap_index():
+    graph = EvidenceGraph().sync([{"evidence_id": "e1", "claim_ids": "c1"}])
+    gaps = [
+        {"gap_id": "g1", "related_claims": ["c1", "c2"]},
+        {"related_claims": ["c2"]},
+        {"gap_id": "g3", "related_claims": "c1"},
+    ]
+    graph.sync_gaps(gaps)
+    assert graph.claims_for_gap("g1") == ["c1", "c2"]
+    assert graph.claims_for_gap("gap_1") == ["c2"]
+    assert graph.claims_for_gap("g3") == []
+    assert graph.gaps_for_claim("c2") == ["g1", "gap_1"]
+    assert graph.is_covered("c1") and not graph.is_covered("c2")
+
+    gaps.append({"gap_id": "g4", "related_claims": ["c3"]})
+    assert graph.sync_gaps(gaps).gaps_for_claim("c3") == ["g4"]
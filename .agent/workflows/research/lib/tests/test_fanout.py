@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+FanOut（Phase 3 / 3.5 の並行実行）テスト
+遅延を注入したスタブツールで、所要時間・ホスト同時実行数・時間予算・結果順序を検証
+"""
+
+import threading
+import time
+
+from . import __init__  # noqa: F401
+
+from ..circuit_breaker import ResearchUrlCircuitBreaker
+from ..context import ResearchRunContext
+from ..fanout import FanOut, FanOutConfig
+from ..handlers.phase3_deep import make_deep_handler
+from ..handlers.phase35_verify import _search_counterevidence
+
+
+class _SlowTools:
+    """検索・取得に遅延を入れ、ホストごとの同時実行数を記録するスタブ"""
+
+    def __init__(self, delays=None, failing=()):
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.active = {}
+        self.max_active = {}
+        self.lock = threading.Lock()
+
+    def _enter(self, host):
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.max_active[host] = max(self.max_active.get(host, 0), self.active[host])
+
+    def _leave(self, host):
+        with self.lock:
+            self.active[host] -= 1
+
+    def search_web(self, query):
+        time.sleep(self.delays.get(query, 0.05))
+        return [{"url": f"https://{query}.example/{i}"} for i in range(3)] + [{"url": "https://shared.example/x"}]
+
+    def read_url_content(self, url):
+        host = url.split("/")[2]
+        self._enter(host)
+        try:
+            time.sleep(self.delays.get(url, 0.1))
+            if url in self.failing:
+                raise RuntimeError(f"403 Forbidden: {url}")
+            return f"Body of {url}. Evidence sentence for the claim."
+        finally:
+            self._leave(host)
+
+
+class _PairLogger:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.results = []
+
+    def log_tool_call(self, tool_name, args=None, call_id=""):
+        with self.lock:
+            cid = f"call_{len(self.calls) + 1:04d}"
+            self.calls[cid] = tool_name
+            return cid
+
+    def log_tool_result(self, *, call_id, status, result=None, duration_ms=None, error=None):
+        with self.lock:
+            self.results.append((call_id, status))
+
+
+def _context(queries):
+    ctx = ResearchRunContext(query="q")
+    ctx.sub_questions = list(queries)
+    ctx.normalized_claims = [{"claim_id": "c1", "statement": "claim"}]
+    ctx.circuit_breaker = ResearchUrlCircuitBreaker()
+    ctx.workflow_logger = _PairLogger()
+    return ctx
+
+
+def test_map_keeps_submission_order_and_overlaps():
+    delays = [0.2, 0.05, 0.15, 0.0, 0.1]
+    start = time.perf_counter()
+    with FanOut(FanOutConfig(max_workers=5)) as fanout:
+        outcomes = fanout.map(lambda d: (time.sleep(d), d)[1], delays)
+    elapsed = time.perf_counter() - start
+    assert [o.value for o in outcomes] == delays
+    assert elapsed < sum(delays) * 0.7
+
+
+def test_per_host_limit_and_round_budget():
+    tools = _SlowTools()
+    urls = [f"https://same.example/{i}" for i in range(6)]
+    with FanOut(FanOutConfig(max_workers=6, per_host_limit=2)) as fanout:
+        outcomes = fanout.map(tools.read_url_content, urls, host=lambda u: "same.example")
+    assert all(o.ok for o in outcomes)
+    assert tools.max_active["same.example"] == 2
+
+    with FanOut(FanOutConfig(max_workers=1, round_budget_sec=0.15)) as fanout:
+        outcomes = fanout.map(lambda d: time.sleep(d) or d, [0.1, 0.1, 0.1])
+    assert outcomes[0].ok
+    assert [o.status for o in outcomes[1:]] == ["budget_exceeded", "budget_exceeded"]
+
+
+def test_deep_round_wall_time_tracks_slowest_fetch_and_is_deterministic():
+    queries = ["alpha", "beta", "gamma", "delta"]
+    delays = {"https://gamma.example/1": 0.4, "beta": 0.2}
+
+    runs = []
+    for workers in (1, 16):
+        tools = _SlowTools(delays, failing={"https://delta.example/2"})
+        ctx = _context(queries)
+        handler = make_deep_handler(tools, None, {"fanout_max_workers": workers, "fanout_per_host_limit": 2})
+        start = time.perf_counter()
+        result = handler(ctx)
+        runs.append((time.perf_counter() - start, ctx, result))
+
+    (serial_sec, serial_ctx, serial), (parallel_sec, parallel_ctx, parallel) = runs
+    assert parallel.success and parallel.output["searches_performed"] == 4
+    # 逐次: 検索4回 + 取得13件の合計 ≒ 2.1s / 並行: 最も遅い検索 + 最も遅い取得 ≒ 0.6s
+    assert serial_sec > 1.8
+    assert parallel_sec < 1.0
+    assert parallel_ctx.evidence
+    assert [e["url"] for e in parallel_ctx.evidence] == [e["url"] for e in serial_ctx.evidence]
+    assert parallel_ctx.seen_urls == serial_ctx.seen_urls
+    assert "https://shared.example/x" in parallel_ctx.seen_urls
+    assert parallel_ctx.circuit_breaker.get_stats()["total_failures"] == 1
+    assert parallel.output["fetch_errors"] == 1
+
+    logger = parallel_ctx.workflow_logger
+    assert len(logger.results) == len(logger.calls)
+    assert {cid for cid, _ in logger.results} == set(logger.calls)
+
+
+def test_deep_round_stops_fetching_host_blocked_mid_round():
+    class _BlockedHostTools(_SlowTools):
+        def __init__(self):
+            super().__init__()
+            self.fetched = []
+
+        def search_web(self, query):
+            return [{"url": f"https://blocked.example/{i}"} for i in range(5)]
+
+        def read_url_content(self, url):
+            with self.lock:
+                self.fetched.append(url)
+            time.sleep(0.02)
+            raise RuntimeError(f"403 Forbidden: {url}")
+
+    tools = _BlockedHostTools()
+    ctx = _context(["q"])
+    ctx.circuit_breaker = ResearchUrlCircuitBreaker(host_block_threshold=2)
+    handler = make_deep_handler(tools, None, {"fanout_max_workers": 8, "fanout_per_host_limit": 1})
+    result = handler(ctx)
+
+    # 5件とも検索時点では遮断前に投入されるが、遮断後のタスクはリクエストを送らない
+    assert len(tools.fetched) == 2
+    assert result.output["fetch_errors"] == 2
+    stats = ctx.circuit_breaker.get_stats()
+    assert stats["blocked_host_list"] == ["blocked.example"]
+    assert stats["total_failures"] == 2
+    logger = ctx.workflow_logger
+    assert len(logger.results) == len(logger.calls)
+
+
+def test_counterevidence_queries_run_concurrently():
+    class Tools:
+        def search_web(self, query):
+            time.sleep(0.2)
+            return [{"url": "u"}] * 2
+
+    ctx = ResearchRunContext(query="q")
+    start = time.perf_counter()
+    with FanOut(FanOutConfig(max_workers=4)) as fanout:
+        result = _search_counterevidence(ctx, "c1", "claim", Tools(), None, max_counter_queries=4, fanout=fanout)
+    assert time.perf_counter() - start < 0.5
+    assert result["found_counterevidence"] is True
+    assert result["impact_on_status"] == "CONTESTED"
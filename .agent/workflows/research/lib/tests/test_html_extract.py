@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+html_extract（イベントループ外のHTML抽出）テスト
+打ち切り・ストリーミング解析が全量解析と同じ先頭を返すこと、プロセスプール経由でも同じ結果になることを検証
+"""
+
+import asyncio
+
+from . import __init__  # noqa: F401
+
+from ..html_extract import (
+    LOCAL_PROFILE,
+    STEALTH_PROFILE,
+    extract_text,
+    extract_text_async,
+    extract_text_offloaded,
+)
+
+
+def _page(n):
+    parts = [
+        "<!doctype html><html><head><title> Fixture &amp; Page </title>"
+        "<script>var s = '<p>ignored</p>';</script></head><body>"
+        "<nav><li>navigation link text</li></nav>"
+    ]
+    for i in range(n):
+        parts.append(
+            f"<article><h2>Heading number {i}</h2>"
+            f"<p>Paragraph {i} \t with   <b>bold</b> &amp; <a href='#'>link</a><br>text.</p>"
+            f"<ul><li>List item {i} long enough<p>nested {i} paragraph</p></li></ul>"
+            f"<table><tr><td>cell {i} value</td><td>short</td></tr></table></article>"
+        )
+    parts.append("<footer><p>footer paragraph text</p></footer></body></html>")
+    return "".join(parts)
+
+
+def test_profiles_extract_blocks_in_document_order():
+    html = _page(1)
+    assert extract_text(html, profile=STEALTH_PROFILE).splitlines()[:4] == [
+        "# Fixture & Page",
+        "Heading number 0 Paragraph 0 with bold & link text. List item 0 long enough nested 0 paragraph cell 0 value short",
+        "Heading number 0",
+        "Paragraph 0 with bold & link text.",
+    ]
+    local = extract_text(html, profile=LOCAL_PROFILE)
+    assert local.splitlines()[0] == "Fixture & Page"
+    assert "navigation link text" in local and "footer paragraph text" in local
+    assert "ignored" not in local and "cell 0 value" not in local
+
+
+def test_cutoff_and_streaming_match_full_parse():
+    html = _page(300)
+    full = extract_text(html)
+    for limit in (50, 1000, 15000, len(full) + 10):
+        assert extract_text(html, max_chars=limit) == full[:limit]
+        assert extract_text(html, max_chars=limit, full_parse_max_chars=0) == full[:limit]
+    assert extract_text(html, full_parse_max_chars=0) == full
+
+
+def test_plain_text_fast_path():
+    assert extract_text("line  one\t\ttab\n\n\n\nline two", max_chars=100) == "line one tab\n\nline two"
+    assert extract_text("a <b> c", content_type="text/plain") == "a <b> c"
+    chromium_wrapped = '<html><head></head><body><pre style="word-wrap: break-word;">{"k": "&lt;v&gt;"}</pre></body></html>'
+    assert extract_text(chromium_wrapped) == '{"k": "<v>"}'
+    assert extract_text("x " * 10000, max_chars=10) == "x x x x x "
+
+
+def test_process_pool_paths_match_inline():
+    html = _page(50)
+    expected = extract_text(html, max_chars=2000)
+    assert extract_text_offloaded(html, max_chars=2000, inline_max_chars=0) == expected
+
+    async def run():
+        return await asyncio.gather(
+            extract_text_async(html, max_chars=2000, inline_max_chars=0),
+            extract_text_async(html, max_chars=2000),
+        )
+
+    assert asyncio.run(run()) == [expected, expected]
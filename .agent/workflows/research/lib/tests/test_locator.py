@@ -2,7 +2,7 @@
 
 from . import __init__  # noqa: F401
 
-from ..locator import build_locator, is_strong_locator, parse_locator
+from ..locator import LocatorIndex, build_locator, is_strong_locator, parse_locator
 
 
 def test_build_locator_exact_match_is_strong():
@@ -23,3 +23,28 @@ def test_build_locator_html_has_heading_and_paragraph_index():
     obj = parse_locator(loc)
     assert obj and obj["heading"] == "Section"
     assert obj["paragraph_index"] == 1
+
+
+def test_locator_index_batch_matches_build_locator():
+    content = (
+        "<h2>Intro</h2><p>Alpha beta gamma.</p><p>Delta epsilon zeta.</p>"
+        "<h2>Details</h2><p>Eta theta.</p><li>Delta epsilon again.</li>"
+    )
+    quotes = [
+        "Delta epsilon",        # 最初に含むブロック（index 1）
+        "Eta  theta.",          # 空白正規化で一致
+        "epsilon again",
+        "not in the page",
+        "   ",
+        "Delta epsilon",        # 同じ quote の2回目
+    ]
+    index = LocatorIndex(content)
+    locators = index.locate_many(url="https://example.com", quotes=quotes)
+    assert locators == [build_locator(url="https://example.com", content=content, quote=q) for q in quotes]
+
+    first, normalized, again = (parse_locator(x) for x in locators[:3])
+    assert (first["paragraph_index"], first["char_start"], first["char_end"]) == (1, 0, 13)
+    assert normalized["match_type"] == "normalized" and normalized["heading"] == "Details"
+    assert again["paragraph_index"] == 3 and again["char_start"] == 6
+    assert locators[3] is None and locators[4] is None
+    assert index.locate(url="", quote="Eta") is None
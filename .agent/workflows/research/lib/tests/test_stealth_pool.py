@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+StealthFetcher プール / ホスト単位トークンバケット テスト
+プールの実ブラウザテストは playwright がある環境でのみ実行（ローカルHTTPサーバーを使用）
+"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from . import __init__  # noqa: F401
+
+from .. import fanout
+from ..host_rate_limit import HostTokenBucket, host_of
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_is_per_host_and_refills():
+    clock = _Clock()
+    bucket = HostTokenBucket(rate_per_min=60, burst=2, clock=clock)  # 1トークン/秒
+
+    assert [bucket.reserve("a.example") for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve("a.example") == pytest.approx(1.0)
+    assert bucket.reserve("a.example") == pytest.approx(2.0)  # 予約済みの後ろに並ぶ
+    assert bucket.reserve("b.example") == 0.0  # 別ホストは待たない
+
+    clock.now += 10  # 補充は burst まで
+    assert [bucket.reserve("a.example") for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve("a.example") > 0
+
+    unlimited = HostTokenBucket(rate_per_min=0, clock=clock)
+    assert all(unlimited.reserve("a.example") == 0.0 for _ in range(100))
+    assert host_of("https://Example.COM:8443/x?q=1") == "example.com"
+    assert host_of is fanout.host_of  # FanOut のホスト別制限と同じキー
+
+
+def test_token_bucket_acquire_spaces_concurrent_requests():
+    bucket = HostTokenBucket(rate_per_min=600, burst=1)  # 0.1秒に1回
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire("a.example") for _ in range(4)))
+        return time.monotonic() - start
+
+    assert 0.25 < asyncio.run(run()) < 0.6
+
+
+class _Handler(BaseHTTPRequestHandler):
+    delay_sec = 0.3
+
+    def do_GET(self):
+        time.sleep(self.delay_sec)
+        if self.path.startswith("/blocked"):
+            body = b'<html><div class="g-recaptcha"></div></html>'
+            status = 403
+        else:
+            text = f"Fixture page {self.path} with enough text to pass the filter."
+            body = f"<html><head><title>{self.path}</title></head><body><p>{text}</p></body></html>".encode()
+            status = 200
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pool_fetches_concurrently_and_recycles(fixture_server):
+    pytest.importorskip("playwright.async_api")
+    from ..stealth_fetcher import StealthFetcher, SyncStealthFetcher
+
+    urls = [f"{fixture_server}/page{i}" for i in range(8)]
+    options = dict(min_delay_sec=0, max_delay_sec=0, rate_limit_per_min=0, human_scroll=False)
+
+    async def run():
+        async with StealthFetcher(pool_size=4, recycle_after=3, **options) as fetcher:
+            start = time.monotonic()
+            results = await fetcher.fetch_many(urls)
+            elapsed = time.monotonic() - start
+            blocked = await fetcher.fetch(f"{fixture_server}/blocked")
+            return results, elapsed, blocked, fetcher.get_pool_stats()
+
+    results, elapsed, blocked, stats = asyncio.run(run())
+    assert [r.url for r in results] == urls
+    assert all(r.status == 200 and "Fixture page" in r.text for r in results)
+    assert elapsed < 8 * _Handler.delay_sec * 0.6  # 4並列
+    assert blocked.bot_detected
+    assert stats["navigations"] == 9
+    assert stats["recycled"] >= 1
+    assert stats["idle"] == 4
+
+    with SyncStealthFetcher(pool_size=2, **options) as fetcher:
+        threads = [threading.Thread(target=fetcher.fetch, args=(u,)) for u in urls[:4]]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(fetcher.get_access_log()) == 4
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Research Agent v4.3.3 - Tool Memo Module
+ツール呼び出し結果のメモ（(tool_name, args) → 結果、TTL付き）
+
+同じ検索・取得・抽出を再実行しないためのキャッシュ。tool_trace.call_tool(memo=...) から使う。
+- キーは tool_name と args（JSON正規化）の sha256
+- JSON にできる結果だけを保存する（None と例外は保存しない＝次回は再実行）
+- storable で弾いた結果も保存しない（検索0件・本文が空など、ブロックされた応答を共有メモに残さない）
+- 複数スレッド（FanOut）から呼ばれるので sqlite 接続は Lock で直列化する
+- 同じファイルを複数 run で共有すれば、似たクエリの再実行でも既存の結果を再生できる
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_TTL_SEC = 6 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tool_memo (
+    key TEXT PRIMARY KEY,
+    tool_name TEXT NOT NULL,
+    args TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+
+def memo_key(tool_name: str, args: Dict[str, Any]) -> str:
+    """(tool_name, args) の内容ハッシュ"""
+    payload = json.dumps([tool_name, args], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def content_digest(text: str) -> str:
+    """本文を memo のキーに入れるための短いハッシュ"""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()[:32]
+
+
+class ToolMemo:
+    """
+    ツール結果のメモストア（sqlite）
+
+    使用例:
+        memo = ToolMemo(Path("_outputs/research/tool_memo.sqlite3"), ttl_sec=3600)
+        context.tool_memo = memo
+        call_tool(context, tool_name="tools.search_web", call=..., args={"query": q}, memo=True)
+        memo.stats()  # {"hits": .., "misses": .., "hit_ratio": ..}
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl_sec: float = DEFAULT_TTL_SEC,
+        ttl_overrides: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_sec = float(ttl_sec)
+        self.ttl_overrides = dict(ttl_overrides or {})
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._unstorable = 0
+        self._rejected = 0
+        self._by_tool: Dict[str, Dict[str, int]] = {}
+
+    def _ttl(self, tool_name: str) -> float:
+        return float(self.ttl_overrides.get(tool_name, self.ttl_sec))
+
+    def _count(self, tool_name: str, kind: str) -> None:
+        row = self._by_tool.setdefault(tool_name, {"hits": 0, "misses": 0})
+        row[kind] += 1
+
+    def get(self, tool_name: str, args: Dict[str, Any]) -> Tuple[bool, Any]:
+        """(hit, value)。期限切れ・未登録は (False, None)"""
+        key = memo_key(tool_name, args)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM tool_memo WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._clock() - row[1] <= self._ttl(tool_name):
+                self._hits += 1
+                self._count(tool_name, "hits")
+                return True, json.loads(row[0])
+            self._misses += 1
+            self._count(tool_name, "misses")
+            return False, None
+
+    def put(
+        self,
+        tool_name: str,
+        args: Dict[str, Any],
+        value: Any,
+        *,
+        storable: Optional[Callable[[Any], bool]] = None,
+    ) -> bool:
+        """結果を保存（None・JSON化できない値・storable が偽を返す値は保存しない）"""
+        if value is None:
+            return False
+        if storable is not None and not storable(value):
+            with self._lock:
+                self._rejected += 1
+            return False
+        try:
+            encoded = json.dumps(value, ensure_ascii=False)
+            encoded_args = json.dumps(args, ensure_ascii=False, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            with self._lock:
+                self._unstorable += 1
+            return False
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_memo (key, tool_name, args, value, created_at) VALUES (?, ?, ?, ?, ?)",
+                (memo_key(tool_name, args), tool_name, encoded_args, encoded, self._clock()),
+            )
+            self._conn.commit()
+            self._stores += 1
+        return True
+
+    def purge_expired(self) -> int:
+        """どの tool の TTL でも期限切れの行を削除して件数を返す"""
+        longest = max([self.ttl_sec, *self.ttl_overrides.values()])
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM tool_memo WHERE created_at < ?", (self._clock() - longest,)
+            )
+            self._conn.commit()
+            return cur.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "path": str(self.path),
+                "ttl_sec": self.ttl_sec,
+                "hits": self._hits,
+                "misses": self._misses,
+                "stores": self._stores,
+                "unstorable": self._unstorable,
+                "rejected": self._rejected,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "by_tool": {k: dict(v) for k, v in sorted(self._by_tool.items())},
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
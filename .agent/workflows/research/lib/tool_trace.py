@@ -8,7 +8,7 @@ Research tool trace helpers.
 from __future__ import annotations
 
 import time
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, Optional, Union
 
 from .context import ResearchRunContext
 
@@ -48,9 +48,16 @@ def call_tool(
     call: Callable[[], Any],
     args: Optional[dict[str, Any]] = None,
     result_summary: Optional[Callable[[Any], Any]] = None,
+    memo: Union[bool, Dict[str, Any]] = False,
+    storable: Optional[Callable[[Any], bool]] = None,
 ) -> Any:
     """
     Run a tool-like callable and emit TOOL_CALL / TOOL_RESULT if logger is available.
+
+    memo: context.tool_memo がある場合に結果をメモする。True なら args をキーにし、
+    dict ならそれをキーにする（args が要約値しか持たない LLM 呼び出し用）。
+    ヒットしたら call() を呼ばずに保存済みの結果を返し、TOOL_RESULT に memo_hit を付ける。
+    storable: 結果をメモしてよいかの判定（偽なら保存しない。例: 空の検索結果には bool）。
     """
     logger = context.workflow_logger
     call_id = ""
@@ -58,8 +65,25 @@ def call_tool(
     if logger is not None:
         call_id = logger.log_tool_call(tool_name, args=args or {})
 
+    store = getattr(context, "tool_memo", None) if memo is not False else None
+    memo_args = (args or {}) if memo is True else memo
+    if store is not None:
+        hit, cached = store.get(tool_name, memo_args)
+        if hit:
+            if logger is not None and call_id:
+                summary = result_summary(cached) if result_summary else _summarize(cached)
+                logger.log_tool_result(
+                    call_id=call_id,
+                    status="ok",
+                    result={**summary, "memo_hit": True} if isinstance(summary, dict) else {"summary": summary, "memo_hit": True},
+                    duration_ms=int((time.perf_counter() - started) * 1000),
+                )
+            return cached
+
     try:
         result = call()
+        if store is not None:
+            store.put(tool_name, memo_args, result, storable=storable)
         if logger is not None and call_id:
             summary = result_summary(result) if result_summary else _summarize(result)
             duration_ms = int((time.perf_counter() - started) * 1000)
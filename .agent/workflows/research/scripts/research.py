@@ -26,6 +26,23 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Disable local web search/fetch tools and run in stub mode",
     )
+    parser.add_argument(
+        "--resume",
+        default="",
+        help="Resume from the last phase checkpoint of a previous run (its output directory)",
+    )
+    parser.add_argument("--no-checkpoint", action="store_true", help="Do not write phase checkpoints")
+    parser.add_argument(
+        "--memo-path",
+        default="",
+        help="Tool result memo (sqlite). Default: _outputs/research/tool_memo.sqlite3",
+    )
+    parser.add_argument(
+        "--memo-ttl-sec",
+        type=float,
+        default=6 * 3600,
+        help="TTL of memoized tool results (0 disables the memo)",
+    )
     return parser.parse_args()
 
 
@@ -46,6 +63,13 @@ def _build_query(args: argparse.Namespace) -> str:
     raise ValueError("query is required (positional, --query, or --goal/--focus)")
 
 
+def _build_query_optional(args: argparse.Namespace) -> str:
+    try:
+        return _build_query(args)
+    except ValueError:
+        return ""
+
+
 def main() -> int:
     args = _parse_args()
     root = _repo_root()
@@ -61,13 +85,22 @@ def main() -> int:
     from workflow_logging_hook import run_logged_main  # type: ignore
 
     def _run() -> int:
-        query = _build_query(args)
-        output_dir = Path(args.output_dir).resolve() if args.output_dir else None
+        resume_dir = Path(args.resume).resolve() if args.resume else None
+        # 再開時はチェックポイントのクエリを使う（指定があれば一致を検査）
+        query = _build_query(args) if resume_dir is None else _build_query_optional(args)
+        output_dir = resume_dir or (Path(args.output_dir).resolve() if args.output_dir else None)
         tools = None if args.no_web_tools else LocalWebTools()
+        memo_path = None
+        if args.memo_ttl_sec > 0:
+            memo_path = Path(args.memo_path).resolve() if args.memo_path else root / "_outputs" / "research" / "tool_memo.sqlite3"
         config = OrchestratorConfig(
             output_dir=output_dir,
             max_verify_rollbacks=max(0, int(args.max_verify_rollbacks)),
             tools=tools,
+            checkpoint=not args.no_checkpoint,
+            resume=resume_dir is not None,
+            memo_path=memo_path,
+            memo_ttl_sec=float(args.memo_ttl_sec),
         )
         context = run_research(query=query, config=config)
         summary = context.get_summary()
@@ -80,6 +113,9 @@ def main() -> int:
             "output_integrity_pass": bool(summary.get("output_integrity_pass")),
             "missing_output_artifacts": summary.get("missing_output_artifacts", []),
             "web_tools_enabled": tools is not None,
+            "resumed_from_phase": summary.get("resumed_from_phase"),
+            "elapsed_sec": context.run_stats.get("elapsed_sec"),
+            "tool_memo_hit_ratio": summary.get("tool_memo_hit_ratio"),
         }
         print(json.dumps(payload, ensure_ascii=False, indent=2))
         return 0 if payload["claimed_success"] and payload["output_integrity_pass"] else 2
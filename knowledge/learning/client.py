@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import atexit
+import collections
 import dataclasses
 import datetime as dt
+import functools
 import json
+import os
 import sqlite3
+import threading
+import time
+import weakref
 from pathlib import Path
 from typing import Any, Iterable, Optional
 
@@ -13,6 +20,20 @@ LEARNING_DIR = ROOT / "knowledge" / "learning"
 DB_PATH = LEARNING_DIR / "learning.db"
 EVENTS_JSONL = LEARNING_DIR / "events.jsonl"
 
+# Buffered ingestion: events are flushed in one transaction once BATCH_SIZE
+# are pending or the oldest pending event is FLUSH_INTERVAL_S old (a daemon
+# timer enforces the latter even when no further events are reported).
+BATCH_SIZE = int(os.getenv("KI_LEARNING_BATCH_SIZE", "64"))
+FLUSH_INTERVAL_S = float(os.getenv("KI_LEARNING_FLUSH_INTERVAL_S", "1.0"))
+BUSY_TIMEOUT_S = 30.0
+_LOCKED_RETRIES = 5
+
+# intent_stats keeps exponentially decayed success/total counters (half-life
+# below) next to the raw counts, for rank_intents(scoring="recency").
+HALF_LIFE_S = float(os.getenv("KI_LEARNING_HALF_LIFE_DAYS", "14")) * 86400.0
+SCORING_MODES = ("ratio", "recency", "bayes")
+_RANK_CACHE_SIZE = 256
+
 
 @dataclasses.dataclass
 class AgentEvent:
@@ -41,14 +62,66 @@ def _ensure_dirs() -> None:
     LEARNING_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def _connect() -> sqlite3.Connection:
-    _ensure_dirs()
-    con = sqlite3.connect(DB_PATH)
+def _ts_epoch(ts: Optional[str]) -> float:
+    try:
+        return dt.datetime.fromisoformat(str(ts)).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+def _decay(weight: float, ref: float, to_ref: float) -> float:
+    """Decay a counter stored at time ref forward to max(ref, to_ref)."""
+    if weight is None:
+        return 0.0
+    if ref is None or to_ref is None or to_ref <= ref:
+        return float(weight)
+    return float(weight) * 0.5 ** ((to_ref - ref) / HALF_LIFE_S)
+
+
+def _connect(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    db_path = Path(db_path or DB_PATH)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    # Autocommit mode: write transactions are opened explicitly with
+    # BEGIN IMMEDIATE so concurrent writers wait on busy_timeout instead of
+    # failing with "database is locked" on a read->write lock upgrade.
+    con = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_S, isolation_level=None, check_same_thread=False)
     con.row_factory = sqlite3.Row
+    con.create_function("ag_decay", 3, _decay, deterministic=True)
+    con.create_function("ag_epoch", 1, _ts_epoch, deterministic=True)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
     return con
 
 
+def _is_locked(exc: sqlite3.OperationalError) -> bool:
+    msg = str(exc).lower()
+    return "locked" in msg or "busy" in msg
+
+
+def _write_txn(con: sqlite3.Connection, fn) -> None:
+    """Run fn(con) inside BEGIN IMMEDIATE ... COMMIT, retrying on lock errors."""
+    for attempt in range(_LOCKED_RETRIES):
+        try:
+            con.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            if not _is_locked(e) or attempt == _LOCKED_RETRIES - 1:
+                raise
+            time.sleep(0.05 * (2 ** attempt))
+            continue
+        try:
+            fn(con)
+            con.execute("COMMIT")
+            return
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+
+
 def _init_schema(con: sqlite3.Connection) -> None:
+    _write_txn(con, _create_schema)
+
+
+def _create_schema(con: sqlite3.Connection) -> None:
     con.execute(
         """
         CREATE TABLE IF NOT EXISTS events (
@@ -101,19 +174,283 @@ def _init_schema(con: sqlite3.Connection) -> None:
         )
         """
     )
-    con.commit()
+    exists = con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='index' AND name='ux_failure_patterns_key'"
+    ).fetchone()
+    if not exists:
+        # Older DBs could hold duplicate keys (racing SELECT-then-INSERT from
+        # several processes). Fold them into the lowest id before indexing.
+        same_key = """
+            d.signature_key = failure_patterns.signature_key AND d.intent_class = failure_patterns.intent_class
+            AND d.error_type = failure_patterns.error_type AND d.root_cause = failure_patterns.root_cause
+        """
+        con.execute(
+            f"""
+            UPDATE failure_patterns
+            SET count = (SELECT SUM(d.count) FROM failure_patterns AS d WHERE {same_key}),
+                last_ts_end = (SELECT MAX(d.last_ts_end) FROM failure_patterns AS d WHERE {same_key})
+            WHERE id IN (
+              SELECT MIN(id) FROM failure_patterns
+              GROUP BY signature_key, intent_class, error_type, root_cause
+              HAVING COUNT(*) > 1
+            )
+            """
+        )
+        con.execute(
+            """
+            DELETE FROM failure_patterns
+            WHERE id NOT IN (
+              SELECT MIN(id) FROM failure_patterns
+              GROUP BY signature_key, intent_class, error_type, root_cause
+            )
+            """
+        )
+        con.execute(
+            """
+            CREATE UNIQUE INDEX ux_failure_patterns_key
+            ON failure_patterns(signature_key, intent_class, error_type, root_cause)
+            """
+        )
+
+    # Per-intent outcome aggregate used by rank_intents (one PK-prefix lookup
+    # instead of a GROUP BY over the raw events per candidate).
+    has_intent_stats = con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='intent_stats'"
+    ).fetchone()
+    if not has_intent_stats:
+        con.execute(
+            """
+            CREATE TABLE intent_stats (
+              agent TEXT NOT NULL,
+              intent_class TEXT NOT NULL,
+              signature_key TEXT NOT NULL,
+              intent TEXT NOT NULL,
+              success INTEGER NOT NULL DEFAULT 0,
+              total INTEGER NOT NULL DEFAULT 0,
+              w_success REAL NOT NULL DEFAULT 0,
+              w_total REAL NOT NULL DEFAULT 0,
+              w_ref REAL NOT NULL DEFAULT 0,
+              last_ts_end TEXT NOT NULL DEFAULT '',
+              PRIMARY KEY (agent, intent_class, signature_key, intent)
+            ) WITHOUT ROWID
+            """
+        )
+        # Backfill from existing history.
+        con.execute(
+            """
+            INSERT INTO intent_stats(
+              agent, intent_class, signature_key, intent,
+              success, total, w_success, w_total, w_ref, last_ts_end
+            )
+            SELECT agent, intent_class, signature_key, intent,
+                   SUM(outcome = 'SUCCESS'), COUNT(*),
+                   SUM((outcome = 'SUCCESS') * ag_decay(1.0, epoch, ref)),
+                   SUM(ag_decay(1.0, epoch, ref)),
+                   MAX(ref), MAX(ts_end)
+            FROM (
+              SELECT *, MAX(epoch) OVER (PARTITION BY agent, intent_class, signature_key, intent) AS ref
+              FROM (
+                SELECT agent, intent_class, COALESCE(signature_key, '') AS signature_key, intent, outcome, ts_end,
+                       COALESCE((julianday(ts_end) - 2440587.5) * 86400.0, ag_epoch(ts_end)) AS epoch
+                FROM events
+              )
+            )
+            GROUP BY agent, intent_class, signature_key, intent
+            """
+        )
+
+
+def _event_params(evt: AgentEvent) -> tuple:
+    return (
+        evt.ts_end,
+        evt.agent,
+        evt.intent,
+        evt.intent_class,
+        evt.outcome,
+        evt.signature_key,
+        evt.error_type,
+        evt.root_cause,
+        evt.fix,
+        float(evt.confidence or 0.0),
+        json.dumps(evt.meta or {}, ensure_ascii=False),
+    )
+
+
+def _intent_stats_rows(batch: list[AgentEvent]) -> list[tuple]:
+    """Pre-aggregate a batch into intent_stats upsert rows."""
+    agg: dict[tuple[str, str, str, str], list[Any]] = {}
+    for evt in batch:
+        key = (evt.agent, evt.intent_class, evt.signature_key or "", evt.intent)
+        epoch = _ts_epoch(evt.ts_end)
+        win = 1.0 if evt.outcome == "SUCCESS" else 0.0
+        slot = agg.get(key)
+        if slot is None:
+            agg[key] = [int(win), 1, win, 1.0, epoch, evt.ts_end]
+            continue
+        success, total, w_success, w_total, ref, _ = slot
+        new_ref = max(ref, epoch)
+        slot[0] = success + int(win)
+        slot[1] = total + 1
+        slot[2] = _decay(w_success, ref, new_ref) + _decay(win, epoch, new_ref)
+        slot[3] = _decay(w_total, ref, new_ref) + _decay(1.0, epoch, new_ref)
+        slot[4] = new_ref
+        slot[5] = evt.ts_end
+    return [(*key, *vals) for key, vals in agg.items()]
+
+
+def _failure_pattern_key(evt: AgentEvent) -> Optional[tuple[str, str, str, str]]:
+    if evt.outcome != "FAILURE":
+        return None
+    if not evt.signature_key or not evt.intent_class:
+        return None
+    return (evt.signature_key, evt.intent_class, evt.error_type or "unknown", evt.root_cause or "unknown")
+
+
+class _JsonlAuditWriter:
+    """Append-only audit log written as one O_APPEND write per flushed batch."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows).encode("utf-8")
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                n = os.write(fd, view)
+                view = view[n:]
+        finally:
+            os.close(fd)
+
+
+def _flush_client_at_exit(ref: "weakref.ref[LearningClient]") -> None:
+    client = ref()
+    if client is not None:
+        try:
+            client.close()
+        except Exception:
+            pass
 
 
 class LearningClient:
-    def __init__(self) -> None:
-        self._con = _connect()
+    """Records agent outcomes into learning.db (+ events.jsonl audit log).
+
+    report_outcome() buffers; pending events are written in a single
+    transaction on batch_size / flush_interval (by a daemon timer, so a quiet
+    reporter does not hold events back), on flush()/close(), before reads
+    through this client, and at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        *,
+        db_path: Optional[Path] = None,
+        events_path: Optional[Path] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ) -> None:
+        self._con = _connect(db_path)
         _init_schema(self._con)
+        self._audit = _JsonlAuditWriter(events_path or EVENTS_JSONL)
+        self.batch_size = max(1, int(batch_size if batch_size is not None else BATCH_SIZE))
+        self.flush_interval = float(flush_interval if flush_interval is not None else FLUSH_INTERVAL_S)
+        self._lock = threading.RLock()
+        self._pending: list[AgentEvent] = []
+        self._pending_since = 0.0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._closed = False
+        self._local_version = 0
+        self._rank_cache: "collections.OrderedDict[tuple, tuple[tuple, dict]]" = collections.OrderedDict()
+        self._atexit_hook = functools.partial(_flush_client_at_exit, weakref.ref(self))
+        atexit.register(self._atexit_hook)
+
+    def __enter__(self) -> "LearningClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 
     def report_outcome(self, evt: AgentEvent) -> None:
-        if not evt.ts_end:
-            evt.ts_end = _now_iso()
-        meta_json = json.dumps(evt.meta or {}, ensure_ascii=False)
-        self._con.execute(
+        self.report_outcomes([evt])
+
+    def report_outcomes(self, events: Iterable[AgentEvent]) -> None:
+        with self._lock:
+            for evt in events:
+                if not evt.ts_end:
+                    evt.ts_end = _now_iso()
+                if not self._pending:
+                    self._pending_since = time.monotonic()
+                self._pending.append(evt)
+            if not self._pending:
+                return
+            if (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._pending_since >= self.flush_interval
+            ):
+                self.flush()
+            else:
+                self._schedule_flush(self.flush_interval - (time.monotonic() - self._pending_since))
+
+    def _schedule_flush(self, delay: float) -> None:
+        # Caller holds self._lock.
+        if self._flush_timer is not None or self._closed:
+            return
+        timer = threading.Timer(max(0.0, delay), self._flush_on_timer)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+
+    def _flush_on_timer(self) -> None:
+        with self._lock:
+            self._flush_timer = None
+            if self._closed or not self._pending:
+                return
+            remaining = self.flush_interval - (time.monotonic() - self._pending_since)
+            if remaining > 0:
+                self._schedule_flush(remaining)
+                return
+            try:
+                self.flush()
+            except Exception:
+                # Events stay pending; try again after another interval.
+                self._schedule_flush(self.flush_interval)
+
+    def flush(self) -> int:
+        """Write pending events in one transaction; returns the number written."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not batch:
+                return 0
+            try:
+                _write_txn(self._con, lambda con: self._ingest(con, batch))
+            except BaseException:
+                self._pending = batch + self._pending
+                raise
+            self._local_version += 1
+            # Append-only audit log (after the DB commit, as before).
+            self._audit.write([evt.to_row() for evt in batch])
+            return len(batch)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self.flush()
+            finally:
+                self._closed = True
+                atexit.unregister(self._atexit_hook)
+                self._con.close()
+
+    def _ingest(self, con: sqlite3.Connection, batch: list[AgentEvent]) -> None:
+        con.executemany(
             """
             INSERT INTO events(
               ts_end, agent, intent, intent_class, outcome, signature_key,
@@ -121,62 +458,56 @@ class LearningClient:
             )
             VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                evt.ts_end,
-                evt.agent,
-                evt.intent,
-                evt.intent_class,
-                evt.outcome,
-                evt.signature_key,
-                evt.error_type,
-                evt.root_cause,
-                evt.fix,
-                float(evt.confidence or 0.0),
-                meta_json,
-            ),
+            [_event_params(evt) for evt in batch],
         )
-        self._con.commit()
+        self._update_failure_patterns(con, batch)
+        self._update_intent_stats(con, batch)
 
-        # Append-only audit log.
-        _ensure_dirs()
-        with EVENTS_JSONL.open("a", encoding="utf-8") as fp:
-            fp.write(json.dumps(evt.to_row(), ensure_ascii=False) + "\n")
-
-        # Update derived aggregates (best-effort).
-        self._update_failure_patterns(evt)
+    def _update_intent_stats(self, con: sqlite3.Connection, batch: list[AgentEvent]) -> None:
+        con.executemany(
+            """
+            INSERT INTO intent_stats(
+              agent, intent_class, signature_key, intent,
+              success, total, w_success, w_total, w_ref, last_ts_end
+            )
+            VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(agent, intent_class, signature_key, intent) DO UPDATE SET
+              success = success + excluded.success,
+              total = total + excluded.total,
+              w_success = ag_decay(w_success, w_ref, excluded.w_ref)
+                          + ag_decay(excluded.w_success, excluded.w_ref, w_ref),
+              w_total = ag_decay(w_total, w_ref, excluded.w_ref)
+                        + ag_decay(excluded.w_total, excluded.w_ref, w_ref),
+              w_ref = max(w_ref, excluded.w_ref),
+              last_ts_end = excluded.last_ts_end
+            """,
+            _intent_stats_rows(batch),
+        )
 
-    def _update_failure_patterns(self, evt: AgentEvent) -> None:
-        if evt.outcome != "FAILURE":
-            return
-        if not evt.signature_key or not evt.intent_class:
+    def _update_failure_patterns(self, con: sqlite3.Connection, batch: list[AgentEvent]) -> None:
+        # Derived aggregates: pre-aggregate the batch, then one upsert per key.
+        agg: dict[tuple[str, str, str, str], list[Any]] = {}
+        for evt in batch:
+            key = _failure_pattern_key(evt)
+            if key is None:
+                continue
+            slot = agg.setdefault(key, [0, ""])
+            slot[0] += 1
+            slot[1] = evt.ts_end or _now_iso()
+        if not agg:
             return
-        error_type = evt.error_type or "unknown"
-        root_cause = evt.root_cause or "unknown"
-        now = evt.ts_end or _now_iso()
-
-        row = self._con.execute(
+        con.executemany(
             """
-            SELECT id, count FROM failure_patterns
-            WHERE signature_key=? AND intent_class=? AND error_type=? AND root_cause=?
+            INSERT INTO failure_patterns(signature_key, intent_class, error_type, root_cause, count, last_ts_end)
+            VALUES(?, ?, ?, ?, ?, ?)
+            ON CONFLICT(signature_key, intent_class, error_type, root_cause)
+            DO UPDATE SET count = count + excluded.count, last_ts_end = excluded.last_ts_end
             """,
-            (evt.signature_key, evt.intent_class, error_type, root_cause),
-        ).fetchone()
-        if row:
-            self._con.execute(
-                "UPDATE failure_patterns SET count=count+1, last_ts_end=? WHERE id=?",
-                (now, row["id"]),
-            )
-        else:
-            self._con.execute(
-                """
-                INSERT INTO failure_patterns(signature_key, intent_class, error_type, root_cause, count, last_ts_end)
-                VALUES(?, ?, ?, ?, 1, ?)
-                """,
-                (evt.signature_key, evt.intent_class, error_type, root_cause, now),
-            )
-        self._con.commit()
+            [(*key, count, last) for key, (count, last) in agg.items()],
+        )
 
     def get_risks(self, *, signature_key: str, intent_class: str, top_k: int = 5) -> list[dict[str, Any]]:
+        self.flush()
         rows = self._con.execute(
             """
             SELECT error_type, root_cause, count, last_ts_end
@@ -189,6 +520,73 @@ class LearningClient:
         ).fetchall()
         return [dict(r) for r in rows]
 
+    def _data_version(self) -> tuple[int, int]:
+        # PRAGMA data_version moves when another connection commits; our own
+        # commits are tracked by _local_version.
+        return (int(self._con.execute("PRAGMA data_version").fetchone()[0]), self._local_version)
+
+    def _load_intent_stats(self, agent: str, intent_class: str, signature_key: str) -> dict[str, tuple]:
+        key = (agent, intent_class, signature_key)
+        version = self._data_version()
+        cached = self._rank_cache.get(key)
+        if cached is not None and cached[0] == version:
+            self._rank_cache.move_to_end(key)
+            return cached[1]
+        rows = self._con.execute(
+            """
+            SELECT intent, success, total, w_success, w_total, w_ref
+            FROM intent_stats
+            WHERE agent=? AND intent_class=? AND signature_key=?
+            """,
+            key,
+        ).fetchall()
+        stats = {str(r["intent"]): (int(r["success"]), int(r["total"]), r["w_success"], r["w_total"], r["w_ref"]) for r in rows}
+        self._rank_cache[key] = (version, stats)
+        self._rank_cache.move_to_end(key)
+        while len(self._rank_cache) > _RANK_CACHE_SIZE:
+            self._rank_cache.popitem(last=False)
+        return stats
+
+    def intent_scores(
+        self,
+        *,
+        agent: str,
+        intent_class: str,
+        intents: Iterable[str],
+        signature_key: str,
+        min_trials: int = 3,
+        scoring: str = "ratio",
+        prior_strength: float = 2.0,
+    ) -> dict[str, tuple[float, int]]:
+        """{intent: (score, trials)} for the candidates.
+
+        ratio:   success/total, neutral 0.5 below min_trials (original behaviour)
+        recency: same with counts decayed by HALF_LIFE_S
+        bayes:   posterior mean with a Beta prior centred on 0.5 and weight prior_strength
+        """
+        if scoring not in SCORING_MODES:
+            raise ValueError(f"scoring must be one of {SCORING_MODES}: {scoring!r}")
+        with self._lock:
+            self.flush()
+            stats = self._load_intent_stats(agent, intent_class, signature_key)
+        now = time.time()
+        scores: dict[str, tuple[float, int]] = {}
+        for intent in intents:
+            success, total, w_success, w_total, w_ref = stats.get(intent, (0, 0, 0.0, 0.0, 0.0))
+            if scoring == "bayes":
+                k = max(0.0, float(prior_strength))
+                score = (success + 0.5 * k) / (total + k) if total + k > 0 else 0.5
+            elif total < min_trials:
+                # Not enough signal: neutral score.
+                score = 0.5
+            elif scoring == "recency":
+                w_total = _decay(w_total, w_ref, now)
+                score = _decay(w_success, w_ref, now) / w_total if w_total > 0 else 0.5
+            else:
+                score = success / max(1, total)
+            scores[intent] = (score, total)
+        return scores
+
     def rank_intents(
         self,
         *,
@@ -197,35 +595,39 @@ class LearningClient:
         intents: Iterable[str],
         signature_key: str,
         min_trials: int = 3,
+        scoring: str = "ratio",
+        prior_strength: float = 2.0,
     ) -> list[str]:
         intent_list = list(intents)
         if not intent_list:
             return []
 
-        scores: dict[str, tuple[float, int]] = {}
-        for intent in intent_list:
-            rows = self._con.execute(
-                """
-                SELECT outcome, COUNT(*) AS c
-                FROM events
-                WHERE agent=? AND intent_class=? AND intent=? AND signature_key=?
-                GROUP BY outcome
-                """,
-                (agent, intent_class, intent, signature_key),
-            ).fetchall()
-            total = sum(int(r["c"]) for r in rows)
-            success = sum(int(r["c"]) for r in rows if str(r["outcome"]) == "SUCCESS")
-            if total < min_trials:
-                # Not enough signal: neutral score.
-                scores[intent] = (0.5, total)
-            else:
-                scores[intent] = (success / max(1, total), total)
+        scores = self.intent_scores(
+            agent=agent,
+            intent_class=intent_class,
+            intents=intent_list,
+            signature_key=signature_key,
+            min_trials=min_trials,
+            scoring=scoring,
+            prior_strength=prior_strength,
+        )
 
-        # Higher success-rate first; tie-break by more trials.
-        intent_list.sort(key=lambda i: (scores.get(i, (0.5, 0))[0], scores.get(i, (0.5, 0))[1]), reverse=True)
+        # Higher score first; tie-break by more trials.
+        intent_list.sort(key=lambda i: scores.get(i, (0.5, 0)), reverse=True)
         return intent_list
 
 
+_shared_client: Optional[LearningClient] = None
+_shared_pid = 0
+_shared_lock = threading.Lock()
+
+
 def get_client() -> LearningClient:
-    return LearningClient()
+    """Process-wide shared client, so per-action reporters share one buffer."""
+    global _shared_client, _shared_pid
+    with _shared_lock:
+        if _shared_client is None or _shared_client._closed or _shared_pid != os.getpid():
+            _shared_client = LearningClient()
+            _shared_pid = os.getpid()
+        return _shared_client
 
@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
-"""WorkflowLoggerログの探索/抽出CLI."""
+"""WorkflowLoggerログの探索/抽出CLI.
+
+問い合わせは RunCatalog（_logs/autonomy/_catalog.sqlite）の索引で答える。
+各関数は既定で refresh=True（mtime が変わった箇所だけ取り込む）。main() は最初に1回だけ refresh する。
+"""
 
 from __future__ import annotations
 
@@ -9,6 +13,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+from run_catalog import RunCatalog
 from workflow_logger import WORKSPACE_ROOT, SCHEMA_VERSION, WorkflowLogger
 
 
@@ -16,17 +21,12 @@ def log_root(workspace_root: Optional[Path] = None) -> Path:
     return (workspace_root or WORKSPACE_ROOT) / "_logs" / "autonomy"
 
 
-def _read_json(path: Path) -> dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def _iter_summary_files(agent_dir: Path) -> list[Path]:
-    files: list[Path] = []
-    for date_dir in sorted(agent_dir.iterdir(), reverse=True):
-        if not date_dir.is_dir():
-            continue
-        files.extend(sorted(date_dir.glob("*_summary.json"), reverse=True))
-    return files
+def open_catalog(workspace_root: Optional[Path] = None, *, refresh: bool = True) -> RunCatalog:
+    ws = workspace_root or WORKSPACE_ROOT
+    catalog = RunCatalog(log_root(ws), workspace_root=ws)
+    if refresh:
+        catalog.refresh()
+    return catalog
 
 
 def _parse_iso(value: str) -> Optional[datetime]:
@@ -38,14 +38,10 @@ def _parse_iso(value: str) -> Optional[datetime]:
         return None
 
 
-def _latest_research_output_dir(workspace_root: Optional[Path] = None) -> Optional[Path]:
-    root = (workspace_root or WORKSPACE_ROOT) / "_outputs" / "research"
-    if not root.exists():
-        return None
-    dirs = [d for d in root.iterdir() if d.is_dir()]
-    if not dirs:
-        return None
-    return max(dirs, key=lambda p: p.stat().st_mtime)
+def _latest_research_output_dir(workspace_root: Optional[Path] = None, *, refresh: bool = True) -> Optional[Path]:
+    with open_catalog(workspace_root, refresh=refresh) as catalog:
+        row = catalog.latest_research_output()
+    return Path(row["output_dir"]) if row else None
 
 
 def _research_report_files(output_dir: Path) -> list[Path]:
@@ -65,72 +61,47 @@ def _research_has_full_artifacts(output_dir: Path) -> bool:
     return all(path.exists() for path in required)
 
 
-def find_research_output_violations(workspace_root: Optional[Path] = None) -> list[dict[str, Any]]:
+def find_research_output_violations(
+    workspace_root: Optional[Path] = None, *, refresh: bool = True
+) -> list[dict[str, Any]]:
     """_outputs/research のうち report-only / 不完全出力を検出する。"""
-    ws = workspace_root or WORKSPACE_ROOT
-    root = ws / "_outputs" / "research"
-    if not root.exists():
-        return []
+    with open_catalog(workspace_root, refresh=refresh) as catalog:
+        outputs = catalog.research_outputs()
 
     rows: list[dict[str, Any]] = []
-    for output_dir in sorted([d for d in root.iterdir() if d.is_dir()], key=lambda p: p.name):
-        custom_reports = sorted(
-            [str(path) for path in output_dir.glob("*_report.md") if path.name != "final_report.md"]
-        )
-        final_report_path = output_dir / "final_report.md"
-        has_final_report = final_report_path.exists()
-        if not custom_reports and not has_final_report:
+    for item in outputs:
+        custom_reports = item["custom_report_files"]
+        if not custom_reports and not item["has_final_report"]:
             continue
-
-        required = {
-            "final_report.md": has_final_report,
-            "audit_pack.json": (output_dir / "audit_pack.json").exists(),
-            "evidence.jsonl": (output_dir / "evidence.jsonl").exists(),
-            "verified_claims.jsonl": (output_dir / "verified_claims.jsonl").exists(),
-        }
-        missing = [name for name, present in required.items() if not present]
+        missing = item["missing_required"]
         if not missing and not custom_reports:
             continue
-
         rows.append(
             {
-                "output_dir": str(output_dir),
+                "output_dir": item["output_dir"],
                 "custom_report_files": custom_reports,
-                "has_final_report": has_final_report,
+                "has_final_report": item["has_final_report"],
                 "missing_required": missing,
             }
         )
     return rows
 
 
-def _research_summary_for_output_dir(output_dir: Path, workspace_root: Optional[Path] = None) -> Optional[dict[str, Any]]:
-    root = log_root(workspace_root)
-    agent_dir = root / "research"
-    if not agent_dir.exists():
-        return None
-    output_dir_str = str(output_dir)
-    for summary_path in _iter_summary_files(agent_dir):
-        try:
-            summary = _read_json(summary_path)
-        except Exception:
-            continue
-        inputs = summary.get("inputs", {})
-        if str(inputs.get("output_dir", "")) == output_dir_str:
-            return summary
-        summary_payload = summary.get("outputs", {}).get("summary", {})
-        if str(summary_payload.get("session_id", "")) and output_dir.name.endswith(str(summary_payload["session_id"])):
-            return summary
-    return None
+def _research_summary_for_output_dir(
+    output_dir: Path, workspace_root: Optional[Path] = None, *, refresh: bool = True
+) -> Optional[dict[str, Any]]:
+    with open_catalog(workspace_root, refresh=refresh) as catalog:
+        return catalog.research_summary_for(output_dir)
 
 
-def reconcile_research_output(workspace_root: Optional[Path] = None) -> Optional[dict[str, Any]]:
+def reconcile_research_output(workspace_root: Optional[Path] = None, *, refresh: bool = True) -> Optional[dict[str, Any]]:
     """report-onlyの/research出力をautonomyログへ補足取り込みする。"""
     ws = workspace_root or WORKSPACE_ROOT
-    output_dir = _latest_research_output_dir(ws)
+    output_dir = _latest_research_output_dir(ws, refresh=refresh)
     if output_dir is None:
         return None
 
-    existing = _research_summary_for_output_dir(output_dir, workspace_root=ws)
+    existing = _research_summary_for_output_dir(output_dir, workspace_root=ws, refresh=False)
     if existing:
         return existing
 
@@ -172,20 +143,18 @@ def reconcile_research_output(workspace_root: Optional[Path] = None) -> Optional
     return logger.finalize()
 
 
-def list_agents(workspace_root: Optional[Path] = None) -> list[dict[str, Any]]:
-    root = log_root(workspace_root)
-    if not root.exists():
+def list_agents(workspace_root: Optional[Path] = None, *, refresh: bool = True) -> list[dict[str, Any]]:
+    if not log_root(workspace_root).exists():
         return []
 
+    with open_catalog(workspace_root, refresh=refresh) as catalog:
+        rows = catalog.agents()
     agents: list[dict[str, Any]] = []
-    for agent_dir in sorted(root.iterdir()):
-        if not agent_dir.is_dir():
-            continue
-        latest_path = agent_dir / "latest.json"
-        latest = _read_json(latest_path) if latest_path.exists() else {}
+    for row in rows:
+        latest = row["latest"]
         agents.append(
             {
-                "agent": agent_dir.name,
+                "agent": row["agent"],
                 "has_latest": bool(latest),
                 "latest_run_id": latest.get("run_id", ""),
                 "latest_completed_at": latest.get("completed_at", ""),
@@ -197,33 +166,26 @@ def list_agents(workspace_root: Optional[Path] = None) -> list[dict[str, Any]]:
     return agents
 
 
-def latest_for_agent(agent: str, workspace_root: Optional[Path] = None) -> dict[str, Any]:
-    root = log_root(workspace_root)
-    latest_path = root / agent / "latest.json"
-    if not latest_path.exists():
+def latest_for_agent(agent: str, workspace_root: Optional[Path] = None, *, refresh: bool = True) -> dict[str, Any]:
+    if not log_root(workspace_root).exists():
         return {}
-    return _read_json(latest_path)
+    with open_catalog(workspace_root, refresh=refresh) as catalog:
+        return catalog.latest(agent)
 
 
-def recent_summaries(agent: str, last_n: int = 3, workspace_root: Optional[Path] = None) -> list[dict[str, Any]]:
-    root = log_root(workspace_root)
-    agent_dir = root / agent
-    if not agent_dir.exists():
+def recent_summaries(
+    agent: str, last_n: int = 3, workspace_root: Optional[Path] = None, *, refresh: bool = True
+) -> list[dict[str, Any]]:
+    if not log_root(workspace_root).exists():
         return []
-    summaries: list[dict[str, Any]] = []
-    for summary_path in _iter_summary_files(agent_dir):
-        try:
-            data = _read_json(summary_path)
-            summaries.append(data)
-        except Exception:
-            continue
-        if len(summaries) >= last_n:
-            break
-    return summaries
+    with open_catalog(workspace_root, refresh=refresh) as catalog:
+        return catalog.recent_summaries(agent, last_n)
 
 
-def bundle_for_agent(agent: str, last_n: int = 3, workspace_root: Optional[Path] = None) -> str:
-    summaries = recent_summaries(agent=agent, last_n=last_n, workspace_root=workspace_root)
+def bundle_for_agent(
+    agent: str, last_n: int = 3, workspace_root: Optional[Path] = None, *, refresh: bool = True
+) -> str:
+    summaries = recent_summaries(agent=agent, last_n=last_n, workspace_root=workspace_root, refresh=refresh)
     if not summaries:
         return f"[{agent}] ログサマリーなし"
 
@@ -243,23 +205,13 @@ def bundle_for_agent(agent: str, last_n: int = 3, workspace_root: Optional[Path]
     return "\n".join(lines).rstrip()
 
 
-def find_claim_mismatches(last_n: int = 20, workspace_root: Optional[Path] = None) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
-    for agent_info in list_agents(workspace_root):
-        agent = agent_info["agent"]
-        for summary in recent_summaries(agent=agent, last_n=last_n, workspace_root=workspace_root):
-            if summary.get("claimed_success") and not summary.get("verified_success"):
-                rows.append(
-                    {
-                        "agent": agent,
-                        "run_id": summary.get("run_id", ""),
-                        "completed_at": summary.get("completed_at", ""),
-                        "log_path": summary.get("log_path", ""),
-                        "summary_path": summary.get("summary_path", ""),
-                        "evidence_refs": summary.get("evidence_refs", []),
-                    }
-                )
-    return rows
+def find_claim_mismatches(
+    last_n: int = 20, workspace_root: Optional[Path] = None, *, refresh: bool = True
+) -> list[dict[str, Any]]:
+    if not log_root(workspace_root).exists():
+        return []
+    with open_catalog(workspace_root, refresh=refresh) as catalog:
+        return catalog.claim_mismatches(last_n)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -284,6 +236,11 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Check _outputs/research for bypass-like/incomplete outputs",
     )
+    parser.add_argument(
+        "--rebuild-catalog",
+        action="store_true",
+        help="Drop and rebuild the run catalog (_logs/autonomy/_catalog.sqlite) from the log tree",
+    )
     return parser
 
 
@@ -296,47 +253,54 @@ def main() -> int:
         print(json.dumps({"schema_version": SCHEMA_VERSION, "message": "no logs"}, ensure_ascii=False))
         return 0
 
+    with open_catalog(refresh=False) as catalog:
+        if args.rebuild_catalog:
+            stats = catalog.rebuild()
+            print(json.dumps({"catalog": str(catalog.path), **stats, **catalog.counts()}, ensure_ascii=False, indent=2))
+            return 0
+        catalog.refresh()
+
     if args.reconcile_research_output:
-        reconcile_research_output()
+        reconcile_research_output(refresh=False)
 
     if args.check_research_outputs:
-        rows = find_research_output_violations()
+        rows = find_research_output_violations(refresh=False)
         print(json.dumps(rows, ensure_ascii=False, indent=2))
         return 1 if rows else 0
 
     if args.mismatches:
-        print(json.dumps(find_claim_mismatches(last_n=args.last_n), ensure_ascii=False, indent=2))
+        print(json.dumps(find_claim_mismatches(last_n=args.last_n, refresh=False), ensure_ascii=False, indent=2))
         return 0
 
     if args.list:
-        print(json.dumps(list_agents(), ensure_ascii=False, indent=2))
+        print(json.dumps(list_agents(refresh=False), ensure_ascii=False, indent=2))
         return 0
 
     if args.agent:
         if args.bundle:
-            print(bundle_for_agent(agent=args.agent, last_n=args.last_n))
+            print(bundle_for_agent(agent=args.agent, last_n=args.last_n, refresh=False))
         else:
             payload = {
                 "schema_version": SCHEMA_VERSION,
                 "agent": args.agent,
-                "latest": latest_for_agent(args.agent),
-                "summaries": recent_summaries(agent=args.agent, last_n=args.last_n),
+                "latest": latest_for_agent(args.agent, refresh=False),
+                "summaries": recent_summaries(agent=args.agent, last_n=args.last_n, refresh=False),
             }
             print(json.dumps(payload, ensure_ascii=False, indent=2))
         return 0
 
     if args.all:
-        agents = [item["agent"] for item in list_agents()]
+        agents = [item["agent"] for item in list_agents(refresh=False)]
         if args.bundle:
-            chunks = [bundle_for_agent(agent=agent, last_n=args.last_n) for agent in agents]
+            chunks = [bundle_for_agent(agent=agent, last_n=args.last_n, refresh=False) for agent in agents]
             print("\n\n".join(chunk for chunk in chunks if chunk))
         else:
             payload = {
                 "schema_version": SCHEMA_VERSION,
                 "agents": {
                     agent: {
-                        "latest": latest_for_agent(agent),
-                        "summaries": recent_summaries(agent=agent, last_n=args.last_n),
+                        "latest": latest_for_agent(agent, refresh=False),
+                        "summaries": recent_summaries(agent=agent, last_n=args.last_n, refresh=False),
                     }
                     for agent in agents
                 },
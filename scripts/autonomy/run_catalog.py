@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""RunCatalog - WorkflowLogger 実行ログの索引 (sqlite).
+
+`_logs/autonomy/_catalog.sqlite` に runs / agents / research_outputs を保持し、
+codex_log_resolver の問い合わせを索引付きの検索で返す。
+
+更新経路:
+- WorkflowLogger.finalize() が record_summary() で完了した実行を直接登録する
+- refresh() はディレクトリの mtime を比較し、変化した日付ディレクトリ・research 出力だけを読み直す
+- rebuild() は索引を空にして全走査する（破損・手動削除からの復旧用）
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+CATALOG_FILENAME = "_catalog.sqlite"
+CATALOG_SCHEMA_VERSION = "1"
+BUSY_TIMEOUT_S = 30.0
+# mtime がこれより新しいディレクトリは「走査済み」にしない（同じ時刻刻みで後から増えたファイルの取りこぼし防止）
+RACY_WINDOW_NS = 2_000_000_000
+
+RESEARCH_REQUIRED_FILES = ("audit_pack.json", "evidence.jsonl", "verified_claims.jsonl")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dirs (
+  path TEXT PRIMARY KEY,
+  mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS agents (
+  agent TEXT PRIMARY KEY,
+  latest_json TEXT,
+  latest_mtime_ns INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS runs (
+  summary_path TEXT PRIMARY KEY,
+  agent TEXT NOT NULL,
+  date_dir TEXT NOT NULL,
+  file_name TEXT NOT NULL,
+  run_id TEXT NOT NULL DEFAULT '',
+  completed_at TEXT NOT NULL DEFAULT '',
+  final_status TEXT NOT NULL DEFAULT '',
+  claimed_success INTEGER NOT NULL DEFAULT 0,
+  verified_success INTEGER NOT NULL DEFAULT 0,
+  output_dir TEXT NOT NULL DEFAULT '',
+  session_id TEXT NOT NULL DEFAULT '',
+  mtime_ns INTEGER NOT NULL DEFAULT 0,
+  size INTEGER NOT NULL DEFAULT 0,
+  summary_json TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_agent_recent ON runs(agent, date_dir DESC, file_name DESC);
+CREATE INDEX IF NOT EXISTS idx_runs_output_dir ON runs(output_dir) WHERE output_dir != '';
+CREATE INDEX IF NOT EXISTS idx_runs_session ON runs(agent, session_id) WHERE session_id != '';
+CREATE TABLE IF NOT EXISTS research_outputs (
+  output_dir TEXT PRIMARY KEY,
+  name TEXT NOT NULL,
+  mtime_ns INTEGER NOT NULL,
+  checked_mtime_ns INTEGER NOT NULL,
+  has_final_report INTEGER NOT NULL,
+  has_full_artifacts INTEGER NOT NULL,
+  custom_reports_json TEXT NOT NULL,
+  report_files_json TEXT NOT NULL,
+  missing_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_research_outputs_mtime ON research_outputs(mtime_ns DESC);
+"""
+
+
+def catalog_path(log_root: Path) -> Path:
+    return Path(log_root) / CATALOG_FILENAME
+
+
+def _stat(path: Path) -> Optional[os.stat_result]:
+    try:
+        return path.stat()
+    except OSError:
+        return None
+
+
+def _inspect_research_output(output_dir: Path) -> dict[str, Any]:
+    """research 出力ディレクトリ1件の報告書/必須成果物の有無を調べる。"""
+    reports = sorted(output_dir.glob("*_report.md"), key=lambda p: p.name)
+    final_report = output_dir / "final_report.md"
+    has_final_report = final_report.exists()
+    if reports:
+        report_files = [str(p) for p in reports]
+    else:
+        report_files = [str(final_report)] if has_final_report else []
+    required = {"final_report.md": has_final_report}
+    for name in RESEARCH_REQUIRED_FILES:
+        required[name] = (output_dir / name).exists()
+    return {
+        "has_final_report": has_final_report,
+        "has_full_artifacts": all(required[name] for name in RESEARCH_REQUIRED_FILES),
+        "custom_reports": sorted(str(p) for p in reports if p.name != "final_report.md"),
+        "report_files": report_files,
+        "missing": [name for name, present in required.items() if not present],
+    }
+
+
+class RunCatalog:
+    """実行サマリー / latest.json / research 出力の sqlite 索引。"""
+
+    def __init__(self, log_root: Path, *, workspace_root: Optional[Path] = None):
+        self.log_root = Path(log_root)
+        self.workspace_root = Path(workspace_root) if workspace_root else self.log_root.parents[1]
+        self.research_root = self.workspace_root / "_outputs" / "research"
+        self.log_root.mkdir(parents=True, exist_ok=True)
+        self.path = catalog_path(self.log_root)
+        self._con = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_S, isolation_level=None)
+        self._con.row_factory = sqlite3.Row
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.executescript(_SCHEMA)
+        self._con.execute(
+            "INSERT OR IGNORE INTO meta(key, value) VALUES('schema_version', ?)", (CATALOG_SCHEMA_VERSION,)
+        )
+        self.last_refresh: dict[str, Any] = {}
+
+    def close(self) -> None:
+        self._con.close()
+
+    def __enter__(self) -> "RunCatalog":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # 更新
+    # ------------------------------------------------------------------
+    def _begin(self) -> None:
+        self._con.execute("BEGIN IMMEDIATE")
+
+    def _rel(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.log_root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _upsert_run(self, agent: str, summary_path: Path, st: Optional[os.stat_result], summary: Optional[dict]) -> None:
+        summary = summary if isinstance(summary, dict) else None
+        data = summary or {}
+        inputs = data.get("inputs") if isinstance(data.get("inputs"), dict) else {}
+        outputs = data.get("outputs") if isinstance(data.get("outputs"), dict) else {}
+        payload = outputs.get("summary") if isinstance(outputs.get("summary"), dict) else {}
+        self._con.execute(
+            """
+            INSERT INTO runs(
+              summary_path, agent, date_dir, file_name, run_id, completed_at, final_status,
+              claimed_success, verified_success, output_dir, session_id, mtime_ns, size, summary_json
+            )
+            VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(summary_path) DO UPDATE SET
+              agent=excluded.agent, date_dir=excluded.date_dir, file_name=excluded.file_name,
+              run_id=excluded.run_id, completed_at=excluded.completed_at, final_status=excluded.final_status,
+              claimed_success=excluded.claimed_success, verified_success=excluded.verified_success,
+              output_dir=excluded.output_dir, session_id=excluded.session_id,
+              mtime_ns=excluded.mtime_ns, size=excluded.size, summary_json=excluded.summary_json
+            """,
+            (
+                self._rel(summary_path),
+                agent,
+                summary_path.parent.name,
+                summary_path.name,
+                str(data.get("run_id", "")),
+                str(data.get("completed_at", "")),
+                str(data.get("final_status", "")),
+                1 if data.get("claimed_success") else 0,
+                1 if data.get("verified_success") else 0,
+                str(inputs.get("output_dir", "") or ""),
+                str(payload.get("session_id", "") or ""),
+                st.st_mtime_ns if st else 0,
+                st.st_size if st else 0,
+                json.dumps(summary, ensure_ascii=False, default=str) if summary is not None else None,
+            ),
+        )
+
+    def _upsert_agent(self, agent: str, latest_path: Path, st: Optional[os.stat_result]) -> None:
+        latest_json = None
+        if st is not None:
+            try:
+                latest_json = json.dumps(json.loads(latest_path.read_text(encoding="utf-8")), ensure_ascii=False)
+            except (OSError, ValueError):
+                latest_json = None
+        self._con.execute(
+            """
+            INSERT INTO agents(agent, latest_json, latest_mtime_ns) VALUES(?, ?, ?)
+            ON CONFLICT(agent) DO UPDATE SET latest_json=excluded.latest_json, latest_mtime_ns=excluded.latest_mtime_ns
+            """,
+            (agent, latest_json, st.st_mtime_ns if st else 0),
+        )
+
+    def record_summary(self, summary_path: Path, summary: dict[str, Any]) -> None:
+        """finalize 直後の実行を登録する（ディレクトリ走査なし）。"""
+        summary_path = Path(summary_path)
+        agent = summary_path.parent.parent.name
+        self._begin()
+        try:
+            self._upsert_run(agent, summary_path, _stat(summary_path), summary)
+            latest_path = self.log_root / agent / "latest.json"
+            self._upsert_agent(agent, latest_path, _stat(latest_path))
+            # 日付ディレクトリは未走査扱い（次の refresh で stat だけ確認し、消えていれば行を掃除する）
+            self._con.execute(
+                "INSERT INTO dirs(path, mtime_ns) VALUES(?, 0) ON CONFLICT(path) DO UPDATE SET mtime_ns=0",
+                (self._rel(summary_path.parent),),
+            )
+            self._con.execute("COMMIT")
+        except BaseException:
+            self._con.execute("ROLLBACK")
+            raise
+
+    def _is_racy(self, st: os.stat_result) -> bool:
+        return self._refresh_started_ns - st.st_mtime_ns < RACY_WINDOW_NS
+
+    def _scan_date_dir(self, agent: str, date_dir: Path) -> bool:
+        """日付ディレクトリ内の変化したサマリーだけを読み直す。全件読めたら True。"""
+        known = {
+            r["file_name"]: (r["mtime_ns"], r["size"], r["summary_json"] is not None)
+            for r in self._con.execute(
+                "SELECT file_name, mtime_ns, size, summary_json FROM runs WHERE agent=? AND date_dir=?",
+                (agent, date_dir.name),
+            )
+        }
+        complete = True
+        present = set()
+        for path in date_dir.glob("*_summary.json"):
+            st = _stat(path)
+            if st is None:
+                continue
+            present.add(path.name)
+            prev = known.get(path.name)
+            if prev and prev[0] == st.st_mtime_ns and prev[1] == st.st_size and prev[2]:
+                continue
+            try:
+                summary = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                summary = None
+                complete = False  # 書き込み途中の可能性: 次回も読み直す
+            self._upsert_run(agent, path, st, summary)
+            self.last_refresh["summaries_read"] += 1
+        for name in set(known) - present:
+            self._con.execute(
+                "DELETE FROM runs WHERE agent=? AND date_dir=? AND file_name=?", (agent, date_dir.name, name)
+            )
+        return complete
+
+    def _refresh_logs(self, dirs: dict[str, int]) -> None:
+        seen_agents: set[str] = set()
+        seen_dirs: set[str] = set()
+        known_agents = {
+            r["agent"]: r["latest_mtime_ns"] for r in self._con.execute("SELECT agent, latest_mtime_ns FROM agents")
+        }
+        for agent_dir in self.log_root.iterdir():
+            if not agent_dir.is_dir():
+                continue
+            agent = agent_dir.name
+            seen_agents.add(agent)
+            latest_path = agent_dir / "latest.json"
+            st = _stat(latest_path)
+            if known_agents.get(agent, -1) != (st.st_mtime_ns if st else 0) or (st and self._is_racy(st)):
+                self._upsert_agent(agent, latest_path, st)
+            for date_dir in agent_dir.iterdir():
+                if not date_dir.is_dir():
+                    continue
+                key = self._rel(date_dir)
+                seen_dirs.add(key)
+                dst = _stat(date_dir)
+                if dst is None or dirs.get(key) == dst.st_mtime_ns:
+                    continue
+                self.last_refresh["dirs_scanned"] += 1
+                complete = self._scan_date_dir(agent, date_dir)
+                # 読めなかったファイルがある / 直近に更新された場合は mtime=0 で記録し、次回も走査する
+                mtime_ns = dst.st_mtime_ns if complete and not self._is_racy(dst) else 0
+                self._con.execute(
+                    "INSERT INTO dirs(path, mtime_ns) VALUES(?, ?)"
+                    " ON CONFLICT(path) DO UPDATE SET mtime_ns=excluded.mtime_ns",
+                    (key, mtime_ns),
+                )
+
+        for agent in set(known_agents) - seen_agents:
+            self._con.execute("DELETE FROM agents WHERE agent=?", (agent,))
+            self._con.execute("DELETE FROM runs WHERE agent=?", (agent,))
+        for key in set(dirs) - seen_dirs:
+            agent, _, date_name = key.partition("/")
+            self._con.execute("DELETE FROM runs WHERE agent=? AND date_dir=?", (agent, date_name))
+            self._con.execute("DELETE FROM dirs WHERE path=?", (key,))
+
+    def _refresh_research_outputs(self) -> None:
+        known = {
+            r["output_dir"]: r["checked_mtime_ns"]
+            for r in self._con.execute("SELECT output_dir, checked_mtime_ns FROM research_outputs")
+        }
+        seen: set[str] = set()
+        if self.research_root.exists():
+            for output_dir in self.research_root.iterdir():
+                if not output_dir.is_dir():
+                    continue
+                st = _stat(output_dir)
+                if st is None:
+                    continue
+                key = str(output_dir)
+                seen.add(key)
+                if known.get(key) == st.st_mtime_ns:
+                    continue
+                # 直近に更新されたディレクトリは checked_mtime_ns=0 で記録し、次回も読み直す
+                checked_mtime_ns = 0 if self._is_racy(st) else st.st_mtime_ns
+                info = _inspect_research_output(output_dir)
+                self.last_refresh["research_outputs_read"] += 1
+                self._con.execute(
+                    """
+                    INSERT INTO research_outputs(
+                      output_dir, name, mtime_ns, checked_mtime_ns, has_final_report, has_full_artifacts,
+                      custom_reports_json, report_files_json, missing_json
+                    )
+                    VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(output_dir) DO UPDATE SET
+                      name=excluded.name, mtime_ns=excluded.mtime_ns, checked_mtime_ns=excluded.checked_mtime_ns,
+                      has_final_report=excluded.has_final_report,
+                      has_full_artifacts=excluded.has_full_artifacts, custom_reports_json=excluded.custom_reports_json,
+                      report_files_json=excluded.report_files_json, missing_json=excluded.missing_json
+                    """,
+                    (
+                        key,
+                        output_dir.name,
+                        st.st_mtime_ns,
+                        checked_mtime_ns,
+                        int(info["has_final_report"]),
+                        int(info["has_full_artifacts"]),
+                        json.dumps(info["custom_reports"], ensure_ascii=False),
+                        json.dumps(info["report_files"], ensure_ascii=False),
+                        json.dumps(info["missing"], ensure_ascii=False),
+                    ),
+                )
+        for key in set(known) - seen:
+            self._con.execute("DELETE FROM research_outputs WHERE output_dir=?", (key,))
+
+    def refresh(self) -> dict[str, Any]:
+        """mtime が変わった箇所だけを取り込む。"""
+        start = time.perf_counter()
+        self._refresh_started_ns = time.time_ns()
+        self.last_refresh = {"dirs_scanned": 0, "summaries_read": 0, "research_outputs_read": 0}
+        self._begin()
+        try:
+            dirs = {r["path"]: r["mtime_ns"] for r in self._con.execute("SELECT path, mtime_ns FROM dirs")}
+            self._refresh_logs(dirs)
+            self._refresh_research_outputs()
+            self._con.execute("COMMIT")
+        except BaseException:
+            self._con.execute("ROLLBACK")
+            raise
+        self.last_refresh["elapsed_ms"] = round((time.perf_counter() - start) * 1000.0, 3)
+        return self.last_refresh
+
+    def rebuild(self) -> dict[str, Any]:
+        """索引を空にして全件走査し直す。"""
+        self._begin()
+        try:
+            for table in ("dirs", "agents", "runs", "research_outputs"):
+                self._con.execute(f"DELETE FROM {table}")
+            self._con.execute("COMMIT")
+        except BaseException:
+            self._con.execute("ROLLBACK")
+            raise
+        stats = self.refresh()
+        stats["runs"] = self._con.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        return stats
+
+    # ------------------------------------------------------------------
+    # 検索
+    # ------------------------------------------------------------------
+    def agents(self) -> list[dict[str, Any]]:
+        rows = self._con.execute("SELECT agent, latest_json FROM agents ORDER BY agent").fetchall()
+        return [{"agent": r["agent"], "latest": json.loads(r["latest_json"]) if r["latest_json"] else {}} for r in rows]
+
+    def latest(self, agent: str) -> dict[str, Any]:
+        row = self._con.execute("SELECT latest_json FROM agents WHERE agent=?", (agent,)).fetchone()
+        return json.loads(row["latest_json"]) if row and row["latest_json"] else {}
+
+    def recent_summaries(self, agent: str, last_n: int) -> list[dict[str, Any]]:
+        rows = self._con.execute(
+            """
+            SELECT summary_json FROM runs
+            WHERE agent=? AND summary_json IS NOT NULL
+            ORDER BY date_dir DESC, file_name DESC
+            LIMIT ?
+            """,
+            (agent, max(0, int(last_n))),
+        ).fetchall()
+        return [json.loads(r["summary_json"]) for r in rows]
+
+    def claim_mismatches(self, last_n: int) -> list[dict[str, Any]]:
+        out: list[dict[str, Any]] = []
+        for agent_row in self._con.execute("SELECT agent FROM agents ORDER BY agent").fetchall():
+            rows = self._con.execute(
+                """
+                SELECT * FROM (
+                  SELECT run_id, completed_at, claimed_success, verified_success, summary_json
+                  FROM runs
+                  WHERE agent=? AND summary_json IS NOT NULL
+                  ORDER BY date_dir DESC, file_name DESC
+                  LIMIT ?
+                )
+                WHERE claimed_success=1 AND verified_success=0
+                """,
+                (agent_row["agent"], max(0, int(last_n))),
+            ).fetchall()
+            for r in rows:
+                summary = json.loads(r["summary_json"])
+                out.append(
+                    {
+                        "agent": agent_row["agent"],
+                        "run_id": summary.get("run_id", ""),
+                        "completed_at": summary.get("completed_at", ""),
+                        "log_path": summary.get("log_path", ""),
+                        "summary_path": summary.get("summary_path", ""),
+                        "evidence_refs": summary.get("evidence_refs", []),
+                    }
+                )
+        return out
+
+    def research_summary_for(self, output_dir: Path) -> Optional[dict[str, Any]]:
+        """output_dir を入力に持つ、または session_id が名前の末尾に一致する最新の research 実行。"""
+        row = self._con.execute(
+            """
+            SELECT summary_json FROM runs
+            WHERE agent='research' AND summary_json IS NOT NULL
+              AND (output_dir=? OR (session_id != '' AND substr(?, -length(session_id)) = session_id))
+            ORDER BY date_dir DESC, file_name DESC
+            LIMIT 1
+            """,
+            (str(output_dir), Path(output_dir).name),
+        ).fetchone()
+        return json.loads(row["summary_json"]) if row else None
+
+    def latest_research_output(self) -> Optional[dict[str, Any]]:
+        row = self._con.execute("SELECT * FROM research_outputs ORDER BY mtime_ns DESC LIMIT 1").fetchone()
+        return self._research_row(row) if row else None
+
+    def research_outputs(self) -> list[dict[str, Any]]:
+        rows = self._con.execute("SELECT * FROM research_outputs ORDER BY name").fetchall()
+        return [self._research_row(r) for r in rows]
+
+    @staticmethod
+    def _research_row(row: sqlite3.Row) -> dict[str, Any]:
+        return {
+            "output_dir": row["output_dir"],
+            "name": row["name"],
+            "has_final_report": bool(row["has_final_report"]),
+            "has_full_artifacts": bool(row["has_full_artifacts"]),
+            "custom_report_files": json.loads(row["custom_reports_json"]),
+            "report_files": json.loads(row["report_files_json"]),
+            "missing_required": json.loads(row["missing_json"]),
+        }
+
+    def counts(self) -> dict[str, int]:
+        return {
+            table: int(self._con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+            for table in ("agents", "runs", "research_outputs")
+        }
+
+
+def record_run_completion(log_root: Path, summary_path: Path, summary: dict[str, Any]) -> None:
+    """WorkflowLogger.finalize() から呼ぶ登録フック（失敗しても呼び出し側は止めない）。"""
+    with RunCatalog(log_root) as catalog:
+        catalog.record_summary(summary_path, summary)
@@ -6,17 +6,24 @@
 - JSONL 1行1イベントで追跡可能性(run_id/trace_id/span/event_seq)を担保
 - フェーズ/ツール/検証/主張(CLAIM)を分離して記録
 - 長い本文は artifact 化し、イベントには参照情報のみ残す
+- 記録は専用スレッドでまとめて直列化・書き込みし、呼び出し側は採番とキュー投入のみ行う
+  （フェーズ終了・例外・インタプリタ終了時にフラッシュ）
 """
 
 from __future__ import annotations
 
+import atexit
+import collections
+import functools
 import hashlib
 import json
 import os
 import re
 import sys
 import threading
+import time
 import uuid
+import weakref
 from dataclasses import asdict, is_dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -25,6 +32,9 @@ from typing import Any, Optional
 SCHEMA_VERSION = "1.0"
 WORKSPACE_ROOT = Path(__file__).resolve().parents[2]
 
+# キューが満杯のときの扱い: block=空くまで待つ（欠落なし） / drop_stream=STREAM_OUTPUT を捨てる
+OVERFLOW_POLICIES = ("block", "drop_stream")
+
 _REDACTED = "***REDACTED***"
 _SECRET_KEY_PATTERN = re.compile(
     r"(password|passwd|passphrase|token|api[_-]?key|secret|authorization|cookie|credential|bearer)",
@@ -37,6 +47,13 @@ _SECRET_VALUE_PATTERNS = [
     re.compile(r"\bgh[pousr]_[A-Za-z0-9_]{20,}\b"),
     re.compile(r"(?i)\bbearer\s+[A-Za-z0-9\-._~+/]+=*"),
 ]
+# 大半の行は秘密を含まないので、まず1回の検索で置換が必要かを判定する
+_SECRET_VALUE_ANY = re.compile(
+    "|".join(
+        f"(?i:{p.pattern[4:]})" if p.pattern.startswith("(?i)") else f"(?:{p.pattern})"
+        for p in _SECRET_VALUE_PATTERNS
+    )
+)
 
 
 def _now_utc() -> datetime:
@@ -81,7 +98,22 @@ def _json_dumps(value: Any, *, indent: Optional[int] = None) -> str:
     return json.dumps(value, ensure_ascii=False, default=_json_default, indent=indent)
 
 
+def _snapshot_value(value: Any) -> Any:
+    """emit 時点の値を固定する（入れ子のコンテナは複製、JSON 以外の値は _json_default で変換）。"""
+    if value is None or isinstance(value, (str, bytes, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {k: _snapshot_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_snapshot_value(v) for v in value]
+    if isinstance(value, bytearray):
+        return bytes(value)
+    return _snapshot_value(_json_default(value))
+
+
 def _redact_text(text: str) -> str:
+    if not _SECRET_VALUE_ANY.search(text):
+        return text
     redacted = text
     for pattern in _SECRET_VALUE_PATTERNS:
         redacted = pattern.sub(_REDACTED, redacted)
@@ -109,6 +141,144 @@ def redact_data(value: Any, *, key_hint: str = "") -> Any:
     return value
 
 
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() not in {"0", "false", "off", "no"}
+
+
+def _record_in_catalog(log_root: Path, summary_path: Path, summary: dict[str, Any]) -> None:
+    """完了した実行を run_catalog に登録する。索引は refresh() で後から追いつけるので失敗は無視する。"""
+    try:
+        from run_catalog import record_run_completion
+
+        record_run_completion(log_root, summary_path, summary)
+    except Exception:
+        pass
+
+
+class _AsyncEventWriter:
+    """イベントをキューに積み、専用スレッドで batch_size 件ずつ書き込む。
+
+    最初のイベントが積まれてから flush_interval 秒以内には必ず書き込む（遅延の上限）。
+    """
+
+    def __init__(
+        self,
+        write_batch: Any,
+        *,
+        max_queue: int,
+        batch_size: int,
+        flush_interval: float,
+        overflow: str,
+        name: str,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}: {overflow!r}")
+        self._write_batch = write_batch
+        self.max_queue = max(1, int(max_queue))
+        self.batch_size = max(1, min(int(batch_size), self.max_queue))
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.overflow = overflow
+
+        self._queue: collections.deque = collections.deque()
+        self._cond = threading.Condition()
+        self._pending = 0  # キュー内 + 書き込み中
+        self._flush_waiters = 0
+        self._closed = False
+
+        self.batches = 0
+        self.events_written = 0
+        self.dropped_events = 0
+        self.write_errors = 0
+        self.max_queue_depth = 0
+
+        self._thread = threading.Thread(target=self._run, name=f"workflow_logger:{name}", daemon=True)
+        self._thread.start()
+
+    def is_full(self) -> bool:
+        return len(self._queue) >= self.max_queue
+
+    def wait_for_space(self) -> None:
+        with self._cond:
+            while len(self._queue) >= self.max_queue and not self._closed:
+                self._cond.wait(0.05)
+
+    def put(self, record: tuple) -> None:
+        with self._cond:
+            self._queue.append(record)
+            self._pending += 1
+            depth = len(self._queue)
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+            if depth == 1 or depth >= self.batch_size:
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """積まれたイベントがファイルへ書き出されるまで待つ。"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                while self._pending and self._thread.is_alive():
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining if remaining is not None else 0.1)
+            finally:
+                self._flush_waiters -= 1
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "mode": "async",
+            "overflow": self.overflow,
+            "batches": self.batches,
+            "events_written": self.events_written,
+            "dropped_events": self.dropped_events,
+            "write_errors": self.write_errors,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._queue) < self.batch_size and not (self._flush_waiters or self._closed):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.batch_size))]
+                self._cond.notify_all()
+            try:
+                self._write_batch(batch)
+                self.events_written += len(batch)
+            except Exception as exc:  # 書き込み失敗でワークフロー本体を止めない
+                self.write_errors += 1
+                print(f"[workflow_logger] write failed: {type(exc).__name__}: {exc}", file=sys.__stderr__)
+            with self._cond:
+                self.batches += 1
+                self._pending -= len(batch)
+                self._cond.notify_all()
+
+
+def _flush_logger_at_exit(ref: "weakref.ref[WorkflowLogger]") -> None:
+    logger = ref()
+    if logger is not None:
+        logger._flush_at_exit()
+
+
 class _TeeStream:
     """stdout/stderr を透過しつつ1行単位でイベント化する。"""
 
@@ -202,6 +372,7 @@ class PhaseScope:
             span_id=self._span_id,
             parent_span_id=self._parent_span_id,
         )
+        self._logger.flush()
         return False
 
     def set_input(self, key: str, value: Any) -> None:
@@ -230,6 +401,11 @@ class WorkflowLogger:
         max_stream_events: int = 4000,
         max_inline_chars: int = 2000,
         max_inline_json_chars: int = 8000,
+        async_write: Optional[bool] = None,
+        overflow: Optional[str] = None,
+        max_queue: int = 10000,
+        batch_size: int = 256,
+        flush_interval_ms: int = 200,
     ):
         self.workspace_root = (workspace_root or WORKSPACE_ROOT).resolve()
         self.agent = _safe_name(agent)
@@ -240,6 +416,9 @@ class WorkflowLogger:
 
         self._lock = threading.RLock()
         self._event_seq = 0
+        self._serializing_thread: Optional[int] = None
+        self._inline_records: list[tuple] = []
+        self._serialize_errors = 0
         self._span_seq = 0
         self._phase_records: list[dict[str, Any]] = []
         self._verification_runs: list[dict[str, Any]] = []
@@ -274,6 +453,22 @@ class WorkflowLogger:
         self.artifacts_dir.mkdir(parents=True, exist_ok=True)
         self._fp = self.log_path.open("a", encoding="utf-8")
 
+        self.async_write = (
+            async_write if async_write is not None else _env_flag("WORKFLOW_LOG_ASYNC", "1")
+        )
+        self._writer: Optional[_AsyncEventWriter] = None
+        if self.async_write:
+            self._writer = _AsyncEventWriter(
+                self._write_records,
+                max_queue=max_queue,
+                batch_size=batch_size,
+                flush_interval=flush_interval_ms / 1000.0,
+                overflow=overflow or os.getenv("WORKFLOW_LOG_OVERFLOW", "block").strip().lower(),
+                name=self.run_id,
+            )
+            self._atexit_hook = functools.partial(_flush_logger_at_exit, weakref.ref(self))
+            atexit.register(self._atexit_hook)
+
         env_capture = os.getenv("WORKFLOW_LOG_CAPTURE_STREAMS", "1").strip().lower()
         self.capture_streams = (
             capture_streams
@@ -408,27 +603,102 @@ class WorkflowLogger:
         span_id: Optional[str] = None,
         parent_span_id: Optional[str] = None,
     ) -> None:
+        """採番してキューに積む（redact/artifact化/直列化は書き込み側で行う）。
+
+        非同期書き込みでは payload を emit 時点で複製するので、呼び出し側が後で書き換えても記録は変わらない。
+        """
+        writer = self._writer
+        serializing = self._serializing_thread == threading.get_ident()
+        if writer is None or serializing:
+            snapshot = dict(payload or {})
+        else:
+            try:
+                snapshot = _snapshot_value(payload or {})
+            except Exception as exc:  # 循環参照など。イベント自体は残す
+                snapshot = {"error": f"payload snapshot failed: {type(exc).__name__}: {exc}"}
+        if writer is not None and not serializing and writer.is_full():
+            if writer.overflow == "drop_stream" and event_type == "STREAM_OUTPUT":
+                writer.dropped_events += 1
+                return
+            writer.wait_for_space()
+
         with self._lock:
             self._event_seq += 1
-            prepared_payload = {}
-            for key, value in (payload or {}).items():
-                prepared_payload[key] = self._prepare_value(key, value)
+            record = (
+                self._event_seq,
+                time.time(),
+                event_type,
+                snapshot,
+                span_id or "",
+                parent_span_id or "",
+            )
+            if serializing:
+                # 直列化中に発生した ARTIFACT_WRITTEN は元イベントの直前に書く
+                self._inline_records.append(record)
+            elif writer is not None:
+                writer.put(record)
+            else:
+                self._write_records([record])
+
+    def _serialize_record(self, record: tuple) -> str:
+        seq, ts, event_type, payload, span_id, parent_span_id = record
+        prepared_payload = {}
+        for key, value in payload.items():
+            prepared_payload[key] = self._prepare_value(key, value)
+        return self._event_line(record, prepared_payload)
+
+    def _event_line(self, record: tuple, prepared_payload: dict[str, Any]) -> str:
+        seq, ts, event_type, _payload, span_id, parent_span_id = record
+        event = {
+            "schema_version": SCHEMA_VERSION,
+            "ts": _iso(datetime.fromtimestamp(ts, timezone.utc)),
+            "event_seq": seq,
+            "event_type": event_type,
+            "run_id": self.run_id,
+            "trace_id": self.trace_id,
+            "span_id": span_id,
+            "parent_span_id": parent_span_id,
+            "agent": self.agent,
+            "workflow": self.workflow,
+            "payload": prepared_payload,
+        }
+        return _json_dumps(event) + "\n"
 
-            event = {
-                "schema_version": SCHEMA_VERSION,
-                "ts": _iso(),
-                "event_seq": self._event_seq,
-                "event_type": event_type,
-                "run_id": self.run_id,
-                "trace_id": self.trace_id,
-                "span_id": span_id or "",
-                "parent_span_id": parent_span_id or "",
-                "agent": self.agent,
-                "workflow": self.workflow,
-                "payload": prepared_payload,
-            }
-            self._fp.write(_json_dumps(event) + "\n")
-            self._fp.flush()
+    def _serialize_with_inline(self, record: tuple, lines: list[str]) -> None:
+        outer = self._inline_records
+        self._inline_records = []
+        try:
+            line = self._serialize_record(record)
+            for nested in self._inline_records:
+                self._serialize_with_inline(nested, lines)
+        finally:
+            self._inline_records = outer
+        lines.append(line)
+
+    def _write_records(self, records: list[tuple]) -> None:
+        self._serializing_thread = threading.get_ident()
+        try:
+            lines: list[str] = []
+            for record in records:
+                try:
+                    self._serialize_with_inline(record, lines)
+                except Exception as exc:  # 1件の直列化失敗でバッチ全体を失わない
+                    self._serialize_errors += 1
+                    error = f"serialize failed: {type(exc).__name__}: {exc}"
+                    lines.append(self._event_line(record, {"error": error}))
+        finally:
+            self._serializing_thread = None
+        self._fp.write("".join(lines))
+        self._fp.flush()
+
+    def _flush_at_exit(self) -> None:
+        """finalize されずに終了する場合も、積まれたイベントは書き出す。"""
+        if self._closed or self._writer is None:
+            return
+        self._writer.flush(timeout=5.0)
+        self._writer.close(timeout=5.0)
+        self._writer = None  # 以降の記録は同期書き込み
+        self._fp.flush()
 
     def _start_stream_capture(self) -> None:
         if self._stdout_original is not None:
@@ -478,6 +748,17 @@ class WorkflowLogger:
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """キュー内のイベントをファイルへ書き出すまで待つ。"""
+        if self._closed or self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def writer_stats(self) -> dict[str, Any]:
+        if self._writer is None:
+            return {"mode": "sync", "serialize_errors": self._serialize_errors}
+        return {**self._writer.stats(), "serialize_errors": self._serialize_errors}
+
     def phase(self, phase_name: str, *, parent_span_id: Optional[str] = None) -> PhaseScope:
         return PhaseScope(
             logger=self,
@@ -651,6 +932,7 @@ class WorkflowLogger:
             "outputs": self._run_outputs,
             "metrics": self._run_metrics,
             "stream_events": min(self._stream_event_count, self.max_stream_events),
+            "event_writer": self.writer_stats(),
         }
         return summary
 
@@ -674,7 +956,12 @@ class WorkflowLogger:
             )
 
         self._emit("RUN_SUMMARY", payload=summary, span_id=self._next_span_id())
+        if self._writer is not None:
+            self._writer.flush()
+            self._writer.close()
+            atexit.unregister(self._atexit_hook)
         summary["total_events"] = self._event_seq
+        summary["event_writer"] = self.writer_stats()
 
         self.summary_path.write_text(_json_dumps(summary, indent=2), encoding="utf-8")
         latest_payload = {
@@ -690,6 +977,8 @@ class WorkflowLogger:
         }
         latest_path = self.agent_log_root / "latest.json"
         latest_path.write_text(_json_dumps(latest_payload, indent=2), encoding="utf-8")
+        if _env_flag("WORKFLOW_LOG_CATALOG", "1"):
+            _record_in_catalog(self.log_root, self.summary_path, summary)
 
         self._fp.flush()
         self._fp.close()
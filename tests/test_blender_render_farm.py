@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""レンダファーム / 修正候補の並列探索 テスト
+
+偽の Blender 実行ファイルで --python-expr のシャード描画を実行し、
+render_farm.RenderFarm の出力とワーカー別統計、CandidateSearch の選択を検証する。
+"""
+
+import json
+import os
+import stat
+import sys
+import textwrap
+import threading
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+BRIDGE_DIR = Path(__file__).resolve().parent.parent / "tools" / "blender_bridge"
+sys.path.insert(0, str(BRIDGE_DIR))
+sys.path.insert(0, str(BRIDGE_DIR / "scripts"))
+
+from blender_cli import BlenderCLI, BlenderCLIError
+from render_farm import CandidateSearch, RenderFarm, candidate_prefix, repair_candidates, shard_views
+
+FAKE_BLENDER = textwrap.dedent('''\
+    #!{python}
+    import sys, types
+    from pathlib import Path
+
+    class _Render:
+        filepath = ""
+        engine = "CYCLES"
+        threads_mode = "AUTO"
+        threads = 0
+        image_settings = types.SimpleNamespace(file_format="")
+
+    scene = types.SimpleNamespace(render=_Render(), camera=None, cycles=types.SimpleNamespace(device=""))
+    cam = types.SimpleNamespace(name="AG_Camera", location=(0, 0, 0), rotation_euler=(0, 0, 0))
+
+    def _render(write_still=False):
+        if "fail" in scene.render.filepath:
+            raise RuntimeError("render failed")
+        Path(scene.render.filepath).write_text(
+            f"{{list(cam.location)}} threads={{scene.render.threads}}", encoding="utf-8"
+        )
+
+    bpy = types.ModuleType("bpy")
+    bpy.context = types.SimpleNamespace(scene=scene)
+    bpy.data = types.SimpleNamespace(objects={{"AG_Camera": cam}})
+    bpy.ops = types.SimpleNamespace(render=types.SimpleNamespace(render=_render))
+    sys.modules["bpy"] = bpy
+
+    args = sys.argv[1:]
+    try:
+        exec(args[args.index("--python-expr") + 1], {{"__name__": "__main__"}})
+    except Exception as e:
+        print("Error:", e, flush=True)
+        sys.exit(1)
+''')
+
+
+@pytest.fixture
+def fake_cli(tmp_path):
+    if os.name == "nt":
+        pytest.skip("偽Blenderは shebang 実行を前提とする")
+    exe = tmp_path / "fake_blender"
+    exe.write_text(FAKE_BLENDER.format(python=sys.executable), encoding="utf-8")
+    exe.chmod(exe.stat().st_mode | stat.S_IEXEC)
+    return BlenderCLI(str(exe))
+
+
+def _write_plan(tmp_path: Path, names, tag="iter_00") -> Path:
+    plan = {
+        "blend": str(tmp_path / f"{tag}.blend"),
+        "camera": "AG_Camera",
+        "views": [
+            {
+                "name": name,
+                "filepath": str(tmp_path / f"{tag}_{name}.png"),
+                "location": [float(i), 0.0, 1.0],
+                "rotation_euler": [0.0, 0.0, 0.0],
+            }
+            for i, name in enumerate(names)
+        ],
+    }
+    path = tmp_path / f"{tag}_render_plan.json"
+    path.write_text(json.dumps(plan), encoding="utf-8")
+    return path
+
+
+def test_shard_views_round_robin():
+    views = [{"name": str(i)} for i in range(5)]
+    shards = shard_views(views, 2)
+    assert [[v["name"] for v in s] for s in shards] == [["0", "2", "4"], ["1", "3"]]
+    assert len(shard_views(views[:1], 4)) == 1
+
+
+def test_render_plan_shards_across_workers(fake_cli, tmp_path):
+    names = ["front", "side", "oblique", "bird", "back"]
+    plan = _write_plan(tmp_path, names)
+    with RenderFarm(fake_cli, workers=2, threads_per_worker=3) as farm:
+        outputs = farm.render_plan(plan)
+        stats = farm.stats()
+
+    assert set(outputs) == set(names)
+    assert Path(outputs["side"]).read_text(encoding="utf-8") == "[1.0, 0.0, 1.0] threads=3"
+    assert stats["plans"] == 1 and stats["threads_per_worker"] == 3
+    assert sum(w["views"] for w in stats["per_worker"]) == 5
+    assert sum(w["shards"] for w in stats["per_worker"]) == 2
+    assert all(w["render_sec"] > 0 for w in stats["per_worker"] if w["shards"])
+    if sys.platform != "win32":
+        assert all(w["peak_rss_mb"] and w["peak_rss_mb"] > 1 for w in stats["per_worker"] if w["shards"])
+    assert (tmp_path / "iter_00_render_plan_shard0.log").exists()
+
+
+def test_render_plan_raises_on_worker_failure(fake_cli, tmp_path):
+    plan = _write_plan(tmp_path, ["front", "fail"])
+    with RenderFarm(fake_cli, workers=2) as farm:
+        with pytest.raises(BlenderCLIError) as excinfo:
+            farm.render_plan(plan)
+    assert "render failed" in excinfo.value.stdout
+
+
+def test_repair_candidates_full_then_subsets():
+    def apply_fn(spec, actions):
+        out = dict(spec)
+        applied = []
+        for a in actions:
+            if a["key"] in out:
+                continue
+            out[a["key"]] = a["value"]
+            applied.append(a["key"])
+        return out, applied
+
+    actions = [{"key": "a", "value": 1}, {"key": "b", "value": 2}, {"key": "c", "value": 3}]
+    one = repair_candidates({}, actions, apply_fn, 1)
+    assert one == [({"a": 1, "b": 2, "c": 3}, ["a", "b", "c"])]
+
+    many = repair_candidates({}, actions, apply_fn, 10)
+    assert [applied for _, applied in many] == [
+        ["a", "b", "c"], ["b", "c"], ["a", "c"], ["a", "b"], ["a"], ["b"], ["c"],
+    ]
+    assert repair_candidates({"a": 0}, actions[:1], apply_fn, 3) == []
+
+
+def test_candidate_search_picks_best_and_tolerates_failures():
+    primary, cold = object(), object()
+    seen = []
+    lock = threading.Lock()
+
+    def evaluate(runner, spec, prefix):
+        with lock:
+            seen.append((prefix, runner))
+        time.sleep(0.05)
+        if spec.get("broken"):
+            raise BlenderCLIError("build failed")
+        return {"prefix": prefix, "score": spec["score"], "pass": False}
+
+    candidates = [({"score": 60}, ["x"]), ({"score": 90}, ["y"]), ({"broken": True}, ["z"])]
+    start = time.perf_counter()
+    best, spec, applied = CandidateSearch(primary, cold).evaluate(1, candidates, evaluate)
+    assert time.perf_counter() - start < 0.14  # 並列に評価される
+
+    assert (best["prefix"], spec, applied) == ("iter_01_c1", {"score": 90}, ["y"])
+    assert best["selected_candidate"] == 1
+    assert [c.get("score") for c in best["candidates"]] == [60, 90, None]
+    assert "build failed" in best["candidates"][2]["error"]
+    assert dict(seen)[candidate_prefix(1, 0)] is primary
+    assert dict(seen)["iter_01_c2"] is cold
+
+    with pytest.raises(BlenderCLIError):
+        CandidateSearch(primary, cold).evaluate(0, [candidates[2], candidates[2]], evaluate)
+
+
+def test_still_renderer_records_plan(tmp_path, monkeypatch):
+    rendered = []
+    scene = types.SimpleNamespace(render=types.SimpleNamespace(filepath=""))
+    bpy = types.ModuleType("bpy")
+    bpy.context = types.SimpleNamespace(scene=scene)
+    bpy.ops = types.SimpleNamespace(
+        render=types.SimpleNamespace(render=lambda write_still=False: rendered.append(scene.render.filepath))
+    )
+    bpy.types = types.SimpleNamespace(Object=object)
+    monkeypatch.setitem(sys.modules, "bpy", bpy)
+    monkeypatch.delitem(sys.modules, "render_plan", raising=False)
+    from render_plan import StillRenderer
+
+    cam = types.SimpleNamespace(name="Cam", location=(1, 2, 3), rotation_euler=(0.5, 0, 0))
+    StillRenderer().render("front", cam, tmp_path / "a.png")
+    assert rendered == [str(tmp_path / "a.png")]
+
+    plan_path = tmp_path / "plan.json"
+    deferred = StillRenderer(str(plan_path))
+    deferred.render("front", cam, tmp_path / "b.png")
+    deferred.write(tmp_path / "x.blend")
+    assert rendered == [str(tmp_path / "a.png")]
+    plan = json.loads(plan_path.read_text(encoding="utf-8"))
+    assert plan["camera"] == "Cam" and plan["blend"] == str(tmp_path / "x.blend")
+    assert plan["views"] == [
+        {"name": "front", "filepath": str(tmp_path / "b.png"), "location": [1.0, 2.0, 3.0], "rotation_euler": [0.5, 0.0, 0.0]}
+    ]
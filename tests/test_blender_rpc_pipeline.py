@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""Antigravity Bridge RPC パイプライン/バッチ テスト
+
+bpy をスタブに差し替えて rpc_server を Blender 外で起動し、
+RpcClient.pipeline / batch と rpc_benchmark を検証する。
+"""
+
+import copy
+import socket
+import sys
+import threading
+import types
+from pathlib import Path
+
+import pytest
+
+BRIDGE_DIR = Path(__file__).resolve().parent.parent / "tools" / "blender_bridge"
+sys.path.insert(0, str(BRIDGE_DIR))
+
+from ag_rpc_client import RpcClient, RpcError, _LineReader
+from rpc_benchmark import run_benchmark
+
+
+class _Obj:
+    def __init__(self, name):
+        self.name = name
+        self.type = "MESH"
+        self.location = (0.0, 0.0, 0.0)
+        self.rotation_euler = (0.0, 0.0, 0.0)
+        self.scale = (1.0, 1.0, 1.0)
+        self.dimensions = (1.0, 1.0, 1.0)
+        self.data = types.SimpleNamespace(materials=[])
+
+
+class _Mat:
+    def __init__(self, name):
+        self.name = name
+        self.diffuse_color = (0.8, 0.8, 0.8, 1.0)
+        self.node_tree = types.SimpleNamespace(nodes={})
+
+
+class _Collection(dict):
+    def remove(self, item, do_unlink=True):
+        self.pop(item.name, None)
+
+    def new(self, name):
+        self[name] = _Mat(name)
+        return self[name]
+
+    def __iter__(self):
+        return iter(list(self.values()))
+
+
+def _make_bpy():
+    """rpc_server が使う範囲だけを持つ bpy スタブ（undo はスナップショット）"""
+    bpy = types.ModuleType("bpy")
+    data = types.SimpleNamespace(objects=_Collection(), materials=_Collection())
+    context = types.SimpleNamespace(active_object=None)
+    undo_stack = [({}, {})]  # Blender の初期ステップ（Original）
+    undo_log = []
+
+    def _cube_add(size=2.0, location=(0, 0, 0)):
+        name = "Cube" if "Cube" not in data.objects else f"Cube.{len(data.objects):03d}"
+        obj = _Obj(name)
+        obj.location = tuple(location)
+        data.objects[name] = obj
+        context.active_object = obj
+
+    def _undo_push(message=""):
+        undo_log.append(message)
+        undo_stack.append((copy.deepcopy(dict(data.objects)), copy.deepcopy(dict(data.materials))))
+
+    def _undo():
+        undo_stack.pop()
+        objects, materials = undo_stack[-1]
+        data.objects.clear()
+        data.objects.update(copy.deepcopy(objects))
+        data.materials.clear()
+        data.materials.update(copy.deepcopy(materials))
+
+    bpy.data = data
+    bpy.context = context
+    bpy.ops = types.SimpleNamespace(
+        mesh=types.SimpleNamespace(primitive_cube_add=_cube_add),
+        ed=types.SimpleNamespace(undo_push=_undo_push, undo=_undo),
+        wm=types.SimpleNamespace(),
+    )
+    bpy.app = types.SimpleNamespace(
+        version_string="stub", binary_path="blender",
+        timers=types.SimpleNamespace(register=lambda *a, **k: None),
+    )
+    bpy.types = types.SimpleNamespace(Operator=object)
+    bpy.props = types.SimpleNamespace(StringProperty=lambda **k: None, IntProperty=lambda **k: None)
+    bpy.utils = types.SimpleNamespace(register_class=lambda cls: None)
+    bpy.undo_log = undo_log
+    return bpy
+
+
+@pytest.fixture
+def server():
+    """スタブ bpy の rpc_server を serve_blocking で起動する（スレッドをメインスレッド役にする）"""
+    bpy = _make_bpy()
+    saved = sys.modules.get("bpy")
+    sys.modules["bpy"] = bpy
+    try:
+        for name in ("antigravity_bridge.rpc_server", "antigravity_bridge"):
+            sys.modules.pop(name, None)
+        from antigravity_bridge import rpc_server
+    finally:
+        if saved is None:
+            sys.modules.pop("bpy", None)
+        else:
+            sys.modules["bpy"] = saved
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    thread = threading.Thread(target=rpc_server.serve_blocking, args=("127.0.0.1", port, 0.05), daemon=True)
+    thread.start()
+    probe = RpcClient("127.0.0.1", port, timeout=5.0, max_retries=20, retry_backoff=0.02)
+    assert probe.ping()["ok"]
+
+    yield types.SimpleNamespace(port=port, bpy=bpy)
+
+    RpcClient("127.0.0.1", port, timeout=5.0).shutdown()
+    thread.join(timeout=5)
+
+
+def test_line_reader_splits_and_carries_over():
+    a, b = socket.socketpair()
+    with a, b:
+        a.sendall(b'{"id": 1}\n{"id"')
+        reader = _LineReader(b, bufsize=4)
+        assert reader.readline() == b'{"id": 1}\n'
+        a.sendall(b': 2}\n')
+        assert reader.readline() == b'{"id": 2}\n'
+
+
+def test_pipeline_keeps_order_on_one_connection(server):
+    with RpcClient("127.0.0.1", server.port, timeout=5.0, reuse_connection=True) as client:
+        results = client.pipeline([("add_cube", {"size": 1.0})] * 60 + [("ping",)], window=8)
+        assert len(results) == 61
+        assert results[0]["name"] == "Cube" and results[1]["name"] == "Cube.001"
+        assert results[-1]["blender"] == "stub"
+        # 同じ接続で通常の呼び出しも続けられる
+        assert len(client.list_objects()["objects"]) == 60
+
+        mixed = client.pipeline([("ping",), ("no_such_method",), ("ping",)], raise_on_error=False)
+        assert isinstance(mixed[1], RpcError) and mixed[1].code == -32601
+        assert mixed[2]["ok"]
+
+
+def test_batch_resolves_refs_in_one_undo_step(server):
+    client = RpcClient("127.0.0.1", server.port, timeout=5.0)
+    out = client.batch([
+        ("add_cube", {"size": 1.0}),
+        {"method": "transform", "params": {"name": "$0.name", "location": [1, 2, 3]}},
+        ("make_material", {"name": "M"}),
+        ("assign_material", {"obj_name": "$0.name", "material_name": "$2.material"}),
+    ], undo_label="edit")
+    assert out["ok"] and out["count"] == 4
+    info = client.get_object_info("Cube")
+    assert info["location"] == [1, 2, 3] and info["materials"] == ["M"]
+    assert server.bpy.undo_log == ["edit"]  # アンドゥ1ステップ
+
+
+def test_atomic_batch_rolls_back_on_failure(server):
+    client = RpcClient("127.0.0.1", server.port, timeout=5.0)
+    client.batch([("add_cube",)], undo_label="setup")
+    with pytest.raises(RpcError) as excinfo:
+        client.batch([("add_cube",), ("add_cube",), ("transform", {"name": "missing", "location": [0, 0, 0]})])
+    assert "ops[2] transform" in excinfo.value.rpc_message
+    assert "rolled_back=True" in excinfo.value.rpc_message
+    assert [o["name"] for o in client.list_objects()["objects"]] == ["Cube"]
+    assert server.bpy.undo_log == ["setup", "AG batch (failed)"]
+
+    with pytest.raises(RpcError, match="batch で使えないメソッド"):
+        client.batch([("shutdown",)])
+
+
+def test_benchmark_reports_all_modes(server):
+    report = run_benchmark(port=server.port, ops=60, window=8, batch_size=25, timeout=5.0)
+    modes = [r["mode"] for r in report["results"]]
+    assert modes[0] == "single" and modes[1].startswith("pipelined") and modes[2].startswith("batched")
+    assert all(r["ops"] == 60 and r["ops_per_sec"] > 0 for r in report["results"])
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""常駐Blenderワーカー テスト
+
+Blender 本体の代わりに、bpy スタブを差し込んで --python / --python-expr を
+実行する偽の実行ファイルを使い、warm_worker.py と rpc_server.run_script を検証する。
+"""
+
+import os
+import stat
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+BRIDGE_DIR = Path(__file__).resolve().parent.parent / "tools" / "blender_bridge"
+sys.path.insert(0, str(BRIDGE_DIR))
+
+from blender_cli import BlenderCLI, BlenderCLIError
+from warm_worker import WarmBlenderWorker
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="偽Blenderは shebang 実行を前提とする")
+
+FAKE_BLENDER = textwrap.dedent('''\
+    #!{python}
+    import runpy, sys, types
+
+    class _WM:
+        def read_homefile(self, use_factory_startup=True):
+            print("[fake] reset", use_factory_startup, flush=True)
+        def open_mainfile(self, filepath, load_ui=False):
+            print("[fake] open", filepath, flush=True)
+        def quit_blender(self):
+            sys.exit(0)
+
+    bpy = types.ModuleType("bpy")
+    bpy.ops = types.SimpleNamespace(wm=_WM())
+    bpy.app = types.SimpleNamespace(
+        version_string="fake-5.0", binary_path=sys.argv[0],
+        timers=types.SimpleNamespace(register=lambda *a, **k: None),
+    )
+    bpy.types = types.SimpleNamespace(Operator=object)
+    bpy.props = types.SimpleNamespace(StringProperty=lambda **k: None, IntProperty=lambda **k: None)
+    bpy.utils = types.SimpleNamespace(register_class=lambda cls: None)
+    sys.modules["bpy"] = bpy
+
+    args = sys.argv[1:]
+    if "--python-expr" in args:
+        exec(args[args.index("--python-expr") + 1], {{"__name__": "__main__"}})
+    elif "--python" in args:
+        sys.argv = [sys.argv[0]] + args
+        runpy.run_path(args[args.index("--python") + 1], run_name="__main__")
+''')
+
+RECORD_SCRIPT = textwrap.dedent('''\
+    import os, sys
+    from pathlib import Path
+    out = Path(sys.argv[sys.argv.index("--") + 1:][0])
+    out.write_text(str(os.getpid()), encoding="utf-8")
+    print("recorded", out)
+''')
+
+FAILING_SCRIPT = 'raise ValueError("spec is broken")\n'
+
+# 初回だけプロセスごと落ちる（GPUドライバ風のメッセージを出してから）
+CRASH_ONCE_SCRIPT = textwrap.dedent('''\
+    import os, sys
+    from pathlib import Path
+    flag = Path(sys.argv[sys.argv.index("--") + 1:][0])
+    if not flag.exists():
+        flag.write_text("crashed", encoding="utf-8")
+        sys.__stdout__.write("Segmentation fault (core dumped)\\n")
+        sys.__stdout__.flush()
+        os._exit(139)
+    print("second attempt ok")
+''')
+
+
+# 実行回数を記録してから長く止まる（非冪等なビルドの代わり）
+HANG_SCRIPT = textwrap.dedent('''\
+    import sys, time
+    from pathlib import Path
+    counter = Path(sys.argv[sys.argv.index("--") + 1:][0])
+    counter.write_text(counter.read_text() + "x" if counter.exists() else "x", encoding="utf-8")
+    time.sleep(30)
+''')
+
+
+@pytest.fixture
+def fake_cli(tmp_path):
+    exe = tmp_path / "blender"
+    exe.write_text(FAKE_BLENDER.format(python=sys.executable), encoding="utf-8")
+    exe.chmod(exe.stat().st_mode | stat.S_IXUSR)
+    return BlenderCLI(str(exe))
+
+
+def _script(tmp_path: Path, name: str, body: str) -> Path:
+    path = tmp_path / name
+    path.write_text(body, encoding="utf-8")
+    return path
+
+
+def test_warm_worker_reuses_one_process(tmp_path, fake_cli):
+    record = _script(tmp_path, "record.py", RECORD_SCRIPT)
+    with WarmBlenderWorker(fake_cli, tmp_path / "worker", startup_timeout=20) as worker:
+        worker.run_script(str(record), args=[str(tmp_path / "a.txt")], log_file=str(tmp_path / "a.log"))
+        worker.run_script(
+            str(record), blend_file=str(tmp_path / "x.blend"), args=[str(tmp_path / "b.txt")],
+            log_file=str(tmp_path / "b.log"), factory_startup=False,
+        )
+        stats = worker.stats()
+
+    assert (tmp_path / "a.txt").read_text() == (tmp_path / "b.txt").read_text()
+    assert "recorded" in (tmp_path / "a.log").read_text()
+    assert stats["mode"] == "warm"
+    assert (stats["starts"], stats["warm_runs"], stats["cold_runs"]) == (1, 2, 0)
+    assert "[fake] open" in (tmp_path / "worker" / "warm_worker_stdout.log").read_text()
+
+
+def test_script_error_raises_and_keeps_worker(tmp_path, fake_cli):
+    failing = _script(tmp_path, "fail.py", FAILING_SCRIPT)
+    record = _script(tmp_path, "record.py", RECORD_SCRIPT)
+    with WarmBlenderWorker(fake_cli, tmp_path / "worker", startup_timeout=20) as worker:
+        with pytest.raises(BlenderCLIError) as excinfo:
+            worker.run_script(str(failing), log_file=str(tmp_path / "fail.log"))
+        assert "spec is broken" in excinfo.value.stdout
+        assert worker.health_check()
+        worker.run_script(str(record), args=[str(tmp_path / "ok.txt")])
+        assert worker.stats()["starts"] == 1
+
+
+def test_crash_is_classified_and_worker_restarted(tmp_path, fake_cli):
+    crash = _script(tmp_path, "crash.py", CRASH_ONCE_SCRIPT)
+    with WarmBlenderWorker(fake_cli, tmp_path / "worker", startup_timeout=20) as worker:
+        worker.run_script(str(crash), args=[str(tmp_path / "flag")], log_file=str(tmp_path / "c.log"))
+        stats = worker.stats()
+
+    assert stats["restarts"] == 1 and stats["starts"] == 2
+    assert stats["crashes"][0]["failure_type"] == "gpu_driver"
+    assert stats["warm_runs"] == 1
+    assert "second attempt ok" in (tmp_path / "c.log").read_text()
+
+
+def test_timeout_is_not_retried(tmp_path, fake_cli):
+    hang = _script(tmp_path, "hang.py", HANG_SCRIPT)
+    record = _script(tmp_path, "record.py", RECORD_SCRIPT)
+    counter = tmp_path / "runs.txt"
+    with WarmBlenderWorker(fake_cli, tmp_path / "worker", startup_timeout=20) as worker:
+        worker.rpc_timeout_margin = 0.5
+        with pytest.raises(subprocess.TimeoutExpired):
+            worker.run_script(str(hang), args=[str(counter)], timeout=1)
+        # 次の実行は新しいプロセスで動く
+        worker.run_script(str(record), args=[str(tmp_path / "ok.txt")])
+        stats = worker.stats()
+
+    assert counter.read_text() == "x"  # 再実行もコールド実行もしない
+    assert stats["timeouts"] == 1
+    assert (stats["starts"], stats["restarts"], stats["cold_runs"]) == (2, 0, 0)
+    assert (tmp_path / "ok.txt").exists()
+
+
+def test_falls_back_to_cold_cli(tmp_path, fake_cli):
+    record = _script(tmp_path, "record.py", RECORD_SCRIPT)
+    broken = BlenderCLI(fake_cli.blender_exe)
+    worker = WarmBlenderWorker(broken, tmp_path / "worker", startup_timeout=1)
+    worker.blender_exe = str(tmp_path / "missing-blender")
+    worker.run_script(str(record), args=[str(tmp_path / "cold.txt")])
+    worker.close()
+
+    stats = worker.stats()
+    assert stats["mode"] == "cold"
+    assert stats["cold_runs"] == 1
+    assert stats["fallback_reason"].startswith("startup failed")
+    assert (tmp_path / "cold.txt").exists()
+
+    cold = WarmBlenderWorker(fake_cli, tmp_path / "cold", warm=False)
+    cold.run_script(str(record), args=[str(tmp_path / "cold2.txt")])
+    assert cold.stats()["starts"] == 0 and cold.stats()["cold_runs"] == 1
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+DESKTOP_ROOT = ROOT / ".agent" / "workflows" / "desktop"
+if str(DESKTOP_ROOT) not in sys.path:
+    sys.path.insert(0, str(DESKTOP_ROOT))
+
+from integrations.chatgpt.dom_probe import PROBE_CONFIG, PROBE_JS, fnv1a32_utf16, text_hash  # noqa: E402
+from integrations.chatgpt.generation_fsm import (  # noqa: E402
+    ChatGPTWaitConfig,
+    GenState,
+    observe_signals_locators_sync,
+    observe_signals_sync,
+    wait_for_generation_sync,
+)
+
+FIXTURE = ROOT / "tests" / "fixtures" / "chatgpt_chat_page.html"
+
+
+class _ScriptedPage:
+    """evaluate の呼び出しを数え、用意した DOM Probe の結果を順に返す"""
+
+    url = "https://chatgpt.com/c/fixture"
+
+    def __init__(self, frames: list[dict]) -> None:
+        self.frames = frames
+        self.evaluate_calls = 0
+        self.waits: list[int] = []
+
+    def evaluate(self, script, arg=None):
+        assert script == PROBE_JS and arg == PROBE_CONFIG
+        frame = self.frames[min(self.evaluate_calls, len(self.frames) - 1)]
+        self.evaluate_calls += 1
+        return dict(frame)
+
+    def wait_for_timeout(self, ms: int) -> None:
+        self.waits.append(ms)
+
+    def locator(self, selector):  # pragma: no cover - DOM Probe が成功する限り呼ばれない
+        raise AssertionError("locator path must not be used")
+
+
+def _frame(stop: bool, text: str | None) -> dict:
+    return {
+        "has_textbox": True,
+        "stop_button_visible": stop,
+        "send_enabled": not stop,
+        "last_msg_len": None if text is None else len(text),
+        "last_msg_hash": None if text is None else text_hash(text),
+        "rate_limited": False,
+        "error_banner": False,
+    }
+
+
+def test_fnv_hash_is_incremental_over_utf16_units() -> None:
+    assert format(fnv1a32_utf16(""), "08x") == "811c9dc5"
+    assert format(fnv1a32_utf16("a"), "08x") == "e40c292c"
+    head, tail = "こんにちは 😀", "😀 world"
+    assert fnv1a32_utf16(tail, fnv1a32_utf16(head)) == fnv1a32_utf16(head + tail)
+    assert text_hash("abc") != text_hash("abd")
+
+
+def test_observe_uses_one_evaluate_per_poll() -> None:
+    page = _ScriptedPage([_frame(True, "途中")])
+    sig = observe_signals_sync(page)
+    assert page.evaluate_calls == 1
+    assert (sig.stop_button_visible, sig.send_enabled, sig.last_msg_len) == (True, False, 2)
+    assert sig.last_msg_hash == text_hash("途中") and sig.observed_by == "dom_probe"
+    assert sig.url == page.url and sig.probe_ms is not None
+
+
+def test_wait_for_generation_reports_poll_latency() -> None:
+    frames = [_frame(True, ""), _frame(True, "a"), _frame(True, "ab"), _frame(False, "ab"), _frame(False, "ab")]
+    page = _ScriptedPage(frames)
+    cfg = ChatGPTWaitConfig(stable_window_ms=0, poll_interval_ms_fast=1)
+    ok, fsm = wait_for_generation_sync(page, cfg)
+    assert ok and fsm.state == GenState.DONE
+    stats = fsm.poll_stats.summary()
+    assert stats["polls"] == page.evaluate_calls == len(page.waits) + 1
+    assert stats["fallbacks"] == 0 and stats["max_ms"] >= stats["avg_ms"] >= 0
+
+
+def test_probe_matches_locators_on_static_fixture() -> None:
+    sync_api = pytest.importorskip("playwright.sync_api")
+    if getattr(sync_api, "__file__", None) is None:  # 他のテストが差し込んだスタブ
+        pytest.skip("playwright is stubbed")
+    with sync_api.sync_playwright() as p:
+        try:
+            browser = p.chromium.launch()
+        except Exception as exc:  # ブラウザ未インストール
+            pytest.skip(f"chromium unavailable: {exc}")
+        page = browser.new_page()
+        page.goto(FIXTURE.as_uri())
+
+        def compare(label: str) -> None:
+            probe = observe_signals_sync(page)
+            legacy = observe_signals_locators_sync(page)
+            keys = ("has_textbox", "stop_button_visible", "send_enabled", "last_msg_len",
+                    "last_msg_hash", "rate_limited", "error_banner")
+            assert probe.observed_by == "dom_probe", label
+            assert {k: getattr(probe, k) for k in keys} == {k: getattr(legacy, k) for k in keys}, label
+
+        compare("idle")
+        page.evaluate("() => fixture.start()")
+        compare("started")
+        for chunk in ["こんにちは ", "world 😀", "x" * 2000]:
+            page.evaluate("(t) => fixture.append(t)", chunk)
+            compare(f"append {chunk[:5]}")
+        page.evaluate("() => fixture.replace('rewritten')")
+        compare("replaced")
+        page.evaluate("() => fixture.relabelStop('Stop')")
+        compare("relabel")
+        page.evaluate("() => fixture.finish()")
+        compare("finished")
+        page.evaluate("() => fixture.ghostSend()")
+        compare("ghost send")
+        page.evaluate("() => fixture.alert('Something went wrong')")
+        compare("alert")
+        page.evaluate("() => { fixture.clearBanner(); fixture.rateLimit(); }")
+        compare("rate limit")
+        assert observe_signals_sync(page).rate_limited is True
+        browser.close()
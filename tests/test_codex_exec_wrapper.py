@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import random
+import sys
+import time
+from pathlib import Path
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+sys.path.insert(0, str(TOOLS_DIR))
+
+import codex_exec_wrapper  # noqa: E402
+
+
+BLOCK = [f"    result_{i} = compute_something(value_{i}, option=True)" for i in range(4)]
+
+
+def _stream(text: str, rng: random.Random) -> str:
+    dedup = codex_exec_wrapper.DuplicateBlockFilter()
+    parts = []
+    pos = 0
+    while pos < len(text):
+        size = rng.randint(1, 40)
+        parts.append(dedup.feed(text[pos:pos + size]))
+        pos += size
+    parts.append(dedup.close())
+    return "".join(parts)
+
+
+def test_removes_every_repeat_and_keeps_first_occurrence() -> None:
+    text = "\n".join(["header", *BLOCK, "middle", *BLOCK, "tail", *BLOCK, "end"])
+
+    duplicates = codex_exec_wrapper.detect_duplicates(text)
+    assert [(d["start_line_a"], d["start_line_b"], d["num_lines"]) for d in duplicates] == [(1, 6, 4), (1, 11, 4)]
+    assert duplicates[0]["hash"] == duplicates[1]["hash"]
+
+    cleaned = codex_exec_wrapper.remove_duplicates(text)
+    assert cleaned == "\n".join(["header", *BLOCK, "middle", "tail", "end"])
+    assert codex_exec_wrapper.detect_duplicates(cleaned) == []
+
+
+def test_short_blocks_are_kept() -> None:
+    two_lines = "\n".join([*BLOCK[:2], "x", *BLOCK[:2]])
+    short = "\n".join(["a = 1", "b = 2", "c = 3", "d", "a = 1", "b = 2", "c = 3"])
+    assert codex_exec_wrapper.remove_duplicates(two_lines) == two_lines
+    assert codex_exec_wrapper.remove_duplicates(short) == short
+
+
+def test_streaming_in_small_chunks_matches_batch() -> None:
+    rng = random.Random(7)
+    pool = [*BLOCK, "", "", "log line", "another log line with more text in it"]
+    for _ in range(50):
+        text = "\n".join(rng.choice(pool) for _ in range(rng.randint(0, 80)))
+        assert _stream(text, rng) == codex_exec_wrapper.remove_duplicates(text)
+
+
+def test_long_runs_of_empty_lines_stay_fast() -> None:
+    text = "\n".join(["", "", "x" * 100] * 20_000)
+    start = time.perf_counter()
+    cleaned = codex_exec_wrapper.remove_duplicates(text)
+    assert time.perf_counter() - start < 5.0
+    assert cleaned.count("x" * 100) == 1
+
+
+def test_clean_output_respects_dedup_flag() -> None:
+    block = [line.strip() for line in BLOCK]
+    stdout = "\n".join([*block, "sep", *block, "tokens used"])
+    assert codex_exec_wrapper.clean_output(stdout, "") == "\n".join([*block, "sep"])
+    assert codex_exec_wrapper.clean_output(stdout, "", dedup=False) == "\n".join([*block, "sep", *block])
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""design_review 画像メトリクス テスト
+
+Blender外では PIL ローダーで読むため、PNG から直接 _load_image_metrics を検証する。
+旧実装（画素ごとの Python ループ）を参照実装として値の一致も確認する。
+"""
+
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+BRIDGE_DIR = Path(__file__).resolve().parent.parent / "tools" / "blender_bridge"
+sys.path.insert(0, str(BRIDGE_DIR))
+
+import design_review
+
+SCHEMA_KEYS = {
+    "exists", "path", "width", "height", "sample_count", "metric_space", "spaces",
+    "luminance_mean", "luminance_std", "saturation_mean", "bright_ratio", "dark_ratio",
+    "mean_r", "mean_g", "mean_b", "cool_ratio",
+}
+
+
+def _reference_metrics(pixels, width, height, sample_cap):
+    """旧 _load_image_metrics のループ（flat RGBA, 下の行から）"""
+    def to_srgb(v):
+        v = min(1.0, max(0.0, v))
+        return 12.92 * v if v <= 0.0031308 else 1.055 * (v ** (1.0 / 2.4)) - 0.055
+
+    def finalize(rows):
+        n = len(rows)
+        lum = [0.2126 * r + 0.7152 * g + 0.0722 * b for r, g, b in rows]
+        mean = sum(lum) / n
+        mr, mg, mb = (sum(c[i] for c in rows) / n for i in range(3))
+        return {
+            "luminance_mean": mean,
+            "luminance_std": max(0.0, sum(v * v for v in lum) / n - mean * mean) ** 0.5,
+            "saturation_mean": sum(max(c) - min(c) for c in rows) / n,
+            "bright_ratio": sum(v >= 0.82 for v in lum) / n,
+            "dark_ratio": sum(v <= 0.12 for v in lum) / n,
+            "mean_r": mr, "mean_g": mg, "mean_b": mb,
+            "cool_ratio": mb / max(1.0e-6, mr + mg + mb),
+        }
+
+    total = width * height
+    stride = max(1, total // sample_cap)
+    linear = []
+    for i in range(0, total, stride):
+        linear.append(tuple(min(1.0, max(0.0, float(pixels[i * 4 + c]))) for c in range(3)))
+    srgb = [tuple(to_srgb(v) for v in px) for px in linear]
+    return {"linear": finalize(linear), "srgb": finalize(srgb)}, len(linear)
+
+
+def _gradient_png(path: Path, width=160, height=90) -> np.ndarray:
+    yy, xx = np.mgrid[0:height, 0:width]
+    arr = np.stack([xx * 255 // width, yy * 255 // height, (xx + yy) % 256], axis=-1).astype(np.uint8)
+    arr[:10, :20] = 255  # 明るい領域
+    arr[-10:, -20:] = 0  # 暗い領域
+    Image.fromarray(arr).save(path)
+    return arr
+
+
+def _blender_flat_rgba(arr: np.ndarray) -> np.ndarray:
+    rgba = np.concatenate([arr[::-1].astype(np.float32) / 255.0, np.ones(arr.shape[:2] + (1,), np.float32)], axis=-1)
+    return rgba.reshape(-1)
+
+
+def test_metrics_match_reference_loop_with_stride(tmp_path):
+    path = tmp_path / "front.png"
+    arr = _gradient_png(path)
+    got = design_review._load_image_metrics(path, sample_cap=1000)
+    ref, n = _reference_metrics(_blender_flat_rgba(arr).tolist(), arr.shape[1], arr.shape[0], 1000)
+
+    assert set(got) == SCHEMA_KEYS
+    assert got["sample_count"] == n
+    for space in ("linear", "srgb"):
+        for key, value in ref[space].items():
+            assert got["spaces"][space][key] == pytest.approx(value, abs=1e-5), (space, key)
+    assert got["luminance_mean"] == got["spaces"]["srgb"]["luminance_mean"]
+
+
+def test_metrics_default_to_all_pixels_and_selected_space(tmp_path):
+    path = tmp_path / "bird.png"
+    _gradient_png(path, width=64, height=48)
+    got = design_review._load_image_metrics(path, metric_space="linear")
+    assert (got["width"], got["height"], got["sample_count"]) == (64, 48, 64 * 48)
+    assert got["metric_space"] == "linear"
+    assert got["mean_b"] == got["spaces"]["linear"]["mean_b"]
+    assert 0.0 < got["bright_ratio"] < 1.0 and 0.0 < got["dark_ratio"] < 1.0
+
+    assert design_review._load_image_metrics(tmp_path / "missing.png") == {
+        "exists": False, "path": str(tmp_path / "missing.png"),
+    }
+
+
+def test_bpy_loader_uses_foreach_get_and_matches_pil(tmp_path, monkeypatch):
+    path = tmp_path / "oblique.png"
+    arr = _gradient_png(path, width=40, height=30)
+    flat = _blender_flat_rgba(arr)
+    removed = []
+
+    class _Pixels:
+        def foreach_get(self, buf):
+            buf[:] = flat
+
+        def __getitem__(self, item):
+            raise AssertionError("pixels[:] のリスト化は使わない")
+
+    image = types.SimpleNamespace(size=(40, 30), channels=4, pixels=_Pixels())
+    images = types.SimpleNamespace(
+        load=lambda p, check_existing=False: image,
+        remove=lambda img, do_unlink=True: removed.append(img),
+    )
+    monkeypatch.setattr(design_review, "bpy", types.SimpleNamespace(data=types.SimpleNamespace(images=images)))
+
+    via_bpy = design_review._load_image_metrics(path, sample_cap=500)
+    monkeypatch.setattr(design_review, "bpy", None)
+    via_pil = design_review._load_image_metrics(path, sample_cap=500)
+
+    assert removed == [image]
+    assert via_bpy["sample_count"] == via_pil["sample_count"]
+    for key, value in via_pil["spaces"]["srgb"].items():
+        assert via_bpy["spaces"]["srgb"][key] == pytest.approx(value, abs=1e-6)
+
+
+def test_evaluate_design_review_without_rubrics(tmp_path):
+    path = tmp_path / "front.png"
+    _gradient_png(path, width=32, height=32)
+    result = design_review.evaluate_design_review({}, {}, {"front": path, "side": tmp_path / "none.png"}, [])
+    assert result["pass"] and result["view_metrics"]["front"]["exists"]
+    assert result["view_metrics"]["side"]["exists"] is False
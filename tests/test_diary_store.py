@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""日記エージェント テスト
+
+diary.py の add/edit/done/delete と FTS5 インデックス（diary_store.py）の同期・検索を検証する。
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# スクリプトのパスを追加
+SCRIPT_DIR = Path(__file__).resolve().parent.parent / "エージェント" / "日記エージェント" / "scripts"
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import diary  # noqa: E402
+from diary_store import DiaryStore, parse_query, to_ngrams  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(diary, "BASE_DIR", tmp_path)
+    monkeypatch.setattr(diary, "DATA_DIR", tmp_path / "_data" / "diary")
+    monkeypatch.setattr(diary, "STORE_FILE", tmp_path / "_data" / "diary" / "index.sqlite")
+    return tmp_path / "_data" / "diary"
+
+
+def _run(capsys, func, **kwargs) -> dict:
+    func(argparse.Namespace(**kwargs))
+    return json.loads(capsys.readouterr().out)
+
+
+def _add(capsys, title, body="", tags="", type_="note") -> str:
+    out = _run(capsys, diary.cmd_add, title=title, type=type_, tags=tags, body=body, body_file="")
+    return out["id"]
+
+
+def _search(capsys, keyword, **kwargs) -> list:
+    params = {"type": None, "tags": "", "limit": 20, **kwargs}
+    return _run(capsys, diary.cmd_search, keyword=keyword, **params)["results"]
+
+
+def test_ngram_tokenization():
+    assert to_ngrams("議事録 MCP") == "議事 事録 録 mc cp p"
+    assert parse_query("会議 tag:仕事 #週報 type:task status:done") == (
+        ["会議"], {"tag": ["仕事", "週報"], "type": ["task"], "status": ["done"]}
+    )
+
+
+def test_search_japanese_substrings_ranking_and_snippet(data_dir, capsys):
+    first = _add(capsys, "定例会議の議事録", body="来週のリリース計画を確認した。", tags="仕事")
+    second = _add(capsys, "買い物メモ", body="牛乳と卵。帰りに会議室の鍵を返す。", tags="生活")
+    _add(capsys, "読書", body="小説を読んだ。", tags="趣味", type_="diary")
+
+    results = _search(capsys, "会議")
+    assert [r["id"] for r in results] == [first, second]  # タイトル一致が上位
+    assert results[0]["match_in"] == ["title"]
+    assert results[1]["match_in"] == ["body"]
+    assert "**会議**" in results[1]["snippet"]
+
+    assert [r["id"] for r in _search(capsys, "議事録 計画")] == [first]
+    assert [r["id"] for r in _search(capsys, "会議 tag:生活")] == [second]
+    assert [r["id"] for r in _search(capsys, "卵")] == [second]  # 1文字
+    assert [r["title"] for r in _search(capsys, "type:diary")] == ["読書"]
+    assert _search(capsys, "存在しない語") == []
+
+
+def test_search_without_word_characters_returns_nothing(data_dir, capsys):
+    _add(capsys, "定例会議", body="議事録")
+    _add(capsys, "買い物", body="牛乳")
+    assert _search(capsys, "!!") == []
+    assert _search(capsys, "？？") == []
+    assert _search(capsys, "!! tag:仕事") == []
+
+
+def test_search_ranks_all_matches_unless_capped(data_dir, capsys):
+    oldest = _add(capsys, "会議の議事録", body="会議")
+    newer = [_add(capsys, f"メモ{i}", body="会議室の予約") for i in range(3)]
+    store = diary.open_store()
+    try:
+        # 既定: 古くてもタイトル一致が上位
+        assert store.search("会議", limit=1)[0]["id"] == oldest
+        # rank_candidates 指定: 新しい側の候補だけを順位付けするので最古の一致は落ちる
+        capped = store.search("会議", limit=10, rank_candidates=2)
+        assert len(capped) == 2
+        assert oldest not in {r["id"] for r in capped}
+        assert {r["id"] for r in capped} <= set(newer)
+    finally:
+        store.close()
+
+
+def test_index_follows_edit_done_delete_and_rebuild(data_dir, capsys):
+    entry_id = _add(capsys, "タスク", body="見積もりを作る", type_="task")
+    _run(capsys, diary.cmd_edit, id=entry_id, title=None, tags="営業", body=None, body_file=None, append="請求書も")
+    assert [r["id"] for r in _search(capsys, "請求書 #営業")] == [entry_id]
+
+    _run(capsys, diary.cmd_done, id=entry_id)
+    assert [r["status"] for r in _search(capsys, "見積もり status:done")] == ["done"]
+    _run(capsys, diary.cmd_delete, id=entry_id)
+    listed = _run(capsys, diary.cmd_list, type=None, status="archived", tags="", limit=20)
+    assert [e["id"] for e in listed["entries"]] == [entry_id]
+
+    # インデックスが無くてもMarkdownから自動で再構築される
+    for path in data_dir.glob("index.sqlite*"):
+        path.unlink()
+    summary = _run(capsys, diary.cmd_summary, days=7, type=None)
+    assert [e["preview"] for e in summary["entries"]] == ["見積もりを作る  請求書も"]
+    assert _run(capsys, diary.cmd_rebuild_index)["count"] == 1
+    assert DiaryStore(diary.STORE_FILE).count() == 1
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""画像好み判定ツール 高速特徴抽出 テスト
+
+NumPy 実装が原寸で PIL 参照実装と一致すること、
+縮小が決定的で元画像サイズを保つことを確認する。
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("PIL")
+from PIL import Image
+
+TOOL_DIR = Path(__file__).resolve().parent.parent / "tools" / "image_preference"
+sys.path.insert(0, str(TOOL_DIR))
+
+from feature_extractor import (
+    extract_features,
+    extract_features_reference,
+    load_working_array,
+)
+
+
+def _encode(arr: np.ndarray, fmt: str) -> bytes:
+    buf = io.BytesIO()
+    Image.fromarray(arr).save(buf, format=fmt)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("shape", [(1, 1, 3), (2, 7, 3), (41, 67, 3), (240, 320, 3)])
+def test_full_resolution_matches_reference(shape):
+    rng = np.random.default_rng(sum(shape))
+    data = _encode(rng.integers(0, 256, shape, dtype=np.uint8), "PNG")
+    fast = extract_features(io.BytesIO(data), max_side=None)
+    ref = extract_features_reference(io.BytesIO(data))
+    assert fast.keys() == ref.keys()
+    for key, value in ref.items():
+        assert fast[key] == pytest.approx(value, abs=1e-12), key
+
+
+def test_gray_and_saturated_pixels_match_reference():
+    # 無彩色・原色・同値チャンネルの境界ケース
+    arr = np.array([[[0, 0, 0], [255, 255, 255], [255, 0, 0], [0, 255, 0]],
+                    [[0, 0, 255], [255, 255, 0], [10, 10, 200], [200, 10, 10]],
+                    [[128, 128, 127], [1, 0, 0], [0, 1, 1], [254, 255, 255]]], dtype=np.uint8)
+    data = _encode(arr, "PNG")
+    fast = extract_features(io.BytesIO(data), max_side=None)
+    ref = extract_features_reference(io.BytesIO(data))
+    for key, value in ref.items():
+        assert fast[key] == pytest.approx(value, abs=1e-12), key
+
+
+def test_downsampling_is_bounded_and_deterministic():
+    yy, xx = np.mgrid[0:1500, 0:2000]
+    arr = np.stack([xx % 256, yy % 256, (xx + yy) % 256], axis=-1).astype(np.uint8)
+    data = _encode(arr, "JPEG")
+
+    rgb, size = load_working_array(io.BytesIO(data), max_side=500)
+    assert size == (2000, 1500)
+    assert max(rgb.shape[:2]) <= 500
+
+    first = extract_features(io.BytesIO(data), max_side=500)
+    second = extract_features(io.BytesIO(data), max_side=500)
+    assert first == second
+    assert (first["width"], first["height"]) == (2000, 1500)
+    assert first["aspect_ratio"] == pytest.approx(2000 / 1500)
+
+
+def test_small_images_are_not_resampled():
+    rng = np.random.default_rng(3)
+    data = _encode(rng.integers(0, 256, (60, 90, 3), dtype=np.uint8), "PNG")
+    assert extract_features(io.BytesIO(data)) == extract_features(io.BytesIO(data), max_side=None)
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""画像好み判定ツール 特徴量ストア テスト
+
+feature_store.py のキャッシュ動作と、学習・分析がストア経由で
+新しい画像だけを特徴量化することを確認する。
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("PIL")
+pytest.importorskip("sklearn")
+from PIL import Image
+
+TOOL_DIR = Path(__file__).resolve().parent.parent / "tools" / "image_preference"
+sys.path.insert(0, str(TOOL_DIR))
+
+import feature_store as fs
+from feature_extractor import extract_features, features_to_vector
+from feature_store import FeatureStore, FeatureWorker, vector_to_features
+from preference_analyzer import PreferenceAnalyzer
+from preference_learner import PreferenceLearner
+
+
+def _save_image(path: Path, rgb: tuple[int, int, int], seed: int = 0) -> Path:
+    rng = np.random.default_rng(seed)
+    arr = np.clip(rng.normal(0, 20, (48, 64, 3)) + np.array(rgb), 0, 255).astype("uint8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(arr).save(path)
+    return path
+
+
+@pytest.fixture
+def extract_counter(monkeypatch):
+    calls = []
+    original = fs.extract_features
+
+    def _counting(src):
+        calls.append(src)
+        return original(src)
+
+    monkeypatch.setattr(fs, "extract_features", _counting)
+    return calls
+
+
+@pytest.fixture
+def training_dir(tmp_path):
+    root = tmp_path / "training_data"
+    for i in range(3):
+        _save_image(root / "好き" / f"w{i}.png", (220, 120, 40), seed=i)
+        _save_image(root / "そうでもない" / f"n{i}.png", (128, 128, 128), seed=10 + i)
+        _save_image(root / "嫌い" / f"c{i}.png", (40, 90, 200), seed=20 + i)
+    return root
+
+
+class TestFeatureStore:
+    def test_vectors_match_direct_extraction(self, tmp_path):
+        img = _save_image(tmp_path / "a.png", (200, 50, 50))
+        store = FeatureStore(tmp_path / "store")
+        paths, matrix = store.load([img])
+        assert paths == [img]
+        np.testing.assert_allclose(matrix[0], features_to_vector(extract_features(img)))
+
+    def test_second_sync_reads_cache_only(self, tmp_path, extract_counter):
+        imgs = [_save_image(tmp_path / f"{i}.png", (30 * i, 80, 80), seed=i) for i in range(4)]
+        store = FeatureStore(tmp_path / "store")
+        _, _, first = store.sync(imgs)
+        assert first == {"extracted": 4, "cached": 0, "failed": 0}
+
+        reopened = FeatureStore(tmp_path / "store")
+        _, rows, second = reopened.sync(imgs)
+        assert second == {"extracted": 0, "cached": 4, "failed": 0}
+        assert len(extract_counter) == 4
+        assert sorted(rows.tolist()) == [0, 1, 2, 3]
+
+    def test_same_content_shares_row_and_changed_file_is_reextracted(self, tmp_path, extract_counter):
+        a = _save_image(tmp_path / "a.png", (10, 200, 10), seed=1)
+        b = tmp_path / "copy.png"
+        b.write_bytes(a.read_bytes())
+        store = FeatureStore(tmp_path / "store")
+        _, rows, counts = store.sync([a, b])
+        assert rows[0] == rows[1]
+        assert counts["extracted"] == 1
+
+        _save_image(a, (250, 250, 10), seed=2)
+        _, rows2, counts2 = store.sync([a, b])
+        assert counts2["extracted"] == 1
+        assert rows2[0] != rows2[1]
+
+    def test_extractor_version_is_part_of_key(self, tmp_path, extract_counter, monkeypatch):
+        img = _save_image(tmp_path / "a.png", (90, 90, 90))
+        FeatureStore(tmp_path / "store").sync([img])
+        monkeypatch.setattr(fs, "FEATURE_EXTRACTOR_VERSION", "test-next")
+        store = FeatureStore(tmp_path / "store")
+        _, _, counts = store.sync([img])
+        assert counts["extracted"] == 1
+        assert store.stats()["stale_vectors"] == 1
+
+    def test_unreadable_file_is_skipped(self, tmp_path):
+        bad = tmp_path / "broken.png"
+        bad.write_bytes(b"not an image")
+        good = _save_image(tmp_path / "ok.png", (1, 2, 3))
+        paths, matrix = FeatureStore(tmp_path / "store").load([bad, good])
+        assert paths == [good]
+        assert matrix.shape == (1, len(fs.get_feature_keys()))
+
+    def test_worker_featurizes_in_background(self, tmp_path, extract_counter):
+        imgs = [_save_image(tmp_path / f"{i}.png", (60, 60, 20 * i), seed=i) for i in range(3)]
+        store = FeatureStore(tmp_path / "store")
+        worker = FeatureWorker(store)
+        assert worker.submit(imgs) == 3
+        assert worker.wait_idle(timeout=30.0)
+        assert worker.stats() == {"pending": 0, "processed": 3, "failed": 0}
+        _, _, counts = store.sync(imgs)
+        assert counts["extracted"] == 0
+
+    def test_vector_to_features_roundtrip(self, tmp_path):
+        img = _save_image(tmp_path / "a.png", (200, 120, 30))
+        features = extract_features(img)
+        restored = vector_to_features(features_to_vector(features))
+        assert restored["dominant_hue_bin"] == features["dominant_hue_bin"]
+        assert restored["warm_ratio"] == pytest.approx(features["warm_ratio"])
+
+
+class TestIncrementalTraining:
+    def test_retrain_extracts_only_new_images(self, training_dir, extract_counter):
+        stats = PreferenceLearner(training_dir).train()
+        assert stats["total_images"] == 9
+        assert stats["feature_cache"]["extracted"] == 9
+
+        _save_image(training_dir / "好き" / "w_new.png", (230, 100, 30), seed=99)
+        stats2 = PreferenceLearner(training_dir).train()
+        assert stats2["total_images"] == 10
+        assert stats2["feature_cache"] == {"extracted": 1, "cached": 9, "failed": 0}
+        assert len(extract_counter) == 10
+
+    def test_analyze_uses_cached_vectors(self, training_dir, extract_counter):
+        PreferenceLearner(training_dir).train()
+        before = len(extract_counter)
+        analysis = PreferenceAnalyzer(training_dir).analyze()
+        assert len(extract_counter) == before
+        assert analysis["image_counts"] == {"好き": 3, "そうでもない": 3, "嫌い": 3}
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""画像好み判定ツール 判定API テスト
+
+常駐モデルの再読み込み、バイト列からの判定、バッチ判定（predict_proba 1回）、
+/api/status のレイテンシ集計を確認する。
+"""
+
+import io
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("PIL")
+pytest.importorskip("sklearn")
+pytest.importorskip("flask")
+from PIL import Image
+
+TOOL_DIR = Path(__file__).resolve().parent.parent / "tools" / "image_preference"
+sys.path.insert(0, str(TOOL_DIR))
+
+from feature_store import FeatureStore
+from preference_judge import PreferenceJudge, ResidentJudge
+from preference_learner import PreferenceLearner
+
+
+def _png_bytes(rgb: tuple[int, int, int], seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    arr = np.clip(rng.normal(0, 20, (48, 64, 3)) + np.array(rgb), 0, 255).astype("uint8")
+    buf = io.BytesIO()
+    Image.fromarray(arr).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def trained(tmp_path):
+    root = tmp_path / "training_data"
+    palettes = {"好き": (220, 120, 40), "そうでもない": (128, 128, 128), "嫌い": (40, 90, 200)}
+    for label, rgb in palettes.items():
+        (root / label).mkdir(parents=True)
+        for i in range(4):
+            (root / label / f"{i}.png").write_bytes(_png_bytes(rgb, seed=i))
+    model_path = tmp_path / "models" / "preference_model.pkl"
+    learner = PreferenceLearner(root, feature_store=FeatureStore(tmp_path / "store"))
+    learner.train(model_save_path=model_path)
+    return root, model_path, learner
+
+
+def test_judge_bytes_matches_path_judge(trained, tmp_path):
+    _, model_path, _ = trained
+    data = _png_bytes((210, 110, 50), seed=7)
+    img = tmp_path / "x.png"
+    img.write_bytes(data)
+    judge = PreferenceJudge(model_path)
+    from_path = judge.judge(img)
+    from_bytes = judge.judge_bytes(data)
+    assert from_bytes["probabilities"] == from_path["probabilities"]
+    assert from_bytes["verdict"] == from_path["verdict"]
+
+
+def test_batch_calls_predict_proba_once(trained, monkeypatch):
+    _, model_path, _ = trained
+    judge = PreferenceJudge(model_path)
+    calls = []
+    original = judge.learner.model.predict_proba
+    monkeypatch.setattr(
+        judge.learner.model, "predict_proba", lambda X: calls.append(X.shape) or original(X)
+    )
+    resident = ResidentJudge(model_path, workers=1)
+    resident.install(judge.learner)
+
+    blobs = [("a.png", _png_bytes((220, 120, 40))), ("bad.png", b"xx"), ("b.png", _png_bytes((40, 90, 200)))]
+    results = resident.judge_many(blobs)
+    assert calls == [(2, len(judge.learner.scaler.mean_))]
+    assert [r["file"] for r in results] == ["a.png", "bad.png", "b.png"]
+    assert "error" in results[1]
+    assert results[0]["label"] == "好き" and results[2]["label"] == "嫌い"
+
+
+def test_process_pool_featurization_keeps_order(trained):
+    _, model_path, _ = trained
+    resident = ResidentJudge(model_path, workers=2, min_parallel=2)
+    try:
+        blobs = [(f"{i}.png", _png_bytes((40 + 40 * i, 90, 90), seed=i)) for i in range(4)]
+        pooled = resident.judge_many(blobs)
+    finally:
+        resident.close()
+    serial = PreferenceJudge(model_path).judge_features(
+        [PreferenceJudge(model_path).judge_bytes(d)["features"] for _, d in blobs]
+    )
+    assert [r["probabilities"] for r in pooled] == [r["probabilities"] for r in serial]
+
+
+def test_resident_judge_reloads_only_when_model_changes(trained):
+    root, model_path, _ = trained
+    resident = ResidentJudge(model_path, workers=1)
+    first = resident.get()
+    assert resident.get() is first
+    assert resident.reloads == 1
+
+    PreferenceLearner(root, feature_store=FeatureStore(root.parent / "store")).train(
+        model_save_path=model_path
+    )
+    os.utime(model_path, ns=(1, 1))
+    assert resident.get() is not first
+    assert resident.reloads == 2
+    assert not model_path.with_name(model_path.name + ".tmp").exists()
+
+
+def test_server_judge_endpoints_and_latency_status(trained, monkeypatch):
+    import server
+
+    root, model_path, learner = trained
+    monkeypatch.setattr(server, "MODEL_PATH", model_path)
+    monkeypatch.setattr(server, "TRAINING_DIR", root)
+    monkeypatch.setattr(server, "feature_store", FeatureStore(root.parent / "store"))
+    monkeypatch.setattr(server, "feature_worker", None)
+    monkeypatch.setattr(server, "resident_judge", ResidentJudge(model_path, workers=1))
+    monkeypatch.setattr(server, "latency_stats", server.LatencyStats())
+    client = server.app.test_client()
+
+    res = client.post("/api/judge", data={"image": (io.BytesIO(_png_bytes((220, 120, 40))), "a.png")})
+    assert res.status_code == 200
+    assert res.get_json()["result"]["label"] == "好き"
+
+    res = client.post(
+        "/api/judge-batch",
+        data={"images": [
+            (io.BytesIO(_png_bytes((220, 120, 40))), "a.png"),
+            (io.BytesIO(_png_bytes((40, 90, 200))), "b.png"),
+        ]},
+    )
+    body = res.get_json()
+    assert body["count"] == 2
+    assert "features" not in body["results"][0]
+
+    status = client.get("/api/status").get_json()
+    assert status["judge_model"]["reloads"] == 1
+    assert status["latency"]["judge"]["requests"] == 1
+    assert status["latency"]["judge_batch"]["images_per_sec"] > 0
+
+
+def test_server_import_does_not_start_services():
+    # spawn ワーカーは python server.py の __main__ を __mp_main__ として読み直す
+    import subprocess
+
+    code = (
+        "import runpy, threading\n"
+        f"ns = runpy.run_path({str(TOOL_DIR / 'server.py')!r}, run_name='__mp_main__')\n"
+        "assert ns['feature_worker'] is None and ns['resident_judge'] is None\n"
+        "assert threading.active_count() == 1, threading.enumerate()\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""KI Learning クライアント（バッチ取り込み）テスト
+
+一時ディレクトリの learning.db / events.jsonl に対して、バッファリング、
+failure_patterns の upsert、旧DBの重複キー統合、複数プロセスからの同時報告を検証する。
+"""
+
+import json
+import multiprocessing as mp
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from knowledge.learning import AgentEvent, LearningClient  # noqa: E402
+
+
+def _failure(i: int = 0, **kw) -> AgentEvent:
+    base = dict(
+        agent="/desktop",
+        intent=f"click_{i}",
+        intent_class="click_send",
+        outcome="FAILURE",
+        signature_key="sig",
+        error_type="timeout",
+    )
+    base.update(kw)
+    return AgentEvent(**base)
+
+
+def _count(db: Path, sql: str):
+    con = sqlite3.connect(db)
+    try:
+        return con.execute(sql).fetchone()[0]
+    finally:
+        con.close()
+
+
+def test_report_outcome_buffers_until_batch_size(tmp_path):
+    db, audit = tmp_path / "learning.db", tmp_path / "events.jsonl"
+    client = LearningClient(db_path=db, events_path=audit, batch_size=5, flush_interval=60)
+    for i in range(4):
+        client.report_outcome(_failure(i))
+    assert _count(db, "SELECT COUNT(*) FROM events") == 0
+    assert not audit.exists()
+
+    client.report_outcome(_failure(4))
+    assert _count(db, "SELECT COUNT(*) FROM events") == 5
+    rows = [json.loads(line) for line in audit.read_text(encoding="utf-8").splitlines()]
+    assert [r["intent"] for r in rows] == [f"click_{i}" for i in range(5)]
+    assert all(r["ts_end"] for r in rows)
+
+    client.report_outcome(_failure(5))
+    # 読み取りは自分のバッファを先に書き出す
+    risks = client.get_risks(signature_key="sig", intent_class="click_send")
+    assert risks[0]["count"] == 6 and risks[0]["root_cause"] == "unknown"
+    client.close()
+    assert _count(db, "PRAGMA journal_mode") == "wal"
+
+
+def test_pending_events_flushed_by_timer_without_further_reports(tmp_path):
+    import time
+
+    db, audit = tmp_path / "learning.db", tmp_path / "events.jsonl"
+    client = LearningClient(db_path=db, events_path=audit, batch_size=64, flush_interval=0.2)
+    client.report_outcome(_failure(0))
+    assert _count(db, "SELECT COUNT(*) FROM events") == 0
+    # 以降の報告が無くても flush_interval 経過後に別接続から見える
+    time.sleep(0.6)
+    assert _count(db, "SELECT COUNT(*) FROM events") == 1
+    assert len(audit.read_text(encoding="utf-8").splitlines()) == 1
+    client.close()
+
+
+def test_failure_patterns_upsert_per_key(tmp_path):
+    db = tmp_path / "learning.db"
+    with LearningClient(db_path=db, events_path=tmp_path / "e.jsonl", batch_size=100) as client:
+        client.report_outcomes(
+            [_failure(0), _failure(1), _failure(2, error_type="ui_not_found"), _failure(3, outcome="SUCCESS")]
+        )
+    with LearningClient(db_path=db, events_path=tmp_path / "e.jsonl", batch_size=1) as client:
+        client.report_outcome(_failure(9, ts_end="2026-01-01T00:00:00+00:00"))
+        risks = client.get_risks(signature_key="sig", intent_class="click_send")
+    assert {(r["error_type"], r["count"]) for r in risks} == {("timeout", 3), ("ui_not_found", 1)}
+    assert next(r for r in risks if r["error_type"] == "timeout")["last_ts_end"] == "2026-01-01T00:00:00+00:00"
+    assert _count(db, "SELECT COUNT(*) FROM failure_patterns") == 2
+
+
+def test_existing_duplicate_patterns_are_merged(tmp_path):
+    db = tmp_path / "learning.db"
+    con = sqlite3.connect(db)
+    con.execute(
+        """
+        CREATE TABLE failure_patterns (
+          id INTEGER PRIMARY KEY AUTOINCREMENT, signature_key TEXT NOT NULL, intent_class TEXT NOT NULL,
+          error_type TEXT NOT NULL, root_cause TEXT NOT NULL, count INTEGER NOT NULL DEFAULT 0,
+          last_ts_end TEXT NOT NULL
+        )
+        """
+    )
+    con.executemany(
+        "INSERT INTO failure_patterns(signature_key, intent_class, error_type, root_cause, count, last_ts_end)"
+        " VALUES(?, ?, ?, ?, ?, ?)",
+        [
+            ("sig", "click_send", "timeout", "unknown", 2, "2026-01-01"),
+            ("sig", "click_send", "timeout", "unknown", 3, "2026-02-01"),
+            ("sig", "click_send", "parse", "json", 1, "2026-01-05"),
+        ],
+    )
+    con.commit()
+    con.close()
+
+    with LearningClient(db_path=db, events_path=tmp_path / "e.jsonl", batch_size=1) as client:
+        client.report_outcome(_failure(0, ts_end="2026-03-01"))
+        risks = client.get_risks(signature_key="sig", intent_class="click_send")
+    assert risks[0] == {"error_type": "timeout", "root_cause": "unknown", "count": 6, "last_ts_end": "2026-03-01"}
+    assert len(risks) == 2
+
+
+def _report_many(args):
+    db, audit, worker, count = args
+    with LearningClient(db_path=Path(db), events_path=Path(audit), batch_size=7) as client:
+        for i in range(count):
+            client.report_outcome(_failure(i, signature_key=f"sig{worker % 2}"))
+
+
+def test_concurrent_reporters_do_not_lose_events(tmp_path):
+    db, audit = tmp_path / "learning.db", tmp_path / "events.jsonl"
+    LearningClient(db_path=db, events_path=audit).close()
+    with mp.Pool(6) as pool:
+        pool.map(_report_many, [(str(db), str(audit), w, 120) for w in range(6)])
+
+    assert _count(db, "SELECT COUNT(*) FROM events") == 720
+    assert _count(db, "SELECT SUM(count) FROM failure_patterns") == 720
+    assert _count(db, "SELECT COUNT(*) FROM failure_patterns") == 2
+    lines = audit.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 720 and all(json.loads(line)["agent"] == "/desktop" for line in lines)
+
+
+def _outcome(intent: str, outcome: str, ts_end: str = "", signature_key: str = "sig") -> AgentEvent:
+    return AgentEvent(
+        agent="/desktop", intent=intent, intent_class="click_send", outcome=outcome,
+        signature_key=signature_key, ts_end=ts_end,
+    )
+
+
+def _legacy_rank(db: Path, intents, min_trials=3):
+    """旧 rank_intents（候補ごとの GROUP BY）"""
+    con = sqlite3.connect(db)
+    scores = {}
+    for intent in intents:
+        rows = con.execute(
+            "SELECT outcome, COUNT(*) FROM events WHERE agent=? AND intent_class=? AND intent=? AND signature_key=?"
+            " GROUP BY outcome",
+            ("/desktop", "click_send", intent, "sig"),
+        ).fetchall()
+        total = sum(c for _, c in rows)
+        success = sum(c for o, c in rows if o == "SUCCESS")
+        scores[intent] = (0.5, total) if total < min_trials else (success / max(1, total), total)
+    con.close()
+    return sorted(intents, key=lambda i: scores[i], reverse=True)
+
+
+def test_rank_intents_matches_legacy_group_by(tmp_path):
+    import random
+
+    rng = random.Random(7)
+    db = tmp_path / "learning.db"
+    intents = [f"i{k}" for k in range(6)]
+    with LearningClient(db_path=db, events_path=tmp_path / "e.jsonl", batch_size=13) as client:
+        client.report_outcomes(
+            _outcome(rng.choice(intents), rng.choice(["SUCCESS", "SUCCESS", "FAILURE", "PARTIAL"]))
+            for _ in range(400)
+        )
+        client.report_outcome(_outcome("rare", "SUCCESS"))
+        candidates = intents + ["rare", "unseen"]
+        ranked = client.rank_intents(agent="/desktop", intent_class="click_send", intents=candidates, signature_key="sig")
+    assert ranked == _legacy_rank(db, candidates)
+
+
+def test_intent_stats_backfilled_from_existing_events(tmp_path):
+    db = tmp_path / "learning.db"
+    with LearningClient(db_path=db, events_path=tmp_path / "e.jsonl", batch_size=1) as client:
+        client.report_outcomes([_outcome("a", "FAILURE")] * 3 + [_outcome("b", "SUCCESS")] * 3)
+    con = sqlite3.connect(db)
+    con.execute("DROP TABLE intent_stats")
+    con.commit()
+    con.close()
+
+    with LearningClient(db_path=db, events_path=tmp_path / "e.jsonl") as client:
+        scores = client.intent_scores(agent="/desktop", intent_class="click_send", intents=["a", "b"], signature_key="sig")
+    assert scores == {"a": (0.0, 3), "b": (1.0, 3)}
+
+
+def test_rank_cache_invalidated_by_other_writers(tmp_path):
+    db = tmp_path / "learning.db"
+    reader = LearningClient(db_path=db, events_path=tmp_path / "e.jsonl", batch_size=1)
+    writer = LearningClient(db_path=db, events_path=tmp_path / "e.jsonl", batch_size=1)
+    writer.report_outcomes([_outcome("a", "SUCCESS")] * 3 + [_outcome("b", "FAILURE")] * 3)
+    kwargs = dict(agent="/desktop", intent_class="click_send", intents=["b", "a"], signature_key="sig")
+    assert reader.rank_intents(**kwargs) == ["a", "b"]
+
+    queries = []
+    reader._con.set_trace_callback(queries.append)
+    assert reader.rank_intents(**kwargs) == ["a", "b"]
+    assert not [q for q in queries if "intent_stats" in q]
+
+    writer.report_outcomes([_outcome("b", "SUCCESS")] * 20 + [_outcome("a", "FAILURE")] * 20)
+    assert reader.rank_intents(**kwargs) == ["b", "a"]
+    assert [q for q in queries if "intent_stats" in q]
+    reader.close()
+    writer.close()
+
+
+def test_recency_and_bayes_scoring(tmp_path):
+    import datetime as dt
+
+    now = dt.datetime.now(dt.timezone.utc)
+    old = (now - dt.timedelta(days=120)).isoformat()
+    recent = now.isoformat()
+    with LearningClient(db_path=tmp_path / "learning.db", events_path=tmp_path / "e.jsonl", batch_size=5) as client:
+        # a: 昔は全勝、最近は全敗 / b: 昔は全敗、最近は全勝（件数は a が多い）
+        client.report_outcomes(
+            [_outcome("a", "SUCCESS", old)] * 12 + [_outcome("a", "FAILURE", recent)] * 4
+            + [_outcome("b", "FAILURE", old)] * 4 + [_outcome("b", "SUCCESS", recent)] * 4
+            + [_outcome("c", "SUCCESS", recent)]
+        )
+        kwargs = dict(agent="/desktop", intent_class="click_send", intents=["a", "b", "c"], signature_key="sig")
+        assert client.rank_intents(**kwargs)[:2] == ["a", "b"]
+        assert client.rank_intents(scoring="recency", **kwargs)[0] == "b"
+
+        bayes = client.intent_scores(scoring="bayes", prior_strength=2.0, **kwargs)
+        assert bayes["c"] == (2 / 3, 1)  # 1勝0敗でも事前分布で 0.5 側に引き戻す
+        assert bayes["a"][0] == (12 + 1) / (16 + 2)
+        try:
+            client.rank_intents(scoring="nope", **kwargs)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("unknown scoring must raise")
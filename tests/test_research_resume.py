@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+RESEARCH_ROOT = ROOT / ".agent" / "workflows" / "research"
+if str(RESEARCH_ROOT) not in sys.path:
+    sys.path.insert(0, str(RESEARCH_ROOT))
+
+from lib.checkpoints import CHECKPOINT_DIRNAME, CheckpointStore  # noqa: E402
+from lib.context import ResearchRunContext  # noqa: E402
+from lib.orchestrator import OrchestratorConfig, ResearchOrchestrator  # noqa: E402
+from lib.phase_runner import Phase  # noqa: E402
+from lib.tool_memo import ToolMemo  # noqa: E402
+from lib.tool_trace import call_tool  # noqa: E402
+
+
+class _CountingWebTools:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str]] = []
+
+    def search_web(self, query: str):
+        self.calls.append(("search", query))
+        return [{"url": "https://example.com/a", "published_at": None}]
+
+    def read_url_content(self, url: str):
+        self.calls.append(("fetch", url))
+        return "Example content for claim extraction. " * 5
+
+
+def _crash(context):  # noqa: ARG001
+    raise RuntimeError("verify crashed")
+
+
+def test_resume_continues_from_last_completed_phase(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RESEARCH_DISABLE_WORKFLOW_LOGGING", "1")
+    output_dir = tmp_path / "run"
+    memo_path = tmp_path / "memo.sqlite3"
+    tools = _CountingWebTools()
+
+    first = ResearchOrchestrator(
+        query="resume smoke",
+        config=OrchestratorConfig(output_dir=output_dir, verbose=False, tools=tools, memo_path=memo_path),
+        custom_handlers={Phase.VERIFY: _crash},
+    ).run()
+    assert first.final_report is None
+    head = CheckpointStore(output_dir / CHECKPOINT_DIRNAME).head()
+    assert head["next_phase"] == Phase.VERIFY.value
+    calls_before = len(tools.calls)
+    assert calls_before > 0
+
+    resumed = ResearchOrchestrator(
+        query="",
+        config=OrchestratorConfig(output_dir=output_dir, verbose=False, tools=tools, memo_path=memo_path, resume=True),
+    ).run()
+    summary = resumed.get_summary()
+    assert resumed.session_id == first.session_id and resumed.query == "resume smoke"
+    assert summary["has_report"] is True
+    assert summary["resumed_from_phase"] == Phase.VERIFY.value
+    assert resumed.evidence == first.evidence
+    # Phase 1〜2 は再実行しない（Phase 3.5 の反証検索・差し戻し後の Phase 3 は検索のみ）
+    assert all(kind == "search" for kind, _ in tools.calls[calls_before:])
+    assert [r["phase"] for r in resumed.phase_results][: len(first.phase_results) - 1] == [
+        r["phase"] for r in first.phase_results[:-1]
+    ]
+
+    stats = json.loads((output_dir / "run_stats.json").read_text(encoding="utf-8"))
+    assert stats["resumed"] is True and stats["resumed_from"]["next_phase"] == Phase.VERIFY.value
+    assert Phase.VERIFY.value in stats["phase_elapsed_sec"]
+    assert not {Phase.WIDE.value, Phase.NORMALIZE.value} & set(stats["phase_elapsed_sec"])
+    assert "tool_memo" in stats
+
+    with pytest.raises(ValueError):
+        ResearchOrchestrator(
+            query="another query",
+            config=OrchestratorConfig(output_dir=output_dir, verbose=False, resume=True),
+        )
+
+
+def test_rerun_replays_memoized_tool_calls(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("RESEARCH_DISABLE_WORKFLOW_LOGGING", "1")
+    memo_path = tmp_path / "memo.sqlite3"
+    tools = _CountingWebTools()
+
+    def run(name: str) -> ResearchRunContext:
+        cfg = OrchestratorConfig(output_dir=tmp_path / name, verbose=False, tools=tools, memo_path=memo_path)
+        return ResearchOrchestrator(query="memo smoke", config=cfg).run()
+
+    first = run("first")
+    calls_first = len(tools.calls)
+    second = run("second")
+    assert len(tools.calls) == calls_first  # 検索・取得はすべてメモから再生
+    assert second.evidence == first.evidence
+    memo_stats = second.run_stats["tool_memo"]
+    assert memo_stats["misses"] == 0 and memo_stats["hit_ratio"] == 1.0
+    assert second.get_summary()["tool_memo_hit_ratio"] == 1.0
+
+
+def test_tool_memo_ttl_and_unstorable_values(tmp_path) -> None:
+    now = [1000.0]
+    memo = ToolMemo(tmp_path / "m.sqlite3", ttl_sec=60, ttl_overrides={"slow": 600}, clock=lambda: now[0])
+    ctx = ResearchRunContext(tool_memo=memo)
+    calls: list[int] = []
+
+    def tool():
+        calls.append(1)
+        return {"n": len(calls)}
+
+    assert call_tool(ctx, tool_name="t", call=tool, args={"q": "x"}, memo=True) == {"n": 1}
+    assert call_tool(ctx, tool_name="t", call=tool, args={"q": "x"}, memo=True) == {"n": 1}
+    assert call_tool(ctx, tool_name="t", call=tool, args={"q": "x"}) == {"n": 2}  # memo 指定なし
+    assert call_tool(ctx, tool_name="t", call=tool, args={"len": 1}, memo={"q": "x"}) == {"n": 1}
+    assert memo.put("slow", {"q": "x"}, [1]) and not memo.put("t", {"q": "y"}, None)
+    assert not memo.put("t", {"q": "z"}, object())
+
+    now[0] += 61
+    assert memo.get("t", {"q": "x"}) == (False, None)
+    assert memo.get("slow", {"q": "x"}) == (True, [1])
+    assert memo.purge_expired() == 0
+    now[0] += 600
+    assert memo.purge_expired() == 2
+
+    stats = memo.stats()
+    assert (stats["hits"], stats["misses"], stats["unstorable"]) == (3, 2, 1)
+    assert stats["by_tool"]["t"] == {"hits": 2, "misses": 2}
+    memo.close()
+
+
+def test_tool_memo_does_not_store_rejected_results(tmp_path) -> None:
+    memo = ToolMemo(tmp_path / "m.sqlite3")
+    ctx = ResearchRunContext(tool_memo=memo)
+    responses = [[], "", [{"url": "https://example.com"}]]
+    calls: list[int] = []
+
+    def blocked_then_ok():
+        calls.append(1)
+        return responses[len(calls) - 1]
+
+    # ブロックされて空だった検索・本文はメモせず、次回は再実行する
+    assert call_tool(ctx, tool_name="tools.search_web", call=blocked_then_ok, args={"query": "q"}, memo=True, storable=bool) == []
+    assert call_tool(ctx, tool_name="tools.search_web", call=blocked_then_ok, args={"query": "q"}, memo=True, storable=bool) == ""
+    rows = call_tool(ctx, tool_name="tools.search_web", call=blocked_then_ok, args={"query": "q"}, memo=True, storable=bool)
+    assert call_tool(ctx, tool_name="tools.search_web", call=blocked_then_ok, args={"query": "q"}, memo=True, storable=bool) == rows
+    assert len(calls) == 3
+    stats = memo.stats()
+    assert (stats["stores"], stats["rejected"], stats["hits"]) == (1, 2, 1)
+    memo.close()
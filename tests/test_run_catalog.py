@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+AUTONOMY_DIR = ROOT / "scripts" / "autonomy"
+if str(AUTONOMY_DIR) not in sys.path:
+    sys.path.insert(0, str(AUTONOMY_DIR))
+
+from codex_log_resolver import (  # noqa: E402
+    find_research_output_violations,
+    list_agents,
+    log_root,
+    open_catalog,
+    recent_summaries,
+)
+from run_catalog import RunCatalog  # noqa: E402
+from workflow_logger import WorkflowLogger  # noqa: E402
+
+
+def _write_run(tmp_path: Path, agent: str, **inputs) -> dict:
+    logger = WorkflowLogger(agent=agent, workflow="catalog_case", workspace_root=tmp_path, capture_streams=False)
+    for key, value in inputs.items():
+        logger.set_input(key, value)
+    return logger.finalize()
+
+
+def test_finalize_records_run_without_refresh(tmp_path: Path) -> None:
+    summary = _write_run(tmp_path, "cat_a")
+    with RunCatalog(log_root(tmp_path), workspace_root=tmp_path) as catalog:
+        assert catalog.counts()["runs"] == 1
+        assert catalog.latest("cat_a")["run_id"] == summary["run_id"]
+        assert catalog.recent_summaries("cat_a", 5)[0]["run_id"] == summary["run_id"]
+
+
+def test_refresh_picks_up_unhooked_runs_and_skips_unchanged(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("WORKFLOW_LOG_CATALOG", "0")
+    first = _write_run(tmp_path, "cat_b")
+    assert not (log_root(tmp_path) / "_catalog.sqlite").exists()
+
+    with open_catalog(tmp_path, refresh=False) as catalog:
+        assert catalog.refresh()["summaries_read"] == 1
+        assert catalog.refresh()["summaries_read"] == 0  # 変化なしなら読み直さない
+
+        second = _write_run(tmp_path, "cat_b")
+        broken = log_root(tmp_path) / "cat_b" / "20000101"
+        broken.mkdir()
+        (broken / "x_summary.json").write_text("{", encoding="utf-8")
+        stats = catalog.refresh()
+        assert stats["summaries_read"] == 2
+        assert [s["run_id"] for s in catalog.recent_summaries("cat_b", 10)] == sorted(
+            [first["run_id"], second["run_id"]], reverse=True
+        )
+
+        (broken / "x_summary.json").unlink()
+        broken.rmdir()
+        catalog.refresh()
+        assert catalog.counts()["runs"] == 2
+
+    assert [s["run_id"] for s in recent_summaries("cat_b", last_n=1, workspace_root=tmp_path)] == [
+        max(first["run_id"], second["run_id"])
+    ]
+
+
+def test_rebuild_recovers_from_deleted_catalog_rows(tmp_path: Path) -> None:
+    _write_run(tmp_path, "cat_c")
+    _write_run(tmp_path, "cat_d")
+    with open_catalog(tmp_path) as catalog:
+        catalog._con.execute("DELETE FROM runs")
+        catalog._con.execute("DELETE FROM agents WHERE agent='cat_d'")
+        stats = catalog.rebuild()
+        assert stats["runs"] == 2
+    assert {row["agent"] for row in list_agents(workspace_root=tmp_path)} == {"cat_c", "cat_d"}
+    assert all(row["has_latest"] for row in list_agents(workspace_root=tmp_path))
+
+
+def test_research_outputs_indexed_and_matched_to_runs(tmp_path: Path) -> None:
+    root = tmp_path / "_outputs" / "research"
+    complete = root / "20260101_0000"
+    report_only = root / "20260102_0000"
+    for output_dir in (complete, report_only):
+        output_dir.mkdir(parents=True)
+        (output_dir / "final_report.md").write_text("# report\n", encoding="utf-8")
+    for name in ("audit_pack.json", "evidence.jsonl", "verified_claims.jsonl"):
+        (complete / name).write_text("{}", encoding="utf-8")
+
+    rows = find_research_output_violations(workspace_root=tmp_path)
+    assert [row["output_dir"] for row in rows] == [str(report_only)]
+    assert rows[0]["missing_required"] == ["audit_pack.json", "evidence.jsonl", "verified_claims.jsonl"]
+
+    (report_only / "extra_report.md").write_text("# extra\n", encoding="utf-8")
+    rows = find_research_output_violations(workspace_root=tmp_path)
+    assert rows[0]["custom_report_files"] == [str(report_only / "extra_report.md")]
+
+    summary = _write_run(tmp_path, "research", output_dir=str(complete))
+    with open_catalog(tmp_path) as catalog:
+        assert catalog.research_summary_for(complete)["run_id"] == summary["run_id"]
+        assert catalog.research_summary_for(report_only) is None
+        assert json.loads(json.dumps(catalog.research_outputs()))[0]["has_full_artifacts"] is True
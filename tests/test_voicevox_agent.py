@@ -555,5 +555,240 @@ class TestAccentVerifier:
         assert "accent_phrases" in result
 
 
+# ═══════════════════════════════════════════════
+# Layer 0: 形態素解析キャッシュ・バッチテスト
+# ═══════════════════════════════════════════════
+
+from エージェント.VOICEVOXエージェント.scripts import accent_verifier as _av
+from エージェント.VOICEVOXエージェント.scripts.accent_verifier import (
+    AccentAnalyzer,
+    normalize_text,
+    verify_accents_batch,
+)
+
+
+class _FakeWord:
+    def __init__(self, surface: str):
+        self.surface = surface
+        fields = ["名詞"] + ["*"] * 5 + [surface, "*", "*", surface] + ["*"] * 13 + ["1", "C1"]
+        self.feature = ",".join(fields)
+
+
+class _FakeTagger:
+    """1文字=1形態素として返すスタブタガー（呼び出し回数を記録）"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return [_FakeWord(ch) for ch in text if not ch.isspace()]
+
+
+@pytest.fixture
+def fake_tagger(monkeypatch):
+    tagger = _FakeTagger()
+    monkeypatch.setattr(_av, "_tagger", tagger)
+    monkeypatch.setattr(_av, "_analyzer", None)
+    yield tagger
+    _av.set_analyzer(None)
+
+
+class TestAccentAnalyzer:
+    """形態素解析キャッシュ（LRU/永続）とバッチAPIのテスト"""
+
+    def test_normalize_text(self):
+        assert normalize_text("  ＡＢＣ　テスト \n") == "ABC テスト"
+
+    def test_repeated_text_hits_cache(self, fake_tagger):
+        analyzer = AccentAnalyzer()
+        first = analyzer.analyze("テスト")
+        second = analyzer.analyze(" テスト ")
+        assert [m.surface for m in first] == [m.surface for m in second]
+        assert fake_tagger.calls == ["テスト"]
+        assert analyzer.stats()["hits"] == 1
+
+    def test_lru_evicts_oldest(self, fake_tagger):
+        analyzer = AccentAnalyzer(maxsize=2)
+        analyzer.analyze_batch(["ア", "イ", "ウ"])
+        analyzer.analyze("ア")
+        assert fake_tagger.calls == ["ア", "イ", "ウ", "ア"]
+
+    def test_batch_dedupes_and_keeps_order(self, fake_tagger):
+        analyzer = AccentAnalyzer()
+        results = analyzer.analyze_batch(["アイ", "ウ", "アイ"])
+        assert [[m.surface for m in r] for r in results] == [["ア", "イ"], ["ウ"], ["ア", "イ"]]
+        assert fake_tagger.calls == ["アイ", "ウ"]
+
+    def test_persistent_cache_survives_new_analyzer(self, fake_tagger, tmp_path):
+        path = tmp_path / "morph.sqlite"
+        first = AccentAnalyzer(cache_path=path)
+        expected = first.analyze("カキク")
+        first.close()
+
+        second = AccentAnalyzer(cache_path=path)
+        assert second.analyze("カキク") == expected
+        assert second.stats()["persistent_hits"] == 1
+        second.close()
+        assert fake_tagger.calls == ["カキク"]
+
+    def test_no_tagger_results_not_cached(self, monkeypatch):
+        monkeypatch.setattr(_av, "_get_tagger", lambda: None)
+        analyzer = AccentAnalyzer()
+        assert analyzer.analyze("テスト") == []
+        assert analyzer.stats()["size"] == 0
+
+    def test_fork_pool_matches_sequential(self, fake_tagger):
+        import multiprocessing
+        if "fork" not in multiprocessing.get_all_start_methods():
+            pytest.skip("fork 非対応環境")
+        texts = [f"テスト{i}" for i in range(20)]
+        sequential = AccentAnalyzer().analyze_batch(texts)
+        pooled = AccentAnalyzer(workers=2)
+        try:
+            assert pooled.analyze_batch(texts) == sequential
+        finally:
+            pooled.close()
+
+    def test_verify_accents_batch_matches_single(self, fake_tagger):
+        query = _make_query(2, 3)
+        texts = ["テスト文です", "テスト"]
+        batch = verify_accents_batch([(query, t) for t in texts])
+        single = [verify_accents(query, t) for t in texts]
+        assert [r.to_dict() for r in batch] == [r.to_dict() for r in single]
+
+    def test_benchmark_reports_throughput(self, fake_tagger):
+        from エージェント.VOICEVOXエージェント.scripts.accent_benchmark import run_benchmark
+        report = run_benchmark(segments=50)
+        modes = {r["mode"]: r for r in report["results"]}
+        assert set(modes) == {"cold", "warm", "batch"}
+        assert all(r["segments"] == 50 for r in modes.values())
+        assert report["warm_cache"]["hits"] > 0
+
+
+# ═══════════════════════════════════════════════
+# Layer 3B: F0転写（高速推定・キャッシュ・ベクトル化）テスト
+# ═══════════════════════════════════════════════
+
+
+@pytest.fixture
+def f0mod():
+    pytest.importorskip("numpy")
+    from エージェント.VOICEVOXエージェント.scripts import f0_transfer
+    return f0_transfer
+
+
+def _write_sine_wav(path, freq_hz, seconds=1.0, sr=24000, silence_sec=0.0):
+    import wave
+    import numpy as np
+    t = np.arange(int(sr * seconds)) / sr
+    y = 0.5 * np.sin(2 * np.pi * freq_hz * t)
+    y[: int(sr * silence_sec)] = 0.0
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes((y * 32767).astype("<i2").tobytes())
+    return path
+
+
+def _legacy_apply_f0(f0mod, query, f0_curve, sr=24000, hop_length=256, blend=0.7):
+    """ベクトル化前の逐次実装（比較用）"""
+    import numpy as np
+    accent_phrases = query["accent_phrases"]
+    frame_duration = hop_length / sr
+    base_hz = float(np.median(f0_curve[f0_curve > 0]))
+    current_time = 0.0
+    for pi, mi, duration in f0mod._estimate_mora_durations(accent_phrases):
+        if mi == -1:
+            current_time += duration
+            continue
+        frame_idx = int((current_time + duration / 2.0) / frame_duration)
+        if frame_idx < len(f0_curve):
+            sl = f0_curve[max(0, frame_idx - 1):min(len(f0_curve), frame_idx + 2)]
+            sl = sl[sl > 0]
+            if len(sl) > 0:
+                new_pitch = f0mod._hz_to_voicevox_pitch(float(np.mean(sl)), base_hz)
+                mora = accent_phrases[pi]["moras"][mi]
+                if mora.get("pitch", 0.0) > 0 and new_pitch > 0:
+                    mora["pitch"] = mora["pitch"] * (1.0 - blend) + new_pitch * blend
+        current_time += duration
+    return query
+
+
+class TestF0Transfer:
+    """F0抽出キャッシュ・YIN推定・ベクトル化マッピングのテスト"""
+
+    def test_yin_tracks_sine(self, f0mod, tmp_path):
+        import numpy as np
+        wav = _write_sine_wav(tmp_path / "a.wav", 220.0, silence_sec=0.25)
+        f0 = f0mod.extract_f0_curve(wav, method="yin", use_cache=False)
+        assert len(f0) == 1 + 24000 // 256
+        voiced = f0[f0 > 0]
+        assert abs(float(np.median(voiced)) - 220.0) < 2.0
+        assert not f0[:15].any(), "無音区間が有声判定された"
+
+    def test_cache_skips_reestimation(self, f0mod, tmp_path, monkeypatch):
+        wav = _write_sine_wav(tmp_path / "a.wav", 180.0)
+        calls = []
+        real = f0mod.F0_ESTIMATORS["yin"]
+        monkeypatch.setitem(
+            f0mod.F0_ESTIMATORS, "yin", lambda y, **kw: calls.append(1) or real(y, **kw)
+        )
+        first = f0mod.extract_f0_curve(wav, method="yin", cache_dir=tmp_path / "c")
+        second = f0mod.extract_f0_curve(wav, method="yin", cache_dir=tmp_path / "c")
+        assert (first == second).all()
+        assert len(calls) == 1
+        # パラメータが違えば別キー
+        f0mod.extract_f0_curve(wav, method="yin", hop_length=128, cache_dir=tmp_path / "c")
+        assert len(calls) == 2
+
+    def test_batch_preserves_order_and_dedupes(self, f0mod, tmp_path, monkeypatch):
+        import shutil
+        a = _write_sine_wav(tmp_path / "a.wav", 150.0)
+        b = _write_sine_wav(tmp_path / "b.wav", 300.0)
+        a_copy = tmp_path / "a_copy.wav"
+        shutil.copy(a, a_copy)
+        calls = []
+        real = f0mod.F0_ESTIMATORS["yin"]
+        monkeypatch.setitem(
+            f0mod.F0_ESTIMATORS, "yin", lambda y, **kw: calls.append(1) or real(y, **kw)
+        )
+        curves = f0mod.extract_f0_curves(
+            [a, b, a_copy, tmp_path / "missing.wav"], method="yin", cache_dir=tmp_path / "c",
+        )
+        assert curves[3] is None
+        assert (curves[0] == curves[2]).all()
+        assert curves[1][curves[1] > 0].mean() > curves[0][curves[0] > 0].mean()
+        assert len(calls) == 2  # 同一内容のコピーは1回だけ抽出
+
+    def test_pitch_array_matches_scalar(self, f0mod):
+        import numpy as np
+        hz = np.array([0.0, 80.0, 150.0, 300.0, 1200.0])
+        expected = [f0mod._hz_to_voicevox_pitch(float(v), 200.0) for v in hz]
+        assert np.allclose(f0mod._hz_to_voicevox_pitch_array(hz, 200.0), expected)
+
+    def test_vectorized_apply_matches_legacy(self, f0mod):
+        import copy
+        import numpy as np
+        rng = np.random.default_rng(0)
+        query = _make_query(5, 4)
+        for phrase in query["accent_phrases"]:
+            for mora in phrase["moras"]:
+                mora["consonant_length"] = float(rng.uniform(0.0, 0.05))
+                mora["vowel_length"] = float(rng.uniform(0.05, 0.15))
+            phrase["pause_mora"] = {"text": "、", "vowel_length": 0.2, "pitch": 0.0}
+        query["accent_phrases"][2]["moras"][1]["pitch"] = 0.0
+        f0 = rng.uniform(100.0, 250.0, 200)
+        f0[rng.random(200) < 0.3] = 0.0
+
+        expected = _legacy_apply_f0(f0mod, copy.deepcopy(query), f0)
+        actual = f0mod.apply_f0_to_query(copy.deepcopy(query), f0)
+        for pe, pa in zip(expected["accent_phrases"], actual["accent_phrases"]):
+            assert [m["pitch"] for m in pe["moras"]] == pytest.approx(
+                [m["pitch"] for m in pa["moras"]]
+            )
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
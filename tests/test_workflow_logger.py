@@ -100,3 +100,130 @@ def test_workflow_logger_does_not_redact_verification_pass_flag(tmp_path: Path)
     assert checks[0]["pass"] is True
     assert evidence["password"] == "***REDACTED***"
     assert evidence["note"] == "ok"
+
+
+def test_workflow_logger_async_writer_flushes_on_phase_end(tmp_path: Path) -> None:
+    logger = WorkflowLogger(
+        agent="async_agent",
+        workflow="async_flow",
+        workspace_root=tmp_path,
+        capture_streams=False,
+        flush_interval_ms=60_000,
+    )
+    with logger.phase("BULK"):
+        for i in range(500):
+            logger._capture_stream_line("stdout", f"line {i} token=sk-{'a' * 20}")
+    # フェーズ終了時点で、書き込み間隔を待たずにファイルへ出ている
+    events = _read_jsonl(logger.log_path)
+    assert events[-1]["event_type"] == "PHASE_END"
+    stream_events = [e for e in events if e["event_type"] == "STREAM_OUTPUT"]
+    assert len(stream_events) == 500
+    assert stream_events[0]["payload"]["text"] == "line 0 token=***REDACTED***"
+    assert [e["event_seq"] for e in events] == list(range(1, len(events) + 1))
+
+    summary = logger.finalize()
+    assert summary["event_writer"]["mode"] == "async"
+    assert summary["event_writer"]["events_written"] == summary["total_events"]
+    assert summary["total_events"] == len(_read_jsonl(logger.log_path))
+
+
+def test_workflow_logger_large_payload_artifact_precedes_event(tmp_path: Path) -> None:
+    for async_write in (True, False):
+        logger = WorkflowLogger(
+            agent=f"artifact_{int(async_write)}",
+            workspace_root=tmp_path,
+            capture_streams=False,
+            async_write=async_write,
+        )
+        logger.set_output("report", "x" * 5000)
+        summary = logger.finalize()
+        events = _read_jsonl(tmp_path / summary["log_path"])
+        types = [e["event_type"] for e in events]
+        idx = types.index("RUN_OUTPUT_SET")
+        assert types[idx - 1] == "ARTIFACT_WRITTEN"
+        assert events[idx]["payload"]["value"]["artifact_id"] == events[idx - 1]["payload"]["artifact"]["artifact_id"]
+        assert summary["total_events"] == len(events)
+
+
+def test_workflow_logger_drop_stream_overflow_policy(tmp_path: Path) -> None:
+    logger = WorkflowLogger(
+        agent="drop_agent",
+        workspace_root=tmp_path,
+        capture_streams=False,
+        overflow="drop_stream",
+        max_queue=4,
+        flush_interval_ms=60_000,
+        batch_size=1000,
+    )
+    for i in range(50):
+        logger._capture_stream_line("stdout", f"line {i}")
+    logger.add_metric("kept", 1)
+    summary = logger.finalize()
+    events = _read_jsonl(tmp_path / summary["log_path"])
+    dropped = summary["event_writer"]["dropped_events"]
+    assert dropped > 0
+    assert sum(e["event_type"] == "STREAM_OUTPUT" for e in events) == 50 - dropped
+    assert any(e["event_type"] == "RUN_METRIC_SET" for e in events)
+
+
+def test_workflow_logger_flushes_pending_events_at_exit(tmp_path: Path) -> None:
+    import subprocess
+
+    code = (
+        "import sys; sys.path.insert(0, %r)\n"
+        "from pathlib import Path\n"
+        "from workflow_logger import WorkflowLogger\n"
+        "lg = WorkflowLogger(agent='exit_agent', workspace_root=Path(%r), capture_streams=False, flush_interval_ms=60000)\n"
+        "for i in range(100): lg.add_metric('i', i)\n"
+        "print(lg.log_path)\n"
+    ) % (str(AUTONOMY_DIR), str(tmp_path))
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    events = _read_jsonl(Path(proc.stdout.strip()))
+    assert sum(e["event_type"] == "RUN_METRIC_SET" for e in events) == 100
+
+
+def test_workflow_logger_async_snapshots_payload_at_emit(tmp_path: Path) -> None:
+    logger = WorkflowLogger(
+        agent="snapshot_agent",
+        workspace_root=tmp_path,
+        capture_streams=False,
+        flush_interval_ms=60_000,
+    )
+    state = {"step": 1, "items": [1]}
+    cid = logger.log_tool_call("tool.x")
+    logger.log_tool_result(call_id=cid, status="ok", result=state)
+    state["step"] = 2
+    state["items"].append(2)
+    summary = logger.finalize()
+    events = _read_jsonl(tmp_path / summary["log_path"])
+    result = next(e for e in events if e["event_type"] == "TOOL_RESULT")
+    assert result["payload"]["result"] == {"step": 1, "items": [1]}
+
+
+def test_workflow_logger_bad_record_does_not_drop_batch(tmp_path: Path) -> None:
+    logger = WorkflowLogger(
+        agent="bad_record_agent",
+        workspace_root=tmp_path,
+        capture_streams=False,
+        flush_interval_ms=60_000,
+    )
+    original = logger._prepare_value
+
+    def prepare(key, value):
+        if key == "key" and value == "boom":
+            raise RuntimeError("cannot serialize")
+        return original(key, value)
+
+    logger._prepare_value = prepare
+    logger.add_metric("before", 1)
+    logger.add_metric("boom", 2)
+    logger.add_metric("after", 3)
+    summary = logger.finalize()
+    events = _read_jsonl(tmp_path / summary["log_path"])
+    metrics = [e for e in events if e["event_type"] == "RUN_METRIC_SET"]
+    assert [e["payload"].get("key") for e in metrics] == ["before", None, "after"]
+    assert metrics[1]["payload"]["error"] == "serialize failed: RuntimeError: cannot serialize"
+    assert [e["event_seq"] for e in events] == list(range(1, len(events) + 1))
+    assert summary["event_writer"]["serialize_errors"] == 1
+    assert summary["event_writer"]["write_errors"] == 0
@@ -9,13 +9,24 @@ BlenderのRPCサーバーに接続し、JSON-RPC over TCPで操作を送信す
     client.ping()
     client.add_cube(size=2.0)
     client.save_as("scene.blend")
+
+    # 応答を待たずに連続送信（パイプライン）
+    client.pipeline([("add_cube", {"size": 1.0}), ("add_sphere", {"radius": 0.5})])
+
+    # 1回のメインスレッド処理・アンドゥ1ステップでまとめて実行
+    client.batch([
+        ("add_cube", {"size": 1.0}),
+        ("transform", {"name": "$0.name", "location": [0, 0, 1]}),
+    ])
 """
 
 import json
 import os
 import socket
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+OpSpec = Union[Tuple[str, Dict[str, Any]], Tuple[str], Dict[str, Any]]
 
 
 class RpcError(RuntimeError):
@@ -30,6 +41,46 @@ class _TransientReceiveError(RuntimeError):
     """一時的な受信不整合を表す内部例外"""
 
 
+class _LineReader:
+    """ソケットから改行区切りで読む（bytearray バッファで余りを次の行へ持ち越す）"""
+
+    def __init__(self, sock: socket.socket, bufsize: int = 65536):
+        self._sock = sock
+        self._bufsize = bufsize
+        self._buf = bytearray()
+        self._scanned = 0
+
+    def readline(self) -> bytes:
+        while True:
+            nl = self._buf.find(b"\n", self._scanned)
+            if nl >= 0:
+                line = bytes(self._buf[:nl + 1])
+                del self._buf[:nl + 1]
+                self._scanned = 0
+                return line
+            self._scanned = len(self._buf)
+            chunk = self._sock.recv(self._bufsize)
+            if not chunk:
+                if not self._buf:
+                    raise _TransientReceiveError("empty response")
+                line = bytes(self._buf)
+                self._buf.clear()
+                self._scanned = 0
+                return line
+            self._buf += chunk
+
+
+def _normalize_ops(ops: Iterable[OpSpec]) -> List[Dict[str, Any]]:
+    """(method, params) / (method,) / {"method", "params"} を dict 形式へそろえる"""
+    out = []
+    for op in ops:
+        if isinstance(op, dict):
+            out.append({"method": op["method"], "params": op.get("params") or {}})
+        else:
+            out.append({"method": op[0], "params": (op[1] if len(op) > 1 else None) or {}})
+    return out
+
+
 class RpcClient:
     """Antigravity Bridge RPCクライアント"""
 
@@ -47,6 +98,7 @@ class RpcClient:
         self.reuse_connection = bool(reuse_connection)
         self._req_id = 0
         self._sock: Optional[socket.socket] = None
+        self._reader: Optional[_LineReader] = None
 
     def _connect(self) -> socket.socket:
         sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
@@ -61,6 +113,7 @@ class RpcClient:
         except Exception:
             pass
         self._sock = None
+        self._reader = None
 
     def close(self) -> None:
         self._disconnect()
@@ -71,39 +124,33 @@ class RpcClient:
     def __exit__(self, exc_type, exc, tb) -> None:
         self.close()
 
-    def _send_and_recv(self, msg: bytes) -> Dict[str, Any]:
-        if self.reuse_connection:
-            if self._sock is None:
-                self._sock = self._connect()
-            sock = self._sock
-            sock.sendall(msg)
-            data = b""
-            while not data.endswith(b"\n"):
-                chunk = sock.recv(65536)
-                if not chunk:
-                    if not data:
-                        raise _TransientReceiveError("empty response")
-                    break
-                data += chunk
-        else:
-            with self._connect() as sock:
-                sock.sendall(msg)
-                data = b""
-                while not data.endswith(b"\n"):
-                    chunk = sock.recv(65536)
-                    if not chunk:
-                        if not data:
-                            raise _TransientReceiveError("empty response")
-                        break
-                    data += chunk
+    def _persistent_reader(self) -> Tuple[socket.socket, _LineReader]:
+        if self._sock is None:
+            self._sock = self._connect()
+            self._reader = _LineReader(self._sock)
+        return self._sock, self._reader
 
+    @staticmethod
+    def _decode(line: bytes) -> Dict[str, Any]:
         try:
-            return json.loads(data.decode("utf-8", "replace"))
+            return json.loads(line.decode("utf-8", "replace"))
         except json.JSONDecodeError as e:
             raise _TransientReceiveError(f"invalid JSON response: {e}") from e
 
-    def _call(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        """RPCメソッドを呼び出す"""
+    def _send_and_recv(self, msg: bytes, req_id: Optional[int] = None) -> Dict[str, Any]:
+        if self.reuse_connection:
+            sock, reader = self._persistent_reader()
+            sock.sendall(msg)
+            while True:
+                resp = self._decode(reader.readline())
+                # 以前にタイムアウトした呼び出しの応答が残っていたら読み捨てる
+                if req_id is None or resp.get("id") in (req_id, None):
+                    return resp
+        with self._connect() as sock:
+            sock.sendall(msg)
+            return self._decode(_LineReader(sock).readline())
+
+    def _payload(self, method: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         self._req_id += 1
         payload = {
             "id": self._req_id,
@@ -112,7 +159,11 @@ class RpcClient:
         }
         if self.token:
             payload["token"] = self.token
+        return payload
 
+    def _call(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """RPCメソッドを呼び出す"""
+        payload = self._payload(method, params)
         msg = (json.dumps(payload) + "\n").encode("utf-8")
 
         last_exc: Optional[Exception] = None
@@ -122,7 +173,7 @@ class RpcClient:
 
         while True:
             try:
-                resp = self._send_and_recv(msg)
+                resp = self._send_and_recv(msg, payload["id"])
 
                 if "error" in resp:
                     rpc_error = RpcError(resp["error"])
@@ -150,12 +201,80 @@ class RpcClient:
 
         raise RuntimeError(f"RPC call failed after {attempts} attempts: {last_exc}") from last_exc
 
+    def pipeline(self, ops: Sequence[OpSpec], window: int = 16, raise_on_error: bool = True) -> List[Any]:
+        """応答を待たずに最大 window 件まで先行送信し、結果を ops の順で返す
+
+        非冪等な op を含むため再送はしない（通信失敗は RuntimeError）。
+        raise_on_error=True なら全応答を読み終えてから最初の RpcError を送出し、
+        False なら失敗した位置に RpcError を入れて返す。
+        """
+        calls = _normalize_ops(ops)
+        if not calls:
+            return []
+        window = max(1, int(window))
+        payloads = [self._payload(c["method"], c["params"]) for c in calls]
+        index_by_id = {p["id"]: i for i, p in enumerate(payloads)}
+        results: List[Any] = [None] * len(payloads)
+        received = 0
+        sent = 0
+
+        own_sock = None
+        try:
+            if self.reuse_connection:
+                sock, reader = self._persistent_reader()
+            else:
+                own_sock = sock = self._connect()
+                reader = _LineReader(sock)
+            while received < len(payloads):
+                if sent < len(payloads) and sent - received < window:
+                    end = min(len(payloads), received + window)
+                    sock.sendall(b"".join((json.dumps(p) + "\n").encode("utf-8") for p in payloads[sent:end]))
+                    sent = end
+                resp = self._decode(reader.readline())
+                idx = index_by_id.get(resp.get("id"))
+                if idx is None:
+                    if resp.get("id") is None and "error" in resp:
+                        raise RpcError(resp["error"])
+                    continue
+                results[idx] = RpcError(resp["error"]) if "error" in resp else resp.get("result")
+                received += 1
+        except RpcError:
+            self._disconnect()
+            raise
+        except (socket.timeout, TimeoutError, OSError, _TransientReceiveError) as e:
+            self._disconnect()
+            raise RuntimeError(f"RPC pipeline failed after {received}/{len(payloads)} responses: {e}") from e
+        finally:
+            if own_sock is not None:
+                own_sock.close()
+
+        if raise_on_error:
+            for r in results:
+                if isinstance(r, RpcError):
+                    raise r
+        return results
+
+    def batch(self, ops: Sequence[OpSpec], atomic: bool = True, undo_label: str = "AG batch") -> dict:
+        """ops をサーバー側の1回のメインスレッド処理で実行する（アンドゥ1ステップ）
+
+        params 内の "$<index>.<key>" は先行 op の結果に置き換わる（例: "$0.name"）。
+        """
+        return self._call("batch", {"ops": _normalize_ops(ops), "atomic": bool(atomic), "undo_label": undo_label})
+
     # ---- 便利メソッド ----
 
     def ping(self) -> dict:
         """疎通確認"""
         return self._call("ping")
 
+    def run_script(self, path: str, argv: Optional[list] = None, blend_file: Optional[str] = None,
+                   factory_startup: bool = True, log_file: Optional[str] = None) -> dict:
+        """Pythonスクリプトをサーバープロセス内で実行（AG_RPC_ENABLE_RUN_SCRIPT=1 のサーバーのみ）"""
+        return self._call("run_script", {
+            "path": path, "argv": list(argv or []), "blend_file": blend_file,
+            "factory_startup": factory_startup, "log_file": log_file,
+        })
+
     def reset_scene(self) -> dict:
         """シーン初期化"""
         return self._call("reset_scene")
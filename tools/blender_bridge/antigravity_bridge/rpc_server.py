@@ -8,14 +8,25 @@ AIエージェントからBlenderを操作するためのRPCサーバーを提
 - ネットワーク受信は別スレッド
 - bpy操作は必ずメインスレッドで実行（キュー＋bpy.app.timers）
 - 許可されたオペレーションのみ実行（ホワイトリスト方式）
+
+プロトコル:
+- 1行JSON = 1リクエスト。1接続で応答を待たずに複数リクエストを送ってよい（パイプライン）。
+  応答は id 付きで、受信順に返す（メインスレッドのキューは FIFO）。
+- batch メソッドは ops のリストを1回のメインスレッド処理でまとめて実行し、
+  アンドゥ1ステップにまとめる（atomic=True なら途中失敗で巻き戻す）。
 """
 
+import contextlib
 import json
 import os
 import queue
+import runpy
 import socket
 import socketserver
+import sys
 import threading
+import time
+import traceback
 from concurrent.futures import Future
 from typing import Any, Callable, Dict, Optional
 
@@ -69,30 +80,45 @@ _AG_RPC_ENABLE_EXEC_PYTHON = _read_env_bool("AG_RPC_ENABLE_EXEC_PYTHON", default
 _AG_RPC_CONNECTION_WAIT_MS = _read_env_float("AG_RPC_CONNECTION_WAIT_MS", 150.0, min_value=0.0)
 _AG_RPC_READ_TIMEOUT_S = _read_env_float("AG_RPC_READ_TIMEOUT_S", 30.0, min_value=0.1)
 _AG_RPC_REQUEST_BACKLOG = _read_env_int("AG_RPC_REQUEST_BACKLOG", 16, min_value=1)
+_AG_RPC_ENABLE_RUN_SCRIPT = _read_env_bool("AG_RPC_ENABLE_RUN_SCRIPT", default=False)
+_AG_RPC_SCRIPT_TIMEOUT_S = _read_env_float("AG_RPC_SCRIPT_TIMEOUT_S", 1800.0, min_value=1.0)
+_AG_RPC_MAX_INFLIGHT = _read_env_int("AG_RPC_MAX_INFLIGHT", 32, min_value=1)
+_AG_RPC_MAX_BATCH_OPS = _read_env_int("AG_RPC_MAX_BATCH_OPS", 1000, min_value=1)
+_AG_RPC_TICK_BUDGET_MS = _read_env_float("AG_RPC_TICK_BUDGET_MS", 8.0, min_value=0.1)
 
 # ---- メインスレッド実行キュー ----
 _main_thread_q: "queue.Queue[tuple[Callable[..., Any], dict, Future]]" = queue.Queue(maxsize=_AG_RPC_MAX_QUEUE)
 _connection_semaphore = threading.BoundedSemaphore(_AG_RPC_MAX_CONNECTIONS)
 _server = None
 _server_thread = None
+# serve_blocking() 実行中（--background 常駐ワーカー）は shutdown でループを抜ける
+_blocking_stop: Optional[threading.Event] = None
+
+
+def _run_queued(fn: Callable[..., Any], params: dict, fut: Future) -> None:
+    """キューから取り出した1件をメインスレッドで実行し、結果をFutureへ返す"""
+    try:
+        result = fn(**params)
+        fut.set_result(result)
+    except Exception as e:
+        fut.set_exception(e)
 
 
 def _pump_main_thread() -> float:
-    """Blenderのメインスレッドでキューを処理する（タイマーコールバック）"""
-    processed = 0
-    while processed < 50:  # 1tickで処理しすぎない
+    """Blenderのメインスレッドでキューを処理する（タイマーコールバック）
+
+    件数ではなく時間予算（AG_RPC_TICK_BUDGET_MS）で区切る。予算切れで残りがあれば
+    次のtickをすぐ回し、空なら0.01秒後に再実行する。
+    """
+    deadline = time.perf_counter() + _AG_RPC_TICK_BUDGET_MS / 1000.0
+    while True:
         try:
             fn, params, fut = _main_thread_q.get_nowait()
         except queue.Empty:
-            break
-        try:
-            result = fn(**params)
-            fut.set_result(result)
-        except Exception as e:
-            fut.set_exception(e)
-        processed += 1
-    # 0.01秒ごとに再実行（継続）
-    return 0.01
+            return 0.01
+        _run_queued(fn, params, fut)
+        if time.perf_counter() >= deadline:
+            return 0.0 if not _main_thread_q.empty() else 0.01
 
 
 # ---- 許可されたオペレーション（ホワイトリスト） ----
@@ -338,12 +364,128 @@ def _op_exec_python(code: str) -> dict:
     return {"ok": True, "result": str(result) if result is not None else None}
 
 
+def _op_run_script(path: str, argv: Optional[list] = None, blend_file: Optional[str] = None,
+                   factory_startup: bool = True, log_file: Optional[str] = None) -> dict:
+    """Pythonスクリプトをこのプロセス内で実行（常駐ワーカー用）
+
+    `blender --background [--factory-startup] [blend] --python path -- argv` と同じ前提を作る:
+    実行前に blend_file を開くか、スタートアップシーンへ戻してから
+    sys.argv を差し替えて __main__ として実行する。出力は log_file に追記する。
+    """
+    if blend_file:
+        bpy.ops.wm.open_mainfile(filepath=blend_file, load_ui=False)
+    else:
+        bpy.ops.wm.read_homefile(use_factory_startup=bool(factory_startup))
+
+    saved_argv = sys.argv
+    sys.argv = [bpy.app.binary_path or "blender", "--background", "--python", path, "--", *(argv or [])]
+    started = time.perf_counter()
+    try:
+        with contextlib.ExitStack() as stack:
+            if log_file:
+                log = stack.enter_context(open(log_file, "a", encoding="utf-8", errors="replace"))
+                stack.enter_context(contextlib.redirect_stdout(log))
+                stack.enter_context(contextlib.redirect_stderr(log))
+            try:
+                runpy.run_path(path, run_name="__main__")
+            except SystemExit as e:
+                if e.code not in (None, 0):
+                    raise RuntimeError(f"スクリプトが終了コード {e.code} で終了: {path}") from None
+            except Exception:
+                traceback.print_exc()
+                raise
+    finally:
+        sys.argv = saved_argv
+    return {"ok": True, "elapsed_sec": round(time.perf_counter() - started, 3)}
+
+
 def _op_shutdown() -> dict:
     """Blenderを終了"""
+    if _blocking_stop is not None:
+        # serve_blocking() のループを抜ければ --background の Blender は終了する
+        _blocking_stop.set()
+        return {"ok": True}
     bpy.ops.wm.quit_blender()
     return {"ok": True}
 
 
+# batch の中から呼べないメソッド（ファイル切替・プロセス制御・入れ子）
+_BATCH_EXCLUDED = {"batch", "shutdown", "run_script", "open", "reset_scene", "undo_step", "redo_step"}
+
+
+def _resolve_refs(value: Any, results: list) -> Any:
+    """"$<index>.<key>" を先行opの結果で置き換える（例: "$0.name"）"""
+    if isinstance(value, str) and value.startswith("$") and "." in value:
+        head, key = value[1:].split(".", 1)
+        if head.isdigit() and int(head) < len(results) and isinstance(results[int(head)], dict):
+            return results[int(head)].get(key, value)
+        return value
+    if isinstance(value, list):
+        return [_resolve_refs(v, results) for v in value]
+    if isinstance(value, dict):
+        return {k: _resolve_refs(v, results) for k, v in value.items()}
+    return value
+
+
+def _undo_push(message: str) -> bool:
+    """アンドゥステップを積む（--background などで不可なら False）"""
+    try:
+        bpy.ops.ed.undo_push(message=message)
+        return True
+    except Exception:
+        return False
+
+
+def _op_batch(ops: list, atomic: bool = True, undo_label: str = "AG batch") -> dict:
+    """複数opを1回のメインスレッド処理で実行し、アンドゥ1ステップにまとめる
+
+    ops は {"method": ..., "params": {...}} のリスト。params 内の "$<index>.<key>" は
+    それまでのopの結果で置き換える。成功時に undo_label のステップを1つだけ積む。
+    atomic=True のときは例外または {"ok": False} で打ち切り、直前のアンドゥステップ
+    （バッチ前の状態）へ巻き戻してエラーにする。
+    """
+    if not isinstance(ops, list):
+        raise ValueError("ops はリストで指定してください")
+    if len(ops) > _AG_RPC_MAX_BATCH_OPS:
+        raise ValueError(f"ops が多すぎます: {len(ops)} > {_AG_RPC_MAX_BATCH_OPS}")
+    steps = []
+    for i, op in enumerate(ops):
+        method = op.get("method") if isinstance(op, dict) else None
+        if method not in _METHODS or method in _BATCH_EXCLUDED:
+            raise ValueError(f"ops[{i}]: batch で使えないメソッド: {method}")
+        if method == "exec_python" and not _AG_RPC_ENABLE_EXEC_PYTHON:
+            raise ValueError(f"ops[{i}]: DEBUG_DISABLED")
+        steps.append((method, _METHODS[method], op.get("params") or {}))
+
+    started = time.perf_counter()
+    results: list = []
+    for i, (method, fn, params) in enumerate(steps):
+        try:
+            result = fn(**_resolve_refs(params, results))
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+        if atomic and isinstance(result, dict) and result.get("ok") is False:
+            rolled_back = False
+            if _undo_push(f"{undo_label} (failed)"):
+                try:
+                    bpy.ops.ed.undo()
+                    rolled_back = True
+                except Exception:
+                    pass
+            raise RuntimeError(
+                f"batch ops[{i}] {method} failed: {result.get('error', 'ok=False')} "
+                f"(rolled_back={rolled_back})"
+            )
+        results.append(result)
+    _undo_push(undo_label)
+    return {
+        "ok": True,
+        "count": len(results),
+        "results": results,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
+    }
+
+
 # ---- メソッド登録テーブル ----
 _METHODS = {
     "ping": _op_ping,
@@ -368,12 +510,24 @@ _METHODS = {
     "save_as": _op_save_as,
     "open": _op_open,
     "exec_python": _op_exec_python,
+    "run_script": _op_run_script,
+    "batch": _op_batch,
     "shutdown": _op_shutdown,
 }
 
+# 既定（60秒）より長く待つメソッド
+_METHOD_TIMEOUT_S = {
+    "run_script": _AG_RPC_SCRIPT_TIMEOUT_S,
+}
+
 
 class _JsonLineHandler(socketserver.StreamRequestHandler):
-    """1行JSON = 1リクエストのハンドラ"""
+    """1行JSON = 1リクエストのハンドラ
+
+    受信スレッド（handle）はリクエストをメインスレッドキューへ積むだけで応答を待たない。
+    応答は接続ごとの送信スレッドが受信順に Future を待って返す。未応答数は
+    AG_RPC_MAX_INFLIGHT で制限し、超えたら受信を止めてTCPの背圧に任せる。
+    """
 
     def _send_json(self, payload: Dict[str, Any]) -> None:
         """改行終端JSONを送信してflushする"""
@@ -384,7 +538,8 @@ class _JsonLineHandler(socketserver.StreamRequestHandler):
             # クライアント切断時の送信失敗は無視
             pass
 
-    def _handle_request_json(self, req: Dict[str, Any]) -> Dict[str, Any]:
+    def _submit_request_json(self, req: Dict[str, Any]):
+        """検証してキューへ積む。即時エラーなら応答dict、積めたら (id, method, Future) を返す"""
         req_id = req.get("id")
         method = req.get("method")
         params = req.get("params") or {}
@@ -403,6 +558,10 @@ class _JsonLineHandler(socketserver.StreamRequestHandler):
             resp["error"] = {"code": -32020, "message": "DEBUG_DISABLED"}
             return resp
 
+        if method == "run_script" and not _AG_RPC_ENABLE_RUN_SCRIPT:
+            resp["error"] = {"code": -32021, "message": "RUN_SCRIPT_DISABLED"}
+            return resp
+
         if _main_thread_q.qsize() >= _AG_RPC_MAX_QUEUE:
             resp["error"] = {"code": -32002, "message": "BUSY_QUEUE_FULL"}
             return resp
@@ -413,14 +572,54 @@ class _JsonLineHandler(socketserver.StreamRequestHandler):
         except queue.Full:
             resp["error"] = {"code": -32002, "message": "BUSY_QUEUE_FULL"}
             return resp
+        return req_id, method, fut
 
+    @staticmethod
+    def _await_response(req_id: Any, method: str, fut: Future) -> Dict[str, Any]:
+        resp: Dict[str, Any] = {"id": req_id}
         try:
-            result = fut.result(timeout=60)  # タイムアウトはメソッドに応じて調整可能
+            result = fut.result(timeout=_METHOD_TIMEOUT_S.get(method, 60))
             resp["result"] = result
         except Exception as e:
             resp["error"] = {"code": -32000, "message": str(e)}
         return resp
 
+    def _write_responses(self, pending: "queue.Queue") -> None:
+        """送信スレッド: 受信順に応答を返す（None で終了）"""
+        while True:
+            entry = pending.get()
+            try:
+                if entry is None:
+                    return
+                self._send_json(entry if isinstance(entry, dict) else self._await_response(*entry))
+            finally:
+                pending.task_done()
+
+    def _read_lines(self, pending: "queue.Queue"):
+        """recv をまとめて読み、改行ごとに返す。応答待ちがある間の読み取りタイムアウトは継続する"""
+        buf = bytearray()
+        start = 0
+        while True:
+            nl = buf.find(b"\n", start)
+            if nl >= 0:
+                line = bytes(buf[:nl])
+                del buf[:nl + 1]
+                start = 0
+                yield line
+                continue
+            start = len(buf)
+            try:
+                chunk = self.connection.recv(65536)
+            except (TimeoutError, socket.timeout):
+                if pending.unfinished_tasks:
+                    continue
+                raise
+            if not chunk:
+                if buf:
+                    yield bytes(buf)
+                return
+            buf += chunk
+
     def handle(self):
         wait_s = max(0.0, float(_AG_RPC_CONNECTION_WAIT_MS) / 1000.0)
         acquired = _connection_semaphore.acquire(timeout=wait_s) if wait_s > 0 else _connection_semaphore.acquire(blocking=False)
@@ -429,13 +628,13 @@ class _JsonLineHandler(socketserver.StreamRequestHandler):
             self._send_json(resp)
             return
 
+        pending: "queue.Queue" = queue.Queue(maxsize=_AG_RPC_MAX_INFLIGHT)
+        writer = threading.Thread(target=self._write_responses, args=(pending,), name="antigravity_rpc_writer", daemon=True)
+        writer.start()
         try:
             self.connection.settimeout(float(_AG_RPC_READ_TIMEOUT_S))
-            # Keep the same connection open to process multiple JSON-RPC lines.
-            while True:
-                raw_line = self.rfile.readline()
-                if not raw_line:
-                    break
+            # Keep the same connection open to process multiple (pipelined) JSON-RPC lines.
+            for raw_line in self._read_lines(pending):
                 raw = raw_line.decode("utf-8", "replace").strip()
                 if not raw:
                     continue
@@ -443,18 +642,17 @@ class _JsonLineHandler(socketserver.StreamRequestHandler):
                 try:
                     req = json.loads(raw)
                 except json.JSONDecodeError as e:
-                    self._send_json({"id": None, "error": {"code": -32700, "message": f"JSONパースエラー: {e}"}})
+                    pending.put({"id": None, "error": {"code": -32700, "message": f"JSONパースエラー: {e}"}})
                     continue
 
-                resp = self._handle_request_json(req)
-                self._send_json(resp)
+                pending.put(self._submit_request_json(req))
         except (TimeoutError, socket.timeout):
-            resp = {"id": None, "error": {"code": -32042, "message": "CONNECTION_TIMEOUT"}}
-            self._send_json(resp)
+            pending.put({"id": None, "error": {"code": -32042, "message": "CONNECTION_TIMEOUT"}})
         except OSError as e:
-            resp = {"id": None, "error": {"code": -32043, "message": f"SOCKET_ERROR: {e}"}}
-            self._send_json(resp)
+            pending.put({"id": None, "error": {"code": -32043, "message": f"SOCKET_ERROR: {e}"}})
         finally:
+            pending.put(None)
+            writer.join()
             try:
                 _connection_semaphore.release()
             except ValueError:
@@ -502,3 +700,38 @@ def stop():
     _server = None
     _server_thread = None
     print("[antigravity_bridge] RPCサーバー停止")
+
+
+def serve_blocking(host: str = "127.0.0.1", port: int = 8765, poll_interval: float = 0.2) -> None:
+    """--background 用: RPCサーバーを開始し、メインスレッドでキューを処理し続ける
+
+    --background では bpy.app.timers が回らないため、start() の代わりにこちらを使う。
+    shutdown メソッドを受けるとループを抜けて戻る（スクリプト終了で Blender も終了する）。
+    """
+    global _server, _server_thread, _blocking_stop
+
+    if _server is not None:
+        print(f"[antigravity_bridge] サーバーは既に起動中 ({host}:{port})")
+        return
+
+    _blocking_stop = threading.Event()
+    _server = _ThreadingTCPServer((host, port), _JsonLineHandler)
+    _server_thread = threading.Thread(
+        target=lambda: _server.serve_forever(poll_interval=0.2), name="antigravity_rpc", daemon=True
+    )
+    _server_thread.start()
+    print(f"[antigravity_bridge] RPCサーバー開始（常駐モード）: {host}:{port}")
+    print(f"[AG] RPC READY {host}:{port}", flush=True)
+
+    try:
+        while not _blocking_stop.is_set():
+            try:
+                fn, params, fut = _main_thread_q.get(timeout=poll_interval)
+            except queue.Empty:
+                continue
+            _run_queued(fn, params, fut)
+    finally:
+        # shutdown の応答を送り終えるまで少し待ってから閉じる
+        time.sleep(0.05)
+        stop()
+        _blocking_stop = None
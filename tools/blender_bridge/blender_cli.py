@@ -173,6 +173,7 @@ class BlenderCLI:
         log_file: Optional[str] = None,
         timeout: int = 600,
         env_extra: Optional[dict] = None,
+        threads: Optional[int] = None,
     ) -> Path:
         """
         Blender CLIでレンダリング実行
@@ -185,6 +186,7 @@ class BlenderCLI:
             device: デバイス（GPU/CPU）
             log_file: ログ出力先
             timeout: タイムアウト秒数
+            threads: レンダスレッド数（--threads。省略時はBlenderの自動設定）
 
         Returns:
             出力ファイルのPath
@@ -237,6 +239,9 @@ print("[AG] レンダ設定完了")
         if log_file:
             cmd.extend(["--log-file", log_file])
 
+        if threads:
+            cmd.extend(["--threads", str(int(threads))])
+
         cmd.extend([
             "--python-expr", setup_expr,
             "--render-frame", str(frame),
@@ -27,6 +27,8 @@ from blender_cli import BlenderCLI, BlenderCLIError, DEFAULT_BLENDER_EXE
 from character_blueprint import build_character_blueprint
 from character_spec import apply_repair_actions, normalize_character_spec, validate_character_spec
 from model_self_review import build_self_review
+from render_farm import CandidateSearch, RenderFarm, repair_candidates
+from warm_worker import WORKER_MODES, WarmBlenderWorker
 
 
 def validate_against_contract(data: Dict[str, Any], schema: Dict[str, Any]) -> List[str]:
@@ -87,6 +89,16 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--samples", type=int, default=None)
     parser.add_argument("--score-threshold", type=float, default=84.0)
     parser.add_argument("--blender-exe", default=DEFAULT_BLENDER_EXE)
+    parser.add_argument(
+        "--blender-worker",
+        choices=WORKER_MODES,
+        default="warm",
+        help="warm: 常駐Blenderで build/validate を実行 / cold: 毎回 blender を起動",
+    )
+    parser.add_argument("--render-workers", type=int, default=0, help="0: build内で順次レンダ / N: N個のBlenderで視点を並列レンダ")
+    parser.add_argument("--render-threads", type=int, default=0, help="レンダワーカー1つあたりのスレッド数（0=自動）")
+    parser.add_argument("--render-device", default="CPU")
+    parser.add_argument("--search-width", type=int, default=1, help="各反復で並列評価する修正候補数")
     parser.add_argument("--preset-json", default="")
 
     parser.add_argument("--asset-manifest", default="")
@@ -179,8 +191,10 @@ def _build_and_validate_iteration(
     blueprint_path: Path,
     samples: Optional[int],
     score_threshold: float,
+    prefix: str = "",
+    render_farm: Optional[RenderFarm] = None,
 ) -> Dict[str, Any]:
-    prefix = f"iter_{iter_idx:02d}"
+    prefix = prefix or f"iter_{iter_idx:02d}"
     blend_path = run_dir / f"{prefix}.blend"
     validation_path = run_dir / f"validation_{prefix}.json"
     build_log = run_dir / f"{prefix}_build.log"
@@ -200,6 +214,9 @@ def _build_and_validate_iteration(
     ]
     if samples is not None:
         build_args.extend(["--samples", str(samples)])
+    plan_path = run_dir / f"{prefix}_render_plan.json"
+    if render_farm is not None:
+        build_args.extend(["--defer-render", str(plan_path)])
 
     cli.run_script(
         str(build_script),
@@ -208,6 +225,8 @@ def _build_and_validate_iteration(
         timeout=1200,
         factory_startup=True,
     )
+    if render_farm is not None:
+        render_farm.render_plan(plan_path)
 
     cli.run_script(
         str(validate_script),
@@ -398,30 +417,45 @@ def main() -> int:
         return 0
 
     cli = BlenderCLI(args.blender_exe)
+    runner = WarmBlenderWorker(cli, run_dir / "warm_worker", warm=args.blender_worker == "warm")
+    farm = RenderFarm(
+        cli,
+        workers=args.render_workers,
+        threads_per_worker=args.render_threads or None,
+        device=args.render_device,
+    ) if args.render_workers > 0 else None
+    search = CandidateSearch(runner, cli)
     max_iterations = int(max(1, args.max_iterations))
     current_spec = spec
+    candidates = [(spec, [])]
     final_iter: Optional[Dict[str, Any]] = None
     best_iter: Optional[Dict[str, Any]] = None
 
     try:
         for idx in range(max_iterations):
-            iter_spec_path = run_dir / f"character_spec_iter_{idx:02d}.json"
-            _write_json(iter_spec_path, current_spec)
-            iter_blueprint = build_character_blueprint(current_spec)
-            iter_blueprint_path = run_dir / f"character_blueprint_iter_{idx:02d}.json"
-            _write_json(iter_blueprint_path, iter_blueprint)
-
-            iter_result = _build_and_validate_iteration(
-                cli=cli,
-                build_script=build_script,
-                validate_script=validate_script,
-                run_dir=run_dir,
-                iter_idx=idx,
-                spec_path=iter_spec_path,
-                blueprint_path=iter_blueprint_path,
-                samples=args.samples,
-                score_threshold=float(max(0.0, min(100.0, args.score_threshold))),
-            )
+            def _evaluate(slot_runner, cand_spec: Dict[str, Any], prefix: str) -> Dict[str, Any]:
+                cand_spec_path = run_dir / f"character_spec_{prefix}.json"
+                _write_json(cand_spec_path, cand_spec)
+                cand_blueprint_path = run_dir / f"character_blueprint_{prefix}.json"
+                _write_json(cand_blueprint_path, build_character_blueprint(cand_spec))
+                return _build_and_validate_iteration(
+                    cli=slot_runner,
+                    build_script=build_script,
+                    validate_script=validate_script,
+                    run_dir=run_dir,
+                    iter_idx=idx,
+                    spec_path=cand_spec_path,
+                    blueprint_path=cand_blueprint_path,
+                    samples=args.samples,
+                    score_threshold=float(max(0.0, min(100.0, args.score_threshold))),
+                    prefix=prefix,
+                    render_farm=farm,
+                )
+
+            iter_result, current_spec, applied = search.evaluate(idx, candidates, _evaluate)
+            if applied:
+                # 並列評価した候補のうち採用された修正（候補0とは限らない）
+                run_report["notes"].append(f"{iter_result['prefix']} repair applied: {', '.join(applied)}")
             run_report["iterations"].append(
                 {
                     "index": iter_result["index"],
@@ -431,6 +465,8 @@ def main() -> int:
                     "artifacts": iter_result["artifacts"],
                 }
             )
+            if "candidates" in iter_result:
+                run_report["iterations"][-1]["candidates"] = iter_result["candidates"]
 
             validation_errors = validate_against_contract(iter_result["validation"], validation_contract)
             if validation_errors:
@@ -455,24 +491,35 @@ def main() -> int:
                 break
 
             actions = iter_result["validation"].get("repair_actions", [])
-            next_spec, applied = apply_repair_actions(current_spec, actions)
-            if not applied:
+            candidates = repair_candidates(current_spec, actions, apply_repair_actions, args.search_width)
+            if not candidates:
                 run_report["notes"].append("validator が修正案を返さなかったため反復終了")
                 final_iter = best_iter or iter_result
                 break
 
-            run_report["notes"].append(f"iter_{idx:02d} repair applied: {', '.join(applied)}")
-            current_spec = next_spec
+            if len(candidates) > 1:
+                run_report["notes"].append(f"iter_{idx + 1:02d} evaluates {len(candidates)} repair candidates in parallel")
     except BlenderCLIError as exc:
+        runner.close()
         run_report["status"] = "FAILED"
         run_report["error"] = str(exc)
         run_report["blender_stdout"] = exc.stdout
         run_report["blender_log"] = exc.log_path
+        run_report["blender_worker"] = runner.stats()
+        if farm is not None:
+            run_report["render_farm"] = farm.stats()
         report_path = run_dir / "run_report.json"
         _write_json(report_path, run_report)
         print(f"[AG] FAILED: {exc}", file=sys.stderr)
         print(f"[AG] report: {report_path}", file=sys.stderr)
         return 1
+    finally:
+        runner.close()
+        if farm is not None:
+            farm.close()
+    run_report["blender_worker"] = runner.stats()
+    if farm is not None:
+        run_report["render_farm"] = farm.stats()
 
     if final_iter is None:
         if best_iter is not None:
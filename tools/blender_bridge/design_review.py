@@ -3,7 +3,9 @@ design_review.py - レンダ画像ベースのデザイン品質レビュー
 
 特徴:
 - 共通ルーブリック + 対象別ルーブリックを合算評価
-- 追加依存なし（Blenderの画像読み込み機能を利用）
+- 追加依存なし（Blenderの画像読み込み機能 + Blender同梱の NumPy を利用）
+- 画像メトリクスは全画素を NumPy でベクトル計算（sample_cap 指定時のみ間引き）
+- Blender外では PIL で読み込むため、同じメトリクス計算を単体テストできる
 - 自動修正向け repair_actions を返す
 """
 
@@ -14,7 +16,12 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-import bpy
+import numpy as np
+
+try:
+    import bpy
+except ImportError:  # Blender外（単体テスト・オフライン再計算）では PIL で読む
+    bpy = None
 
 _ALLOWED_METRIC_SPACES = {"srgb", "linear"}
 _REPAIR_VALUE_LIMITS: Dict[str, Tuple[float, float, float]] = {
@@ -47,57 +54,32 @@ def _normalize_metric_space(value: Any, default: str = "srgb") -> str:
     return default
 
 
-def _linear_to_srgb_channel(value: float) -> float:
-    v = _clamp(float(value), 0.0, 1.0)
-    if v <= 0.0031308:
-        return 12.92 * v
-    return 1.055 * (v ** (1.0 / 2.4)) - 0.055
+def _linear_to_srgb(values: np.ndarray) -> np.ndarray:
+    v = np.clip(values, 0.0, 1.0)
+    return np.where(v <= 0.0031308, 12.92 * v, 1.055 * np.power(v, 1.0 / 2.4) - 0.055)
 
 
-def _init_color_acc() -> Dict[str, float]:
-    return {
-        "lum_sum": 0.0,
-        "lum_sq_sum": 0.0,
-        "sat_sum": 0.0,
-        "r_sum": 0.0,
-        "g_sum": 0.0,
-        "b_sum": 0.0,
-        "bright_count": 0.0,
-        "dark_count": 0.0,
-    }
+def _color_metrics(rgb: np.ndarray) -> Dict[str, float]:
+    """(N, 3) の RGB（0..1）から輝度・彩度・明暗比率・寒色比を求める"""
+    if rgb.shape[0] == 0:
+        rgb = np.zeros((1, 3), dtype=np.float32)
+    # (3, N) の連続配列にすると各チャネルの演算が連続アクセスになる
+    r, g, b = np.ascontiguousarray(rgb.T)
+    lum = 0.2126 * r + 0.7152 * g + 0.0722 * b
+    sat = np.maximum(np.maximum(r, g), b) - np.minimum(np.minimum(r, g), b)
 
+    lum_mean = float(lum.mean(dtype=np.float64))
+    variance = max(0.0, float(np.dot(lum.astype(np.float64), lum)) / lum.size - lum_mean * lum_mean)
 
-def _accumulate_color_metrics(acc: Dict[str, float], r: float, g: float, b: float) -> None:
-    lum = 0.2126 * r + 0.7152 * g + 0.0722 * b
-    sat = max(r, g, b) - min(r, g, b)
-
-    acc["lum_sum"] += lum
-    acc["lum_sq_sum"] += lum * lum
-    acc["sat_sum"] += sat
-    acc["r_sum"] += r
-    acc["g_sum"] += g
-    acc["b_sum"] += b
-    acc["bright_count"] += 1.0 if lum >= 0.82 else 0.0
-    acc["dark_count"] += 1.0 if lum <= 0.12 else 0.0
-
-
-def _finalize_color_metrics(acc: Dict[str, float], sample_count: int) -> Dict[str, float]:
-    n = max(1, int(sample_count))
-    lum_mean = float(acc["lum_sum"] / n)
-    variance = max(0.0, float(acc["lum_sq_sum"] / n) - lum_mean * lum_mean)
-    lum_std = variance ** 0.5
-
-    mean_r = float(acc["r_sum"] / n)
-    mean_g = float(acc["g_sum"] / n)
-    mean_b = float(acc["b_sum"] / n)
+    mean_r, mean_g, mean_b = (float(c.mean(dtype=np.float64)) for c in (r, g, b))
     cool_ratio = mean_b / max(1.0e-6, mean_r + mean_g + mean_b)
 
     return {
         "luminance_mean": lum_mean,
-        "luminance_std": float(lum_std),
-        "saturation_mean": float(acc["sat_sum"] / n),
-        "bright_ratio": float(acc["bright_count"] / n),
-        "dark_ratio": float(acc["dark_count"] / n),
+        "luminance_std": float(variance ** 0.5),
+        "saturation_mean": float(sat.mean(dtype=np.float64)),
+        "bright_ratio": float(np.count_nonzero(lum >= 0.82) / lum.size),
+        "dark_ratio": float(np.count_nonzero(lum <= 0.12) / lum.size),
         "mean_r": mean_r,
         "mean_g": mean_g,
         "mean_b": mean_b,
@@ -155,47 +137,64 @@ def _append_bounded_set_action(
     )
 
 
-def _load_image_metrics(path: Path, sample_cap: int = 45000, metric_space: str = "srgb") -> Dict[str, Any]:
-    if not path.exists() or not path.is_file():
-        return {"exists": False, "path": str(path)}
-
-    metric_space = _normalize_metric_space(metric_space, default="srgb")
-
+def _load_pixels_bpy(path: Path) -> Tuple[int, int, np.ndarray]:
+    """Blenderで読み込み、foreach_get で float32 バッファへ直接コピーする"""
     image = bpy.data.images.load(str(path), check_existing=False)
     try:
         width = int(image.size[0])
         height = int(image.size[1])
-        pixels = list(image.pixels[:])
+        channels = int(image.channels) or 4
+        buf = np.empty(width * height * channels, dtype=np.float32)
+        image.pixels.foreach_get(buf)
     finally:
         bpy.data.images.remove(image, do_unlink=True)
+    if channels < 3:
+        gray = buf.reshape(-1, channels)[:, :1]
+        return width, height, np.repeat(gray, 3, axis=1)
+    return width, height, buf.reshape(-1, channels)[:, :3]
 
-    total_pixels = max(1, width * height)
-    stride = max(1, total_pixels // max(1, int(sample_cap)))
 
-    n = 0
-    linear_acc = _init_color_acc()
-    srgb_acc = _init_color_acc()
+def _load_pixels_pil(path: Path) -> Tuple[int, int, np.ndarray]:
+    """PILで読み込み、Blenderの image.pixels と同じ並び（下の行から、0..1）にそろえる"""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        rgb = np.asarray(img.convert("RGB"), dtype=np.float32)
+    height, width = rgb.shape[:2]
+    rgb = rgb[::-1] / 255.0
+    return width, height, rgb.reshape(-1, 3)
+
+
+def _load_pixels(path: Path) -> Tuple[int, int, np.ndarray]:
+    if bpy is not None:
+        return _load_pixels_bpy(path)
+    return _load_pixels_pil(path)
+
 
-    for px_idx in range(0, total_pixels, stride):
-        base = px_idx * 4
-        if base + 3 >= len(pixels):
-            break
-        r_lin = _clamp(float(pixels[base]), 0.0, 1.0)
-        g_lin = _clamp(float(pixels[base + 1]), 0.0, 1.0)
-        b_lin = _clamp(float(pixels[base + 2]), 0.0, 1.0)
+def _load_image_metrics(path: Path, sample_cap: Optional[int] = None, metric_space: str = "srgb") -> Dict[str, Any]:
+    """レンダ画像の色メトリクス（linear / srgb 両方）を返す
 
-        _accumulate_color_metrics(linear_acc, r_lin, g_lin, b_lin)
+    既定は全画素で計算する。sample_cap を指定すると約 sample_cap 画素になるよう
+    一定間隔（stride）で間引く。
+    """
+    if not path.exists() or not path.is_file():
+        return {"exists": False, "path": str(path)}
 
-        r_srgb = _linear_to_srgb_channel(r_lin)
-        g_srgb = _linear_to_srgb_channel(g_lin)
-        b_srgb = _linear_to_srgb_channel(b_lin)
-        _accumulate_color_metrics(srgb_acc, r_srgb, g_srgb, b_srgb)
+    metric_space = _normalize_metric_space(metric_space, default="srgb")
+
+    width, height, rgb = _load_pixels(path)
+    total_pixels = max(1, width * height)
+    if sample_cap:
+        stride = max(1, total_pixels // max(1, int(sample_cap)))
+        if stride > 1:
+            rgb = rgb[::stride]
 
-        n += 1
+    linear = np.clip(rgb, 0.0, 1.0)
+    n = int(linear.shape[0])
 
     spaces = {
-        "linear": _finalize_color_metrics(linear_acc, n),
-        "srgb": _finalize_color_metrics(srgb_acc, n),
+        "linear": _color_metrics(linear),
+        "srgb": _color_metrics(_linear_to_srgb(linear)),
     }
     selected = spaces.get(metric_space) or spaces["srgb"]
 
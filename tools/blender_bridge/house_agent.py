@@ -19,6 +19,8 @@ from typing import Any, Dict, List
 from blender_cli import BlenderCLI, BlenderCLIError, DEFAULT_BLENDER_EXE
 from house_spec import apply_repair_actions, normalize_house_spec, validate_spec
 from model_self_review import build_self_review
+from render_farm import CandidateSearch, RenderFarm, repair_candidates
+from warm_worker import WORKER_MODES, WarmBlenderWorker
 
 
 def validate_against_contract(data: Dict[str, Any], schema: Dict[str, Any]) -> List[str]:
@@ -95,6 +97,16 @@ def parse_args():
     p.add_argument("--samples", type=int, default=None)
     p.add_argument("--score-threshold", type=float, default=85.0)
     p.add_argument("--blender-exe", default=DEFAULT_BLENDER_EXE)
+    p.add_argument(
+        "--blender-worker",
+        choices=WORKER_MODES,
+        default="warm",
+        help="warm: 常駐Blenderで build/validate を実行 / cold: 毎回 blender を起動",
+    )
+    p.add_argument("--render-workers", type=int, default=0, help="0: build内で順次レンダ / N: N個のBlenderで視点を並列レンダ")
+    p.add_argument("--render-threads", type=int, default=0, help="レンダワーカー1つあたりのスレッド数（0=自動）")
+    p.add_argument("--render-device", default="CPU")
+    p.add_argument("--search-width", type=int, default=1, help="各反復で並列評価する修正候補数")
     p.add_argument("--preset-json", default="")
     p.add_argument("--open-gui", action="store_true")
     p.add_argument("--interactive", action="store_true")
@@ -143,8 +155,10 @@ def build_and_validate_iteration(
     spec_path: Path,
     samples: int = None,
     score_threshold: float = 85.0,
+    prefix: str = "",
+    render_farm: RenderFarm = None,
 ) -> Dict[str, Any]:
-    prefix = f"iter_{iter_idx:02d}"
+    prefix = prefix or f"iter_{iter_idx:02d}"
     blend_path = run_dir / f"{prefix}.blend"
     validation_path = run_dir / f"validation_{prefix}.json"
     build_log = run_dir / f"{prefix}_build.log"
@@ -162,6 +176,9 @@ def build_and_validate_iteration(
     ]
     if samples is not None:
         script_args.extend(["--samples", str(samples)])
+    plan_path = run_dir / f"{prefix}_render_plan.json"
+    if render_farm is not None:
+        script_args.extend(["--defer-render", str(plan_path)])
 
     cli.run_script(
         str(build_script),
@@ -170,6 +187,8 @@ def build_and_validate_iteration(
         timeout=1200,
         factory_startup=True,
     )
+    if render_farm is not None:
+        render_farm.render_plan(plan_path)
 
     cli.run_script(
         str(validate_script),
@@ -254,6 +273,14 @@ def main() -> int:
     spec_path.write_text(json.dumps(spec, ensure_ascii=False, indent=2), encoding="utf-8")
 
     cli = BlenderCLI(args.blender_exe)
+    runner = WarmBlenderWorker(cli, run_dir / "warm_worker", warm=args.blender_worker == "warm")
+    farm = RenderFarm(
+        cli,
+        workers=args.render_workers,
+        threads_per_worker=args.render_threads or None,
+        device=args.render_device,
+    ) if args.render_workers > 0 else None
+    search = CandidateSearch(runner, cli)
 
     run_report: Dict[str, Any] = {
         "status": "RUNNING",
@@ -269,23 +296,31 @@ def main() -> int:
     final_iter = None
     best_iter = None
     current_spec = spec
+    candidates = [(spec, [])]
     max_iterations = int(max(1, args.max_iterations))
 
     try:
         for idx in range(max_iterations):
-            iter_spec_path = run_dir / f"house_spec_iter_{idx:02d}.json"
-            iter_spec_path.write_text(json.dumps(current_spec, ensure_ascii=False, indent=2), encoding="utf-8")
+            def _evaluate(slot_runner, cand_spec: Dict[str, Any], prefix: str) -> Dict[str, Any]:
+                cand_spec_path = run_dir / f"house_spec_{prefix}.json"
+                cand_spec_path.write_text(json.dumps(cand_spec, ensure_ascii=False, indent=2), encoding="utf-8")
+                return build_and_validate_iteration(
+                    cli=slot_runner,
+                    build_script=build_script,
+                    validate_script=validate_script,
+                    run_dir=run_dir,
+                    iter_idx=idx,
+                    spec_path=cand_spec_path,
+                    samples=args.samples,
+                    score_threshold=float(max(0.0, min(100.0, args.score_threshold))),
+                    prefix=prefix,
+                    render_farm=farm,
+                )
 
-            iter_result = build_and_validate_iteration(
-                cli=cli,
-                build_script=build_script,
-                validate_script=validate_script,
-                run_dir=run_dir,
-                iter_idx=idx,
-                spec_path=iter_spec_path,
-                samples=args.samples,
-                score_threshold=float(max(0.0, min(100.0, args.score_threshold))),
-            )
+            iter_result, current_spec, applied = search.evaluate(idx, candidates, _evaluate)
+            if applied:
+                # 並列評価した候補のうち採用された修正（候補0とは限らない）
+                run_report["notes"].append(f"{iter_result['prefix']} repair applied: {', '.join(applied)}")
             run_report["iterations"].append(
                 {
                     "index": iter_result["index"],
@@ -295,6 +330,8 @@ def main() -> int:
                     "artifacts": iter_result["artifacts"],
                 }
             )
+            if "candidates" in iter_result:
+                run_report["iterations"][-1]["candidates"] = iter_result["candidates"]
 
             validation_contract_errors = validate_against_contract(iter_result["validation"], validation_contract)
             if validation_contract_errors:
@@ -321,24 +358,35 @@ def main() -> int:
                 break
 
             repair_actions = iter_result["validation"].get("repair_actions", [])
-            next_spec, applied = apply_repair_actions(current_spec, repair_actions)
-            if not applied:
+            candidates = repair_candidates(current_spec, repair_actions, apply_repair_actions, args.search_width)
+            if not candidates:
                 run_report["notes"].append("validator が修正案を返さなかったため反復終了")
                 final_iter = best_iter or iter_result
                 break
-            run_report["notes"].append(f"iter_{idx:02d} repair applied: {', '.join(applied)}")
-            current_spec = next_spec
+            if len(candidates) > 1:
+                run_report["notes"].append(f"iter_{idx + 1:02d} evaluates {len(candidates)} repair candidates in parallel")
 
     except BlenderCLIError as e:
+        runner.close()
         run_report["status"] = "FAILED"
         run_report["error"] = str(e)
         run_report["blender_stdout"] = e.stdout
         run_report["blender_log"] = e.log_path
+        run_report["blender_worker"] = runner.stats()
+        if farm is not None:
+            run_report["render_farm"] = farm.stats()
         report_path = run_dir / "run_report.json"
         report_path.write_text(json.dumps(run_report, ensure_ascii=False, indent=2), encoding="utf-8")
         print(f"[AG] FAILED: {e}", file=sys.stderr)
         print(f"[AG] report: {report_path}", file=sys.stderr)
         return 1
+    finally:
+        runner.close()
+        if farm is not None:
+            farm.close()
+    run_report["blender_worker"] = runner.stats()
+    if farm is not None:
+        run_report["render_farm"] = farm.stats()
 
     if final_iter is None:
         if best_iter is not None:
@@ -0,0 +1,334 @@
+"""
+レンダファーム - 視点と候補specを複数のBlenderワーカープロセスへ分配する
+
+GPUの無いレンダ機（CPU Cycles）では、build スクリプト内で6視点を順番に描くと
+セットアップや検証の間コアが遊ぶ。ファームモードでは:
+
+1. build スクリプトを --defer-render で実行し、視点ごとのカメラ姿勢を計画JSONに書かせる
+2. RenderFarm が視点をシャードに分け、N個の `blender --background` に
+   ワーカーごとのスレッド数を指定して並列に描かせる（BlenderCLI.render と同じ起動形）
+3. 各ワーカーのレンダ時間とピークメモリを記録し、run_report に載せる
+
+CandidateSearch は apply_repair_actions から作った複数の修正候補を並列に
+build → render → validate し、最もスコアの高い候補を次の反復へ採用する。
+
+使用例:
+    farm = RenderFarm(cli, workers=4)
+    outputs = farm.render_plan(run_dir / "iter_00_render_plan.json")
+    run_report["render_farm"] = farm.stats()
+"""
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from blender_cli import BlenderCLI, BlenderCLIError
+
+# シャード1つを描くワーカー側スクリプト（--python-expr、シャードJSONのパスは末尾引数）
+_RENDER_SHARD_EXPR = """
+import json, sys
+import bpy
+
+shard = json.loads(open(sys.argv[sys.argv.index("--") + 1], encoding="utf-8").read())
+scene = bpy.context.scene
+cam = bpy.data.objects.get(shard.get("camera") or "") or scene.camera
+scene.camera = cam
+if shard.get("threads"):
+    scene.render.threads_mode = "FIXED"
+    scene.render.threads = int(shard["threads"])
+if shard.get("device") and scene.render.engine == "CYCLES":
+    scene.cycles.device = shard["device"]
+scene.render.image_settings.file_format = "PNG"
+for view in shard["views"]:
+    cam.location = view["location"]
+    cam.rotation_euler = view["rotation_euler"]
+    scene.render.filepath = view["filepath"]
+    bpy.ops.render.render(write_still=True)
+    print("[AG] rendered", view["name"], view["filepath"], flush=True)
+"""
+
+
+def _peak_rss_mb_from_rusage(ru_maxrss: int) -> float:
+    # Linux は KiB、macOS はバイト
+    if sys.platform == "darwin":
+        return round(ru_maxrss / (1024.0 * 1024.0), 1)
+    return round(ru_maxrss / 1024.0, 1)
+
+
+def run_measured(cmd: List[str], log_file: Path, timeout: float, env: Optional[dict] = None) -> Dict[str, Any]:
+    """子プロセスを実行し、終了コード・経過秒・ピークメモリ（MB）を返す
+
+    POSIX では os.wait4 の rusage から子プロセス単体のピークRSSを取る。
+    Windows では psutil があれば peak_wset をポーリングする（無ければ None）。
+    """
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    peak_mb: Optional[float] = None
+    with open(log_file, "a", encoding="utf-8", errors="replace") as out:
+        proc = subprocess.Popen(cmd, stdout=out, stderr=subprocess.STDOUT, env=env)
+        deadline = time.monotonic() + float(timeout)
+        if hasattr(os, "wait4"):
+            while True:
+                pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+                if pid:
+                    proc.returncode = os.waitstatus_to_exitcode(status)
+                    peak_mb = _peak_rss_mb_from_rusage(usage.ru_maxrss)
+                    break
+                if time.monotonic() > deadline:
+                    proc.kill()
+                    proc.wait()
+                    raise BlenderCLIError(f"レンダワーカーがタイムアウト ({timeout}s)", log_path=str(log_file))
+                time.sleep(0.05)
+        else:
+            try:
+                import psutil
+                handle = psutil.Process(proc.pid)
+            except Exception:
+                handle = None
+            while proc.poll() is None:
+                if handle is not None:
+                    try:
+                        peak = getattr(handle.memory_info(), "peak_wset", 0) or handle.memory_info().rss
+                        peak_mb = max(peak_mb or 0.0, round(peak / (1024.0 * 1024.0), 1))
+                    except Exception:
+                        pass
+                if time.monotonic() > deadline:
+                    proc.kill()
+                    proc.wait()
+                    raise BlenderCLIError(f"レンダワーカーがタイムアウト ({timeout}s)", log_path=str(log_file))
+                time.sleep(0.05)
+    return {
+        "returncode": proc.returncode,
+        "elapsed_sec": round(time.perf_counter() - started, 3),
+        "peak_rss_mb": peak_mb,
+    }
+
+
+def shard_views(views: Sequence[Dict[str, Any]], shards: int) -> List[List[Dict[str, Any]]]:
+    """視点をラウンドロビンで shards 個に分ける（空シャードは作らない）"""
+    n = max(1, min(int(shards), len(views)))
+    out: List[List[Dict[str, Any]]] = [[] for _ in range(n)]
+    for i, view in enumerate(views):
+        out[i % n].append(view)
+    return out
+
+
+class RenderFarm:
+    """N個の Blender ワーカーで計画JSONの視点を並列レンダする
+
+    同時に走るレンダは常に workers 個まで（複数候補から同時に render_plan を呼んでも共有）。
+    """
+
+    def __init__(
+        self,
+        cli: BlenderCLI,
+        workers: int = 2,
+        threads_per_worker: Optional[int] = None,
+        device: str = "CPU",
+        timeout: float = 1800.0,
+    ):
+        self.cli = cli
+        self.workers = max(1, int(workers))
+        cpu = os.cpu_count() or 1
+        self.threads_per_worker = int(threads_per_worker or max(1, cpu // self.workers))
+        self.device = device
+        self.timeout = float(timeout)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ag_render")
+        self._slots: "queue.Queue[int]" = queue.Queue()
+        for i in range(self.workers):
+            self._slots.put(i)
+        self._lock = threading.Lock()
+        self._per_worker: List[Dict[str, Any]] = [
+            {"worker": i, "shards": 0, "views": 0, "render_sec": 0.0, "peak_rss_mb": None}
+            for i in range(self.workers)
+        ]
+        self._plans = 0
+
+    def _render_shard(self, blend: str, camera: str, views: List[Dict[str, Any]], shard_path: Path) -> Dict[str, Any]:
+        slot = self._slots.get()
+        try:
+            shard_path.write_text(
+                json.dumps(
+                    {"camera": camera, "threads": self.threads_per_worker, "device": self.device, "views": views},
+                    ensure_ascii=False,
+                ),
+                encoding="utf-8",
+            )
+            cmd = [
+                self.cli.blender_exe,
+                "--background",
+                blend,
+                "--threads",
+                str(self.threads_per_worker),
+                "--python-exit-code",
+                "1",
+                "--python-expr",
+                _RENDER_SHARD_EXPR,
+                "--",
+                str(shard_path),
+            ]
+            log_file = shard_path.with_suffix(".log")
+            usage = run_measured(cmd, log_file, timeout=self.timeout, env=os.environ.copy())
+            with self._lock:
+                stat = self._per_worker[slot]
+                stat["shards"] += 1
+                stat["views"] += len(views)
+                stat["render_sec"] = round(stat["render_sec"] + usage["elapsed_sec"], 3)
+                if usage["peak_rss_mb"] is not None:
+                    stat["peak_rss_mb"] = max(stat["peak_rss_mb"] or 0.0, usage["peak_rss_mb"])
+            if usage["returncode"] != 0:
+                log_text = log_file.read_text(encoding="utf-8", errors="replace") if log_file.exists() else ""
+                raise BlenderCLIError(
+                    f"レンダワーカー失敗 (rc={usage['returncode']}): {shard_path.name}",
+                    returncode=usage["returncode"],
+                    stdout=log_text[-4000:],
+                    log_path=str(log_file),
+                )
+            return {"worker": slot, **usage}
+        finally:
+            self._slots.put(slot)
+
+    def render_plan(self, plan_path: Path) -> Dict[str, str]:
+        """計画JSONの全視点を描き、{視点名: 出力パス} を返す"""
+        plan_path = Path(plan_path)
+        plan = json.loads(plan_path.read_text(encoding="utf-8"))
+        views = list(plan.get("views", []))
+        if not views:
+            return {}
+        futures = [
+            self._pool.submit(
+                self._render_shard,
+                str(plan["blend"]),
+                str(plan.get("camera", "")),
+                shard,
+                plan_path.with_name(f"{plan_path.stem}_shard{k}.json"),
+            )
+            for k, shard in enumerate(shard_views(views, self.workers))
+        ]
+        errors = []
+        for fut in futures:
+            try:
+                fut.result()
+            except BlenderCLIError as e:
+                errors.append(e)
+        with self._lock:
+            self._plans += 1
+        if errors:
+            raise errors[0]
+
+        outputs = {str(v["name"]): str(v["filepath"]) for v in views}
+        missing = [p for p in outputs.values() if not Path(p).exists()]
+        if missing:
+            raise BlenderCLIError(f"レンダ出力が見つかりません: {missing}", log_path=str(plan_path))
+        return outputs
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "threads_per_worker": self.threads_per_worker,
+                "device": self.device,
+                "plans": self._plans,
+                "per_worker": [dict(s) for s in self._per_worker],
+            }
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "RenderFarm":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def repair_candidates(
+    spec: Dict[str, Any],
+    actions: Sequence[Dict[str, Any]],
+    apply_fn: Callable[[Dict[str, Any], Sequence[Dict[str, Any]]], Tuple[Dict[str, Any], List[str]]],
+    limit: int,
+) -> List[Tuple[Dict[str, Any], List[str]]]:
+    """修正候補を作る: 全アクション適用 → 1つ抜き → 1つだけ、の順に重複を除いて limit 件まで"""
+    limit = max(1, int(limit))
+    actions = list(actions)
+    subsets: List[List[Dict[str, Any]]] = [actions]
+    if len(actions) > 1:
+        subsets += [actions[:i] + actions[i + 1:] for i in range(len(actions))]
+        subsets += [[a] for a in actions]
+
+    out: List[Tuple[Dict[str, Any], List[str]]] = []
+    seen = set()
+    for subset in subsets:
+        next_spec, applied = apply_fn(spec, subset)
+        if not applied:
+            continue
+        key = json.dumps(next_spec, sort_keys=True, ensure_ascii=False, default=str)
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append((next_spec, list(applied)))
+        if len(out) >= limit:
+            break
+    return out
+
+
+def candidate_prefix(iter_idx: int, candidate_idx: int) -> str:
+    base = f"iter_{iter_idx:02d}"
+    return base if candidate_idx == 0 else f"{base}_c{candidate_idx}"
+
+
+class CandidateSearch:
+    """反復ごとに複数の候補specを並列評価し、最高スコアの結果を返す
+
+    候補0は常駐ワーカー（primary）、それ以外は毎回起動の BlenderCLI で build/validate する。
+    """
+
+    def __init__(self, primary: Any, cli: BlenderCLI):
+        self.primary = primary
+        self.cli = cli
+
+    def evaluate(
+        self,
+        iter_idx: int,
+        candidates: Sequence[Tuple[Dict[str, Any], List[str]]],
+        evaluate_fn: Callable[[Any, Dict[str, Any], str], Dict[str, Any]],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], List[str]]:
+        """(最良の反復結果, その spec, その applied) を返す。全候補が失敗したら最初の例外を送出"""
+        if len(candidates) == 1:
+            spec, applied = candidates[0]
+            return evaluate_fn(self.primary, spec, candidate_prefix(iter_idx, 0)), spec, applied
+
+        def _run(j: int):
+            runner = self.primary if j == 0 else self.cli
+            return evaluate_fn(runner, candidates[j][0], candidate_prefix(iter_idx, j))
+
+        outcomes: List[Any] = []
+        with ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="ag_candidate") as ex:
+            futures = [ex.submit(_run, j) for j in range(len(candidates))]
+            for fut in futures:
+                try:
+                    outcomes.append(fut.result())
+                except BlenderCLIError as e:
+                    outcomes.append(e)
+
+        ok = [(j, r) for j, r in enumerate(outcomes) if not isinstance(r, Exception)]
+        if not ok:
+            raise outcomes[0]
+        best_j, best = max(ok, key=lambda jr: (float(jr[1].get("score", 0) or 0), -jr[0]))
+        best["candidates"] = [
+            {
+                "prefix": candidate_prefix(iter_idx, j),
+                "applied": candidates[j][1],
+                **({"error": str(r)} if isinstance(r, Exception) else {"score": r.get("score", 0), "pass": r.get("pass")}),
+            }
+            for j, r in enumerate(outcomes)
+        ]
+        best["selected_candidate"] = best_j
+        return best, candidates[best_j][0], candidates[best_j][1]
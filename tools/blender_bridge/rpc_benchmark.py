@@ -0,0 +1,118 @@
+"""
+RPCスループット計測 - single / pipelined / batched の ops/秒を比較する
+
+起動中の Antigravity Bridge（GUI の RPC か常駐ワーカー）に対して、
+小さな編集 op（transform / assign_material / set_material_color）を同じ件数だけ
+3通りの送り方で実行する:
+
+    single     1 op = 1 往復（従来の RpcClient._call）
+    pipelined  応答を待たずに window 件まで先行送信（RpcClient.pipeline）
+    batched    batch_size 件ずつ batch メソッドで1回のメインスレッド処理
+
+使い方:
+    python rpc_benchmark.py --ops 600
+    python rpc_benchmark.py --port 8765 --token xxx --window 32 --batch-size 200
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from ag_rpc_client import RpcClient
+
+BENCH_OBJECT = "AG_Bench_Cube"
+BENCH_MATERIAL = "AG_Bench_Mat"
+
+
+def _prepare(client: RpcClient) -> Dict[str, str]:
+    """計測用のオブジェクトとマテリアルを用意する（名前は Blender 側の採番に従う）"""
+    cube = client.add_cube(size=1.0)
+    mat = client.make_material(name=BENCH_MATERIAL)
+    return {"object": cube.get("name", BENCH_OBJECT), "material": mat.get("material", BENCH_MATERIAL)}
+
+
+def make_ops(count: int, names: Dict[str, str]) -> List[tuple]:
+    """シーンを増やさない編集 op を count 件作る"""
+    ops = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            ops.append(("transform", {"name": names["object"], "location": [i * 0.01, 0.0, 0.0]}))
+        elif kind == 1:
+            ops.append(("assign_material", {"obj_name": names["object"], "material_name": names["material"]}))
+        else:
+            shade = (i % 100) / 100.0
+            ops.append(("set_material_color", {"material_name": names["material"], "rgba": [shade, 0.2, 0.2, 1.0]}))
+    return ops
+
+
+def _measure(mode: str, count: int, fn) -> Dict[str, Any]:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": mode,
+        "ops": count,
+        "seconds": round(elapsed, 4),
+        "ops_per_sec": round(count / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def run_benchmark(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    token: Optional[str] = None,
+    ops: int = 300,
+    window: int = 16,
+    batch_size: int = 100,
+    timeout: float = 30.0,
+) -> Dict[str, Any]:
+    """3モードで同じ op 列を実行し、ops/秒を返す"""
+    client = RpcClient(host, port, timeout=timeout, token=token, max_retries=0, reuse_connection=True)
+    try:
+        names = _prepare(client)
+        op_list = make_ops(ops, names)
+
+        def _single():
+            for method, params in op_list:
+                client._call(method, params)
+
+        def _batched():
+            for i in range(0, len(op_list), batch_size):
+                client.batch(op_list[i:i + batch_size], undo_label="AG benchmark")
+
+        results = [
+            _measure("single", len(op_list), _single),
+            _measure(f"pipelined(window={window})", len(op_list), lambda: client.pipeline(op_list, window=window)),
+            _measure(f"batched(size={batch_size})", len(op_list), _batched),
+        ]
+        client.delete_object(names["object"])
+    finally:
+        client.close()
+
+    base = results[0]["seconds"]
+    for r in results:
+        r["speedup"] = round(base / r["seconds"], 2) if r["seconds"] > 0 else None
+    return {"host": host, "port": port, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Antigravity Bridge RPC の ops/秒を計測")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token", default=None)
+    parser.add_argument("--ops", type=int, default=300)
+    parser.add_argument("--window", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        host=args.host, port=args.port, token=args.token,
+        ops=args.ops, window=args.window, batch_size=args.batch_size,
+    )
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
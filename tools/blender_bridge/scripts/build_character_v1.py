@@ -15,11 +15,17 @@ import json
 import math
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import bpy
 from mathutils import Vector
 
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from render_plan import StillRenderer
+
 
 def parse_args() -> argparse.Namespace:
     argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
@@ -32,6 +38,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--samples", type=int, default=128)
     parser.add_argument("--engine", default="CYCLES")
     parser.add_argument("--device", default="GPU")
+    parser.add_argument("--defer-render", default="", help="レンダせず視点計画JSONを書く（render_farm で描画）")
     return parser.parse_args(argv)
 
 
@@ -246,7 +253,15 @@ def _setup_render(engine: str, device: str, samples: int) -> None:
                     dev.use = True
 
 
-def _render_views(camera: bpy.types.Object, output_dir: Path, prefix: str, dims: Dict[str, float], view_hints: Dict[str, Any]) -> Dict[str, str]:
+def _render_views(
+    camera: bpy.types.Object,
+    output_dir: Path,
+    prefix: str,
+    dims: Dict[str, float],
+    view_hints: Dict[str, Any],
+    renderer: Optional[StillRenderer] = None,
+) -> Dict[str, str]:
+    renderer = renderer or StillRenderer()
     height = float(dims.get("height", 1.72))
     width = float(dims.get("width", 0.7))
     depth = float(dims.get("depth", 0.45))
@@ -264,15 +279,11 @@ def _render_views(camera: bpy.types.Object, output_dir: Path, prefix: str, dims:
         views[name] = Vector((float(loc[0]), float(loc[1]), float(loc[2])))
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    scene = bpy.context.scene
     outputs: Dict[str, str] = {}
     for name, location in views.items():
         camera.location = location
         _look_at(camera, target)
-        path = output_dir / f"{prefix}_{name}.png"
-        scene.render.filepath = str(path)
-        bpy.ops.render.render(write_still=True)
-        outputs[name] = str(path)
+        outputs[name] = renderer.render(name, camera, output_dir / f"{prefix}_{name}.png")
     return outputs
 
 
@@ -421,7 +432,8 @@ def main() -> None:
     _setup_render(engine=args.engine, device=args.device, samples=args.samples)
 
     output_dir = Path(args.output_dir).resolve()
-    views = _render_views(camera, output_dir=output_dir, prefix=args.render_prefix, dims=dims, view_hints=view_hints)
+    renderer = StillRenderer(args.defer_render)
+    views = _render_views(camera, output_dir=output_dir, prefix=args.render_prefix, dims=dims, view_hints=view_hints, renderer=renderer)
 
     blend_path = Path(args.save_blend).resolve()
     blend_path.parent.mkdir(parents=True, exist_ok=True)
@@ -435,6 +447,7 @@ def main() -> None:
     metrics["render_outputs"] = views
     bpy.context.scene["ag_character_actual_json"] = json.dumps(metrics, ensure_ascii=False)
     bpy.ops.wm.save_mainfile(filepath=str(blend_path))
+    renderer.write(blend_path)
 
     print(f"[AG] blend={blend_path}")
     print(f"[AG] front={views.get('front', '')}")
@@ -23,6 +23,12 @@ import bmesh
 import bpy
 from mathutils import Vector
 
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from render_plan import StillRenderer
+
 
 # ==============================
 # Args / IO
@@ -40,6 +46,7 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--samples", type=int, default=128)
     p.add_argument("--engine", default="CYCLES")
     p.add_argument("--device", default="GPU")
+    p.add_argument("--defer-render", default="", help="レンダせず視点計画JSONを書く（render_farm で描画）")
     return p.parse_args(argv)
 
 
@@ -775,7 +782,7 @@ def _setup_camera_and_lights(spec: Dict[str, Any]) -> bpy.types.Object:
 
 
 def _render_6views(out_dir: Path, prefix: str, cam: bpy.types.Object,
-                   spec: Dict[str, Any]) -> Dict[str, str]:
+                   spec: Dict[str, Any], renderer: StillRenderer) -> Dict[str, str]:
     """6視点レンダリング"""
     fw = _sf(spec.get("footprint_w_m"), 8.0)
     fd = _sf(spec.get("footprint_d_m"), 6.0)
@@ -802,16 +809,12 @@ def _render_6views(out_dir: Path, prefix: str, cam: bpy.types.Object,
     }
 
     out_dir.mkdir(parents=True, exist_ok=True)
-    scene = bpy.context.scene
     result: Dict[str, str] = {}
 
     for name, loc in views.items():
         cam.location = loc
         _look_at(cam, target)
-        path = out_dir / f"{prefix}_{name}.png"
-        scene.render.filepath = str(path)
-        bpy.ops.render.render(write_still=True)
-        result[name] = str(path)
+        result[name] = renderer.render(name, cam, out_dir / f"{prefix}_{name}.png")
     return result
 
 
@@ -924,7 +927,8 @@ def main() -> None:
     # レンダリング
     _setup_render(engine=args.engine, device=args.device, samples=samples)
     cam = _setup_camera_and_lights(spec)
-    views = _render_6views(out_dir=out_dir, prefix=args.render_prefix, cam=cam, spec=spec)
+    renderer = StillRenderer(args.defer_render)
+    views = _render_6views(out_dir=out_dir, prefix=args.render_prefix, cam=cam, spec=spec, renderer=renderer)
 
     # メトリクス保存
     metrics = _build_metrics(spec, foundation, walls, roof, door)
@@ -933,6 +937,7 @@ def main() -> None:
     # Blend保存
     blend_path.parent.mkdir(parents=True, exist_ok=True)
     bpy.ops.wm.save_as_mainfile(filepath=str(blend_path))
+    renderer.write(blend_path)
 
     # Legacy出力
     if args.output:
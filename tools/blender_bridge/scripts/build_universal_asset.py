@@ -22,6 +22,12 @@ from typing import Any, Dict, List, Optional, Sequence, Tuple
 import bpy
 from mathutils import Vector
 
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from render_plan import StillRenderer
+
 
 def parse_args() -> argparse.Namespace:
     argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
@@ -33,6 +39,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--samples", type=int, default=128)
     parser.add_argument("--engine", default="CYCLES")
     parser.add_argument("--device", default="GPU")
+    parser.add_argument("--defer-render", default="", help="レンダせず視点計画JSONを書く（render_farm で描画）")
     return parser.parse_args(argv)
 
 
@@ -517,7 +524,9 @@ def _render_views(
     dimensions: Dict[str, float],
     camera_distance_scale: float = 1.0,
     view_mode: str = "default",
+    renderer: Optional[StillRenderer] = None,
 ) -> Dict[str, str]:
+    renderer = renderer or StillRenderer()
     width = float(dimensions.get("width", 2.0))
     depth = float(dimensions.get("depth", 2.0))
     height = float(dimensions.get("height", 2.0))
@@ -541,16 +550,12 @@ def _render_views(
         }
 
     outputs: Dict[str, str] = {}
-    scene = bpy.context.scene
     output_dir.mkdir(parents=True, exist_ok=True)
 
     for name, location in view_defs.items():
         camera.location = location
         _look_at(camera, target)
-        path = output_dir / f"{prefix}_{name}.png"
-        scene.render.filepath = str(path)
-        bpy.ops.render.render(write_still=True)
-        outputs[name] = str(path)
+        outputs[name] = renderer.render(name, camera, output_dir / f"{prefix}_{name}.png")
     return outputs
 
 
@@ -562,7 +567,9 @@ def _render_turntable(
     camera_distance_scale: float,
     view_mode: str,
     frames: int = 8,
+    renderer: Optional[StillRenderer] = None,
 ) -> List[str]:
+    renderer = renderer or StillRenderer()
     width = float(dimensions.get("width", 2.0))
     depth = float(dimensions.get("depth", 2.0))
     height = float(dimensions.get("height", 2.0))
@@ -579,17 +586,13 @@ def _render_turntable(
 
     frames = int(max(3, min(64, frames)))
     output_dir.mkdir(parents=True, exist_ok=True)
-    scene = bpy.context.scene
 
     outputs: List[str] = []
     for i in range(frames):
         angle = (float(i) / float(frames)) * math.pi * 2.0
         camera.location = Vector((math.cos(angle) * radius, math.sin(angle) * radius, z))
         _look_at(camera, target)
-        path = output_dir / f"{prefix}_turn_{i:02d}.png"
-        scene.render.filepath = str(path)
-        bpy.ops.render.render(write_still=True)
-        outputs.append(str(path))
+        outputs.append(renderer.render(f"turn_{i:02d}", camera, output_dir / f"{prefix}_turn_{i:02d}.png"))
     return outputs
 
 
@@ -823,6 +826,7 @@ def main() -> None:
     _setup_render(engine=args.engine, device=args.device, samples=args.samples, exposure=exposure)
 
     output_dir = Path(args.output_dir).resolve()
+    renderer = StillRenderer(args.defer_render)
     views = _render_views(
         camera,
         output_dir=output_dir,
@@ -830,6 +834,7 @@ def main() -> None:
         dimensions=spec.get("dimensions_m", {}),
         camera_distance_scale=camera_distance_scale,
         view_mode=("enclosed" if scene_view_mode == "enclosed" else "default"),
+        renderer=renderer,
     )
     turntable: List[str] = []
     if str(spec.get("domain", "")).lower() == "scene" and quality_mode in ("balanced", "high"):
@@ -841,6 +846,7 @@ def main() -> None:
             camera_distance_scale=camera_distance_scale,
             view_mode=("enclosed" if scene_view_mode == "enclosed" else "default"),
             frames=(12 if quality_mode == "high" else 8),
+            renderer=renderer,
         )
 
     blend_path = Path(args.save_blend).resolve()
@@ -872,6 +878,7 @@ def main() -> None:
 
     # 保存し直してcustom propertyを反映
     bpy.ops.wm.save_mainfile(filepath=str(blend_path))
+    renderer.write(blend_path)
 
     print(f"[AG] blend={blend_path}")
     print(f"[AG] front={views.get('front', '')}")
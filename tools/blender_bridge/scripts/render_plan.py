@@ -0,0 +1,59 @@
+"""
+render_plan.py - 視点レンダの即時実行 / レンダファーム向け計画の記録（Blender内で使用）
+
+build_* スクリプトは各視点でカメラを置いてからレンダする。--defer-render PATH が
+指定されたときはレンダせず、視点ごとのカメラ姿勢と出力先を計画 JSON に記録する。
+計画はエージェント側の render_farm.RenderFarm が複数の Blender ワーカーへ分配して描画する。
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import bpy
+
+
+class StillRenderer:
+    """plan_path が空なら従来どおり即時レンダ、指定時は計画に追記する"""
+
+    def __init__(self, plan_path: str = ""):
+        self.plan_path = str(plan_path or "")
+        self.views: List[Dict[str, Any]] = []
+        self.camera_name = ""
+
+    @property
+    def deferred(self) -> bool:
+        return bool(self.plan_path)
+
+    def render(self, name: str, camera: bpy.types.Object, path: Path) -> str:
+        scene = bpy.context.scene
+        if not self.deferred:
+            scene.render.filepath = str(path)
+            bpy.ops.render.render(write_still=True)
+            return str(path)
+        self.camera_name = camera.name
+        self.views.append(
+            {
+                "name": name,
+                "filepath": str(path),
+                "location": [float(v) for v in camera.location],
+                "rotation_euler": [float(v) for v in camera.rotation_euler],
+            }
+        )
+        return str(path)
+
+    def write(self, blend_path: Path) -> None:
+        """保存済み blend と視点一覧を計画 JSON に書き出す（即時モードでは何もしない）"""
+        if not self.deferred:
+            return
+        plan = {
+            "blend": str(blend_path),
+            "camera": self.camera_name,
+            "views": self.views,
+        }
+        out = Path(self.plan_path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(plan, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[AG] render_plan={out} views={len(self.views)}")
@@ -0,0 +1,321 @@
+"""
+常駐Blenderワーカー - build/validate スクリプトを温まった1プロセスで実行する
+
+house_agent / character_agent / universal_agent の反復では、1回ごとに
+`blender --background` を build 用と validate 用に2回コールド起動していた。
+短い反復では起動とアドオン初期化が支配的になるため、エージェント実行中は
+--background の Blender を1つ常駐させ、antigravity_bridge の JSON-line RPC
+（run_script メソッド）でスクリプトをプロセス内実行する。
+
+- 各スクリプトの前にスタートアップシーンへ戻す（blend 指定時はそれを開く）
+- 実行前にヘルスチェック（プロセス生存 + ping）
+- クラッシュ時は error_recovery.classify_failure で分類して記録し、再起動して再実行
+- 応答待ちのタイムアウトは再実行しない（スクリプトが途中まで進んでいる可能性がある）。
+  プロセスを止めて subprocess.TimeoutExpired を送出し、次の実行で起動し直す
+- 起動できない・再起動上限に達した・env_extra 指定などは BlenderCLI のコールド実行へフォールバック
+
+使用例:
+    cli = BlenderCLI(exe)
+    with WarmBlenderWorker(cli, run_dir) as runner:
+        runner.run_script("build.py", args=[...], log_file="build.log")
+"""
+
+import os
+import secrets
+import socket
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ag_rpc_client import RpcClient, RpcError
+from blender_cli import BlenderCLI, BlenderCLIError
+from error_recovery import check_process_health, classify_failure
+
+
+WORKER_MODES = ("warm", "cold")
+
+# run_script の応答待ちに、スクリプトの timeout へ上乗せする秒数（サーバー側の応答を待つ余裕）
+RPC_TIMEOUT_MARGIN_S = 30.0
+
+
+def _is_timeout(exc: BaseException) -> bool:
+    """RPC の応答待ちタイムアウトか（RpcClient は RuntimeError で包んで送出する）"""
+    return isinstance(exc, socket.timeout) or isinstance(exc.__cause__, socket.timeout)
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+def _tail(path: Optional[str], limit: int = 4000) -> str:
+    if not path:
+        return ""
+    p = Path(path)
+    if not p.exists():
+        return ""
+    return p.read_text(encoding="utf-8", errors="replace")[-limit:]
+
+
+class WarmBlenderWorker:
+    """BlenderCLI.run_script と同じ呼び出し形で使える常駐ワーカー
+
+    warm=False のときは常に BlenderCLI へ委譲する（--blender-worker cold 相当）。
+    """
+
+    def __init__(
+        self,
+        cli: BlenderCLI,
+        work_dir: Path,
+        warm: bool = True,
+        host: str = "127.0.0.1",
+        startup_timeout: float = 60.0,
+        max_restarts: int = 2,
+    ):
+        self.cli = cli
+        self.blender_exe = cli.blender_exe
+        self.work_dir = Path(work_dir)
+        self.warm = bool(warm)
+        self.host = host
+        self.startup_timeout = float(startup_timeout)
+        self.max_restarts = max(0, int(max_restarts))
+        self._token = secrets.token_hex(16)
+        self._proc: Optional[subprocess.Popen] = None
+        self._port: Optional[int] = None
+        self._stdout_file = None
+        self._disabled_reason = "" if self.warm else "cold mode requested"
+        self._stats: Dict[str, Any] = {
+            "starts": 0,
+            "restarts": 0,
+            "warm_runs": 0,
+            "cold_runs": 0,
+            "startup_sec": [],
+            "crashes": [],
+            "timeouts": 0,
+        }
+        self.rpc_timeout_margin = RPC_TIMEOUT_MARGIN_S
+
+    # ---- プロセス管理 ----
+
+    @property
+    def log_path(self) -> Path:
+        return self.work_dir / "warm_worker_stdout.log"
+
+    def _client(self, timeout: float) -> RpcClient:
+        return RpcClient(
+            self.host, self._port, timeout=timeout, token=self._token,
+            max_retries=0, reuse_connection=False,
+        )
+
+    def start(self) -> None:
+        """常駐Blenderを起動し、RPC応答まで待つ"""
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self._port = _free_port(self.host)
+        bridge_dir = Path(__file__).resolve().parent
+        bootstrap = (
+            "import sys\n"
+            f"sys.path.insert(0, r\"{bridge_dir}\")\n"
+            "from antigravity_bridge import rpc_server\n"
+            f"rpc_server.serve_blocking(\"{self.host}\", {self._port})\n"
+        )
+        env = os.environ.copy()
+        env.update({
+            "AG_RPC_TOKEN": self._token,
+            "AG_RPC_ENABLE_RUN_SCRIPT": "1",
+            "AG_RPC_MAX_CONNECTIONS": "2",  # スクリプト実行中もヘルスチェックを通す
+        })
+        cmd = [self.blender_exe, "--background", "--factory-startup", "--python-expr", bootstrap]
+
+        # stdout=PIPE はバッファ詰まりの原因になるのでファイルへ（クラッシュ分類にも使う）
+        self._stdout_file = open(self.log_path, "a", encoding="utf-8", errors="replace")
+        started = time.perf_counter()
+        self._proc = subprocess.Popen(cmd, env=env, stdout=self._stdout_file, stderr=subprocess.STDOUT)
+        self._stats["starts"] += 1
+
+        client = self._client(timeout=3.0)
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if not check_process_health(self._proc)["alive"]:
+                raise RuntimeError(
+                    f"常駐Blenderが起動直後に終了しました (rc={self._proc.returncode})。ログ: {self.log_path}"
+                )
+            try:
+                if client.ping().get("ok"):
+                    self._stats["startup_sec"].append(round(time.perf_counter() - started, 3))
+                    print(f"[AG] warm worker ready (pid={self._proc.pid}, port={self._port})")
+                    return
+            except (RpcError, RuntimeError, OSError):
+                time.sleep(0.2)
+        self._kill()
+        raise TimeoutError(f"常駐Blenderが{self.startup_timeout}秒以内に応答しませんでした")
+
+    def health_check(self, timeout: float = 5.0) -> bool:
+        """プロセス生存と ping 応答を確認する"""
+        if self._proc is None or not check_process_health(self._proc)["alive"]:
+            return False
+        try:
+            return bool(self._client(timeout=timeout).ping().get("ok"))
+        except (RpcError, RuntimeError, OSError):
+            return False
+
+    def _kill(self) -> None:
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.kill()
+            try:
+                self._proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                pass
+        self._proc = None
+        if self._stdout_file is not None:
+            self._stdout_file.close()
+            self._stdout_file = None
+
+    def _ensure_started(self) -> bool:
+        """常駐プロセスを使える状態にする。使えなければ False（コールド実行へ）"""
+        if self._disabled_reason:
+            return False
+        if self._proc is not None and self.health_check():
+            return True
+        if self._proc is not None:
+            # 反復の合間に落ちていた
+            self._record_crash("<idle>")
+            if not self._can_restart():
+                return False
+            self._stats["restarts"] += 1
+        self._kill()
+        try:
+            self.start()
+            return True
+        except Exception as e:
+            self._disabled_reason = f"startup failed: {e}"
+            print(f"[AG] warm worker unavailable, fallback to cold CLI: {e}")
+            self._kill()
+            return False
+
+    def _record_crash(self, script: str) -> str:
+        failure_type = classify_failure(str(self.log_path))
+        returncode = self._proc.poll() if self._proc is not None else None
+        self._stats["crashes"].append({
+            "script": script,
+            "failure_type": failure_type,
+            "returncode": returncode,
+        })
+        print(f"[AG] warm worker crashed ({failure_type}, rc={returncode}) during {script}")
+        return failure_type
+
+    def _can_restart(self) -> bool:
+        if self._stats["restarts"] >= self.max_restarts:
+            self._disabled_reason = f"restart limit reached ({self.max_restarts})"
+            self._kill()
+            return False
+        return True
+
+    # ---- 実行 ----
+
+    def run_script(
+        self,
+        script_path: str,
+        blend_file: Optional[str] = None,
+        args: Optional[list] = None,
+        log_file: Optional[str] = None,
+        timeout: int = 300,
+        factory_startup: bool = True,
+        env_extra: Optional[dict] = None,
+    ) -> subprocess.CompletedProcess:
+        """BlenderCLI.run_script 互換。常駐プロセスで実行し、使えなければコールド実行する"""
+        if env_extra or not self._ensure_started():
+            return self._run_cold(script_path, blend_file, args, log_file, timeout, factory_startup, env_extra)
+
+        params = {
+            "path": str(script_path),
+            "argv": [str(a) for a in (args or [])],
+            "blend_file": str(blend_file) if blend_file else None,
+            "factory_startup": bool(factory_startup),
+            "log_file": str(log_file) if log_file else None,
+        }
+        while True:
+            try:
+                self._client(timeout=float(timeout) + self.rpc_timeout_margin).run_script(**params)
+                self._stats["warm_runs"] += 1
+                return subprocess.CompletedProcess(
+                    args=["<warm>", str(script_path), *params["argv"]],
+                    returncode=0,
+                    stdout=_tail(log_file),
+                    stderr="",
+                )
+            except RpcError as e:
+                if e.code == -32000:
+                    # スクリプト自体の失敗（コールド実行の rc!=0 と同じ扱い）
+                    raise BlenderCLIError(
+                        f"スクリプト実行失敗 (warm): {script_path}: {e.rpc_message}",
+                        returncode=1,
+                        stdout=_tail(log_file),
+                        log_path=log_file or "",
+                    ) from e
+                crashed = not self.health_check()
+                if not crashed:
+                    raise
+            except (RuntimeError, OSError) as e:
+                if _is_timeout(e):
+                    # 非冪等なスクリプトを二重に走らせないよう、再実行もコールド実行もしない
+                    self._stats["timeouts"] += 1
+                    print(f"[AG] warm worker timed out after {timeout}s during {Path(script_path).name}")
+                    self._kill()
+                    raise subprocess.TimeoutExpired(
+                        ["<warm>", str(script_path), *params["argv"]], timeout, output=_tail(log_file),
+                    ) from e
+                crashed = True
+
+            # ここに来るのはプロセスのクラッシュ・応答不能
+            self._record_crash(Path(script_path).name)
+            if not self._can_restart():
+                return self._run_cold(script_path, blend_file, args, log_file, timeout, factory_startup, env_extra)
+            self._stats["restarts"] += 1
+            self._kill()
+            try:
+                self.start()
+            except Exception as e:
+                self._disabled_reason = f"restart failed: {e}"
+                self._kill()
+                return self._run_cold(script_path, blend_file, args, log_file, timeout, factory_startup, env_extra)
+
+    def _run_cold(self, script_path, blend_file, args, log_file, timeout, factory_startup, env_extra):
+        self._stats["cold_runs"] += 1
+        return self.cli.run_script(
+            script_path,
+            blend_file=blend_file,
+            args=args,
+            log_file=log_file,
+            timeout=timeout,
+            factory_startup=factory_startup,
+            env_extra=env_extra,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """run_report 用の統計"""
+        mode = "warm" if self.warm and not self._disabled_reason else "cold"
+        if self.warm and self._disabled_reason and self._stats["warm_runs"]:
+            mode = "warm+cold_fallback"
+        return {
+            "mode": mode,
+            "fallback_reason": self._disabled_reason if self.warm else "",
+            **{k: (list(v) if isinstance(v, list) else v) for k, v in self._stats.items()},
+        }
+
+    def close(self) -> None:
+        """常駐プロセスを終了する"""
+        if self._proc is not None and self._proc.poll() is None:
+            try:
+                self._client(timeout=5.0).shutdown()
+                self._proc.wait(timeout=15)
+            except Exception:
+                pass
+        self._kill()
+
+    def __enter__(self) -> "WarmBlenderWorker":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
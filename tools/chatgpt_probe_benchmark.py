@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""ChatGPT 生成シグナル観測（generation_fsm）のポーリング1回あたりの所要時間の計測.
+
+tests/fixtures/chatgpt_chat_page.html をローカルの Chromium で開き、
+最新のアシスタント発言を --chars 文字まで伸ばしながら（ストリーミングを模して追記）
+- locators:  observe_signals_locators_sync（AdaptiveSelector + ロケータ呼び出し約10往復）
+- dom_probe: observe_signals_sync（DOM Probe を1回 evaluate）
+で --polls 回ずつ観測し、所要時間を比べる。両者のシグナルが一致することも確認する。
+
+出力: モード・発言サイズごとの poll_p50_ms / poll_p95_ms / poll_max_ms と identical
+
+使い方（playwright と chromium が必要）:
+    python tools/chatgpt_probe_benchmark.py --chars 1000,20000,100000 --polls 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+DESKTOP_ROOT = ROOT / ".agent" / "workflows" / "desktop"
+if str(DESKTOP_ROOT) not in sys.path:
+    sys.path.insert(0, str(DESKTOP_ROOT))
+
+from playwright.sync_api import sync_playwright  # noqa: E402
+
+from integrations.chatgpt.generation_fsm import observe_signals_locators_sync, observe_signals_sync  # noqa: E402
+
+FIXTURE = ROOT / "tests" / "fixtures" / "chatgpt_chat_page.html"
+SIGNAL_KEYS = ("has_textbox", "stop_button_visible", "send_enabled", "last_msg_len", "last_msg_hash",
+               "rate_limited", "error_banner")
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def run_case(page: Any, chars: int, polls: int) -> list[dict[str, Any]]:
+    page.goto(FIXTURE.as_uri())
+    page.evaluate("() => fixture.start()")
+    chunk = "ストリーミング中の回答テキスト stream chunk. "
+    step = max(1, chars // polls)
+    timings: dict[str, list[float]] = {"locators": [], "dom_probe": []}
+    identical = True
+    written = 0
+    for _ in range(polls):
+        add = (chunk * (step // len(chunk) + 1))[:step]
+        page.evaluate("(t) => fixture.append(t)", add)
+        written += len(add)
+        legacy = observe_signals_locators_sync(page)
+        probe = observe_signals_sync(page)
+        timings["locators"].append(legacy.probe_ms or 0.0)
+        timings["dom_probe"].append(probe.probe_ms or 0.0)
+        identical &= all(getattr(legacy, k) == getattr(probe, k) for k in SIGNAL_KEYS)
+    return [
+        {
+            "mode": mode,
+            "message_chars": written,
+            "polls": polls,
+            "poll_p50_ms": round(statistics.median(values), 2),
+            "poll_p95_ms": round(_percentile(values, 0.95), 2),
+            "poll_max_ms": round(max(values), 2),
+            "identical": identical,
+        }
+        for mode, values in timings.items()
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="ChatGPT 生成シグナル観測の1ポーリングの所要時間をロケータ版と比較")
+    parser.add_argument("--chars", default="1000,20000,100000")
+    parser.add_argument("--polls", type=int, default=50)
+    args = parser.parse_args()
+    results = []
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        page = browser.new_page()
+        for chars in [int(x) for x in args.chars.split(",") if x.strip()]:
+            results.extend(run_case(page, chars, args.polls))
+        browser.close()
+    print(json.dumps({"results": results}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""/check ルール（cycle_dependency / dangling_reference）のスケーリング計測.
+
+N ノードの合成グラフ（5ノードの環 + 前向きの枝 + N段の一本鎖）と、N ファイル + N/10 件の参照切れで
+- cycles:   find_cycles（Tarjan, 反復）
+- dangling: detect_dangling_reference（basename/stem 辞書 + トライグラム索引）
+の秒数と 1ノードあたりの µs を出す。--legacy-max 以下の規模では旧実装（再帰DFS / 線形走査）も計測する。
+
+使い方:
+    python tools/check_rules_benchmark.py --scales 1000,10000,50000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+CHECK_DIR = ROOT / ".agent" / "workflows" / "check"
+if str(CHECK_DIR) not in sys.path:
+    sys.path.insert(0, str(CHECK_DIR))
+
+from core.finding import Edge  # noqa: E402
+from rules.cycle_dependency import find_cycles  # noqa: E402
+from rules.dangling_reference import detect_dangling_reference  # noqa: E402
+
+WORDS = ["readme", "skill", "workflow", "config", "runner", "report", "cache", "index", "fetch", "guide"]
+
+
+def _edge(src: str, dst: str) -> Edge:
+    return Edge(src_file=src, dst_file=dst, edge_type="import", raw_target=dst, confidence=0.9)
+
+
+def _graph(n: int, rng: random.Random) -> dict[str, list[tuple[str, Edge]]]:
+    nodes = [f"/ws/n{i}.py" for i in range(n)]
+    graph: dict[str, list[tuple[str, Edge]]] = {node: [] for node in nodes}
+    for i, node in enumerate(nodes):
+        ring_next = nodes[i - i % 5 + (i + 1) % 5] if i - i % 5 + 4 < n else None
+        if ring_next:
+            graph[node].append((ring_next, _edge(node, ring_next)))
+        for _ in range(2):
+            j = rng.randrange(i, n)
+            if j // 5 != i // 5:
+                graph[node].append((nodes[j], _edge(node, nodes[j])))
+    chain = [f"/ws/chain{i}.py" for i in range(n)]
+    for a, b in zip(chain, chain[1:]):
+        graph.setdefault(a, []).append((b, _edge(a, b)))
+    return graph
+
+
+def _files_and_dangling(n: int, rng: random.Random) -> tuple[list[str], list[Edge]]:
+    files = [f"/ws/{rng.choice(WORDS)}_{i}/{rng.choice(WORDS)}{i % 97}.{rng.choice(['md', 'py', 'json'])}" for i in range(n)]
+    edges = [_edge(files[i], f"/ws/missing/{rng.choice(WORDS)}{rng.randrange(n)}.md") for i in range(0, n, 10)]
+    return files, edges
+
+
+def _legacy_find_cycles(graph):
+    visited, stack, cycles = set(), set(), []
+
+    def dfs(node, path):
+        visited.add(node)
+        stack.add(node)
+        for neighbor, edge in graph.get(node, []):
+            if neighbor not in visited:
+                dfs(neighbor, path + [(node, neighbor, edge)])
+            elif neighbor in stack:
+                cycles.append(path + [(node, neighbor, edge)])
+        stack.remove(node)
+
+    for node in graph:
+        if node not in visited:
+            dfs(node, [])
+    return cycles
+
+
+def _legacy_similar(target: str, candidates: list[str]) -> list[str]:
+    target_name, target_stem = Path(target).name.lower(), Path(target).stem.lower()
+    similar = []
+    for c in candidates:
+        c_name, c_stem = Path(c).name.lower(), Path(c).stem.lower()
+        if c_name == target_name:
+            similar.insert(0, c)
+        elif c_stem == target_stem or target_stem in c_name or c_stem in target_name:
+            similar.append(c)
+    return similar
+
+
+def _timed(fn) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run_scale(n: int, legacy_max: int) -> dict[str, Any]:
+    rng = random.Random(n)
+    graph = _graph(n, rng)
+    files, edges = _files_and_dangling(n, rng)
+    cycles_sec, cycles = _timed(lambda: find_cycles(graph))
+    dangling_sec, findings = _timed(lambda: detect_dangling_reference(edges, files))
+    row: dict[str, Any] = {
+        "nodes": len(graph),
+        "cycles": len(cycles),
+        "cycles_sec": round(cycles_sec, 4),
+        "cycles_us_per_node": round(cycles_sec / len(graph) * 1e6, 2),
+        "files": n,
+        "dangling": len(findings),
+        "dangling_sec": round(dangling_sec, 4),
+        "dangling_us_per_file": round(dangling_sec / n * 1e6, 2),
+    }
+    if n <= legacy_max:
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, 4 * len(graph)))
+        try:
+            row["legacy_cycles_sec"] = round(_timed(lambda: _legacy_find_cycles(graph))[0], 4)
+        except RecursionError:
+            row["legacy_cycles_sec"] = "RecursionError"
+        finally:
+            sys.setrecursionlimit(limit)
+        row["legacy_dangling_sec"] = round(_timed(lambda: [_legacy_similar(e.dst_file, files) for e in edges])[0], 4)
+    return row
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="cycle_dependency / dangling_reference のノード数に対するスケーリングを計測")
+    parser.add_argument("--scales", default="1000,5000,10000,50000")
+    parser.add_argument("--legacy-max", type=int, default=5000, help="旧実装も計測する最大規模")
+    args = parser.parse_args()
+    scales = [int(x) for x in args.scales.split(",") if x.strip()]
+    print(json.dumps({"results": [run_scale(n, args.legacy_max) for n in scales]}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""codex_exec_wrapper の重複ブロック除去の計測.
+
+合成した Codex 風トランスクリプト（ログ行・空行・コードブロック、その一部を後で再出力）に対して
+- batch:  remove_duplicates（一括）
+- stream: DuplicateBlockFilter.feed を 4KB ずつ（実行中の出力を想定）
+の秒数と行/秒を出す。--legacy-max 以下の行数では、重複なしの同規模トランスクリプト（旧実装の最悪ケース）で
+旧実装（全行ペア比較・最初の1件のみ）と新実装を比較する。
+
+使い方:
+    python tools/codex_dedup_benchmark.py --lines 1000,10000,100000
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import random
+import sys
+import time
+from contextlib import redirect_stderr
+from pathlib import Path
+from typing import Any
+
+TOOLS_DIR = Path(__file__).resolve().parent
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from codex_exec_wrapper import DuplicateBlockFilter, remove_duplicates  # noqa: E402
+
+
+def _transcript(lines: int, rng: random.Random, repeat_ratio: float = 0.15) -> str:
+    out: list[str] = []
+    blocks: list[list[str]] = []
+    while len(out) < lines:
+        roll = rng.random()
+        if roll < repeat_ratio and blocks:
+            out.extend(rng.choice(blocks))  # 以前のブロックを再出力（重複）
+        elif roll < 0.35:
+            block = [f"    step_{len(out)}_{j} = compute(value_{j}, option={rng.randrange(1000)})" for j in range(rng.randint(3, 12))]
+            blocks.append(block)
+            out.extend(["```python", *block, "```"])
+        else:
+            out.append(f"[exec] {len(out)}: reading file src/module_{rng.randrange(500)}.py ok")
+            if rng.random() < 0.3:
+                out.append("")
+    return "\n".join(out[:lines])
+
+
+def _legacy_remove(text: str, min_block_len: int = 80) -> str:
+    lines = text.split("\n")
+    n = len(lines)
+    for i in range(n):
+        for j in range(i + 1, n):
+            match_len = 0
+            k = 0
+            while i + k < j and j + k < n and lines[i + k] == lines[j + k]:
+                match_len += len(lines[i + k])
+                k += 1
+            if match_len >= min_block_len and k >= 3:
+                return "\n".join(lines[:j] + lines[j + k:])
+    return text
+
+
+def _timed(fn) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _stream(text: str, chunk: int = 4096) -> tuple[str, DuplicateBlockFilter]:
+    dedup = DuplicateBlockFilter()
+    parts = [dedup.feed(text[pos:pos + chunk]) for pos in range(0, len(text), chunk)]
+    parts.append(dedup.close())
+    return "".join(parts), dedup
+
+
+def run_scale(lines: int, legacy_max: int) -> dict[str, Any]:
+    text = _transcript(lines, random.Random(lines))
+    with redirect_stderr(io.StringIO()):
+        batch_sec, cleaned = _timed(lambda: remove_duplicates(text))
+    stream_sec, (streamed, dedup) = _timed(lambda: _stream(text))
+    row: dict[str, Any] = {
+        "lines": lines,
+        "duplicate_blocks": len(dedup.duplicates),
+        "removed_lines": dedup.removed_lines,
+        "batch_sec": round(batch_sec, 4),
+        "stream_sec": round(stream_sec, 4),
+        "lines_per_sec": round(lines / batch_sec) if batch_sec else None,
+        "stream_matches_batch": streamed == cleaned,
+    }
+    if lines <= legacy_max:
+        unique = _transcript(lines, random.Random(lines), repeat_ratio=0.0)
+        row["no_dup_legacy_sec"] = round(_timed(lambda: _legacy_remove(unique))[0], 4)
+        with redirect_stderr(io.StringIO()):
+            row["no_dup_batch_sec"] = round(_timed(lambda: remove_duplicates(unique))[0], 4)
+    return row
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="重複ブロック除去の行数に対するスケーリングを計測")
+    parser.add_argument("--lines", default="1000,10000,100000")
+    parser.add_argument("--legacy-max", type=int, default=2000, help="旧実装も計測する最大行数")
+    args = parser.parse_args()
+    scales = [int(x) for x in args.lines.split(",") if x.strip()]
+    print(json.dumps({"results": [run_scale(n, args.legacy_max) for n in scales]}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
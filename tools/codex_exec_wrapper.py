@@ -19,6 +19,7 @@ Codex Exec ラッパースクリプト
   python tools/codex_exec_wrapper.py "リポジトリ分析" -o result.md
   python tools/codex_exec_wrapper.py "分析" -o result.md --json meta.json
   python tools/codex_exec_wrapper.py "分析" --scope ".agent/workflows"
+  python tools/codex_exec_wrapper.py "分析" --stream   # 重複除去しながら逐次表示
 """
 
 import argparse
@@ -28,6 +29,7 @@ import os
 import re
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
@@ -109,75 +111,237 @@ def run_codex_exec(
     }
 
 
-def detect_duplicates(text: str, min_block_len: int = 80) -> list[dict]:
-    """テキスト内で重複するブロックを検出する"""
-    duplicates = []
-    lines = text.split("\n")
-    n = len(lines)
-
-    for i in range(n):
-        for j in range(i + 1, n):
-            match_len = 0
-            k = 0
-            while i + k < j and j + k < n and lines[i + k] == lines[j + k]:
-                match_len += len(lines[i + k])
+class DuplicateBlockFilter:
+    """重複ブロックを逐次除去するフィルタ（ストリーミング対応）
+
+    min_lines 行以上・min_block_len 文字以上（改行を除く行長の合計）の行ブロックが
+    それ以前に出現していれば、2回目以降を除去する。最初の出現は保持する。
+
+    行を整数IDに置き換え、min_lines 行の窓をキーに過去の開始位置を引く
+    （窓ごとのローリングハッシュ）。一致した候補から前方へ延長し、最長のものを採用する。
+    空行の連続は1回の比較で読み飛ばすので、全体でほぼ線形時間になる。
+
+    feed() は確定した行だけを返し、重複の途中かもしれない行は保留する。
+    feed() と close() の戻り値を連結すると remove_duplicates() と同じ結果になる。
+    """
+
+    # 窓ごとに保持する候補数（最初の出現側と直近側を半分ずつ）
+    MAX_CANDIDATES = 8
+
+    def __init__(self, min_block_len: int = 80, min_lines: int = 3):
+        self.min_block_len = min_block_len
+        self.min_lines = max(1, min_lines)
+        self.duplicates: list[dict] = []
+        self.removed_lines = 0
+        self._lines: list[str] = []
+        self._ids: list[int] = []
+        self._intern: dict[str, int] = {}
+        self._chars = [0]  # 行長の累積和
+        self._windows: dict[tuple[int, ...], list[int]] = {}
+        self._run_start: list[int] = []  # 空行なら連続空行の先頭位置、それ以外は -1
+        self._run_end: dict[int, int] = {}  # 閉じた空行連続の 先頭 → 終端(排他)
+        self._head = 0
+        self._progress: dict[int, int] = {}  # 保留中の候補ごとの一致行数（_head 用）
+        self._partial = ""
+        self._emitted = False
+        self._closed = False
+
+    def feed(self, chunk: str) -> str:
+        parts = (self._partial + chunk).split("\n")
+        self._partial = parts.pop()
+        for line in parts:
+            self._append(line)
+        return self._drain(final=False)
+
+    def close(self) -> str:
+        if not self._closed:
+            self._closed = True
+            self._append(self._partial)
+            self._partial = ""
+        return self._drain(final=True)
+
+    def _append(self, line: str) -> None:
+        pos = len(self._lines)
+        self._lines.append(line)
+        self._ids.append(self._intern.setdefault(line, len(self._intern)))
+        self._chars.append(self._chars[-1] + len(line))
+        if line:
+            self._run_start.append(-1)
+            if pos and self._run_start[pos - 1] >= 0:
+                self._run_end[self._run_start[pos - 1]] = pos
+        else:
+            prev = self._run_start[pos - 1] if pos else -1
+            self._run_start.append(prev if prev >= 0 else pos)
+
+        start = pos - self.min_lines + 1
+        if start >= 0:
+            bucket = self._windows.setdefault(tuple(self._ids[start:pos + 1]), [])
+            bucket.append(start)
+            if len(bucket) > self.MAX_CANDIDATES:
+                del bucket[self.MAX_CANDIDATES // 2]
+
+    def _empty_run_end(self, pos: int) -> int:
+        return self._run_end.get(self._run_start[pos], len(self._lines))
+
+    def _extend(self, i: int, h: int, k: int) -> tuple[int, bool]:
+        """i と h から k 行一致済みの状態で延長する。(一致行数, 未着の行待ちか)"""
+        ids = self._ids
+        n = len(ids)
+        limit = h - i  # 先の出現と重ならない範囲
+        while k < limit:
+            a, b = i + k, h + k
+            if b >= n:
+                return k, True
+            if ids[a] != ids[b]:
+                return k, False
+            if self._run_start[b] >= 0:
+                # 両側とも空行: 短い方の連続の終わりまで一度に進める
+                k += max(1, min(self._empty_run_end(a) - a, self._empty_run_end(b) - b, limit - k))
+            else:
                 k += 1
-            if match_len >= min_block_len and k >= 3:
-                block = "\n".join(lines[i : i + k])
-                block_hash = hashlib.sha256(block.encode("utf-8")).hexdigest()[:16]
-                duplicates.append({
-                    "start_line_a": i,
-                    "start_line_b": j,
+        return limit, False
+
+    def _match_at(self, h: int, final: bool) -> tuple[int, int] | None:
+        """h から始まる重複 (先の出現位置, 行数)。無ければ (-1, 0)、入力待ちなら None"""
+        key = tuple(self._ids[h:h + self.min_lines])
+        candidates = [i for i in self._windows.get(key, ()) if i + self.min_lines <= h]
+        best_i, best_k = -1, 0
+        for i in candidates:
+            k, waiting = self._extend(i, h, self._progress.get(i, 0))
+            self._progress[i] = k
+            if waiting and not final:
+                return None
+            if k > best_k:
+                best_i, best_k = i, k
+        if best_k >= self.min_lines and self._chars[h + best_k] - self._chars[h] >= self.min_block_len:
+            return best_i, best_k
+        return -1, 0
+
+    def _drain(self, final: bool) -> str:
+        out: list[str] = []
+        n = len(self._lines)
+        while self._head < n:
+            h = self._head
+            if h + self.min_lines > n:
+                if not final:
+                    break
+                match: tuple[int, int] | None = (-1, 0)
+            else:
+                match = self._match_at(h, final)
+                if match is None:
+                    break
+            self._progress = {}
+            first, k = match
+            if k:
+                block = "\n".join(self._lines[h:h + k])
+                self.duplicates.append({
+                    "start_line_a": first,
+                    "start_line_b": h,
                     "num_lines": k,
-                    "char_count": match_len,
-                    "hash": block_hash,
+                    "char_count": self._chars[h + k] - self._chars[h],
+                    "hash": hashlib.sha256(block.encode("utf-8")).hexdigest()[:16],
                 })
-                break
-        if duplicates:
-            break
+                self.removed_lines += k
+                self._head += k
+                continue
+            out.append(("\n" if self._emitted else "") + self._lines[h])
+            self._emitted = True
+            self._head += 1
+        return "".join(out)
+
+
+def run_codex_exec_streaming(
+    prompt: str,
+    *,
+    timeout: int = 600,
+    cwd: str | None = None,
+    extra_args: list[str] | None = None,
+    dedup: DuplicateBlockFilter | None = None,
+    on_output=None,
+) -> dict:
+    """codex exec を実行し、stdout を届いた順に（dedup があれば重複除去して）on_output へ渡す
 
-    return duplicates
+    戻り値は run_codex_exec と同じ（stdout は除去前の生の出力）。
+    """
+    parts = ["codex", "exec"]
+    if extra_args:
+        parts.extend(extra_args)
+    parts.append(_escape_shell_arg(prompt))
+    cmd_str = " ".join(parts)
+    work_dir = cwd or os.getcwd()
+    emit = on_output or (lambda text: (sys.stdout.write(text), sys.stdout.flush()))
+
+    print(f"[info] 実行開始: codex exec --stream (timeout={timeout}s)", file=sys.stderr)
+    start = time.monotonic()
+    proc = subprocess.Popen(
+        cmd_str,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        cwd=work_dir,
+        encoding="utf-8",
+        errors="replace",
+        shell=True,
+    )
+    stderr_chunks: list[str] = []
+    stderr_thread = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+    stderr_thread.start()
+    timed_out = threading.Event()
+
+    def _kill() -> None:
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, _kill)
+    timer.start()
+    stdout_chunks: list[str] = []
+    try:
+        for line in proc.stdout:
+            stdout_chunks.append(line)
+            text = dedup.feed(line) if dedup is not None else line
+            if text:
+                emit(text)
+        if dedup is not None:
+            tail = dedup.close()
+            if tail:
+                emit(tail)
+        proc.wait()
+    finally:
+        timer.cancel()
+    stderr_thread.join(timeout=5)
+
+    elapsed = time.monotonic() - start
+    if timed_out.is_set():
+        print(f"[error] タイムアウト ({timeout}秒超過)", file=sys.stderr)
+    else:
+        print(f"[info] 実行完了: {elapsed:.1f}秒, exit_code={proc.returncode}", file=sys.stderr)
+    return {
+        "stdout": "".join(stdout_chunks),
+        "stderr": "".join(stderr_chunks),
+        "exit_code": 124 if timed_out.is_set() else proc.returncode,
+        "elapsed_seconds": round(elapsed, 2),
+        "timed_out": timed_out.is_set(),
+    }
+
+
+def detect_duplicates(text: str, min_block_len: int = 80) -> list[dict]:
+    """テキスト内で重複するブロック（2回目以降の出現）をすべて検出する"""
+    dedup = DuplicateBlockFilter(min_block_len=min_block_len)
+    dedup.feed(text)
+    dedup.close()
+    return dedup.duplicates
 
 
 def remove_duplicates(text: str, min_block_len: int = 80) -> str:
     """テキスト内の重複ブロックを除去する
 
-    最初の出現を保持し、2回目以降を除去する。
+    最初の出現を保持し、2回目以降をすべて除去する。
     """
-    lines = text.split("\n")
-    n = len(lines)
-    remove_ranges = []
-
-    for i in range(n):
-        for j in range(i + 1, n):
-            match_len = 0
-            k = 0
-            while i + k < j and j + k < n and lines[i + k] == lines[j + k]:
-                match_len += len(lines[i + k])
-                k += 1
-            if match_len >= min_block_len and k >= 3:
-                # 2番目の出現（j〜j+k-1）を除去対象にする
-                remove_ranges.append((j, j + k))
-                break
-        if remove_ranges:
-            break
-
-    if not remove_ranges:
+    dedup = DuplicateBlockFilter(min_block_len=min_block_len)
+    cleaned = dedup.feed(text) + dedup.close()
+    if not dedup.duplicates:
         return text
-
-    # 除去対象行を削除
-    keep = []
-    remove_set = set()
-    for start, end in remove_ranges:
-        for idx in range(start, end):
-            remove_set.add(idx)
-
-    for idx, line in enumerate(lines):
-        if idx not in remove_set:
-            keep.append(line)
-
-    cleaned = "\n".join(keep)
-    print(f"[info] 重複除去: {len(remove_set)}行を除去", file=sys.stderr)
+    print(f"[info] 重複除去: {dedup.removed_lines}行を除去", file=sys.stderr)
     return cleaned
 
 
@@ -189,12 +353,12 @@ def extract_tokens_used(text: str) -> int | None:
     return None
 
 
-def clean_output(stdout: str, stderr: str) -> str:
+def clean_output(stdout: str, stderr: str, *, dedup: bool = True) -> str:
     """stdout/stderrから最終的なクリーンな出力を生成
 
     1. メインコンテンツはstdoutから取得
     2. stdoutが空ならstderrを使用
-    3. 重複があれば除去
+    3. 重複があれば除去（dedup=False で無効）
     4. 'tokens used' 行をメタデータとして分離
     """
     # メインコンテンツの決定
@@ -206,8 +370,7 @@ def clean_output(stdout: str, stderr: str) -> str:
         return ""
 
     # 重複除去
-    dups = detect_duplicates(content)
-    if dups:
+    if dedup:
         content = remove_duplicates(content)
 
     # 'tokens used' 行を末尾から除去（メタデータなのでコンテンツに含めない）
@@ -263,6 +426,11 @@ def main():
         "--cwd",
         help="作業ディレクトリ（デフォルト: カレント）",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="stdoutを届いた順に表示（--no-dedup/--raw でなければ重複除去しながら）",
+    )
 
     args = parser.parse_args()
 
@@ -275,11 +443,21 @@ def main():
     find_codex_command()
 
     # 実行
-    result = run_codex_exec(
-        prompt,
-        timeout=args.timeout,
-        cwd=args.cwd,
-    )
+    if args.stream:
+        live_dedup = None if (args.no_dedup or args.raw) else DuplicateBlockFilter()
+        result = run_codex_exec_streaming(
+            prompt,
+            timeout=args.timeout,
+            cwd=args.cwd,
+            dedup=live_dedup,
+            on_output=None if not args.output else (lambda text: None),
+        )
+    else:
+        result = run_codex_exec(
+            prompt,
+            timeout=args.timeout,
+            cwd=args.cwd,
+        )
 
     # メタデータ収集
     tokens_from_stdout = extract_tokens_used(result["stdout"])
@@ -290,7 +468,7 @@ def main():
     if args.raw:
         final_output = result["stdout"]
     else:
-        final_output = clean_output(result["stdout"], result["stderr"])
+        final_output = clean_output(result["stdout"], result["stderr"], dedup=not args.no_dedup)
 
     # 重複検出レポート
     stdout_dups = detect_duplicates(result["stdout"])
@@ -324,8 +502,8 @@ def main():
         output_path.write_text(final_output, encoding="utf-8")
         print(f"[ok] 出力保存: {output_path}", file=sys.stderr)
         print(f"[ok] 文字数: {len(final_output)}", file=sys.stderr)
-    else:
-        # ターミナル出力
+    elif not args.stream:
+        # ターミナル出力（--stream では実行中に表示済み）
         print(final_output)
 
     # JSON メタデータ出力
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""日記エージェントの全文検索インデックス（diary_store）の計測.
+
+N 件の合成エントリー（日本語の本文 + タグ）を DiaryStore.rebuild で一括投入し、
+- rebuild: 一括投入の秒数
+- upsert:  1件更新の平均 ms
+- search:  代表クエリ（2〜4文字の日本語・英単語・1文字・タグ/タイプフィルタ付き）の中央値/最大 ms
+を出す。
+
+使い方:
+    python tools/diary_search_benchmark.py --entries 10000,100000
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_DIR = ROOT / "エージェント" / "日記エージェント" / "scripts"
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from diary_store import DiaryStore  # noqa: E402
+
+COMMON = [
+    "会議", "議事録", "リリース", "計画", "買い物", "牛乳", "読書", "散歩", "振り返り", "見積もり",
+    "請求書", "開発", "テスト", "レビュー", "設計", "調査", "MCP", "Unity", "Python", "deploy",
+]
+KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをん"
+KANJI = "日月火水木金土山川田人口目耳手足力気天雨空花草虫犬猫車町村森林石音字学校先生年本文"
+TAGS = ["仕事", "生活", "趣味", "開発", "学習"]
+QUERIES = ["議事録", "会議 計画", "MCP", "振り返り tag:仕事", "牛乳 type:diary", "請求書 見積もり", "卵", "存在しない語"]
+
+
+def _vocabulary(rng: random.Random, size: int = 20000) -> list[str]:
+    """日記らしい語彙（頻出語は少数、大半はまれな語）"""
+    words = {"".join(rng.choice(KANJI) for _ in range(2)) + rng.choice(KANA) for _ in range(size)}
+    return sorted(words)
+
+
+def _entries(n: int, rng: random.Random):
+    vocabulary = _vocabulary(random.Random(0))
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(vocabulary))))  # Zipf
+    for i in range(n):
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(20, 60))
+        words[rng.randrange(len(words))] = rng.choice(COMMON) if rng.random() < 0.3 else words[0]
+        body = "。".join("".join(words[j:j + 4]) for j in range(0, len(words), 4))
+        yield (
+            {
+                "id": f"20260101_{i:08d}",
+                "type": rng.choice(["diary", "task", "note"]),
+                "title": rng.choice(vocabulary[:2000]) + (rng.choice(COMMON) if rng.random() < 0.1 else ""),
+                "tags": rng.sample(TAGS, rng.randint(0, 2)),
+                "created": f"2026-01-01T00:00:00+09:00#{i:08d}",
+                "status": "active",
+            },
+            body,
+            f"note/20260101_{i:08d}.md",
+        )
+
+
+def run_scale(n: int, repeat: int) -> dict[str, Any]:
+    rng = random.Random(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DiaryStore(Path(tmp) / "index.sqlite")
+        start = time.perf_counter()
+        store.rebuild(_entries(n, rng))
+        rebuild_sec = time.perf_counter() - start
+
+        updates = list(_entries(50, random.Random(0)))
+        start = time.perf_counter()
+        for meta, body, file in updates:
+            store.upsert(meta, body, file)
+        upsert_ms = (time.perf_counter() - start) / len(updates) * 1000
+
+        search: dict[str, Any] = {}
+        vocabulary = _vocabulary(random.Random(0))
+        queries = QUERIES + [vocabulary[10], vocabulary[500], vocabulary[5000] + " " + vocabulary[7000][:2]]
+        for query in queries:
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                hits = store.search(query, limit=20)
+                samples.append((time.perf_counter() - start) * 1000)
+            search[query] = {"median_ms": round(statistics.median(samples), 2), "max_ms": round(max(samples), 2), "hits": len(hits)}
+        size_mb = sum(p.stat().st_size for p in Path(tmp).iterdir()) / 1e6
+        store.close()
+    return {
+        "entries": n,
+        "rebuild_sec": round(rebuild_sec, 2),
+        "upsert_ms": round(upsert_ms, 2),
+        "db_mb": round(size_mb, 1),
+        "search": search,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="diary_store の件数に対する検索レイテンシを計測")
+    parser.add_argument("--entries", default="10000,100000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    scales = [int(x) for x in args.entries.split(",") if x.strip()]
+    print(json.dumps({"results": [run_scale(n, args.repeat) for n in scales]}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""リサーチエージェントの Claim⇄Evidence 集計（evidence_graph.py）の計測.
+
+Phase 3 のラウンドを模して、毎ラウンド --per-round 件の Evidence を追記し、
+coverage_map と RoundSnapshot 用の Claim 集計（aggregate_confidence 相当）を求める。
+- scan:  旧実装（Claim ごとに全 Evidence を走査し、aggregate_confidence を呼び直す）
+- graph: EvidenceGraph.sync（追記分だけ取り込み）+ coverage_map / aggregate
+最終ラウンドの1ラウンドあたりの所要時間を比べる。両者の集計が一致することも確認する。
+
+使い方:
+    python tools/evidence_graph_benchmark.py --evidence 1000,10000,50000 --claims 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+RESEARCH_DIR = ROOT / ".agent" / "workflows" / "research"
+if str(RESEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(RESEARCH_DIR))
+
+from lib.evidence_graph import EvidenceGraph, _scoring_evidence  # noqa: E402
+from lib.scoring import aggregate_confidence  # noqa: E402
+
+
+def _make_evidence(i: int, n_claims: int, rng: random.Random) -> dict[str, Any]:
+    return {
+        "evidence_id": f"ev_{i}",
+        "url": f"https://example.com/{rng.randrange(500)}",
+        "claim_ids": [f"c{rng.randrange(n_claims)}" for _ in range(rng.randint(1, 2))],
+        "tier": rng.choice(["S", "A", "B", "C"]),
+        "stance": rng.choice(["supports", "refutes", "neutral"]),
+        "cluster_key": f"k{rng.randrange(20)}",
+        "quote": "quote",
+        "locator": "loc" if rng.random() < 0.7 else None,
+    }
+
+
+def _scan_round(claims: list[dict[str, Any]], evidence: list[dict[str, Any]]) -> dict[str, tuple]:
+    """旧 Phase 3: _build_coverage_map + _build_round_snapshot の全件走査"""
+    out = {}
+    now = datetime.now()
+    for claim in claims:
+        cid = claim["claim_id"]
+        related = [e for e in evidence if isinstance(e, dict) and cid in (e.get("claim_ids") or [])]
+        citeable = sum(1 for e in related if e.get("quote") and e.get("locator"))
+        conf = mass = 0.0
+        if related:
+            res = aggregate_confidence([_scoring_evidence(cid, e) for e in related], now=now)
+            conf, mass = res.confidence, res.evidence_mass
+        out[cid] = (len(related), citeable, round(conf, 9), round(mass, 9))
+    return out
+
+
+def _graph_round(graph: EvidenceGraph, claims: list[dict[str, Any]], evidence: list[dict[str, Any]]) -> dict[str, tuple]:
+    graph.sync(evidence)
+    coverage = graph.coverage_map(claims)
+    out = {}
+    for claim in claims:
+        cid = claim["claim_id"]
+        agg = graph.aggregate(cid)
+        cov = coverage[cid]
+        out[cid] = (cov["evidence_count"], cov["citeable_count"], round(agg.confidence, 9), round(agg.evidence_mass, 9))
+    return out
+
+
+def run_scale(total: int, n_claims: int, per_round: int) -> dict[str, Any]:
+    rng = random.Random(total)
+    claims = [{"claim_id": f"c{i}"} for i in range(n_claims)]
+    evidence: list[dict[str, Any]] = []
+    graph = EvidenceGraph()
+    graph_total = 0.0
+    while len(evidence) < total:
+        evidence.extend(_make_evidence(len(evidence) + j, n_claims, rng) for j in range(per_round))
+        start = time.perf_counter()
+        got = _graph_round(graph, claims, evidence)
+        graph_last = time.perf_counter() - start
+        graph_total += graph_last
+
+    start = time.perf_counter()
+    expected = _scan_round(claims, evidence)
+    scan_last = time.perf_counter() - start
+
+    return {
+        "evidence": len(evidence),
+        "claims": n_claims,
+        "per_round": per_round,
+        "scan_round_ms": round(scan_last * 1000, 2),
+        "graph_round_ms": round(graph_last * 1000, 2),
+        "graph_all_rounds_ms": round(graph_total * 1000, 1),
+        "speedup": round(scan_last / graph_last, 1) if graph_last else None,
+        "identical": got == expected,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Claim⇄Evidence 集計の Evidence 数に対するラウンド所要時間を計測")
+    parser.add_argument("--evidence", default="1000,10000,50000")
+    parser.add_argument("--claims", type=int, default=50)
+    parser.add_argument("--per-round", type=int, default=40)
+    args = parser.parse_args()
+    scales = [int(x) for x in args.evidence.split(",") if x.strip()]
+    print(json.dumps({"results": [run_scale(n, args.claims, args.per_round) for n in scales]}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
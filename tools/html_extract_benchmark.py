@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""リサーチエージェントのHTML抽出（html_extract）によるイベントループ遅延の計測.
+
+StealthFetcher の一括フェッチを模して、asyncio 上で N ページを並行に
+「取得（--latency-ms の待ち）→ テキスト抽出」し、その間 10ms ごとに起きるプローブで
+イベントループの遅延（予定時刻からの遅れ）を測る。
+
+モード:
+    inline: 旧実装（BeautifulSoup の全量解析をループ上で実行）
+    offloaded: extract_text_async（大きいページはプロセスプール + max_chars で打ち切り）
+
+出力: モード・ページサイズごとの loop_lag_p95_ms / loop_lag_max_ms / elapsed_sec
+
+使い方:
+    python tools/html_extract_benchmark.py --pages 40 --sizes-kb 50,500,3000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = ROOT / ".agent" / "workflows" / "research" / "lib"
+if str(LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(LIB_DIR))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from html_extract import STEALTH_PROFILE, extract_text_async, get_extract_pool, shutdown_extract_pool  # noqa: E402
+
+PROBE_INTERVAL_SEC = 0.01
+
+
+def _legacy_extract(html: str) -> str:
+    """旧 StealthFetcher._extract_text（比較用）"""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "svg", "canvas", "iframe", "nav", "footer", "header"]):
+        tag.decompose()
+    chunks = []
+    title = soup.title.string.strip() if soup.title and soup.title.string else ""
+    if title:
+        chunks.append(f"# {title}")
+    for node in soup.select("h1, h2, h3, h4, p, li, td, th, dt, dd, article, section"):
+        t = node.get_text(" ", strip=True)
+        if t and len(t) > 10:
+            chunks.append(t)
+    merged = re.sub(r"[ \t]+", " ", "\n".join(chunks))
+    return re.sub(r"\n{3,}", "\n\n", merged).strip()
+
+
+def _page(size_kb: int, seed: int) -> str:
+    block = (
+        f"<div class='card'><h2>見出し {seed}</h2><p>本文の段落です。<a href='/x'>リンク</a>を含み、"
+        "抽出対象になる程度の長さがあります。</p><ul><li>項目のテキスト その1</li><li>項目のテキスト その2</li></ul>"
+        "<script>window.__data = {\"k\": \"v\"};</script></div>"
+    )
+    n = max(1, size_kb * 1024 // len(block.encode("utf-8")))
+    return f"<!doctype html><html><head><title>page {seed}</title></head><body>{block * n}</body></html>"
+
+
+async def _probe(lags: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + PROBE_INTERVAL_SEC
+        await asyncio.sleep(PROBE_INTERVAL_SEC)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def _bulk_fetch(mode: str, pages: list[str], latency_sec: float, max_chars: int) -> list[float]:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(lags, stop))
+
+    async def fetch(html: str) -> str:
+        await asyncio.sleep(latency_sec)  # ページ遷移の待ち
+        if mode == "inline":
+            return _legacy_extract(html)[:max_chars]
+        return await extract_text_async(html, profile=STEALTH_PROFILE, max_chars=max_chars)
+
+    await asyncio.gather(*(fetch(p) for p in pages))
+    stop.set()
+    await probe
+    return lags
+
+
+def run_case(mode: str, size_kb: int, n: int, latency_ms: int, max_chars: int) -> dict[str, Any]:
+    pages = [_page(size_kb, i) for i in range(n)]
+    start = time.perf_counter()
+    lags = asyncio.run(_bulk_fetch(mode, pages, latency_ms / 1000, max_chars))
+    elapsed = time.perf_counter() - start
+    lags_ms = sorted(x * 1000 for x in lags) or [0.0]
+    return {
+        "mode": mode,
+        "page_kb": size_kb,
+        "pages": n,
+        "elapsed_sec": round(elapsed, 2),
+        "loop_lag_p50_ms": round(statistics.median(lags_ms), 1),
+        "loop_lag_p95_ms": round(lags_ms[int(len(lags_ms) * 0.95) - 1 if len(lags_ms) > 1 else 0], 1),
+        "loop_lag_max_ms": round(lags_ms[-1], 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="HTML抽出のイベントループ遅延を旧実装と比較")
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--sizes-kb", default="50,500,3000")
+    parser.add_argument("--latency-ms", type=int, default=200)
+    parser.add_argument("--max-chars", type=int, default=15000)
+    parser.add_argument("--modes", default="inline,offloaded")
+    args = parser.parse_args()
+
+    pool = get_extract_pool()
+    list(pool.map(abs, range(pool._max_workers)))  # ワーカー起動をウォームアップ（計測に含めない）
+    results = []
+    try:
+        for size_kb in [int(x) for x in args.sizes_kb.split(",") if x.strip()]:
+            for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+                results.append(run_case(mode, size_kb, args.pages, args.latency_ms, args.max_chars))
+    finally:
+        shutdown_extract_pool()
+    print(json.dumps({"results": results}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
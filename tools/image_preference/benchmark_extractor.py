@@ -0,0 +1,145 @@
+"""
+特徴抽出ベンチマーク
+
+参照実装（PIL・原寸）と高速版（draft/reduce + NumPy）を同じ画像セットで比較し、
+スループット（枚/秒）と特徴量のずれ（drift）を報告する。
+学習済みモデルがあれば、判定ラベルの一致率も出す。
+
+使い方:
+    python benchmark_extractor.py                       # training_data を計測
+    python benchmark_extractor.py --synthetic 8         # 4032x3024 の合成 JPEG も追加
+    python benchmark_extractor.py --max-side 512 --json
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from feature_extractor import (
+    WORKING_MAX_SIDE,
+    extract_features,
+    extract_features_reference,
+    features_to_vector,
+    get_feature_keys,
+)
+from preference_learner import IMAGE_EXTENSIONS, LABEL_MAP
+
+BASE_DIR = Path(__file__).parent
+
+
+def make_synthetic_photos(out_dir: Path, count: int, size=(4032, 3024)) -> list[Path]:
+    """カメラ写真相当の大きな JPEG（グラデーション + ノイズ）を決定的に生成する。"""
+    rng = np.random.default_rng(0)
+    w, h = size
+    yy, xx = np.mgrid[0:h, 0:w].astype(np.float32)
+    paths = []
+    for i in range(count):
+        base = np.stack([
+            xx / w * 255,
+            yy / h * 255,
+            (1.0 - xx / w) * 128 + 64 * i / max(1, count),
+        ], axis=-1)
+        noise = rng.normal(0, 18, (h, w, 3)).astype(np.float32)
+        arr = np.clip(base + noise, 0, 255).astype(np.uint8)
+        path = out_dir / f"synthetic_{i}.jpg"
+        Image.fromarray(arr).save(path, quality=92)
+        paths.append(path)
+    return paths
+
+
+def collect_images(training_dir: Path) -> list[Path]:
+    images = []
+    for label in LABEL_MAP:
+        folder = training_dir / label
+        if folder.exists():
+            images += sorted(
+                p for p in folder.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS
+            )
+    return images
+
+
+def _timed(fn, paths):
+    start = time.perf_counter()
+    out = [fn(p) for p in paths]
+    elapsed = time.perf_counter() - start
+    return out, elapsed
+
+
+def run_benchmark(paths: list[Path], max_side: int = WORKING_MAX_SIDE, model_path=None) -> dict:
+    """両実装で全画像を特徴量化し、速度とずれを集計する。"""
+    ref, ref_sec = _timed(extract_features_reference, paths)
+    fast, fast_sec = _timed(lambda p: extract_features(p, max_side=max_side), paths)
+    # 2回目も同じ値になること（縮小が決定的であること）を確認
+    again = [extract_features(p, max_side=max_side) for p in paths]
+
+    keys = get_feature_keys()
+    ref_m = np.vstack([features_to_vector(f) for f in ref])
+    fast_m = np.vstack([features_to_vector(f) for f in fast])
+    diff = np.abs(ref_m - fast_m)
+    drift = {
+        k: {"mean_abs": round(float(diff[:, i].mean()), 5), "max_abs": round(float(diff[:, i].max()), 5)}
+        for i, k in enumerate(keys)
+    }
+    worst = sorted(drift.items(), key=lambda kv: -kv[1]["max_abs"])[:8]
+
+    report = {
+        "images": len(paths),
+        "max_side": max_side,
+        "reference": {"seconds": round(ref_sec, 3), "images_per_sec": round(len(paths) / ref_sec, 1)},
+        "fast": {"seconds": round(fast_sec, 3), "images_per_sec": round(len(paths) / fast_sec, 1)},
+        "speedup": round(ref_sec / fast_sec, 2) if fast_sec > 0 else None,
+        "deterministic": all(a == b for a, b in zip(fast, again)),
+        "drift_worst": dict(worst),
+    }
+
+    if model_path and Path(model_path).exists():
+        from preference_judge import PreferenceJudge
+        judge = PreferenceJudge(model_path)
+        ref_labels = [r["label"] for r in judge.judge_features(ref)]
+        fast_labels = [r["label"] for r in judge.judge_features(fast)]
+        agree = sum(a == b for a, b in zip(ref_labels, fast_labels))
+        report["label_agreement"] = round(agree / len(paths), 3)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="特徴抽出ベンチマーク（参照実装 vs 高速版）")
+    parser.add_argument("--training-dir", default=str(BASE_DIR / "training_data"))
+    parser.add_argument("--model", default=str(BASE_DIR / "models" / "preference_model.pkl"))
+    parser.add_argument("--synthetic", type=int, default=0, help="追加する合成 4032x3024 JPEG の枚数")
+    parser.add_argument("--max-side", type=int, default=WORKING_MAX_SIDE)
+    parser.add_argument("--json", action="store_true", help="JSON で出力")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = collect_images(Path(args.training_dir))
+        if args.synthetic:
+            paths += make_synthetic_photos(Path(tmp), args.synthetic)
+        if not paths:
+            print("⚠️ 計測する画像がありません")
+            return
+        report = run_benchmark(paths, max_side=args.max_side, model_path=args.model)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    print(f"\n📊 特徴抽出ベンチマーク（{report['images']}枚, 長辺 {report['max_side']}px）")
+    print(f"  参照実装: {report['reference']['images_per_sec']} 枚/秒")
+    print(f"  高速版  : {report['fast']['images_per_sec']} 枚/秒（{report['speedup']}倍）")
+    print(f"  決定的  : {'はい' if report['deterministic'] else 'いいえ'}")
+    if "label_agreement" in report:
+        print(f"  判定一致率: {report['label_agreement']:.1%}")
+    print("\n🔍 ずれが大きい特徴量:")
+    for name, d in report["drift_worst"].items():
+        print(f"  {name}: 平均 {d['mean_abs']:.5f} / 最大 {d['max_abs']:.5f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,186 @@
 
 画像からカラーヒストグラム、明るさ、彩度、コントラスト、
 エッジ密度、アスペクト比などの特徴量を抽出する。
+
+extract_features() は高速版: JPEG の draft（DCT スケーリング）と整数倍 reduce で
+作業解像度（長辺 WORKING_MAX_SIDE 以下）に落とし、1枚の NumPy 配列から
+全特徴量を計算する。HSV・グレースケール・エッジ・ラプラシアンは PIL と
+同じ丸めで実装しているので、max_side=None なら extract_features_reference() と一致する。
 """
 
+import math
 import numpy as np
 from PIL import Image, ImageStat, ImageFilter
 from pathlib import Path
-from typing import Union
+from typing import BinaryIO, Optional, Union
 import json
 
+# 作業解像度（長辺ピクセル）。縮小は決定的（draft + 整数倍 reduce）
+WORKING_MAX_SIDE = 768
+
+# 抽出処理・キー構成を変えたら上げる（feature_store のキャッシュキーに含まれる）
+FEATURE_EXTRACTOR_VERSION = f"2-{WORKING_MAX_SIDE}"
+
+
+def load_working_array(
+    image_path: Union[str, Path, BinaryIO],
+    max_side: Optional[int] = WORKING_MAX_SIDE,
+) -> tuple[np.ndarray, tuple[int, int]]:
+    """画像を作業解像度の RGB uint8 配列 (H, W, 3) として読み込む。
+
+    Returns:
+        (配列, 元画像の (幅, 高さ))
+    """
+    img = Image.open(image_path)
+    original_size = img.size
+    if max_side and max(original_size) > max_side:
+        # JPEG はデコード時に 1/2〜1/8 へ縮小できる（要求サイズ以上を保つ）
+        scale = max_side / max(original_size)
+        img.draft("RGB", (
+            max(1, math.ceil(original_size[0] * scale)),
+            max(1, math.ceil(original_size[1] * scale)),
+        ))
+    img = img.convert("RGB")
+    if max_side and max(img.size) > max_side:
+        img = img.reduce(math.ceil(max(img.size) / max_side))
+    return np.asarray(img), original_size
+
+
+def _rgb_to_hsv(rgb: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """PIL の convert("HSV") と同じ丸めで H, S, V (uint8) を計算する。"""
+    f = rgb.astype(np.float32)
+    r, g, b = f[..., 0], f[..., 1], f[..., 2]
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    cr = maxc - minc
+    gray = cr == 0
+    safe_cr = np.where(gray, np.float32(1.0), cr)
+    safe_max = np.where(maxc == 0, np.float32(1.0), maxc)
+
+    # PIL(C) は float で割り、2.0 / 4.0 との加算は double で行ってから float に戻す
+    rc = ((maxc - r) / safe_cr).astype(np.float64)
+    gc = ((maxc - g) / safe_cr).astype(np.float64)
+    bc = ((maxc - b) / safe_cr).astype(np.float64)
+    h = np.where(
+        r == maxc,
+        (bc - gc).astype(np.float32),
+        np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc),
+    ).astype(np.float32)
+    h = np.fmod(h.astype(np.float64) / 6.0 + 1.0, 1.0).astype(np.float32)
+
+    hue = np.where(gray, 0, np.clip((h.astype(np.float64) * 255.0).astype(np.int32), 0, 255))
+    sat = np.where(gray, 0, np.clip(((cr / safe_max).astype(np.float64) * 255.0).astype(np.int32), 0, 255))
+    return hue.astype(np.uint8), sat.astype(np.uint8), maxc.astype(np.uint8)
+
+
+def _rgb_to_gray(rgb: np.ndarray) -> np.ndarray:
+    """PIL の convert("L") と同じ整数近似（ITU-R 601-2）。"""
+    a = rgb.astype(np.int32)
+    return ((a[..., 0] * 19595 + a[..., 1] * 38470 + a[..., 2] * 7471 + 0x8000) >> 16).astype(np.int32)
+
+
+def _edge_and_laplacian(gray: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """FIND_EDGES とラプラシアン（offset=128）を1回の3x3畳み込みで求める。
+
+    カーネルはどちらも [-1,-1,-1,-1,8,-1,-1,-1,-1]。PIL と同様に外周1画素は入力をそのまま残す。
+    """
+    edges = gray.copy()
+    lap = gray.copy()
+    h, w = gray.shape
+    if h >= 3 and w >= 3:
+        conv = 9 * gray[1:-1, 1:-1]
+        for dy in range(3):
+            for dx in range(3):
+                conv -= gray[dy:h - 2 + dy, dx:w - 2 + dx]
+        edges[1:-1, 1:-1] = np.clip(conv, 0, 255)
+        lap[1:-1, 1:-1] = np.clip(conv + 128, 0, 255)
+    return edges, lap
+
+
+def extract_features(
+    image_path: Union[str, Path, BinaryIO],
+    max_side: Optional[int] = WORKING_MAX_SIDE,
+) -> dict:
+    """画像から特徴量を抽出する（高速版）。
+
+    Args:
+        image_path: 画像ファイルのパス（またはバイナリのファイルオブジェクト）
+        max_side: 作業解像度の長辺。None なら原寸で計算する
+
+    Returns:
+        特徴量の辞書（width / height / aspect_ratio は元画像のサイズ）
+    """
+    rgb, (width, height) = load_working_array(image_path, max_side)
+
+    features = {}
+
+    # 基本情報
+    features["width"] = width
+    features["height"] = height
+    features["aspect_ratio"] = width / height
+
+    # RGB統計
+    flat = rgb.reshape(-1, 3).astype(np.float64)
+    mean = flat.mean(axis=0)
+    std = flat.std(axis=0)
+    for i, ch in enumerate("rgb"):
+        features[f"mean_{ch}"] = float(mean[i]) / 255.0
+    for i, ch in enumerate("rgb"):
+        features[f"stddev_{ch}"] = float(std[i]) / 255.0
+
+    # HSV（色相・彩度・明度）
+    h_data, s_data, v_data = (c.ravel() for c in _rgb_to_hsv(rgb))
+    features["mean_hue"] = float(np.mean(h_data)) / 255.0
+    features["mean_saturation"] = float(np.mean(s_data)) / 255.0
+    features["mean_brightness"] = float(np.mean(v_data)) / 255.0
+    features["stddev_hue"] = float(np.std(h_data)) / 255.0
+    features["stddev_saturation"] = float(np.std(s_data)) / 255.0
+    features["stddev_brightness"] = float(np.std(v_data)) / 255.0
+
+    # 色相ヒストグラム（12ビン）・明るさヒストグラム（8ビン）は bincount 1回ずつ
+    h_counts = np.bincount(h_data, minlength=256)
+    v_counts = np.bincount(v_data, minlength=256)
+    h_hist = np.add.reduceat(h_counts, np.ceil(np.linspace(0, 256, 13)[:-1]).astype(int))
+    v_hist = v_counts.reshape(8, 32).sum(axis=1)
+    h_hist_norm = h_hist / h_hist.sum() if h_hist.sum() > 0 else h_hist
+    for i, val in enumerate(h_hist_norm):
+        features[f"hue_bin_{i}"] = float(val)
+    v_hist_norm = v_hist / v_hist.sum() if v_hist.sum() > 0 else v_hist
+    for i, val in enumerate(v_hist_norm):
+        features[f"brightness_bin_{i}"] = float(val)
+
+    # コントラスト（明度の標準偏差）
+    features["contrast"] = features["stddev_brightness"]
+
+    # エッジ密度・シャープネス（NumPy の3x3畳み込み）
+    edges, lap = _edge_and_laplacian(_rgb_to_gray(rgb))
+    features["edge_density"] = float(np.mean(edges)) / 255.0
+    features["edge_stddev"] = float(np.std(edges)) / 255.0
+    features["sharpness"] = float(np.var(lap.astype(float))) / (255.0 ** 2)
+
+    # カラフルさ（RGBチャンネルの標準偏差の平均）
+    features["colorfulness"] = (
+        features["stddev_r"] + features["stddev_g"] + features["stddev_b"]
+    ) / 3.0
+
+    # 暖色比率（色相 0-30 or 210-255）・寒色比率（色相 90-170）
+    n_pixels = len(h_data)
+    features["warm_ratio"] = float(h_counts[:30].sum() + h_counts[211:].sum()) / n_pixels
+    features["cool_ratio"] = float(h_counts[90:171].sum()) / n_pixels
+
+    # ドミナントカラー（最頻色相ビン）
+    features["dominant_hue_bin"] = int(np.argmax(h_hist_norm))
+
+    return features
+
+
+def extract_features_reference(image_path: Union[str, Path, BinaryIO]) -> dict:
+    """画像から特徴量を抽出する（PIL による原寸の参照実装）。
 
-def extract_features(image_path: Union[str, Path]) -> dict:
-    """画像から特徴量を抽出する。
+    高速版 extract_features() の検証・ベンチマーク用。
 
     Args:
-        image_path: 画像ファイルのパス
+        image_path: 画像ファイルのパス（またはバイナリのファイルオブジェクト）
 
     Returns:
         特徴量の辞書
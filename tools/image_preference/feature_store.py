@@ -0,0 +1,366 @@
+"""
+特徴量ストアモジュール
+
+画像の特徴量ベクトルを「ファイル内容ハッシュ × 抽出器バージョン」をキーに永続化する。
+ベクトル本体は NumPy memmap（行 = 画像、列 = get_feature_keys() の順）、
+ハッシュ→行番号 と パス→(サイズ, mtime, ハッシュ) の索引は sqlite に持つ。
+
+学習・分析は sync() で必要な行番号だけを解決し memmap を直接読むため、
+再学習のコストは「新しく追加・変更された画像の枚数」に比例する。
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import queue
+from io import BytesIO
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+from feature_extractor import (
+    FEATURE_EXTRACTOR_VERSION,
+    extract_features,
+    features_to_vector,
+    get_feature_keys,
+)
+
+# training_data 直下に置くストアのディレクトリ名（ラベルフォルダとは衝突しない）
+FEATURE_STORE_DIRNAME = ".feature_store"
+
+# memmap のバイト順・型は固定（プラットフォーム間でファイルを共有できるように）
+VECTOR_DTYPE = np.dtype("<f8")
+
+
+def content_hash(data: bytes) -> str:
+    """画像バイト列の内容ハッシュ（sha256）を返す。"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def vector_to_features(vec: np.ndarray) -> dict:
+    """特徴量ベクトルを extract_features() 互換の辞書に戻す。
+
+    width / height はベクトルに含まれないため復元されない。
+    """
+    keys = get_feature_keys()
+    features = {k: float(v) for k, v in zip(keys, vec)}
+    features["dominant_hue_bin"] = int(round(features.get("dominant_hue_bin", 0)))
+    return features
+
+
+class FeatureStore:
+    """特徴量ベクトルの永続キャッシュ。
+
+    ファイルは初回利用時に作られる（生成しただけではディスクに触れない）。
+    書き込みは sqlite の IMMEDIATE トランザクションで行番号を確保してから
+    memmap ファイルへ追記するため、複数スレッド・複数プロセスから同時に使ってよい。
+    """
+
+    def __init__(self, store_dir: Union[str, Path]):
+        self.store_dir = Path(store_dir)
+        self.index_path = self.store_dir / "index.sqlite"
+        self.vectors_path = self.store_dir / "vectors.f8"
+        self.version = FEATURE_EXTRACTOR_VERSION
+        self.dim = len(get_feature_keys())
+        self._row_bytes = self.dim * VECTOR_DTYPE.itemsize
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._mmap: Optional[np.memmap] = None
+        # 直近の sync() で新規抽出・キャッシュヒットした件数
+        self.last_sync = {"extracted": 0, "cached": 0, "failed": 0}
+
+    # ── 内部: 接続・memmap ──
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            str(self.index_path), timeout=30.0,
+            isolation_level=None, check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS vectors (
+                content_hash TEXT NOT NULL,
+                extractor_version TEXT NOT NULL,
+                row INTEGER NOT NULL UNIQUE,
+                PRIMARY KEY (content_hash, extractor_version)
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL
+            );
+        """)
+        row = conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        if row is None:
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('dim', ?)", (str(self.dim),))
+        elif int(row[0]) != self.dim:
+            # 列数が変わった古いストアは読めないので作り直す
+            conn.execute("DELETE FROM vectors")
+            conn.execute("DELETE FROM files")
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'dim'", (str(self.dim),))
+            self.vectors_path.write_bytes(b"")
+        self.vectors_path.touch(exist_ok=True)
+        self._conn = conn
+        return conn
+
+    def _matrix(self, min_rows: int) -> np.ndarray:
+        """少なくとも min_rows 行を読める memmap を返す（追記で伸びたら開き直す）。"""
+        if self._mmap is None or self._mmap.shape[0] < min_rows:
+            n_rows = self.vectors_path.stat().st_size // self._row_bytes
+            if n_rows < min_rows:
+                raise RuntimeError(
+                    f"特徴量ストアが壊れています（{n_rows}行 < {min_rows}行）: {self.vectors_path}"
+                )
+            self._mmap = None
+            if n_rows == 0:
+                return np.empty((0, self.dim), dtype=VECTOR_DTYPE)
+            self._mmap = np.memmap(
+                self.vectors_path, dtype=VECTOR_DTYPE, mode="r", shape=(n_rows, self.dim)
+            )
+        return self._mmap
+
+    def _rows_for_hashes(self, hashes: Iterable[str]) -> dict[str, int]:
+        conn = self._connect()
+        wanted = list(set(hashes))
+        found: dict[str, int] = {}
+        for i in range(0, len(wanted), 500):
+            chunk = wanted[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for h, row in conn.execute(
+                f"SELECT content_hash, row FROM vectors"
+                f" WHERE extractor_version = ? AND content_hash IN ({marks})",
+                [self.version, *chunk],
+            ):
+                found[h] = row
+        return found
+
+    def _append(self, h: str, vec: np.ndarray) -> int:
+        """ベクトルを追記して行番号を返す。既に同じキーがあればその行を返す。"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            existing = conn.execute(
+                "SELECT row FROM vectors WHERE content_hash = ? AND extractor_version = ?",
+                (h, self.version),
+            ).fetchone()
+            if existing is not None:
+                conn.execute("COMMIT")
+                return existing[0]
+            row = conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM vectors").fetchone()[0]
+            with open(self.vectors_path, "r+b") as f:
+                f.seek(row * self._row_bytes)
+                f.write(np.asarray(vec, dtype=VECTOR_DTYPE).tobytes())
+            conn.execute(
+                "INSERT INTO vectors (content_hash, extractor_version, row) VALUES (?, ?, ?)",
+                (h, self.version, row),
+            )
+            conn.execute("COMMIT")
+            return row
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _remember_file(self, key: str, st: os.stat_result, h: str) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, content_hash) VALUES (?, ?, ?, ?)",
+            (key, st.st_size, st.st_mtime_ns, h),
+        )
+
+    # ── 公開API ──
+
+    def add_bytes(self, data: bytes) -> int:
+        """画像バイト列を特徴量化して保存し、行番号を返す（既存なら抽出しない）。"""
+        h = content_hash(data)
+        with self._lock:
+            row = self._rows_for_hashes([h]).get(h)
+        if row is not None:
+            return row
+        vec = features_to_vector(extract_features(BytesIO(data)))
+        with self._lock:
+            return self._append(h, vec)
+
+    def sync(
+        self, paths: Iterable[Union[str, Path]]
+    ) -> tuple[list[Path], np.ndarray, dict]:
+        """各パスの行番号を解決する。未登録・変更済みのファイルだけ特徴量を抽出する。
+
+        サイズと mtime が前回と同じファイルは読み直さずにハッシュを再利用する。
+
+        Returns:
+            (成功したパスのリスト, 対応する行番号の配列, 件数 {extracted, cached, failed})
+            読めなかった画像は警告を出してスキップする。
+        """
+        paths = [Path(p) for p in paths]
+        counts = {"extracted": 0, "cached": 0, "failed": 0}
+        ok_paths: list[Path] = []
+        rows: list[int] = []
+
+        with self._lock:
+            conn = self._connect()
+            known = {
+                path: (size, mtime_ns, h)
+                for path, size, mtime_ns, h in conn.execute(
+                    "SELECT path, size, mtime_ns, content_hash FROM files"
+                )
+            }
+            hash_of: dict[Path, str] = {}
+            stats: dict[Path, os.stat_result] = {}
+            for p in paths:
+                try:
+                    st = p.stat()
+                except OSError as e:
+                    print(f"⚠️ スキップ: {p} ({e})")
+                    counts["failed"] += 1
+                    continue
+                stats[p] = st
+                entry = known.get(str(p.resolve()))
+                if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+                    hash_of[p] = entry[2]
+            row_of = self._rows_for_hashes(hash_of.values())
+
+        for p, st in stats.items():
+            h = hash_of.get(p)
+            row = row_of.get(h) if h else None
+            if row is None:
+                try:
+                    data = p.read_bytes()
+                    h = content_hash(data)
+                    with self._lock:
+                        row = self._rows_for_hashes([h]).get(h)
+                    if row is None:
+                        vec = features_to_vector(extract_features(BytesIO(data)))
+                        with self._lock:
+                            row = self._append(h, vec)
+                        counts["extracted"] += 1
+                    else:
+                        counts["cached"] += 1
+                    with self._lock:
+                        self._remember_file(str(p.resolve()), st, h)
+                except Exception as e:
+                    print(f"⚠️ スキップ: {p} ({e})")
+                    counts["failed"] += 1
+                    continue
+            else:
+                counts["cached"] += 1
+            ok_paths.append(p)
+            rows.append(row)
+
+        self.last_sync = counts
+        return ok_paths, np.asarray(rows, dtype=np.int64), counts
+
+    def vectors(self, rows: np.ndarray) -> np.ndarray:
+        """行番号の配列に対応する特徴量行列 (len(rows), dim) を memmap から読む。"""
+        rows = np.asarray(rows, dtype=np.int64)
+        if rows.size == 0:
+            return np.empty((0, self.dim), dtype=np.float64)
+        with self._lock:
+            self._connect()
+            matrix = self._matrix(int(rows.max()) + 1)
+            return np.asarray(matrix[rows], dtype=np.float64)
+
+    def load(self, paths: Iterable[Union[str, Path]]) -> tuple[list[Path], np.ndarray]:
+        """sync() して特徴量行列を返すショートカット。"""
+        ok_paths, rows, _ = self.sync(paths)
+        return ok_paths, self.vectors(rows)
+
+    def stats(self) -> dict:
+        """ストアの統計情報を返す。"""
+        with self._lock:
+            conn = self._connect()
+            current = conn.execute(
+                "SELECT COUNT(*) FROM vectors WHERE extractor_version = ?", (self.version,)
+            ).fetchone()[0]
+            total = conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+            files = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        return {
+            "extractor_version": self.version,
+            "vectors": current,
+            "stale_vectors": total - current,
+            "files": files,
+            "bytes": self.vectors_path.stat().st_size,
+            "last_sync": dict(self.last_sync),
+        }
+
+    def clear(self) -> None:
+        """ストアを空にする（抽出器の大きな変更後の作り直し用）。"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM vectors")
+            conn.execute("DELETE FROM files")
+            self._mmap = None
+            self.vectors_path.write_bytes(b"")
+
+    def close(self) -> None:
+        with self._lock:
+            self._mmap = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class FeatureWorker:
+    """アップロード画像をバックグラウンドで特徴量化するワーカースレッド。
+
+    submit() はすぐ戻り、学習前に wait_idle() で取りこぼしを待てる。
+    ワーカーが処理しきれていなくても、学習側の sync() が残りを抽出するので結果は変わらない。
+    """
+
+    def __init__(self, store: FeatureStore):
+        self.store = store
+        self._queue: "queue.Queue[Path]" = queue.Queue()
+        self._idle = threading.Condition()
+        self._pending = 0
+        self.processed = 0
+        self.failed = 0
+        self._thread = threading.Thread(
+            target=self._run, name="feature-store-worker", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, paths: Iterable[Union[str, Path]]) -> int:
+        """特徴量化するパスをキューに積み、積んだ件数を返す。"""
+        count = 0
+        for p in paths:
+            with self._idle:
+                self._pending += 1
+            self._queue.put(Path(p))
+            count += 1
+        return count
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """キューが空になるまで待つ。タイムアウトしたら False。"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def stats(self) -> dict:
+        with self._idle:
+            pending = self._pending
+        return {"pending": pending, "processed": self.processed, "failed": self.failed}
+
+    def _run(self) -> None:
+        while True:
+            path = self._queue.get()
+            try:
+                _, rows, _ = self.store.sync([path])
+                if rows.size:
+                    self.processed += 1
+                else:
+                    self.failed += 1
+            except Exception as e:
+                print(f"⚠️ 特徴量化に失敗: {path} ({e})")
+                self.failed += 1
+            finally:
+                with self._idle:
+                    self._pending -= 1
+                    self._idle.notify_all()
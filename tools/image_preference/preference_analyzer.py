@@ -17,6 +17,7 @@ from typing import Union, Optional
 from feature_extractor import extract_features, features_to_vector, get_feature_keys
 from preference_learner import PreferenceLearner, LABEL_MAP, IMAGE_EXTENSIONS
 from reason_store import ReasonStore
+from feature_store import FeatureStore, FEATURE_STORE_DIRNAME, vector_to_features
 
 # 理由テキストから抽出するキーワードパターン
 KEYWORD_PATTERNS = {
@@ -260,8 +261,12 @@ class PreferenceAnalyzer:
         self,
         training_dir: Union[str, Path] = "training_data",
         model_path: Optional[Union[str, Path]] = None,
+        feature_store: Optional[FeatureStore] = None,
     ):
         self.training_dir = Path(training_dir)
+        self.feature_store = feature_store or FeatureStore(
+            self.training_dir / FEATURE_STORE_DIRNAME
+        )
         self.learner = None
         if model_path and Path(model_path).exists():
             self.learner = PreferenceLearner.load(model_path)
@@ -276,14 +281,12 @@ class PreferenceAnalyzer:
             folder = self.training_dir / label_name
             if not folder.exists():
                 continue
-            features_list = []
-            for img_path in folder.iterdir():
-                if img_path.suffix.lower() in IMAGE_EXTENSIONS:
-                    try:
-                        features_list.append(extract_features(img_path))
-                    except Exception:
-                        pass
-            category_features[label_name] = features_list
+            images = sorted(
+                p for p in folder.iterdir()
+                if p.suffix.lower() in IMAGE_EXTENSIONS
+            )
+            _, matrix = self.feature_store.load(images)
+            category_features[label_name] = [vector_to_features(v) for v in matrix]
 
         if not category_features.get("好き"):
             return {"error": "「好き」フォルダに画像がありません"}
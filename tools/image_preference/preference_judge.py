@@ -4,19 +4,33 @@
 学習済みモデルを使って新しい画像を OK/NO 判定する。
 """
 
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 import numpy as np
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
 from feature_extractor import extract_features, features_to_vector
 from preference_learner import PreferenceLearner, LABEL_NAMES
 
 
+def featurize_bytes(data: bytes) -> dict:
+    """アップロードされた画像バイト列から直接特徴量を抽出する（一時ファイル不要）。"""
+    return extract_features(BytesIO(data))
+
+
 class PreferenceJudge:
     """学習済みモデルで画像の好み判定を行うクラス。"""
 
-    def __init__(self, model_path: Union[str, Path] = "models/preference_model.pkl"):
-        self.learner = PreferenceLearner.load(model_path)
+    def __init__(
+        self,
+        model_path: Union[str, Path] = "models/preference_model.pkl",
+        learner: Optional[PreferenceLearner] = None,
+    ):
+        self.learner = learner or PreferenceLearner.load(model_path)
 
     def judge(self, image_path: Union[str, Path]) -> dict:
         """画像を判定する。
@@ -32,52 +46,170 @@ class PreferenceJudge:
                 - probabilities: 各ラベルの確率
                 - features: 抽出された特徴量
         """
-        features = extract_features(image_path)
-        vec = features_to_vector(features)
-        vec_scaled = self.learner.scaler.transform(vec.reshape(1, -1))
-
-        # 予測
-        pred_label = int(self.learner.model.predict(vec_scaled)[0])
-        probas = self.learner.model.predict_proba(vec_scaled)[0]
-
-        # OK/NO判定（「好き」=OK、それ以外=NO）
-        verdict = "OK" if pred_label == 2 else "NO"
-
-        # 確信度（最大確率）
-        confidence = float(np.max(probas))
-
-        # 各ラベルの確率
+        return self.judge_features([extract_features(image_path)])[0]
+
+    def judge_bytes(self, data: bytes) -> dict:
+        """画像バイト列を判定する。戻り値は judge() と同じ。"""
+        return self.judge_features([featurize_bytes(data)])[0]
+
+    def judge_features(self, features_list: list[dict]) -> list[dict]:
+        """抽出済み特徴量をまとめて判定する（predict_proba は1回だけ呼ぶ）。"""
+        if not features_list:
+            return []
+        X = np.vstack([features_to_vector(f) for f in features_list])
+        X_scaled = self.learner.scaler.transform(X)
+        probas_all = self.learner.model.predict_proba(X_scaled)
         classes = self.learner.model.classes_
-        probabilities = {}
-        for i, cls in enumerate(classes):
-            probabilities[LABEL_NAMES[cls]] = float(probas[i])
-
-        # 好き度スコア（0-100）
-        like_score = float(probabilities.get("好き", 0) * 100)
 
-        return {
-            "verdict": verdict,
-            "label": LABEL_NAMES[pred_label],
-            "confidence": confidence,
-            "like_score": round(like_score, 1),
-            "probabilities": probabilities,
-            "features": features,
-        }
+        results = []
+        for features, probas in zip(features_list, probas_all):
+            # 予測（RandomForest の predict と同じく確率最大のクラス）
+            pred_label = int(classes[int(np.argmax(probas))])
+
+            # OK/NO判定（「好き」=OK、それ以外=NO）
+            verdict = "OK" if pred_label == 2 else "NO"
+
+            # 確信度（最大確率）
+            confidence = float(np.max(probas))
+
+            # 各ラベルの確率
+            probabilities = {}
+            for i, cls in enumerate(classes):
+                probabilities[LABEL_NAMES[cls]] = float(probas[i])
+
+            # 好き度スコア（0-100）
+            like_score = float(probabilities.get("好き", 0) * 100)
+
+            results.append({
+                "verdict": verdict,
+                "label": LABEL_NAMES[pred_label],
+                "confidence": confidence,
+                "like_score": round(like_score, 1),
+                "probabilities": probabilities,
+                "features": features,
+            })
+        return results
 
     def judge_batch(self, image_paths: list) -> list[dict]:
-        """複数の画像を一括判定する。"""
-        results = []
+        """複数の画像を一括判定する。読めない画像はその要素だけ error を返す。"""
+        features_list = []
         for path in image_paths:
             try:
-                result = self.judge(path)
-                result["file"] = str(path)
-                results.append(result)
+                features_list.append(extract_features(path))
             except Exception as e:
-                results.append({
-                    "file": str(path),
-                    "error": str(e),
-                })
-        return results
+                features_list.append(e)
+        names = [str(p) for p in image_paths]
+        return _merge_batch_results(self, names, features_list)
+
+
+def _merge_batch_results(
+    judge: PreferenceJudge, names: list[str], features_list: list
+) -> list[dict]:
+    """特徴量（または例外）の並びを判定し、入力順の結果リストにする。"""
+    ok = [(i, f) for i, f in enumerate(features_list) if not isinstance(f, Exception)]
+    judged = judge.judge_features([f for _, f in ok])
+    results: list[dict] = [
+        {"file": name, "error": str(f)} if isinstance(f, Exception) else {}
+        for name, f in zip(names, features_list)
+    ]
+    for (i, _), result in zip(ok, judged):
+        result["file"] = names[i]
+        results[i] = result
+    return results
+
+
+def _model_signature(model_path: Path) -> Optional[tuple[int, int]]:
+    try:
+        st = model_path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ResidentJudge:
+    """サーバー常駐用の判定器。
+
+    モデルはメモリに保持し、pickle が書き換わったとき（mtime/サイズの変化）だけ
+    読み直して参照を差し替える。読み込み中も旧モデルで判定を続けられる。
+    バッチ判定の特徴量抽出はプロセスプールで並列化する。
+    """
+
+    def __init__(
+        self,
+        model_path: Union[str, Path],
+        workers: Optional[int] = None,
+        min_parallel: int = 4,
+    ):
+        self.model_path = Path(model_path)
+        self.workers = workers if workers is not None else min(4, os.cpu_count() or 1)
+        self.min_parallel = min_parallel
+        self._judge: Optional[PreferenceJudge] = None
+        self._signature: Optional[tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.reloads = 0
+
+    def get(self) -> Optional[PreferenceJudge]:
+        """現在のモデルを返す。ファイルが更新されていれば読み直す。未学習なら None。"""
+        signature = _model_signature(self.model_path)
+        if signature is None:
+            return self._judge
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    judge = PreferenceJudge(self.model_path)
+                    self._judge, self._signature = judge, signature
+                    self.reloads += 1
+        return self._judge
+
+    def install(self, learner: PreferenceLearner) -> None:
+        """学習直後のモデルをそのまま常駐モデルにする（pickle を読み直さない）。"""
+        with self._lock:
+            self._judge = PreferenceJudge(learner=learner)
+            self._signature = _model_signature(self.model_path)
+            self.reloads += 1
+
+    def featurize_many(self, blobs: list[bytes]) -> list:
+        """画像バイト列を並列に特徴量化する。失敗した要素は例外オブジェクトになる。"""
+        if self.workers <= 1 or len(blobs) < self.min_parallel:
+            return [_featurize_or_error(b) for b in blobs]
+        with self._lock:
+            if self._pool is None:
+                # Flask のスレッドと共存させるため fork ではなく spawn で起動する
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            pool = self._pool
+        return list(pool.map(_featurize_or_error, blobs))
+
+    def judge_many(self, named_blobs: list[tuple[str, bytes]]) -> list[dict]:
+        """(ファイル名, バイト列) のリストを一括判定する。predict_proba は1回。"""
+        judge = self.get()
+        if judge is None:
+            raise FileNotFoundError(f"モデルがありません: {self.model_path}")
+        features_list = self.featurize_many([data for _, data in named_blobs])
+        return _merge_batch_results(judge, [name for name, _ in named_blobs], features_list)
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._judge is not None,
+            "reloads": self.reloads,
+            "workers": self.workers,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+def _featurize_or_error(data: bytes):
+    try:
+        return featurize_bytes(data)
+    except Exception as e:
+        return ValueError(f"画像を読み込めません: {e}")
 
 
 if __name__ == "__main__":
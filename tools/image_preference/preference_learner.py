@@ -6,6 +6,7 @@
 """
 
 import json
+import os
 import pickle
 import numpy as np
 from pathlib import Path
@@ -15,7 +16,8 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import cross_val_score
 
-from feature_extractor import extract_features, features_to_vector, get_feature_keys
+from feature_extractor import get_feature_keys
+from feature_store import FeatureStore, FEATURE_STORE_DIRNAME
 
 
 # ラベル定義
@@ -33,8 +35,16 @@ IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".gif", ".tiff"}
 class PreferenceLearner:
     """ユーザーの画像好みを学習するクラス。"""
 
-    def __init__(self, training_dir: str | Path = "training_data"):
+    def __init__(
+        self,
+        training_dir: str | Path = "training_data",
+        feature_store: Optional[FeatureStore] = None,
+    ):
         self.training_dir = Path(training_dir)
+        # 特徴量は内容ハッシュ単位でキャッシュし、新しい画像だけ抽出する
+        self.feature_store = feature_store or FeatureStore(
+            self.training_dir / FEATURE_STORE_DIRNAME
+        )
         self.model: Optional[RandomForestClassifier] = None
         self.scaler: Optional[StandardScaler] = None
         self.feature_importances: Optional[dict] = None
@@ -66,31 +76,23 @@ class PreferenceLearner:
         """
         image_map = self.scan_images()
 
-        # 特徴量とラベルを収集
-        X_list = []
-        y_list = []
-        file_paths = []
-
+        # 特徴量とラベルを収集（未キャッシュの画像だけ抽出し、行列は memmap から読む）
+        all_paths = []
+        all_labels = []
         for label_name, images in image_map.items():
-            label = LABEL_MAP[label_name]
-            for img_path in images:
-                try:
-                    features = extract_features(img_path)
-                    vec = features_to_vector(features)
-                    X_list.append(vec)
-                    y_list.append(label)
-                    file_paths.append(str(img_path))
-                except Exception as e:
-                    print(f"⚠️ スキップ: {img_path} ({e})")
-
-        if len(X_list) < 3:
+            all_paths.extend(images)
+            all_labels.extend([LABEL_MAP[label_name]] * len(images))
+        label_of = dict(zip(all_paths, all_labels))
+
+        file_paths, rows, sync_counts = self.feature_store.sync(all_paths)
+        X = self.feature_store.vectors(rows)
+        y = np.array([label_of[p] for p in file_paths], dtype=np.int64)
+
+        if len(file_paths) < 3:
             raise ValueError(
-                f"画像が少なすぎます（{len(X_list)}枚）。各フォルダに最低1枚ずつ配置してください。"
+                f"画像が少なすぎます（{len(file_paths)}枚）。各フォルダに最低1枚ずつ配置してください。"
             )
 
-        X = np.array(X_list)
-        y = np.array(y_list)
-
         # 正規化
         self.scaler = StandardScaler()
         X_scaled = self.scaler.fit_transform(X)
@@ -114,7 +116,7 @@ class PreferenceLearner:
 
         # クロスバリデーション（データが十分な場合）
         cv_score = None
-        if len(X_list) >= 10:
+        if len(file_paths) >= 10:
             n_splits = min(5, len(set(y)))
             if n_splits >= 2:
                 scores = cross_val_score(self.model, X_scaled, y, cv=n_splits)
@@ -122,13 +124,14 @@ class PreferenceLearner:
 
         # 統計情報
         self.training_stats = {
-            "total_images": len(X_list),
+            "total_images": len(file_paths),
             "per_label": {
                 name: int(np.sum(y == label))
                 for name, label in LABEL_MAP.items()
             },
             "feature_count": len(keys),
             "cv_accuracy": cv_score,
+            "feature_cache": sync_counts,
             "top_features": sorted(
                 self.feature_importances.items(),
                 key=lambda x: x[1],
@@ -140,13 +143,16 @@ class PreferenceLearner:
         if model_save_path:
             save_path = Path(model_save_path)
             save_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(save_path, "wb") as f:
+            # 一時ファイルに書いてから置き換える（常駐サーバーが書きかけを読まないように）
+            tmp_path = save_path.with_name(save_path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
                 pickle.dump({
                     "model": self.model,
                     "scaler": self.scaler,
                     "feature_importances": self.feature_importances,
                     "training_stats": self.training_stats,
                 }, f)
+            os.replace(tmp_path, save_path)
             print(f"✅ モデル保存: {save_path}")
 
         return self.training_stats
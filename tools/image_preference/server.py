@@ -7,11 +7,13 @@ Flask ベースの API サーバー。
 
 import json
 import sys
-import os
 import base64
-import tempfile
+import threading
+import time
+from collections import deque
 from pathlib import Path
 from io import BytesIO
+from typing import Optional
 
 from flask import Flask, request, jsonify, send_from_directory
 from werkzeug.utils import secure_filename
@@ -20,9 +22,10 @@ from werkzeug.utils import secure_filename
 sys.path.insert(0, str(Path(__file__).parent))
 
 from preference_learner import PreferenceLearner, IMAGE_EXTENSIONS
-from preference_judge import PreferenceJudge
+from preference_judge import ResidentJudge
 from preference_analyzer import PreferenceAnalyzer, refine_reason_text, describe_image_features
 from reason_store import ReasonStore
+from feature_store import FeatureStore, FeatureWorker, FEATURE_STORE_DIRNAME
 
 app = Flask(__name__, static_folder="static")
 
@@ -31,10 +34,77 @@ BASE_DIR = Path(__file__).parent
 TRAINING_DIR = BASE_DIR / "training_data"
 MODEL_PATH = BASE_DIR / "models" / "preference_model.pkl"
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_BATCH_IMAGES = 64
 
 # 理由テキストストア
 reason_store = ReasonStore(TRAINING_DIR / "reasons.json")
 
+# 特徴量ストア（アップロード時にバックグラウンドで特徴量化しておく）
+feature_store: Optional[FeatureStore] = None
+feature_worker: Optional[FeatureWorker] = None
+
+# 常駐モデル（/api/train で差し替え、pickle が外部で更新されても自動で読み直す）
+resident_judge: Optional[ResidentJudge] = None
+
+_services_lock = threading.Lock()
+
+
+@app.before_request
+def init_services():
+    """常駐オブジェクトを起動時（初回リクエスト時）に作る。
+
+    import 時に作ると、判定の spawn ワーカーが __main__（python server.py）を
+    読み直すたびにバックグラウンドスレッドの起動などが走るため。
+    """
+    global feature_store, feature_worker, resident_judge
+    with _services_lock:
+        if feature_store is None:
+            feature_store = FeatureStore(TRAINING_DIR / FEATURE_STORE_DIRNAME)
+        if feature_worker is None:
+            feature_worker = FeatureWorker(feature_store)
+        if resident_judge is None:
+            resident_judge = ResidentJudge(MODEL_PATH)
+
+
+class LatencyStats:
+    """エンドポイントごとの処理時間を直近 window 件で集計する。"""
+
+    def __init__(self, window: int = 500):
+        self._samples: dict[str, deque] = {}
+        self._counts: dict[str, int] = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, images: int = 1):
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self._window)).append(
+                (seconds, images)
+            )
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            items = {name: list(samples) for name, samples in self._samples.items()}
+            counts = dict(self._counts)
+        result = {}
+        for name, samples in items.items():
+            ms = sorted(sec * 1000.0 for sec, _ in samples)
+            images = sum(n for _, n in samples)
+            total_sec = sum(sec for sec, _ in samples)
+            result[name] = {
+                "requests": counts[name],
+                "window": len(ms),
+                "mean_ms": round(sum(ms) / len(ms), 2),
+                "p50_ms": round(ms[len(ms) // 2], 2),
+                "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 2),
+                "max_ms": round(ms[-1], 2),
+                "images_per_sec": round(images / total_sec, 1) if total_sec > 0 else None,
+            }
+        return result
+
+
+latency_stats = LatencyStats()
+
 
 @app.route("/")
 def index():
@@ -68,6 +138,9 @@ def status():
         "model_ready": model_exists,
         "image_counts": image_counts,
         "total_images": sum(image_counts.values()),
+        "feature_store": {**feature_store.stats(), "worker": feature_worker.stats()},
+        "judge_model": resident_judge.stats(),
+        "latency": latency_stats.snapshot(),
     })
 
 
@@ -75,8 +148,12 @@ def status():
 def train():
     """モデルを学習する"""
     try:
-        learner = PreferenceLearner(TRAINING_DIR)
+        # アップロード直後の特徴量化が終わるのを少し待つ（残りは学習側で抽出される）
+        feature_worker.wait_idle(timeout=30.0)
+        learner = PreferenceLearner(TRAINING_DIR, feature_store=feature_store)
         stats = learner.train(model_save_path=MODEL_PATH)
+        # 学習済みモデルをそのまま常駐モデルに差し替える
+        resident_judge.install(learner)
         return jsonify({"success": True, "stats": stats})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 400
@@ -95,29 +172,46 @@ def judge():
     if not file.filename:
         return jsonify({"error": "ファイル名が空です"}), 400
 
-    # 一時ファイルに保存して判定（Windows対応: ファイルを閉じてから処理）
-    suffix = Path(file.filename).suffix
-    tmp_fd, tmp_path = tempfile.mkstemp(suffix=suffix)
+    # アップロードのバイト列から直接判定する（一時ファイルを作らない）
+    started = time.perf_counter()
+    j = resident_judge.get()
+    if j is None:
+        return jsonify({"error": "モデルが未学習です。先に学習を実行してください。"}), 400
     try:
-        os.close(tmp_fd)  # ファイルディスクリプタを閉じる
-        file.save(tmp_path)
-        j = PreferenceJudge(MODEL_PATH)
-        result = j.judge(tmp_path)
-        # 特徴量は大きいのでサマリーのみ返す
+        result = j.judge_bytes(file.read())
+    except Exception as e:
+        return jsonify({"error": f"画像を読み込めません: {e}"}), 400
+    # 特徴量は大きいのでサマリーのみ返す
+    result.pop("features", None)
+    latency_stats.record("judge", time.perf_counter() - started)
+    return jsonify({"success": True, "result": result})
+
+
+@app.route("/api/judge-batch", methods=["POST"])
+def judge_batch():
+    """複数画像をまとめて判定する（特徴量抽出は並列、推論は1回）"""
+    if not MODEL_PATH.exists():
+        return jsonify({"error": "モデルが未学習です。先に学習を実行してください。"}), 400
+
+    files = [f for f in request.files.getlist("images") if f.filename]
+    if not files:
+        return jsonify({"error": "画像ファイルが必要です"}), 400
+    if len(files) > MAX_BATCH_IMAGES:
+        return jsonify({"error": f"一度に判定できるのは{MAX_BATCH_IMAGES}枚までです"}), 400
+
+    started = time.perf_counter()
+    results = resident_judge.judge_many([(f.filename, f.read()) for f in files])
+    for result in results:
         result.pop("features", None)
-        return jsonify({"success": True, "result": result})
-    finally:
-        try:
-            os.unlink(tmp_path)
-        except OSError:
-            pass
+    latency_stats.record("judge_batch", time.perf_counter() - started, images=len(files))
+    return jsonify({"success": True, "results": results, "count": len(results)})
 
 
 @app.route("/api/analyze", methods=["GET"])
 def analyze():
     """好み傾向を分析する"""
     model_path = MODEL_PATH if MODEL_PATH.exists() else None
-    analyzer = PreferenceAnalyzer(TRAINING_DIR, model_path)
+    analyzer = PreferenceAnalyzer(TRAINING_DIR, model_path, feature_store=feature_store)
     result = analyzer.analyze()
     return jsonify({"success": True, "analysis": result})
 
@@ -135,6 +229,7 @@ def upload():
     files = request.files.getlist("images")
     reason = request.form.get("reason", "").strip()
     saved = []
+    saved_paths = []
     for file in files:
         if file.filename:
             filename = secure_filename(file.filename)
@@ -144,11 +239,20 @@ def upload():
             dest = TRAINING_DIR / category / filename
             file.save(str(dest))
             saved.append(filename)
+            saved_paths.append(dest)
             # 理由があれば保存
             if reason:
                 reason_store.save_reason(category, filename, reason)
 
-    return jsonify({"success": True, "uploaded": saved, "count": len(saved)})
+    # 新しいファイルだけ特徴量化（レスポンスは待たない）
+    queued = feature_worker.submit(saved_paths)
+
+    return jsonify({
+        "success": True,
+        "uploaded": saved,
+        "count": len(saved),
+        "featurize_queued": queued,
+    })
 
 
 @app.route("/api/training-images", methods=["GET"])
@@ -283,4 +387,5 @@ if __name__ == "__main__":
     print(f"📁 トレーニングデータ: {TRAINING_DIR}")
     print(f"🧠 モデル: {MODEL_PATH}")
     print(f"🌐 http://localhost:5000")
+    init_services()
     app.run(host="0.0.0.0", port=5000, debug=True)
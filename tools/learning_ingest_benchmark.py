@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""KI Learning 取り込みスループット計測.
+
+1 / 4 / 16 個の報告プロセスが同じ learning.db へ同時に report_outcome し、
+- per_event: batch_size=1（1イベント=1トランザクション）
+- batched:   batch_size=N（N件を1トランザクション + JSONL 一括追記）
+の events/秒と、`database is locked` 等のエラー数を比較する。DB は一時ディレクトリに作る。
+
+使い方:
+    python tools/learning_ingest_benchmark.py --events 2000 --batch-size 64
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from knowledge.learning import AgentEvent, LearningClient  # noqa: E402
+
+
+def _reporter(args: tuple) -> dict[str, Any]:
+    db_path, events_path, worker, count, batch_size, start_at = args
+    errors = 0
+    with LearningClient(db_path=Path(db_path), events_path=Path(events_path), batch_size=batch_size) as client:
+        while time.time() < start_at:
+            time.sleep(0.001)
+        for i in range(count):
+            evt = AgentEvent(
+                agent="/bench",
+                intent=f"intent_{i % 8}",
+                intent_class="bench_action",
+                outcome="FAILURE" if i % 4 == 0 else "SUCCESS",
+                signature_key=f"sig_{worker % 4}",
+                error_type="timeout" if i % 8 == 0 else "ui_not_found",
+                meta={"worker": worker, "i": i},
+            )
+            try:
+                client.report_outcome(evt)
+            except Exception:
+                errors += 1
+    return {"worker": worker, "errors": errors, "finished_at": time.time()}
+
+
+def _run(reporters: int, events_per_reporter: int, batch_size: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="ki_ingest_bench_") as tmp:
+        db_path = Path(tmp) / "learning.db"
+        events_path = Path(tmp) / "events.jsonl"
+        LearningClient(db_path=db_path, events_path=events_path).close()  # スキーマ作成を計測外で
+        start_at = time.time() + 0.5
+        jobs = [
+            (str(db_path), str(events_path), w, events_per_reporter, batch_size, start_at)
+            for w in range(reporters)
+        ]
+        with mp.Pool(reporters) as pool:
+            results = pool.map(_reporter, jobs)
+        elapsed = max(r["finished_at"] for r in results) - start_at
+        total = reporters * events_per_reporter
+        with LearningClient(db_path=db_path, events_path=events_path) as client:
+            stored = client._con.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        audit_lines = len(events_path.read_text(encoding="utf-8").splitlines())
+    return {
+        "reporters": reporters,
+        "batch_size": batch_size,
+        "events": total,
+        "stored": stored,
+        "audit_lines": audit_lines,
+        "errors": sum(r["errors"] for r in results),
+        "seconds": round(elapsed, 3),
+        "events_per_sec": round(total / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def run_benchmark(events: int = 2000, batch_size: int = 64, reporters: tuple[int, ...] = (1, 4, 16)) -> dict[str, Any]:
+    rows = []
+    for n in reporters:
+        per = max(1, events // n)
+        rows.append({"mode": "per_event", **_run(n, per, 1)})
+        rows.append({"mode": "batched", **_run(n, per, batch_size)})
+    return {"events_total_target": events, "results": rows}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="LearningClient の同時報告スループットを計測")
+    parser.add_argument("--events", type=int, default=2000, help="各構成での総イベント数")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--reporters", default="1,4,16")
+    args = parser.parse_args()
+    reporters = tuple(int(x) for x in args.reporters.split(",") if x.strip())
+    print(json.dumps(run_benchmark(args.events, args.batch_size, reporters), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""KI Learning の rank_intents レイテンシ計測.
+
+events 件数を 1k → 10M と増やしながら、
+- legacy: 候補ごとに events を GROUP BY outcome（旧 rank_intents と同じクエリ）
+- indexed: intent_stats の主キー前方一致1回（キャッシュ無効化して毎回読む）
+- cached: 同じ条件の2回目以降（data_version が変わらなければ DB を読まない）
+の1回あたりの ms を比較する。DB は一時ディレクトリに作る。
+
+使い方:
+    python tools/learning_rank_benchmark.py --scales 1000,100000,1000000
+    python tools/learning_rank_benchmark.py --scales 1000,10000000 --repeat 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from knowledge.learning import LearningClient  # noqa: E402
+
+AGENT = "/desktop"
+INTENT_CLASS = "click_send"
+INTENTS = [f"intent_{i}" for i in range(12)]
+SIGNATURES = 200
+
+_LEGACY_SQL = """
+    SELECT outcome, COUNT(*) AS c
+    FROM events
+    WHERE agent=? AND intent_class=? AND intent=? AND signature_key=?
+    GROUP BY outcome
+"""
+
+
+def _seed(db_path: Path, events: int) -> None:
+    """events テーブルだけを作って一括投入する（intent_stats はクライアント初期化時に再構築）"""
+    con = sqlite3.connect(db_path)
+    con.execute(
+        """
+        CREATE TABLE events (
+          id INTEGER PRIMARY KEY AUTOINCREMENT, ts_end TEXT NOT NULL, agent TEXT NOT NULL,
+          intent TEXT NOT NULL, intent_class TEXT NOT NULL, outcome TEXT NOT NULL, signature_key TEXT,
+          error_type TEXT, root_cause TEXT, fix TEXT, confidence REAL, meta_json TEXT
+        )
+        """
+    )
+    con.execute(
+        f"""
+        WITH RECURSIVE seq(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n + 1 < {int(events)})
+        INSERT INTO events(ts_end, agent, intent, intent_class, outcome, signature_key, meta_json)
+        SELECT strftime('%Y-%m-%dT%H:%M:%S+00:00', 1700000000 + n, 'unixepoch'), '{AGENT}',
+               'intent_' || (n % {len(INTENTS)}), '{INTENT_CLASS}',
+               CASE WHEN (n * 7) % 10 < (n % {len(INTENTS)}) THEN 'FAILURE' ELSE 'SUCCESS' END,
+               'sig_' || (n % {SIGNATURES}), '{{}}'
+        FROM seq
+        """
+    )
+    con.commit()
+    con.close()
+
+
+def _per_call_ms(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return round((time.perf_counter() - start) / repeat * 1000.0, 4)
+
+
+def run_scale(events: int, repeat: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="ki_rank_bench_") as tmp:
+        db_path = Path(tmp) / "learning.db"
+        _seed(db_path, events)
+        start = time.perf_counter()
+        client = LearningClient(db_path=db_path, events_path=Path(tmp) / "events.jsonl")
+        backfill_sec = time.perf_counter() - start
+        con = client._con  # idx_events_lookup はクライアント初期化で作成済み
+
+        kwargs = dict(agent=AGENT, intent_class=INTENT_CLASS, intents=INTENTS, signature_key="sig_7")
+
+        def _legacy():
+            for intent in INTENTS:
+                con.execute(_LEGACY_SQL, (AGENT, INTENT_CLASS, intent, "sig_7")).fetchall()
+
+        def _indexed():
+            client._rank_cache.clear()
+            client.rank_intents(**kwargs)
+
+        result = {
+            "events": events,
+            "backfill_sec": round(backfill_sec, 3),
+            "legacy_ms": _per_call_ms(_legacy, max(1, repeat // 10)),
+            "indexed_ms": _per_call_ms(_indexed, repeat),
+            "cached_ms": _per_call_ms(lambda: client.rank_intents(**kwargs), repeat),
+        }
+        client.close()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="rank_intents の events 件数に対するレイテンシを計測")
+    parser.add_argument("--scales", default="1000,10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    scales = [int(x) for x in args.scales.split(",") if x.strip()]
+    results = [run_scale(n, args.repeat) for n in scales]
+    print(json.dumps({"intents": len(INTENTS), "results": results}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
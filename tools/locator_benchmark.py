@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""リサーチエージェントの Evidence locator 生成（locator.py）の計測.
+
+大きなHTMLページ（段落数 P）に Q 件の quote（完全一致・空白違い・本文に無いもの）を当て、
+- per_quote: quote ごとに build_locator（毎回ページを解析し直す = 旧 Phase 3 の動き）
+- indexed:   LocatorIndex を1回作って locate_many
+の所要時間を比べる。両者の出力が一致することも確認する。
+
+使い方:
+    python tools/locator_benchmark.py --paragraphs 1000,10000 --quotes 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+RESEARCH_DIR = ROOT / ".agent" / "workflows" / "research"
+if str(RESEARCH_DIR) not in sys.path:
+    sys.path.insert(0, str(RESEARCH_DIR))
+
+from lib.locator import LocatorIndex, build_locator  # noqa: E402
+
+WORDS = ["研究", "結果", "データ", "分析", "モデル", "性能", "評価", "手法", "system", "model", "latency", "cache"]
+
+
+def _page(paragraphs: int, rng: random.Random) -> tuple[str, list[str]]:
+    texts = [" ".join(rng.choice(WORDS) + str(rng.randint(0, 9999)) for _ in range(rng.randint(20, 60))) for _ in range(paragraphs)]
+    parts = ["<html><head><title>bench</title></head><body>"]
+    for i, txt in enumerate(texts):
+        if i % 20 == 0:
+            parts.append(f"<h2>Section {i // 20}</h2>")
+        parts.append(f"<p>{txt}</p>")
+    parts.append("</body></html>")
+    return "".join(parts), texts
+
+
+def _quotes(texts: list[str], n: int, rng: random.Random) -> list[str]:
+    quotes = []
+    for i in range(n):
+        words = rng.choice(texts).split(" ")
+        a = rng.randrange(len(words))
+        quote = " ".join(words[a:a + rng.randint(5, 15)])
+        if i % 5 == 1:
+            quote = quote.replace(" ", "  ")  # normalized match
+        elif i % 5 == 2:
+            quote += " 本文に無い語"  # 一致なし
+        quotes.append(quote)
+    return quotes
+
+
+def run_scale(paragraphs: int, n_quotes: int) -> dict[str, Any]:
+    rng = random.Random(paragraphs)
+    content, texts = _page(paragraphs, rng)
+    quotes = _quotes(texts, n_quotes, rng)
+    url = "https://example.com/page"
+
+    start = time.perf_counter()
+    expected = [build_locator(url=url, content=content, quote=q) for q in quotes]
+    per_quote_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = LocatorIndex(content)
+    build_sec = time.perf_counter() - start
+    got = index.locate_many(url=url, quotes=quotes)
+    indexed_sec = time.perf_counter() - start
+
+    return {
+        "paragraphs": paragraphs,
+        "content_kb": round(len(content.encode("utf-8")) / 1024),
+        "quotes": n_quotes,
+        "located": sum(1 for x in got if x),
+        "per_quote_ms": round(per_quote_sec * 1000, 1),
+        "indexed_ms": round(indexed_sec * 1000, 1),
+        "index_build_ms": round(build_sec * 1000, 1),
+        "speedup": round(per_quote_sec / indexed_sec, 1) if indexed_sec else None,
+        "identical": got == expected,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="locator 生成の quote 数・ページサイズに対する所要時間を計測")
+    parser.add_argument("--paragraphs", default="1000,10000")
+    parser.add_argument("--quotes", type=int, default=50)
+    args = parser.parse_args()
+    scales = [int(x) for x in args.paragraphs.split(",") if x.strip()]
+    print(json.dumps({"results": [run_scale(p, args.quotes) for p in scales]}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""codex_log_resolver の問い合わせレイテンシ計測.
+
+agents × days × runs_per_day 件のサマリーを一時ディレクトリに作り、
+- legacy: 日付ディレクトリを glob してサマリーを JSON パース（旧 recent_summaries と同じ走査）
+- refresh: RunCatalog.refresh()（変化なし = stat のみ）
+- indexed: refresh 後の recent_summaries / claim_mismatches（索引検索のみ）
+の1回あたりの ms を比較する。
+
+使い方:
+    python tools/run_catalog_benchmark.py --agents 10 --days 90 --runs-per-day 20
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+AUTONOMY_DIR = ROOT / "scripts" / "autonomy"
+if str(AUTONOMY_DIR) not in sys.path:
+    sys.path.insert(0, str(AUTONOMY_DIR))
+
+from run_catalog import RACY_WINDOW_NS, RunCatalog  # noqa: E402
+
+
+def _seed(log_root: Path, agents: int, days: int, runs_per_day: int) -> int:
+    count = 0
+    for a in range(agents):
+        agent = f"agent_{a}"
+        for d in range(days):
+            date_dir = log_root / agent / f"2026{1 + d // 28:02d}{1 + d % 28:02d}"
+            date_dir.mkdir(parents=True, exist_ok=True)
+            for r in range(runs_per_day):
+                run_id = f"{agent}_bench_{date_dir.name}_{r:04d}"
+                summary = {
+                    "agent": agent,
+                    "run_id": run_id,
+                    "completed_at": f"{date_dir.name}T00:00:{r % 60:02d}Z",
+                    "final_status": "SUCCESS",
+                    "claimed_success": True,
+                    "verified_success": r % 7 != 0,
+                    "inputs": {"note": "x" * 200},
+                    "evidence_refs": [f"verification_{r}"],
+                }
+                (date_dir / f"{run_id}_summary.json").write_text(json.dumps(summary), encoding="utf-8")
+                count += 1
+        (log_root / agent / "latest.json").write_text(json.dumps({"run_id": run_id}), encoding="utf-8")
+    return count
+
+
+def _legacy_recent(agent_dir: Path, last_n: int) -> list[dict[str, Any]]:
+    out: list[dict[str, Any]] = []
+    for date_dir in sorted(agent_dir.iterdir(), reverse=True):
+        if not date_dir.is_dir():
+            continue
+        for path in sorted(date_dir.glob("*_summary.json"), reverse=True):
+            out.append(json.loads(path.read_text(encoding="utf-8")))
+            if len(out) >= last_n:
+                return out
+    return out
+
+
+def _legacy_mismatches(log_root: Path, last_n: int) -> int:
+    hits = 0
+    for agent_dir in sorted(log_root.iterdir()):
+        if agent_dir.is_dir():
+            hits += sum(
+                1 for s in _legacy_recent(agent_dir, last_n) if s["claimed_success"] and not s["verified_success"]
+            )
+    return hits
+
+
+def _per_call_ms(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return round((time.perf_counter() - start) / repeat * 1000.0, 3)
+
+
+def run_benchmark(agents: int = 10, days: int = 90, runs_per_day: int = 20, repeat: int = 5) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="run_catalog_bench_") as tmp:
+        workspace = Path(tmp)
+        log_root = workspace / "_logs" / "autonomy"
+        runs = _seed(log_root, agents, days, runs_per_day)
+        time.sleep(RACY_WINDOW_NS / 1e9)  # 作成直後のディレクトリは毎回走査されるので落ち着くまで待つ
+        with RunCatalog(log_root, workspace_root=workspace) as catalog:
+            start = time.perf_counter()
+            catalog.rebuild()
+            rebuild_sec = time.perf_counter() - start
+            last_n = runs_per_day * days  # find_claim_mismatches の「全件」相当
+            result = {
+                "runs": runs,
+                "rebuild_sec": round(rebuild_sec, 3),
+                "legacy_recent_ms": _per_call_ms(lambda: _legacy_recent(log_root / "agent_0", 3), repeat),
+                "legacy_mismatches_ms": _per_call_ms(lambda: _legacy_mismatches(log_root, last_n), 1),
+                "refresh_unchanged_ms": _per_call_ms(catalog.refresh, repeat),
+                "indexed_recent_ms": _per_call_ms(lambda: catalog.recent_summaries("agent_0", 3), repeat * 20),
+                "indexed_mismatches_ms": _per_call_ms(lambda: catalog.claim_mismatches(last_n), repeat),
+            }
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="RunCatalog と旧ディレクトリ走査の問い合わせレイテンシを計測")
+    parser.add_argument("--agents", type=int, default=10)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--runs-per-day", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.agents, args.days, args.runs_per_day, args.repeat), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
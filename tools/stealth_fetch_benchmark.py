@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""リサーチエージェントの StealthFetcher（フェッチャープール）の計測.
+
+ローカルHTTPサーバー（応答に --latency-ms の遅延を入れた合成ページ）に対して
+N 件のURLを取得し、モードごとに
+- pages_per_min: 1分あたりの取得ページ数
+- peak_rss_mb:   計測中のプロセスツリー（Chromium子プロセスを含む）の最大RSS
+を出す。ホストは 127.0.0.1〜127.0.0.H に振り分ける（ホスト単位レートリミットの確認用）。
+
+モード:
+    per_url: 1URLごとにブラウザを起動・終了（旧 fetch_sync 相当）
+    serial:  ブラウザ1つ・ページ1つで順次（旧 StealthFetcher 相当）
+    pool:    ブラウザ1つ・ページ pool_size 個で並行（fetch_many）
+
+使い方:
+    python tools/stealth_fetch_benchmark.py --urls 40 --pool-sizes 1,4,8
+    python tools/stealth_fetch_benchmark.py --modes serial,pool --latency-ms 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = ROOT / ".agent" / "workflows" / "research" / "lib"
+if str(LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(LIB_DIR))
+
+from stealth_fetcher import StealthFetcher  # noqa: E402
+
+PARAGRAPH = "<p>合成ページの本文です。フェッチャープールの計測用に十分な長さのテキストを含みます。</p>"
+
+
+def _handler(latency_sec: float):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency_sec)
+            body = f"<html><head><title>{self.path}</title></head><body>{PARAGRAPH * 50}</body></html>".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def _tree_rss_mb() -> float:
+    """自プロセスと子孫プロセスのRSS合計（Linuxの /proc から。取れなければ0）"""
+    children: dict[int, list[int]] = {}
+    rss_kb: dict[int, int] = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            status = (entry / "status").read_text()
+        except OSError:
+            continue
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+        for line in status.splitlines():
+            if line.startswith("VmRSS:"):
+                rss_kb[int(entry.name)] = int(line.split()[1])
+    total, stack = 0, [os.getpid()]
+    while stack:
+        pid = stack.pop()
+        total += rss_kb.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total / 1024
+
+
+class _RssSampler:
+    """計測中のRSSを定期的に採取して最大値を保持"""
+
+    def __init__(self, interval_sec: float = 0.2):
+        self.interval_sec = interval_sec
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_mb = max(self.peak_mb, _tree_rss_mb())
+            self._stop.wait(self.interval_sec)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, _tree_rss_mb())
+
+
+async def _fetch(mode: str, urls: list[str], pool_size: int, options: dict[str, Any]) -> list[Any]:
+    if mode == "per_url":
+        results = []
+        for url in urls:
+            async with StealthFetcher(**options) as fetcher:
+                results.append(await fetcher.fetch(url))
+        return results
+    async with StealthFetcher(pool_size=pool_size if mode == "pool" else 1, **options) as fetcher:
+        if mode == "serial":
+            return [await fetcher.fetch(url) for url in urls]
+        return await fetcher.fetch_many(urls)
+
+
+def run_mode(mode: str, base_urls: list[str], n: int, pool_size: int, rate_limit_per_min: int) -> dict[str, Any]:
+    urls = [f"{base_urls[i % len(base_urls)]}/page{i}" for i in range(n)]
+    options = {
+        "min_delay_sec": 0,
+        "max_delay_sec": 0,
+        "rate_limit_per_min": rate_limit_per_min,
+        "host_burst": max(1, pool_size),
+        "human_scroll": False,
+    }
+    with _RssSampler() as sampler:
+        start = time.perf_counter()
+        results = asyncio.run(_fetch(mode, urls, pool_size, options))
+        elapsed = time.perf_counter() - start
+    ok = sum(1 for r in results if r.status == 200 and r.text)
+    return {
+        "mode": mode,
+        "pool_size": pool_size if mode == "pool" else 1,
+        "urls": n,
+        "ok": ok,
+        "elapsed_sec": round(elapsed, 2),
+        "pages_per_min": round(ok / elapsed * 60, 1),
+        "peak_rss_mb": round(sampler.peak_mb, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="StealthFetcher のプールサイズに対するスループットとメモリを計測")
+    parser.add_argument("--urls", type=int, default=40)
+    parser.add_argument("--hosts", type=int, default=4)
+    parser.add_argument("--latency-ms", type=int, default=300)
+    parser.add_argument("--modes", default="per_url,serial,pool")
+    parser.add_argument("--pool-sizes", default="1,4,8")
+    parser.add_argument("--rate-limit-per-min", type=int, default=0, help="ホストごとの上限（0=無制限）")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("0.0.0.0", 0), _handler(args.latency_ms / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    base_urls = [f"http://127.0.0.{h + 1}:{port}" for h in range(max(1, args.hosts))]
+
+    results = []
+    try:
+        for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            sizes = [int(x) for x in args.pool_sizes.split(",") if x.strip()] if mode == "pool" else [1]
+            for pool_size in sizes:
+                n = min(args.urls, 10) if mode == "per_url" else args.urls  # per_url は起動コストが大きいので縮小
+                results.append(run_mode(mode, base_urls, n, pool_size, args.rate_limit_per_min))
+    finally:
+        server.shutdown()
+        server.server_close()
+    print(json.dumps({"latency_ms": args.latency_ms, "hosts": args.hosts, "results": results}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""WorkflowLogger のスループット計測.
+
+同期書き込み（WORKFLOW_LOG_ASYNC=0 相当）と非同期バッチ書き込みで、
+- 直接 emit したときの events/秒
+- stdout キャプチャ有効時の1行あたりのオーバーヘッド（print のみとの差）
+を比較する。ログは一時ディレクトリに書き、終了時に削除する。
+
+使い方:
+    python tools/workflow_logger_benchmark.py --events 20000 --lines 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+AUTONOMY_DIR = ROOT / "scripts" / "autonomy"
+if str(AUTONOMY_DIR) not in sys.path:
+    sys.path.insert(0, str(AUTONOMY_DIR))
+
+from workflow_logger import WorkflowLogger  # noqa: E402
+
+
+def _bench_events(workspace: Path, count: int, async_write: bool) -> dict[str, Any]:
+    logger = WorkflowLogger(
+        agent="bench",
+        workflow="events",
+        workspace_root=workspace,
+        capture_streams=False,
+        async_write=async_write,
+    )
+    start = time.perf_counter()
+    for i in range(count):
+        logger.add_metric("step", {"i": i, "note": "benchmark event"})
+    emit_sec = time.perf_counter() - start
+    logger.flush()
+    total_sec = time.perf_counter() - start
+    summary = logger.finalize()
+    return {
+        "events": count,
+        "emit_sec": round(emit_sec, 4),
+        "total_sec": round(total_sec, 4),
+        "events_per_sec": round(count / total_sec, 1) if total_sec > 0 else None,
+        "writer": summary["event_writer"],
+    }
+
+
+def _print_lines(count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        print(f"line {i}: subprocess output")
+    return time.perf_counter() - start
+
+
+def _bench_capture(workspace: Path, count: int, async_write: bool) -> dict[str, Any]:
+    saved = sys.stdout
+    devnull = open(os.devnull, "w", encoding="utf-8")
+    sys.stdout = devnull
+    try:
+        baseline = _print_lines(count)
+        logger = WorkflowLogger(
+            agent="bench",
+            workflow="capture",
+            workspace_root=workspace,
+            capture_streams=True,
+            max_stream_events=count + 10,
+            async_write=async_write,
+        )
+        captured = _print_lines(count)
+        logger.finalize()
+    finally:
+        sys.stdout = saved
+        devnull.close()
+    return {
+        "lines": count,
+        "print_only_sec": round(baseline, 4),
+        "captured_sec": round(captured, 4),
+        "overhead_us_per_line": round((captured - baseline) / count * 1e6, 2),
+    }
+
+
+def run_benchmark(events: int = 10000, lines: int = 10000) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="wflog_bench_") as tmp:
+        workspace = Path(tmp)
+        for mode, async_write in (("sync", False), ("async", True)):
+            results[mode] = {
+                "emit": _bench_events(workspace, events, async_write),
+                "capture": _bench_capture(workspace, lines, async_write),
+            }
+    sync_eps = results["sync"]["emit"]["events_per_sec"] or 0.0
+    async_eps = results["async"]["emit"]["events_per_sec"] or 0.0
+    results["speedup_events_per_sec"] = round(async_eps / sync_eps, 2) if sync_eps else None
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="WorkflowLogger の events/秒と行キャプチャのオーバーヘッドを計測")
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--lines", type=int, default=10000)
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.events, args.lines), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
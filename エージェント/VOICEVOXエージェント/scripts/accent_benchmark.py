@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+アクセント照合ベンチマーク — verify_accents のスループット（セグメント/秒）
+
+VOICEVOXサーバー無しで測れるよう、audio_query は形態素の発音形から
+合成した擬似クエリを使う。動画・日記ナレーションと同様に、同じフレーズが
+繰り返し出現するコーパスで以下のモードを比較する:
+
+    cold    キャッシュ無効（従来相当: 毎回形態素解析）
+    warm    LRU キャッシュ有効、1セグメントずつ verify_accents
+    batch   verify_accents_batch（1呼び出しでまとめて解析）
+    pool    batch + fork ワーカープール（--workers > 0 のとき）
+
+使い方:
+    python エージェント/VOICEVOXエージェント/scripts/accent_benchmark.py --segments 2000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(_SCRIPT_DIR.parent.parent.parent))
+
+from エージェント.VOICEVOXエージェント.scripts import accent_verifier as av
+
+# ナレーションで頻出する定型句（繰り返し出現させる）
+DEFAULT_PHRASES = [
+    "今日は天気です",
+    "それでは始めましょう",
+    "ご覧いただきありがとうございました",
+    "次のシーンに移ります",
+    "ここがポイントです",
+    "朝から雨が降っていました",
+    "新しいプロジェクトを始めた",
+    "チャンネル登録お願いします",
+]
+
+
+def build_corpus(segments: int, phrases: Optional[List[str]] = None) -> List[str]:
+    """phrases を巡回して segments 件のコーパスを作る（一部はユニーク文）"""
+    phrases = phrases or DEFAULT_PHRASES
+    corpus = []
+    for i in range(segments):
+        if i % 10 == 9:
+            corpus.append(f"{phrases[i % len(phrases)]}、その{i}番目")
+        else:
+            corpus.append(phrases[i % len(phrases)])
+    return corpus
+
+
+def synthetic_query(morphemes: List[av.MorphemeInfo]) -> Dict[str, Any]:
+    """形態素の発音形から1語1句の擬似 audio_query を組み立てる"""
+    phrases = []
+    for m in morphemes:
+        if not m.pronunciation or m.pronunciation == "*":
+            continue
+        moras = [{"text": ch, "pitch": 5.5} for ch in m.pronunciation]
+        phrases.append({"moras": moras, "accent": 1})
+    return {"accent_phrases": phrases}
+
+
+def _measure(label: str, count: int, fn) -> Dict[str, Any]:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": label,
+        "segments": count,
+        "seconds": round(elapsed, 4),
+        "segments_per_sec": round(count / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def run_benchmark(segments: int = 1000, workers: int = 0) -> Dict[str, Any]:
+    """
+    各モードで verify_accents を実行し、スループットを返す。
+
+    共有アナライザは計測中だけ差し替え、終了時に元へ戻す。
+    """
+    corpus = build_corpus(segments)
+    previous = av._analyzer
+
+    # 擬似クエリは計測対象外で先に作っておく
+    probe = av.AccentAnalyzer()
+    queries = [synthetic_query(m) for m in probe.analyze_batch(corpus)]
+    probe.close()
+    items = list(zip(queries, corpus))
+
+    results = []
+    try:
+        av._analyzer = av.AccentAnalyzer(maxsize=0)
+        results.append(_measure(
+            "cold", len(items),
+            lambda: [av.verify_accents(q, t) for q, t in items],
+        ))
+        av._analyzer.close()
+
+        av._analyzer = av.AccentAnalyzer()
+        results.append(_measure(
+            "warm", len(items),
+            lambda: [av.verify_accents(q, t) for q, t in items],
+        ))
+        warm_stats = av._analyzer.stats()
+        av._analyzer.close()
+
+        av._analyzer = av.AccentAnalyzer()
+        results.append(_measure(
+            "batch", len(items),
+            lambda: av.verify_accents_batch(items),
+        ))
+        av._analyzer.close()
+
+        if workers > 0:
+            # ユニーク文のみでプールの効果を見る（キャッシュは無効）
+            unique = [(q, f"{t}。{i}") for i, (q, t) in enumerate(items)]
+            av._analyzer = av.AccentAnalyzer(maxsize=0, workers=workers)
+            av._analyzer.analyze_batch(["ウォームアップ", "プール起動"])
+            results.append(_measure(
+                f"pool({workers})", len(unique),
+                lambda: av.verify_accents_batch(unique),
+            ))
+            av._analyzer.close()
+    finally:
+        av._analyzer = previous
+
+    return {
+        "tagger_available": av._get_tagger() is not None,
+        "corpus_unique_ratio": round(len(set(corpus)) / max(1, len(corpus)), 3),
+        "warm_cache": warm_stats,
+        "results": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="verify_accents スループット計測")
+    parser.add_argument("--segments", type=int, default=1000, help="セグメント数")
+    parser.add_argument("--workers", type=int, default=0, help="fork ワーカー数（0=計測しない）")
+    args = parser.parse_args()
+
+    report = run_benchmark(segments=args.segments, workers=args.workers)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    _here = Path(__file__).resolve()
+    for _parent in _here.parents:
+        _shared_dir = _parent / ".agent" / "workflows" / "shared"
+        if _shared_dir.exists():
+            if str(_shared_dir) not in sys.path:
+                sys.path.insert(0, str(_shared_dir))
+            break
+    try:
+        from workflow_logging_hook import run_logged_main as _run_logged_main
+    except Exception:
+        raise SystemExit(main())
+    else:
+        raise SystemExit(
+            _run_logged_main(
+                "voicebox",
+                "accent_benchmark",
+                main,
+                phase_name="ACCENT_BENCHMARK_RUN",
+            )
+        )
@@ -9,14 +9,25 @@ VOICEVOXのaudio_queryと照合・補正する。
     query = client.create_audio_query(text, speaker_id)
     query = verify_and_fix_accents(query, text, speaker_id, client)
     # → Layer 1, Layer 2 へ
+
+形態素解析は AccentAnalyzer がキャッシュする（同じフレーズは再解析しない）:
+    get_accent_info_batch(segments)   # まとめて先読み
+    VOICEVOX_MORPH_CACHE=_data/voicevox/morph_cache.sqlite  # 永続化する場合
 """
 from __future__ import annotations
 
+import json
 import logging
+import multiprocessing
 import os
 import re
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -148,17 +159,8 @@ def count_moras(kana: str) -> int:
 # ═══════════════════════════════════════════════
 
 
-def get_accent_info(text: str) -> List[MorphemeInfo]:
-    """
-    テキストをMeCab+UniDicで解析し、各形態素のアクセント情報を返す。
-
-    Returns:
-        各形態素のMorphemeInfoリスト
-    """
-    tagger = _get_tagger()
-    if tagger is None:
-        return []
-
+def _tokenize(tagger: Any, text: str) -> List[MorphemeInfo]:
+    """タガーでテキストを解析し、MorphemeInfoリストに変換する（キャッシュなし）"""
     words = tagger(text)
     result = []
 
@@ -202,6 +204,318 @@ def get_accent_info(text: str) -> List[MorphemeInfo]:
     return result
 
 
+def normalize_text(text: str) -> str:
+    """
+    キャッシュキー用にテキストを正規化する。
+
+    NFKC（全角英数→半角、半角カナ→全角）+ 前後空白除去 + 連続空白の圧縮。
+    解析もこの正規化済みテキストに対して行うため、同じキーは必ず同じ結果になる。
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def _dictionary_signature() -> str:
+    """永続キャッシュの無効化用に、使用中の辞書を識別する文字列を返す"""
+    try:
+        import unidic_lite
+        return f"unidic-lite:{getattr(unidic_lite, '__version__', 'unknown')}"
+    except ImportError:
+        return "unidic-lite:none"
+
+
+# ═══════════════════════════════════════════════
+# 形態素解析サービス（LRU/永続キャッシュ + バッチ + fork プール）
+# ═══════════════════════════════════════════════
+
+# 永続キャッシュのスキーマ版。MorphemeInfo の構造や _tokenize の解釈を変えたら上げる
+MORPH_CACHE_VERSION = 1
+
+
+def _pool_tokenize(texts: List[str]) -> List[List[MorphemeInfo]]:
+    """fork ワーカー側の処理。親プロセスでロード済みのタガーをそのまま使う"""
+    tagger = _get_tagger()
+    if tagger is None:
+        return [[] for _ in texts]
+    return [_tokenize(tagger, t) for t in texts]
+
+
+class AccentAnalyzer:
+    """
+    形態素解析結果をキャッシュする解析レイヤ。
+
+    - 正規化テキストをキーにした LRU（プロセス内）
+    - 任意で SQLite 永続キャッシュ（辞書シグネチャ + スキーマ版でキー分離）
+    - analyze_batch() で複数セグメントを1呼び出しで解析
+    - workers > 0 なら fork したワーカープールで未解析分を並列処理
+      （親でタガーをロードしてから fork するので辞書はコピーオンライトで共有）
+
+    返すリストは呼び出し毎に新しいリストだが、要素の MorphemeInfo は
+    キャッシュと共有される。呼び出し側で書き換えないこと。
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        cache_path: Optional[Path] = None,
+        workers: int = 0,
+    ) -> None:
+        self.maxsize = max(0, int(maxsize))
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.workers = max(0, int(workers))
+        self.hits = 0
+        self.misses = 0
+        self.persistent_hits = 0
+        self._lru: "OrderedDict[str, Tuple[MorphemeInfo, ...]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._pool = None
+        self._signature = f"v{MORPH_CACHE_VERSION}|{_dictionary_signature()}"
+
+    # ── キャッシュ層 ─────────────────────────────
+
+    def _open_db(self) -> Optional[sqlite3.Connection]:
+        if self.cache_path is None:
+            return None
+        if self._db is None:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            con = sqlite3.connect(str(self.cache_path), timeout=10.0, check_same_thread=False)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS morphemes (
+                  signature TEXT NOT NULL,
+                  text TEXT NOT NULL,
+                  morphemes_json TEXT NOT NULL,
+                  PRIMARY KEY (signature, text)
+                )
+                """
+            )
+            con.commit()
+            self._db = con
+        return self._db
+
+    def _lru_get(self, key: str) -> Optional[Tuple[MorphemeInfo, ...]]:
+        cached = self._lru.get(key)
+        if cached is not None:
+            self._lru.move_to_end(key)
+        return cached
+
+    def _lru_put(self, key: str, value: Tuple[MorphemeInfo, ...]) -> None:
+        if self.maxsize == 0:
+            return
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    def _db_get_many(self, keys: Sequence[str]) -> Dict[str, Tuple[MorphemeInfo, ...]]:
+        con = self._open_db()
+        if con is None or not keys:
+            return {}
+        found: Dict[str, Tuple[MorphemeInfo, ...]] = {}
+        # SQLite の変数上限を避けるため分割して引く
+        for i in range(0, len(keys), 500):
+            chunk = list(keys[i:i + 500])
+            placeholders = ",".join("?" * len(chunk))
+            rows = con.execute(
+                f"SELECT text, morphemes_json FROM morphemes "
+                f"WHERE signature=? AND text IN ({placeholders})",
+                [self._signature, *chunk],
+            ).fetchall()
+            for text, raw in rows:
+                try:
+                    found[text] = tuple(MorphemeInfo(**d) for d in json.loads(raw))
+                except (TypeError, ValueError):
+                    continue  # 壊れた行は再解析させる
+        return found
+
+    def _db_put_many(self, items: Dict[str, Tuple[MorphemeInfo, ...]]) -> None:
+        con = self._open_db()
+        if con is None or not items:
+            return
+        try:
+            con.executemany(
+                "INSERT OR REPLACE INTO morphemes(signature, text, morphemes_json) VALUES(?, ?, ?)",
+                [
+                    (
+                        self._signature,
+                        key,
+                        json.dumps([asdict(m) for m in value], ensure_ascii=False),
+                    )
+                    for key, value in items.items()
+                ],
+            )
+            con.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"形態素キャッシュ書き込み失敗（解析結果は有効）: {e}")
+
+    # ── 解析 ────────────────────────────────────
+
+    def _get_pool(self):
+        if self.workers <= 0:
+            return None
+        if self._pool is not None:
+            return self._pool
+        if "fork" not in multiprocessing.get_all_start_methods():
+            # spawn では辞書を共有できず、ワーカー毎のロードで逆に遅くなる
+            logger.info("fork 非対応環境のためワーカープールを使わず逐次解析します")
+            self.workers = 0
+            return None
+        # 呼び出し元で親のタガーはロード済み（子はロード済み辞書を共有する）
+        self._pool = multiprocessing.get_context("fork").Pool(self.workers)
+        return self._pool
+
+    def _tokenize_many(self, tagger: Any, texts: List[str]) -> List[List[MorphemeInfo]]:
+        pool = self._get_pool() if len(texts) > 1 else None
+        if pool is None:
+            return [_tokenize(tagger, t) for t in texts]
+
+        n = self.workers
+        size = max(1, -(-len(texts) // (n * 4)))
+        chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+        out: List[List[MorphemeInfo]] = []
+        for part in pool.map(_pool_tokenize, chunks):
+            out.extend(part)
+        return out
+
+    def analyze(self, text: str) -> List[MorphemeInfo]:
+        """1セグメントを解析する（キャッシュ経由）"""
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts: Iterable[str]) -> List[List[MorphemeInfo]]:
+        """
+        複数セグメントをまとめて解析する。
+
+        重複テキストは1回だけ解析し、LRU → 永続キャッシュ → タガーの順に引く。
+
+        Returns:
+            入力と同じ順序の MorphemeInfo リストのリスト
+        """
+        keys = [normalize_text(t) for t in texts]
+        resolved: Dict[str, Tuple[MorphemeInfo, ...]] = {}
+
+        with self._lock:
+            pending: List[str] = []
+            seen = set()
+            for key in keys:
+                if key in seen:
+                    continue
+                seen.add(key)
+                cached = self._lru_get(key)
+                if cached is not None:
+                    resolved[key] = cached
+                    self.hits += 1
+                else:
+                    pending.append(key)
+
+            if pending:
+                from_db = self._db_get_many(pending)
+                for key, value in from_db.items():
+                    resolved[key] = value
+                    self._lru_put(key, value)
+                self.persistent_hits += len(from_db)
+                pending = [k for k in pending if k not in from_db]
+
+            if pending:
+                self.misses += len(pending)
+                tagger = _get_tagger()
+                if tagger is None:
+                    # タガー未導入時の空結果はキャッシュしない（導入後に解析させる）
+                    for key in pending:
+                        resolved[key] = ()
+                else:
+                    fresh: Dict[str, Tuple[MorphemeInfo, ...]] = {}
+                    for key, morphemes in zip(pending, self._tokenize_many(tagger, pending)):
+                        value = tuple(morphemes)
+                        resolved[key] = value
+                        fresh[key] = value
+                        self._lru_put(key, value)
+                    self._db_put_many(fresh)
+
+        return [list(resolved[key]) for key in keys]
+
+    def stats(self) -> Dict[str, Any]:
+        """キャッシュ統計"""
+        total = self.hits + self.persistent_hits + self.misses
+        return {
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "size": len(self._lru),
+            "hit_ratio": (self.hits + self.persistent_hits) / total if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        """プロセス内 LRU を破棄する（永続キャッシュは残す）"""
+        with self._lock:
+            self._lru.clear()
+            self.hits = self.misses = self.persistent_hits = 0
+
+    def close(self) -> None:
+        """ワーカープールと永続キャッシュ接続を閉じる"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_analyzer: Optional[AccentAnalyzer] = None
+_analyzer_lock = threading.Lock()
+
+
+def get_analyzer() -> AccentAnalyzer:
+    """
+    プロセス共有の AccentAnalyzer を返す。
+
+    環境変数:
+        VOICEVOX_MORPH_CACHE: 永続キャッシュ(SQLite)のパス。未設定なら LRU のみ
+        VOICEVOX_MORPH_WORKERS: バッチ解析の fork ワーカー数（既定 0 = 逐次）
+    """
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is None:
+            cache_path = os.environ.get("VOICEVOX_MORPH_CACHE") or None
+            try:
+                workers = int(os.environ.get("VOICEVOX_MORPH_WORKERS", "0"))
+            except ValueError:
+                workers = 0
+            _analyzer = AccentAnalyzer(
+                cache_path=Path(cache_path) if cache_path else None,
+                workers=workers,
+            )
+        return _analyzer
+
+
+def set_analyzer(analyzer: Optional[AccentAnalyzer]) -> None:
+    """共有 AccentAnalyzer を差し替える（None で次回 get_analyzer() 時に再生成）"""
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is not None and _analyzer is not analyzer:
+            _analyzer.close()
+        _analyzer = analyzer
+
+
+def get_accent_info(text: str) -> List[MorphemeInfo]:
+    """
+    テキストをMeCab+UniDicで解析し、各形態素のアクセント情報を返す。
+
+    結果は正規化テキスト単位でキャッシュされる（get_analyzer() 参照）。
+
+    Returns:
+        各形態素のMorphemeInfoリスト
+    """
+    return get_analyzer().analyze(text)
+
+
+def get_accent_info_batch(texts: Iterable[str]) -> List[List[MorphemeInfo]]:
+    """複数テキストを1呼び出しで解析する。入力順に結果を返す"""
+    return get_analyzer().analyze_batch(texts)
+
+
 # ═══════════════════════════════════════════════
 # 照合と修正
 # ═══════════════════════════════════════════════
@@ -317,6 +631,8 @@ def _determine_accent_position(
 def verify_accents(
     query: Dict[str, Any],
     text: str,
+    *,
+    morphemes: Optional[List[MorphemeInfo]] = None,
 ) -> VerificationResult:
     """
     audio_queryのアクセント位置をMeCab辞書と照合する。
@@ -326,11 +642,13 @@ def verify_accents(
     Args:
         query: VOICEVOX audio_query
         text: 元テキスト
+        morphemes: 解析済みの形態素（省略時は get_accent_info(text)）
 
     Returns:
         VerificationResult（不一致箇所のリスト含む）
     """
-    morphemes = get_accent_info(text)
+    if morphemes is None:
+        morphemes = get_accent_info(text)
     if not morphemes:
         logger.warning("形態素解析結果が空。照合スキップ。")
         return VerificationResult()
@@ -384,6 +702,21 @@ def verify_accents(
     return result
 
 
+def verify_accents_batch(
+    items: Sequence[Tuple[Dict[str, Any], str]],
+) -> List[VerificationResult]:
+    """
+    (audio_query, テキスト) の組をまとめて照合する。
+
+    形態素解析は analyze_batch() の1呼び出しにまとめる。
+    """
+    all_morphemes = get_accent_info_batch([text for _, text in items])
+    return [
+        verify_accents(query, text, morphemes=morphemes)
+        for (query, text), morphemes in zip(items, all_morphemes)
+    ]
+
+
 def verify_and_fix_accents(
     query: Dict[str, Any],
     text: str,
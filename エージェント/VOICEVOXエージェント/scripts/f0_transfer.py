@@ -8,20 +8,263 @@ VOICEVOXのaudio_queryのモーラピッチにマッピングする。
 使い方:
     from f0_transfer import extract_f0_curve, apply_f0_to_query
     
-    f0_curve = extract_f0_curve("reference.wav")
+    f0_curve = extract_f0_curve("reference.wav")               # pyin（高品質）
+    f0_curve = extract_f0_curve("reference.wav", method="yin")  # NumPy YIN（高速）
     query = apply_f0_to_query(query, f0_curve)
+
+抽出結果は音声内容ハッシュ + パラメータをキーにディスクキャッシュされる
+（VOICEVOX_F0_CACHE で場所を変更、use_cache=False で無効化）。
+複数ファイルは extract_f0_curves() でまとめて抽出できる。
 """
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import math
+import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# ═══════════════════════════════════════════════
+# 音声読み込み
+# ═══════════════════════════════════════════════
+
+
+def _load_wav_numpy(audio_path: Path, sr: int) -> np.ndarray:
+    """
+    librosa無しでWAVを読み込む（PCM 8/16/24/32bit）。
+
+    モノラル化し、sr と異なる場合は線形補間でリサンプルする。
+    """
+    import wave
+
+    with wave.open(str(audio_path), "rb") as wf:
+        n_channels = wf.getnchannels()
+        width = wf.getsampwidth()
+        src_sr = wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+
+    if width == 1:
+        y = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        y = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        v = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        v = np.where(v >= 1 << 23, v - (1 << 24), v)
+        y = v.astype(np.float32) / float(1 << 23)
+    elif width == 4:
+        y = np.frombuffer(raw, dtype="<i4").astype(np.float32) / float(1 << 31)
+    else:
+        raise ValueError(f"未対応のサンプル幅: {width}byte")
+
+    if n_channels > 1:
+        y = y.reshape(-1, n_channels).mean(axis=1)
+
+    if src_sr != sr and len(y) > 1:
+        n_out = int(round(len(y) * sr / src_sr))
+        y = np.interp(
+            np.arange(n_out) * (src_sr / sr),
+            np.arange(len(y)),
+            y,
+        ).astype(np.float32)
+    return y
+
+
+def _load_audio(audio_path: Path, sr: int) -> np.ndarray:
+    """librosaがあれば librosa.load、無ければ標準 wave で読み込む"""
+    try:
+        import librosa
+    except ImportError:
+        return _load_wav_numpy(audio_path, sr)
+    y, _sr = librosa.load(str(audio_path), sr=sr, mono=True)
+    return y
+
+
+# ═══════════════════════════════════════════════
+# F0推定器
+# ═══════════════════════════════════════════════
+
+
+def _frame_signal(y: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """
+    center=True 相当でフレーム化する（librosa.pyin とフレーム数・時刻を揃える）。
+
+    Returns:
+        (n_frames, frame_length) のビュー
+    """
+    pad = frame_length // 2
+    y = np.pad(y.astype(np.float64), (pad, pad), mode="constant")
+    n_frames = 1 + (len(y) - frame_length) // hop_length
+    return np.lib.stride_tricks.as_strided(
+        y,
+        shape=(n_frames, frame_length),
+        strides=(y.strides[0] * hop_length, y.strides[0]),
+        writeable=False,
+    )
+
+
+def _yin_f0(
+    y: np.ndarray,
+    *,
+    sr: int,
+    fmin: float,
+    fmax: float,
+    hop_length: int,
+    threshold: float = 0.1,
+    silence_db: float = -50.0,
+    chunk_frames: int = 2048,
+) -> np.ndarray:
+    """
+    NumPyによるYIN推定（全フレームを行列でまとめて処理）。
+
+    差分関数は FFT の相互相関とエネルギー累積和から求め、
+    累積平均正規化差分(CMNDF)が threshold を下回る最初の谷を周期とする。
+    谷が見つからないフレームと、無音フレーム（silence_db 未満）は 0.0 = 無声。
+    """
+    tau_min = max(2, int(sr // fmax))
+    tau_max = int(math.ceil(sr / fmin))
+    # 窓長 W ≧ tau_max を確保できるフレーム長（2の冪）
+    frame_length = 1 << int(math.ceil(math.log2(2 * tau_max + 1)))
+    win = frame_length - tau_max
+    n_fft = 1 << int(math.ceil(math.log2(frame_length + win)))
+
+    frames_all = _frame_signal(y, frame_length, hop_length)
+    out = np.zeros(len(frames_all), dtype=np.float64)
+    silence = 10.0 ** (silence_db / 10.0)
+    taus = np.arange(tau_max + 1, dtype=np.float64)
+
+    for c0 in range(0, len(frames_all), chunk_frames):
+        frames = frames_all[c0:c0 + chunk_frames]
+
+        # r(τ) = Σ_{j<W} x_j x_{j+τ}
+        spec = np.fft.rfft(frames, n=n_fft, axis=1)
+        head = np.fft.rfft(frames[:, :win], n=n_fft, axis=1)
+        r = np.fft.irfft(spec * np.conj(head), n=n_fft, axis=1)[:, :tau_max + 1]
+
+        # d(τ) = E(x[0:W]) + E(x[τ:τ+W]) - 2 r(τ)
+        sq = np.concatenate(
+            [np.zeros((len(frames), 1)), np.cumsum(frames ** 2, axis=1)], axis=1
+        )
+        e0 = sq[:, win:win + 1]
+        e_tau = sq[:, win:win + tau_max + 1] - sq[:, :tau_max + 1]
+        d = np.maximum(e0 + e_tau - 2.0 * r, 0.0)
+
+        # CMNDF
+        cum = np.cumsum(d[:, 1:], axis=1)
+        cmndf = np.ones_like(d)
+        cmndf[:, 1:] = d[:, 1:] * taus[1:] / np.maximum(cum, 1e-12)
+
+        search = cmndf[:, tau_min:tau_max]
+        nxt = cmndf[:, tau_min + 1:tau_max + 1]
+        below = (search < threshold) & (search <= nxt)
+        found = below.any(axis=1)
+        tau = np.argmax(below, axis=1) + tau_min
+
+        # 放物線補間でサブサンプル精度に
+        rows = np.arange(len(frames))
+        t_lo = np.clip(tau - 1, 1, tau_max)
+        t_hi = np.clip(tau + 1, 1, tau_max)
+        a, b, c = cmndf[rows, t_lo], cmndf[rows, tau], cmndf[rows, t_hi]
+        denom = a - 2.0 * b + c
+        shift = np.where(np.abs(denom) > 1e-12, 0.5 * (a - c) / np.where(denom == 0, 1, denom), 0.0)
+        period = tau + np.clip(shift, -1.0, 1.0)
+
+        energy = e0[:, 0] / win
+        voiced = found & (energy > silence)
+        out[c0:c0 + len(frames)] = np.where(voiced, sr / period, 0.0)
+
+    return out
+
+
+def _pyin_f0(
+    y: np.ndarray,
+    *,
+    sr: int,
+    fmin: float,
+    fmax: float,
+    hop_length: int,
+) -> np.ndarray:
+    """librosa.pyin（高品質・低速）"""
+    import librosa
+
+    f0, voiced_flag, voiced_prob = librosa.pyin(
+        y,
+        sr=sr,
+        fmin=fmin,
+        fmax=fmax,
+        hop_length=hop_length,
+    )
+    # NaNを0に変換（無声部分）
+    return np.nan_to_num(f0, nan=0.0)
+
+
+# method名 → 推定関数。"pyin"=高品質モード、"yin"=高速モード
+F0_ESTIMATORS = {
+    "pyin": _pyin_f0,
+    "yin": _yin_f0,
+}
+
+
+# ═══════════════════════════════════════════════
+# F0キャッシュ（ディスク）
+# ═══════════════════════════════════════════════
+
+# キャッシュキーに含める版。推定器の実装を変えたら上げる
+F0_CACHE_VERSION = 1
+
+DEFAULT_F0_CACHE_DIR = Path("_outputs/voicebox/f0_cache")
+
+
+def _default_cache_dir() -> Path:
+    env = os.environ.get("VOICEVOX_F0_CACHE")
+    return Path(env) if env else DEFAULT_F0_CACHE_DIR
+
+
+def f0_cache_key(audio_path: str | Path, **params: Any) -> str:
+    """
+    音声内容のハッシュ + 抽出パラメータからキャッシュキーを作る。
+
+    ファイル名や更新日時ではなく中身で引くので、同じ参照クリップを
+    別パスにコピーしてもヒットし、上書きされれば自動的に外れる。
+    """
+    h = hashlib.sha256()
+    with open(audio_path, "rb") as fp:
+        for block in iter(lambda: fp.read(1 << 20), b""):
+            h.update(block)
+    param_str = json.dumps(
+        {"v": F0_CACHE_VERSION, **params}, sort_keys=True, separators=(",", ":")
+    )
+    h.update(param_str.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _cache_load(cache_dir: Path, key: str) -> Optional[np.ndarray]:
+    path = cache_dir / f"{key}.npy"
+    if not path.exists():
+        return None
+    try:
+        return np.load(path, allow_pickle=False)
+    except (OSError, ValueError):
+        return None  # 壊れたキャッシュは再抽出させる
+
+
+def _cache_store(cache_dir: Path, key: str, f0: np.ndarray) -> None:
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # 一時ファイル経由で置き換え（並列抽出でも壊れたnpyを残さない）
+        tmp = cache_dir / f"{key}.{os.getpid()}.tmp.npy"
+        np.save(tmp, f0, allow_pickle=False)
+        os.replace(tmp, cache_dir / f"{key}.npy")
+    except OSError as e:
+        logger.warning(f"F0キャッシュ書き込み失敗（抽出結果は有効）: {e}")
+
+
 # ═══════════════════════════════════════════════
 # F0抽出
 # ═══════════════════════════════════════════════
@@ -34,6 +277,9 @@ def extract_f0_curve(
     fmin: float = 50.0,
     fmax: float = 600.0,
     hop_length: int = 256,
+    method: str = "pyin",
+    use_cache: bool = True,
+    cache_dir: Optional[str | Path] = None,
 ) -> Optional[np.ndarray]:
     """
     音声ファイルからF0(基本周波数)カーブを抽出する。
@@ -44,16 +290,24 @@ def extract_f0_curve(
         fmin: F0推定の下限Hz
         fmax: F0推定の上限Hz
         hop_length: フレームシフト（サンプル数）
+        method: "pyin"（高品質・librosa必須）or "yin"（NumPy高速版）
+        use_cache: True=音声ハッシュ+パラメータでディスクキャッシュを使う
+        cache_dir: キャッシュ先（省略時は VOICEVOX_F0_CACHE か _outputs/voicebox/f0_cache）
 
     Returns:
         F0カーブ(Hz) np.ndarray。無声部分は0.0。
         失敗時はNone。
     """
-    try:
-        import librosa
-    except ImportError:
-        logger.warning("librosa未インストール。pip install librosa")
-        return None
+    estimator = F0_ESTIMATORS.get(method)
+    if estimator is None:
+        raise ValueError(f"未知のF0推定方式: {method} (選択肢: {sorted(F0_ESTIMATORS)})")
+
+    if method == "pyin":
+        try:
+            import librosa  # noqa: F401
+        except ImportError:
+            logger.warning("librosa未インストール。pip install librosa（または method='yin'）")
+            return None
 
     audio_path = Path(audio_path)
     if not audio_path.exists():
@@ -61,27 +315,34 @@ def extract_f0_curve(
         return None
 
     try:
-        # 音声読み込み
-        y, _sr = librosa.load(str(audio_path), sr=sr, mono=True)
-
-        # pyin でF0推定（librosa推奨の方式）
-        f0, voiced_flag, voiced_prob = librosa.pyin(
-            y,
-            sr=sr,
-            fmin=fmin,
-            fmax=fmax,
-            hop_length=hop_length,
-        )
-
-        # NaNを0に変換（無声部分）
-        f0 = np.nan_to_num(f0, nan=0.0)
+        key = None
+        if use_cache:
+            cache_dir = Path(cache_dir) if cache_dir else _default_cache_dir()
+            key = f0_cache_key(
+                audio_path, method=method, sr=sr, fmin=fmin, fmax=fmax, hop_length=hop_length,
+            )
+            cached = _cache_load(cache_dir, key)
+            if cached is not None:
+                logger.debug(f"F0キャッシュヒット: {audio_path.name}")
+                return cached
 
-        logger.info(
-            f"F0抽出完了: {audio_path.name}, "
-            f"{len(f0)}フレーム, "
-            f"有声率={np.count_nonzero(f0)/len(f0)*100:.1f}%, "
-            f"F0範囲={f0[f0>0].min():.1f}~{f0[f0>0].max():.1f}Hz"
-        )
+        # 音声読み込み
+        y = _load_audio(audio_path, sr)
+        f0 = estimator(y, sr=sr, fmin=fmin, fmax=fmax, hop_length=hop_length)
+
+        voiced = f0[f0 > 0]
+        if len(voiced):
+            logger.info(
+                f"F0抽出完了({method}): {audio_path.name}, "
+                f"{len(f0)}フレーム, "
+                f"有声率={len(voiced)/len(f0)*100:.1f}%, "
+                f"F0範囲={voiced.min():.1f}~{voiced.max():.1f}Hz"
+            )
+        else:
+            logger.info(f"F0抽出完了({method}): {audio_path.name}, 有声フレームなし")
+
+        if key is not None:
+            _cache_store(cache_dir, key, f0)
         return f0
 
     except Exception as e:
@@ -89,6 +350,83 @@ def extract_f0_curve(
         return None
 
 
+def _extract_f0_worker(args: Tuple[str, Dict[str, Any]]) -> Optional[np.ndarray]:
+    path, kwargs = args
+    return extract_f0_curve(path, **kwargs)
+
+
+def extract_f0_curves(
+    audio_paths: Sequence[str | Path],
+    *,
+    workers: int = 0,
+    **kwargs: Any,
+) -> List[Optional[np.ndarray]]:
+    """
+    複数の参照音声からF0カーブをまとめて抽出する。
+
+    キャッシュ済みのものは即座に返し、残りを workers プロセスで並列抽出する
+    （workers=0 なら逐次）。同じ内容のファイルは1回だけ抽出する。
+
+    Args:
+        audio_paths: WAVファイルパスのリスト
+        workers: 並列プロセス数
+        **kwargs: extract_f0_curve に渡す引数（method, sr, hop_length 等）
+
+    Returns:
+        入力順のF0カーブのリスト（失敗要素はNone）
+    """
+    paths = [str(p) for p in audio_paths]
+    results: List[Optional[np.ndarray]] = [None] * len(paths)
+
+    # 抽出が必要な代表パス → 結果を配る入力位置
+    pending: Dict[str, List[int]] = {}
+    if kwargs.get("use_cache", True):
+        cache_dir = Path(kwargs["cache_dir"]) if kwargs.get("cache_dir") else _default_cache_dir()
+        params = {
+            "method": kwargs.get("method", "pyin"),
+            "sr": kwargs.get("sr", 24000),
+            "fmin": kwargs.get("fmin", 50.0),
+            "fmax": kwargs.get("fmax", 600.0),
+            "hop_length": kwargs.get("hop_length", 256),
+        }
+        key_of: Dict[str, str] = {}
+        hits: Dict[str, np.ndarray] = {}
+        owner: Dict[str, str] = {}  # キャッシュキー → 代表パス
+        for i, path in enumerate(paths):
+            if not Path(path).exists():
+                pending.setdefault(path, []).append(i)  # 抽出側で警告してNone
+                continue
+            if path not in key_of:
+                key_of[path] = f0_cache_key(path, **params)
+            key = key_of[path]
+            if key not in hits and key not in owner:
+                cached = _cache_load(cache_dir, key)
+                if cached is not None:
+                    hits[key] = cached
+            if key in hits:
+                results[i] = hits[key]
+            else:
+                # 内容が同じ別ファイルは代表1件の抽出結果を共有する
+                pending.setdefault(owner.setdefault(key, path), []).append(i)
+    else:
+        for i, path in enumerate(paths):
+            pending.setdefault(path, []).append(i)
+
+    jobs = list(pending.items())
+    if workers > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            curves = list(ex.map(_extract_f0_worker, [(p, kwargs) for p, _ in jobs]))
+    else:
+        curves = [extract_f0_curve(p, **kwargs) for p, _ in jobs]
+
+    for (_, idxs), f0 in zip(jobs, curves):
+        for i in idxs:
+            results[i] = f0
+    return results
+
+
 # ═══════════════════════════════════════════════
 # F0 → VOICEVOXピッチ変換
 # ═══════════════════════════════════════════════
@@ -115,6 +453,15 @@ def _hz_to_voicevox_pitch(f0_hz: float, base_hz: float = 300.0) -> float:
     return max(3.0, min(8.0, pitch))  # クランプ
 
 
+def _hz_to_voicevox_pitch_array(f0_hz: np.ndarray, base_hz: float = 300.0) -> np.ndarray:
+    """_hz_to_voicevox_pitch の配列版（0Hz以下は0.0=無声）"""
+    f0_hz = np.asarray(f0_hz, dtype=np.float64)
+    voiced = f0_hz > 0
+    safe = np.where(voiced, f0_hz, base_hz)
+    pitch = np.clip(5.5 + 12.0 * np.log2(safe / base_hz) * 0.1, 3.0, 8.0)
+    return np.where(voiced, pitch, 0.0)
+
+
 def _estimate_mora_durations(
     accent_phrases: List[Dict[str, Any]],
 ) -> List[Tuple[int, int, float]]:
@@ -177,6 +524,8 @@ def apply_f0_to_query(
     if not mora_durations:
         return query
 
+    f0_curve = np.asarray(f0_curve, dtype=np.float64)
+
     # F0カーブの時間解像度
     frame_duration = hop_length / sr  # 1フレームの秒数
 
@@ -190,41 +539,31 @@ def apply_f0_to_query(
         base_hz = float(np.median(voiced_f0))
         logger.info(f"基準周波数を自動推定: {base_hz:.1f}Hz")
 
-    # 各モーラの時間位置を計算し、F0カーブからpitchを取得
-    current_time = 0.0
-    for pi, mi, duration in mora_durations:
-        if mi == -1:
-            # ポーズはスキップ
-            current_time += duration
-            continue
-
-        # モーラの中心時間 → F0フレーム
-        center_time = current_time + duration / 2.0
-        frame_idx = int(center_time / frame_duration)
-
-        if frame_idx >= len(f0_curve):
-            current_time += duration
-            continue
-
-        # 周辺フレームの平均F0（3フレーム幅）
-        start = max(0, frame_idx - 1)
-        end = min(len(f0_curve), frame_idx + 2)
-        f0_slice = f0_curve[start:end]
-        voiced_slice = f0_slice[f0_slice > 0]
-
-        if len(voiced_slice) > 0:
-            avg_f0 = float(np.mean(voiced_slice))
-            new_pitch = _hz_to_voicevox_pitch(avg_f0, base_hz)
-
-            # 元のpitchとブレンド
-            phrase = accent_phrases[pi]
-            mora = phrase["moras"][mi]
-            old_pitch = mora.get("pitch", 0.0)
-
-            if old_pitch > 0 and new_pitch > 0:
-                mora["pitch"] = old_pitch * (1.0 - blend) + new_pitch * blend
-
-        current_time += duration
+    # 各モーラ（ポーズ含む）の中心時刻 → F0フレーム位置をまとめて計算
+    durations = np.array([d for _, _, d in mora_durations], dtype=np.float64)
+    starts = np.concatenate([[0.0], np.cumsum(durations)[:-1]])
+    frame_idx = ((starts + durations / 2.0) / frame_duration).astype(np.int64)
+
+    # 周辺フレームの有声平均F0（3フレーム幅: idx-1〜idx+1、範囲外は除外）
+    n = len(f0_curve)
+    offsets = frame_idx[:, None] + np.array([-1, 0, 1])
+    in_range = (offsets >= 0) & (offsets < n)
+    window = np.where(in_range, f0_curve[np.clip(offsets, 0, n - 1)], 0.0)
+    voiced = window > 0
+    counts = voiced.sum(axis=1)
+    avg_f0 = np.where(counts > 0, window.sum(axis=1) / np.maximum(counts, 1), 0.0)
+    new_pitch = _hz_to_voicevox_pitch_array(avg_f0, base_hz)
+
+    is_mora = np.array([mi != -1 for _, mi, _ in mora_durations])
+    apply = is_mora & (frame_idx < n) & (counts > 0) & (new_pitch > 0)
+
+    # 元のpitchとブレンド（書き戻しのみ Python で行う）
+    for k in np.flatnonzero(apply):
+        pi, mi, _ = mora_durations[k]
+        mora = accent_phrases[pi]["moras"][mi]
+        old_pitch = mora.get("pitch", 0.0)
+        if old_pitch > 0:
+            mora["pitch"] = old_pitch * (1.0 - blend) + float(new_pitch[k]) * blend
 
     return query
 
@@ -239,6 +578,7 @@ def transfer_f0(
     reference_audio: str | Path,
     *,
     blend: float = 0.7,
+    method: str = "pyin",
 ) -> Dict[str, Any]:
     """
     参照音声のF0をaudio_queryに転写するワンライナー。
@@ -247,11 +587,12 @@ def transfer_f0(
         query: VOICEVOX audio_query
         reference_audio: 参照WAVファイルパス
         blend: ブレンド率 (0.0〜1.0)
+        method: F0推定方式（"pyin"=高品質, "yin"=高速）
 
     Returns:
         F0が適用されたaudio_query
     """
-    f0_curve = extract_f0_curve(reference_audio)
+    f0_curve = extract_f0_curve(reference_audio, method=method)
     if f0_curve is None:
         return query
 
@@ -22,7 +22,10 @@ from エージェント.VOICEVOXエージェント.scripts.situation_analyzer im
 from エージェント.VOICEVOXエージェント.scripts.adjustment_planner import create_plan, AdjustmentPlan
 from エージェント.VOICEVOXエージェント.scripts.presets import PresetManager
 from エージェント.VOICEVOXエージェント.scripts.base_tuner import apply_base_tuning
-from エージェント.VOICEVOXエージェント.scripts.accent_verifier import verify_and_fix_accents
+from エージェント.VOICEVOXエージェント.scripts.accent_verifier import (
+    get_accent_info_batch,
+    verify_and_fix_accents,
+)
 
 
 def run_pipeline(
@@ -67,6 +70,13 @@ def run_pipeline(
     # Step 1: テキスト前処理
     segments = preprocess(text)
 
+    # Layer 0 用の形態素解析をまとめて先読み（以降の照合はキャッシュから引く）
+    if enable_accent_verification:
+        try:
+            get_accent_info_batch(segments)
+        except Exception:
+            pass  # 照合ステップ側で個別にエラーを記録する
+
     # 出力ディレクトリ
     if output_dir is None:
         today = datetime.now().strftime("%Y%m%d")
@@ -3,6 +3,7 @@ from .models import (
     AssetEntry,
     AssetsManifest,
     DirectorQualityReport,
+    MediaPassStats,
     MediaProbeEntry,
     MediaProbeManifest,
     NarrationEntry,
@@ -22,6 +23,7 @@ __all__ = [
     "AssetEntry",
     "AssetsManifest",
     "DirectorQualityReport",
+    "MediaPassStats",
     "MediaProbeEntry",
     "MediaProbeManifest",
     "NarrationEntry",
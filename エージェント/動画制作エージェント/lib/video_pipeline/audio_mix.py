@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import math
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from .ffmpeg_utils import decode_audio_pcm
+
+MIX_SAMPLE_RATE = 48000
+MIX_CHANNELS = 2
+SILENCE_THRESHOLD_DB = -70.0
+
+
+def _pcm_bytes_to_float(raw: bytes, sample_width: int) -> np.ndarray:
+    if sample_width == 1:
+        return (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    if sample_width == 2:
+        return np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    if sample_width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        value = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        value = np.where(value >= 1 << 23, value - (1 << 24), value)
+        return value.astype(np.float32) / float(1 << 23)
+    if sample_width == 4:
+        return np.frombuffer(raw, dtype="<i4").astype(np.float32) / float(1 << 31)
+    raise ValueError(f"unsupported sample width: {sample_width}")
+
+
+def read_audio(path: Path, *, sample_rate: int = MIX_SAMPLE_RATE, channels: int = MIX_CHANNELS) -> np.ndarray:
+    """Load audio as float32 (frames, channels) at the mix layout.
+
+    PCM WAV (VOICEVOX output) is read in-process; anything else falls back to one ffmpeg decode.
+    """
+    try:
+        with wave.open(str(path), "rb") as handle:
+            src_channels = handle.getnchannels()
+            src_rate = handle.getframerate()
+            data = _pcm_bytes_to_float(handle.readframes(handle.getnframes()), handle.getsampwidth())
+    except (wave.Error, ValueError, EOFError):
+        raw = decode_audio_pcm(path, sample_rate=sample_rate, channels=channels)
+        return np.frombuffer(raw, dtype="<f4").reshape(-1, channels).copy()
+
+    samples = data.reshape(-1, src_channels)
+    return conform_layout(samples, src_rate=src_rate, sample_rate=sample_rate, channels=channels)
+
+
+def conform_layout(samples: np.ndarray, *, src_rate: int, sample_rate: int, channels: int) -> np.ndarray:
+    if samples.shape[1] != channels:
+        if samples.shape[1] == 1:
+            samples = np.repeat(samples, channels, axis=1)
+        else:
+            samples = np.repeat(samples.mean(axis=1, keepdims=True), channels, axis=1)
+    if src_rate != sample_rate and len(samples) > 1:
+        n_out = int(round(len(samples) * sample_rate / src_rate))
+        src_pos = np.arange(len(samples), dtype=np.float64)
+        dst_pos = np.arange(n_out, dtype=np.float64) * (src_rate / sample_rate)
+        samples = np.stack([np.interp(dst_pos, src_pos, samples[:, ch]) for ch in range(channels)], axis=1)
+    return samples.astype(np.float32, copy=False)
+
+
+class PcmMixer:
+    """Fixed-length float32 mix bus. Segments are summed in place (amix normalize=0 equivalent)."""
+
+    def __init__(self, total_sec: float, *, sample_rate: int = MIX_SAMPLE_RATE, channels: int = MIX_CHANNELS) -> None:
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.total_frames = max(0, int(round(total_sec * sample_rate)))
+        self.buffer = np.zeros((self.total_frames, channels), dtype=np.float32)
+
+    def add(self, samples: np.ndarray, *, offset_sec: float = 0.0, gain: float | np.ndarray = 1.0) -> None:
+        start = int(round(offset_sec * self.sample_rate))
+        if start >= self.total_frames or len(samples) == 0:
+            return
+        end = min(self.total_frames, start + len(samples))
+        chunk = samples[: end - start]
+        if isinstance(gain, np.ndarray):
+            chunk = chunk * gain[: end - start, None]
+        elif gain != 1.0:
+            chunk = chunk * gain
+        self.buffer[start:end] += chunk
+
+
+def loop_to_length(samples: np.ndarray, frames: int) -> np.ndarray:
+    if len(samples) == 0 or frames <= 0:
+        return samples[:0]
+    reps = int(math.ceil(frames / len(samples)))
+    return np.tile(samples, (reps, 1))[:frames] if reps > 1 else samples[:frames]
+
+
+def fade_envelope(frames: int, *, sample_rate: int, fade_in_sec: float, fade_out_sec: float) -> np.ndarray:
+    """Linear in/out envelope matching afade t=in:st=0 / t=out:st=end-d."""
+    env = np.ones(frames, dtype=np.float32)
+    fade_in = min(frames, int(round(fade_in_sec * sample_rate)))
+    if fade_in > 0:
+        env[:fade_in] = np.linspace(0.0, 1.0, fade_in, endpoint=False, dtype=np.float32)
+    fade_out = min(frames, int(round(fade_out_sec * sample_rate)))
+    if fade_out > 0:
+        env[frames - fade_out :] *= np.linspace(1.0, 0.0, fade_out, dtype=np.float32)
+    return env
+
+
+def ducking_gain(
+    sidechain: np.ndarray,
+    *,
+    sample_rate: int,
+    threshold: float,
+    ratio: float,
+    attack_ms: float = 20.0,
+    release_ms: float = 250.0,
+    block_ms: float = 10.0,
+) -> np.ndarray:
+    """Per-sample gain for the BGM bus, keyed by narration RMS (sidechaincompress approximation).
+
+    The envelope follower runs on 10 ms blocks so the recursive part stays short; the resulting
+    gain curve is interpolated back to sample resolution.
+    """
+    frames = len(sidechain)
+    if frames == 0:
+        return np.ones(0, dtype=np.float32)
+    block = max(1, int(sample_rate * block_ms / 1000.0))
+    n_blocks = int(math.ceil(frames / block))
+    mono = sidechain.mean(axis=1) if sidechain.ndim == 2 else sidechain
+    padded = np.zeros(n_blocks * block, dtype=np.float32)
+    padded[:frames] = mono
+    level = np.sqrt(np.mean(padded.reshape(n_blocks, block) ** 2, axis=1))
+
+    att = math.exp(-block / (attack_ms / 1000.0 * sample_rate))
+    rel = math.exp(-block / (release_ms / 1000.0 * sample_rate))
+    env = np.empty(n_blocks, dtype=np.float64)
+    current = 0.0
+    for i, value in enumerate(level.tolist()):
+        coeff = att if value > current else rel
+        current = coeff * current + (1.0 - coeff) * value
+        env[i] = current
+
+    over_db = 20.0 * np.log10(np.maximum(env, 1e-12) / threshold)
+    reduction_db = np.where(over_db > 0.0, over_db * (1.0 - 1.0 / ratio), 0.0)
+    block_gain = np.power(10.0, -reduction_db / 20.0)
+    centers = (np.arange(n_blocks) + 0.5) * block
+    return np.interp(np.arange(frames), centers, block_gain).astype(np.float32)
+
+
+def peak_dbfs(samples: np.ndarray) -> float:
+    if samples.size == 0:
+        return -math.inf
+    peak = float(np.max(np.abs(samples)))
+    return 20.0 * math.log10(peak) if peak > 0.0 else -math.inf
+
+
+def is_buffer_effectively_empty(samples: np.ndarray) -> bool:
+    return peak_dbfs(samples) < SILENCE_THRESHOLD_DB
+
+
+def write_wav_s16(path: Path, samples: np.ndarray, *, sample_rate: int = MIX_SAMPLE_RATE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pcm = (np.clip(samples, -1.0, 32767.0 / 32768.0) * 32768.0).astype("<i2")
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(samples.shape[1] if samples.ndim == 2 else 1)
+        handle.setsampwidth(2)
+        handle.setframerate(sample_rate)
+        handle.writeframes(pcm.tobytes())
@@ -2,12 +2,52 @@ from __future__ import annotations
 
 import hashlib
 import json
-import math
 import re
+import subprocess
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
-from .io import run_command
+from .io import read_json, run_command, write_json
+
+
+@dataclass
+class MediaPassCounter:
+    """Counts full-media decode/encode passes (and ffprobe calls) made by one step."""
+
+    decode: int = 0
+    encode: int = 0
+    probe: int = 0
+    details: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, int]:
+        return {"decode": self.decode, "encode": self.encode, "probe": self.probe}
+
+
+_active_counter: ContextVar[MediaPassCounter | None] = ContextVar("media_pass_counter", default=None)
+
+
+@contextmanager
+def track_media_passes() -> Iterator[MediaPassCounter]:
+    counter = MediaPassCounter()
+    token = _active_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _active_counter.reset(token)
+
+
+def count_media_pass(*, decode: int = 0, encode: int = 0, probe: int = 0, label: str = "") -> None:
+    counter = _active_counter.get()
+    if counter is None:
+        return
+    counter.decode += decode
+    counter.encode += encode
+    counter.probe += probe
+    if label:
+        counter.details.append(label)
 
 
 def file_sha256(path: Path) -> str:
@@ -30,6 +70,7 @@ def parse_fraction(value: str | None) -> float:
 
 
 def ffprobe_json(path: Path) -> dict[str, Any]:
+    count_media_pass(probe=1)
     result = run_command([
         "ffprobe",
         "-v",
@@ -70,6 +111,7 @@ def probe_wav_duration(path: Path) -> float:
 
 
 def estimate_brightness(path: Path) -> float:
+    count_media_pass(decode=1, label=f"signalstats:{path.name}")
     result = run_command([
         "ffmpeg",
         "-hide_banner",
@@ -92,6 +134,7 @@ def estimate_brightness(path: Path) -> float:
 def estimate_freeze_ratio(path: Path, duration_sec: float) -> float:
     if duration_sec <= 0.0:
         return 1.0
+    count_media_pass(decode=1, label=f"freezedetect:{path.name}")
     result = run_command([
         "ffmpeg",
         "-hide_banner",
@@ -143,6 +186,7 @@ def ffmpeg_conform_video(
         "setsar=1",
         f"fps={fps}",
     ])
+    count_media_pass(decode=1, encode=1, label=f"conform:{src.name}")
     result = run_command([
         "ffmpeg",
         "-y",
@@ -252,26 +296,105 @@ def frames_to_seconds(frames: int, fps: int) -> float:
     return frames / float(fps)
 
 
-def calculate_loudnorm_filter(target_lufs: float, truepeak_db: float) -> str:
-    return f"loudnorm=I={target_lufs}:TP={truepeak_db}:LRA=11"
+LOUDNORM_LRA = 11.0
+_LOUDNORM_MEASURE_KEYS = ("input_i", "input_tp", "input_lra", "input_thresh", "target_offset")
 
 
-def is_audio_effectively_empty(path: Path) -> bool:
+def calculate_loudnorm_filter(
+    target_lufs: float,
+    truepeak_db: float,
+    measured: dict[str, str] | None = None,
+) -> str:
+    base = f"loudnorm=I={target_lufs}:TP={truepeak_db}:LRA=11"
+    if not measured:
+        return base
+    # Second pass: feed first-pass measurements back so loudnorm can apply a linear gain.
+    return (
+        f"{base}:measured_I={measured['input_i']}:measured_TP={measured['input_tp']}"
+        f":measured_LRA={measured['input_lra']}:measured_thresh={measured['input_thresh']}"
+        f":offset={measured['target_offset']}:linear=true"
+    )
+
+
+def parse_loudnorm_json(stderr: str) -> dict[str, str] | None:
+    start = stderr.rfind("{")
+    end = stderr.rfind("}")
+    if start < 0 or end <= start:
+        return None
+    try:
+        payload = json.loads(stderr[start : end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not all(key in payload for key in _LOUDNORM_MEASURE_KEYS):
+        return None
+    # -inf measurements (silent input) cannot be fed to the second pass.
+    if any("inf" in str(payload[key]) for key in _LOUDNORM_MEASURE_KEYS):
+        return None
+    return {key: str(payload[key]) for key in _LOUDNORM_MEASURE_KEYS}
+
+
+def measure_loudnorm(
+    path: Path,
+    *,
+    target_lufs: float,
+    truepeak_db: float,
+    cache_dir: Path | None = None,
+) -> dict[str, str] | None:
+    """First loudnorm pass. Measurements are cached by input content hash and targets."""
+    cache_path: Path | None = None
+    if cache_dir is not None:
+        key = hashlib.sha256(
+            f"{file_sha256(path)}|I={target_lufs}|TP={truepeak_db}|LRA={LOUDNORM_LRA}".encode("utf-8")
+        ).hexdigest()
+        cache_path = cache_dir / f"{key}.json"
+        if cache_path.is_file():
+            try:
+                cached = read_json(cache_path)
+            except (OSError, ValueError):
+                cached = {}
+            if all(k in cached for k in _LOUDNORM_MEASURE_KEYS):
+                return {k: str(cached[k]) for k in _LOUDNORM_MEASURE_KEYS}
+
+    count_media_pass(decode=1, label=f"loudnorm_measure:{path.name}")
     result = run_command([
         "ffmpeg",
         "-hide_banner",
+        "-nostats",
         "-i",
         str(path),
         "-af",
-        "volumedetect",
+        f"{calculate_loudnorm_filter(target_lufs, truepeak_db)}:print_format=json",
         "-f",
         "null",
         "-",
-    ])
+    ], timeout_sec=1200)
+    if result.returncode != 0:
+        return None
+    measured = parse_loudnorm_json(result.stderr)
+    if measured and cache_path is not None:
+        write_json(cache_path, measured)
+    return measured
+
+
+def decode_audio_pcm(
+    path: Path,
+    *,
+    sample_rate: int,
+    channels: int,
+    duration_sec: float | None = None,
+    loop: bool = False,
+) -> bytes:
+    """Decode any ffmpeg-readable audio into interleaved float32 PCM on stdout (one pass)."""
+    args = ["ffmpeg", "-hide_banner", "-nostdin"]
+    if loop:
+        args += ["-stream_loop", "-1"]
+    args += ["-i", str(path), "-vn"]
+    if duration_sec is not None:
+        args += ["-t", f"{duration_sec:.3f}"]
+    args += ["-ar", str(sample_rate), "-ac", str(channels), "-f", "f32le", "-"]
+    count_media_pass(decode=1, label=f"pcm_decode:{path.name}")
+    result = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=1200, check=False)
     if result.returncode != 0:
-        return False
-    match = re.search(r"max_volume:\s*(-?[0-9.]+)\s*dB", result.stderr)
-    if not match:
-        return False
-    value = float(match.group(1))
-    return math.isinf(value) or value < -70.0
+        message = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffmpeg decode failed for {path.name}: {message}")
+    return result.stdout
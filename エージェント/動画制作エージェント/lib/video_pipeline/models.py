@@ -318,6 +318,22 @@ class RunError(BaseModel):
     at: str = Field(default_factory=utc_now_iso)
 
 
+class MediaPassStats(BaseModel):
+    """Full-media decode/encode passes (ffmpeg + remotion) and ffprobe calls, per step and in total."""
+
+    decode: int = 0
+    encode: int = 0
+    probe: int = 0
+    by_step: dict[str, dict[str, int]] = Field(default_factory=dict)
+
+    def record(self, step_id: str, counts: dict[str, int]) -> None:
+        # A re-run step replaces its previous counts so totals stay per-run.
+        self.by_step[step_id] = dict(counts)
+        self.decode = sum(item.get("decode", 0) for item in self.by_step.values())
+        self.encode = sum(item.get("encode", 0) for item in self.by_step.values())
+        self.probe = sum(item.get("probe", 0) for item in self.by_step.values())
+
+
 class RunState(BaseModel):
     model_config = ConfigDict(validate_assignment=True)
 
@@ -329,6 +345,7 @@ class RunState(BaseModel):
     artifacts: dict[str, str] = Field(default_factory=dict)
     qc_warnings: list[str] = Field(default_factory=list)
     errors: list[RunError] = Field(default_factory=list)
+    media_passes: MediaPassStats = Field(default_factory=MediaPassStats)
 
     @model_validator(mode="after")
     def ensure_step_keys(self) -> "RunState":
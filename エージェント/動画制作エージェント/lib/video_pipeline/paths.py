@@ -78,6 +78,10 @@ class PipelinePaths:
     def mix_path(self) -> Path:
         return self.output_dir / "mix.wav"
 
+    @property
+    def loudnorm_cache_dir(self) -> Path:
+        return self.repo_root / "_outputs" / "video_pipeline" / "_cache" / "loudnorm"
+
     @property
     def exports_dir(self) -> Path:
         return self.output_dir / "exports"
@@ -1,9 +1,23 @@
 from __future__ import annotations
 
 import shutil
+import subprocess
 from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
+
+from .audio_mix import (
+    MIX_CHANNELS,
+    MIX_SAMPLE_RATE,
+    PcmMixer,
+    ducking_gain,
+    fade_envelope,
+    is_buffer_effectively_empty,
+    loop_to_length,
+    read_audio,
+    write_wav_s16,
+)
 from .constants import DEFAULT_COMPOSITION_ID, VIDEO_EXTENSIONS
 from .director import (
     augment_shot_list_payload,
@@ -14,10 +28,12 @@ from .director import (
 from .ffmpeg_utils import (
     beat_snap_frame,
     calculate_loudnorm_filter,
+    count_media_pass,
+    decode_audio_pcm,
     ffmpeg_conform_video,
     file_sha256,
     frames_to_seconds,
-    is_audio_effectively_empty,
+    measure_loudnorm,
     probe_wav_duration,
     sample_video_metrics,
     score_take,
@@ -529,8 +545,10 @@ def step_a7_render(paths: PipelinePaths) -> StepOutput:
         str(paths.remotion_props_path),
         "--overwrite",
     ]
+    count_media_pass(encode=1, label="remotion_render")
     result = run_command(command, cwd=paths.remotion_dir, timeout_sec=3600)
     if result.returncode != 0 and "--props-file" in (result.stderr or ""):
+        count_media_pass(encode=1, label="remotion_render_fallback")
         props_json = paths.remotion_props_path.read_text(encoding="utf-8")
         fallback = [
             "npx",
@@ -556,98 +574,71 @@ def step_a8_mix(paths: PipelinePaths) -> StepOutput:
     shot_list = load_shot_list(paths)
     timeline = load_timeline(paths)
     total_sec = timeline.total_duration_sec
+    bgm_settings = shot_list.settings.bgm
 
-    input_args: list[str] = ["-f", "lavfi", "-i", "anullsrc=r=48000:cl=stereo"]
-    filter_parts: list[str] = [f"[0:a]atrim=0:{total_sec:.3f},asetpts=N/SR/TB[nbase]"]
-    narr_labels: list[str] = ["[nbase]"]
-    next_input_index = 1
+    # Narration: per-shot WAVs are summed into one PCM bus in-process (no ffmpeg graph).
+    narration = PcmMixer(total_sec, sample_rate=MIX_SAMPLE_RATE, channels=MIX_CHANNELS)
     for shot in timeline.shots:
         if not shot.narration_src:
             continue
         narration_path = Path(shot.narration_src)
         if not narration_path.is_file():
             continue
-        input_args.extend(["-i", str(narration_path)])
-        delay_ms = int(round((shot.start_frame / timeline.fps) * 1000.0))
-        label = f"n{next_input_index}"
-        filter_parts.append(
-            f"[{next_input_index}:a]adelay={delay_ms}|{delay_ms},atrim=0:{total_sec:.3f},asetpts=N/SR/TB[{label}]"
-        )
-        narr_labels.append(f"[{label}]")
-        next_input_index += 1
-
-    narr_mix_label = "narr"
-    if len(narr_labels) == 1:
-        filter_parts.append(f"{narr_labels[0]}anull[{narr_mix_label}]")
-    else:
-        filter_parts.append("".join(narr_labels) + f"amix=inputs={len(narr_labels)}:normalize=0[{narr_mix_label}]")
+        narration.add(read_audio(narration_path), offset_sec=shot.start_frame / timeline.fps)
 
-    bgm_path = resolve_bgm_path(shot_list.settings.bgm.path, paths)
-    final_label = "mix"
+    mix = narration.buffer
+    bgm_path = resolve_bgm_path(bgm_settings.path, paths)
     if bgm_path and bgm_path.is_file():
-        input_args.extend(["-stream_loop", "-1", "-i", str(bgm_path)])
-        bgm_idx = next_input_index
-        fade_out_start = max(0.0, total_sec - shot_list.settings.bgm.fade_out_sec)
-        filter_parts.append(
-            f"[{bgm_idx}:a]atrim=0:{total_sec:.3f},volume={shot_list.settings.bgm.volume_db:.2f}dB,"
-            f"afade=t=in:st=0:d={shot_list.settings.bgm.fade_in_sec:.3f},"
-            f"afade=t=out:st={fade_out_start:.3f}:d={shot_list.settings.bgm.fade_out_sec:.3f}[bgm]"
+        raw = decode_audio_pcm(
+            bgm_path,
+            sample_rate=MIX_SAMPLE_RATE,
+            channels=MIX_CHANNELS,
+            duration_sec=total_sec,
+            loop=True,
         )
-        if shot_list.settings.bgm.ducking_enabled:
-            filter_parts.append(
-                f"[bgm][{narr_mix_label}]sidechaincompress=threshold={shot_list.settings.bgm.duck_threshold}:"
-                f"ratio={shot_list.settings.bgm.duck_ratio}:attack=20:release=250[bgduck]"
+        bgm = loop_to_length(np.frombuffer(raw, dtype="<f4").reshape(-1, MIX_CHANNELS), narration.total_frames)
+        gain = fade_envelope(
+            len(bgm),
+            sample_rate=MIX_SAMPLE_RATE,
+            fade_in_sec=bgm_settings.fade_in_sec,
+            fade_out_sec=bgm_settings.fade_out_sec,
+        ) * np.float32(10.0 ** (bgm_settings.volume_db / 20.0))
+        if bgm_settings.ducking_enabled:
+            gain *= ducking_gain(
+                mix[: len(bgm)],
+                sample_rate=MIX_SAMPLE_RATE,
+                threshold=bgm_settings.duck_threshold,
+                ratio=bgm_settings.duck_ratio,
             )
-            filter_parts.append(f"[bgduck][{narr_mix_label}]amix=inputs=2:normalize=0[{final_label}]")
-        else:
-            filter_parts.append(f"[bgm][{narr_mix_label}]amix=inputs=2:normalize=0[{final_label}]")
-    else:
-        filter_parts.append(f"[{narr_mix_label}]anull[{final_label}]")
+        bus = PcmMixer(total_sec, sample_rate=MIX_SAMPLE_RATE, channels=MIX_CHANNELS)
+        bus.add(mix)
+        bus.add(bgm, gain=gain)
+        mix = bus.buffer
 
-    command = [
-        "ffmpeg",
-        "-y",
-        "-hide_banner",
-        *input_args,
-        "-filter_complex",
-        ";".join(filter_parts),
-        "-map",
-        f"[{final_label}]",
-        "-t",
-        f"{total_sec:.3f}",
-        "-ar",
-        "48000",
-        "-ac",
-        "2",
-        "-c:a",
-        "pcm_s16le",
-        str(paths.mix_path),
-    ]
-    result = run_command(command, timeout_sec=1200)
-    if result.returncode != 0:
-        raise RuntimeError(f"audio mix failed: {result.stderr.strip()}")
+    write_wav_s16(paths.mix_path, mix, sample_rate=MIX_SAMPLE_RATE)
     warnings: list[str] = []
-    if is_audio_effectively_empty(paths.mix_path):
+    if is_buffer_effectively_empty(mix):
         warnings.append("mixed_audio_is_near_silence")
+    else:
+        # First loudnorm pass now, while mix.wav is hot; A9 reuses the cached measurement.
+        measured = measure_loudnorm(
+            paths.mix_path,
+            target_lufs=shot_list.settings.export.target_lufs,
+            truepeak_db=shot_list.settings.export.truepeak_db,
+            cache_dir=paths.loudnorm_cache_dir,
+        )
+        if measured is None:
+            warnings.append("loudnorm_measure_failed")
     return StepOutput(
         artifacts={"mix.wav": normalize_path_str(paths.mix_path)},
         warnings=warnings,
     )
 
 
-def step_a9_finalize(paths: PipelinePaths) -> StepOutput:
-    shot_list = load_shot_list(paths)
-    if not paths.draft_path.is_file():
-        raise FileNotFoundError(f"draft video not found: {paths.draft_path}")
-    if not paths.mix_path.is_file():
-        raise FileNotFoundError(f"mix wav not found: {paths.mix_path}")
-
-    loudnorm = calculate_loudnorm_filter(
-        target_lufs=shot_list.settings.export.target_lufs,
-        truepeak_db=shot_list.settings.export.truepeak_db,
-    )
-    warnings: list[str] = []
-    primary = run_command([
+def _mux_final(paths: PipelinePaths, audio_filter: str | None) -> subprocess.CompletedProcess[str]:
+    # Video is stream-copied; only the audio track is encoded.
+    count_media_pass(decode=1, encode=1, label="finalize_mux" + ("_loudnorm" if audio_filter else ""))
+    command = [
         "ffmpeg",
         "-y",
         "-hide_banner",
@@ -665,35 +656,38 @@ def step_a9_finalize(paths: PipelinePaths) -> StepOutput:
         "aac",
         "-b:a",
         "320k",
-        "-af",
-        loudnorm,
-        "-movflags",
-        "+faststart",
-        str(paths.final_path),
-    ], timeout_sec=1800)
+    ]
+    if audio_filter:
+        command += ["-af", audio_filter]
+    command += ["-movflags", "+faststart", str(paths.final_path)]
+    return run_command(command, timeout_sec=1800)
+
+
+def step_a9_finalize(paths: PipelinePaths) -> StepOutput:
+    shot_list = load_shot_list(paths)
+    if not paths.draft_path.is_file():
+        raise FileNotFoundError(f"draft video not found: {paths.draft_path}")
+    if not paths.mix_path.is_file():
+        raise FileNotFoundError(f"mix wav not found: {paths.mix_path}")
+
+    export = shot_list.settings.export
+    warnings: list[str] = []
+    measured = measure_loudnorm(
+        paths.mix_path,
+        target_lufs=export.target_lufs,
+        truepeak_db=export.truepeak_db,
+        cache_dir=paths.loudnorm_cache_dir,
+    )
+    if measured is None:
+        warnings.append("loudnorm_two_pass_unavailable_single_pass_applied")
+    loudnorm = calculate_loudnorm_filter(
+        target_lufs=export.target_lufs,
+        truepeak_db=export.truepeak_db,
+        measured=measured,
+    )
+    primary = _mux_final(paths, loudnorm)
     if primary.returncode != 0:
-        fallback = run_command([
-            "ffmpeg",
-            "-y",
-            "-hide_banner",
-            "-i",
-            str(paths.draft_path),
-            "-i",
-            str(paths.mix_path),
-            "-map",
-            "0:v:0",
-            "-map",
-            "1:a:0",
-            "-c:v",
-            "copy",
-            "-c:a",
-            "aac",
-            "-b:a",
-            "320k",
-            "-movflags",
-            "+faststart",
-            str(paths.final_path),
-        ], timeout_sec=1800)
+        fallback = _mux_final(paths, None)
         if fallback.returncode != 0:
             raise RuntimeError(f"finalize failed: {fallback.stderr.strip()}")
         warnings.append("loudnorm_failed_fallback_mux_applied")
@@ -23,6 +23,7 @@ def _add_lib_path() -> None:
 _add_lib_path()
 
 from video_pipeline.constants import STEP_IDS
+from video_pipeline.ffmpeg_utils import track_media_passes
 from video_pipeline.io import read_json
 from video_pipeline.models import DirectorQualityReport, RunState
 from video_pipeline.paths import PipelinePaths
@@ -166,9 +167,11 @@ def execute_step(
             return
         manager.set_step_running(state, step_id)
     try:
-        output = step_runner(step_id)(paths, force, dry_run)
+        with track_media_passes() as passes:
+            output = step_runner(step_id)(paths, force, dry_run)
     except Exception as err:
         with state_lock:
+            state.media_passes.record(step_id, passes.as_dict())
             manager.set_step_failed(
                 state,
                 step_id,
@@ -182,6 +185,7 @@ def execute_step(
         for key, value in output.artifacts.items():
             state.artifacts[key] = value
         state.qc_warnings.extend(output.warnings)
+        state.media_passes.record(step_id, passes.as_dict())
         manager.save(state)
         manager.set_step_success(state, step_id)
 
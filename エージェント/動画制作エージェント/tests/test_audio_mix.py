@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from video_pipeline import ffmpeg_utils, steps
+from video_pipeline.audio_mix import (
+    PcmMixer,
+    ducking_gain,
+    fade_envelope,
+    is_buffer_effectively_empty,
+    read_audio,
+    write_wav_s16,
+)
+from video_pipeline.ffmpeg_utils import (
+    calculate_loudnorm_filter,
+    count_media_pass,
+    parse_loudnorm_json,
+    track_media_passes,
+)
+from video_pipeline.models import RunState, ShotList, Timeline, TimelineShot
+from video_pipeline.paths import PipelinePaths
+
+
+def _write_tone(path: Path, *, seconds: float, sample_rate: int = 24000, amplitude: float = 0.5) -> None:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pcm = (amplitude * np.sin(2 * np.pi * 440.0 * t) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(sample_rate)
+        handle.writeframes(pcm.tobytes())
+
+
+def test_read_audio_resamples_mono_voicevox_wav(tmp_path: Path) -> None:
+    src = tmp_path / "n.wav"
+    _write_tone(src, seconds=0.5)
+    samples = read_audio(src)
+    assert samples.shape == (24000, 2)
+    assert np.allclose(samples[:, 0], samples[:, 1])
+    assert 0.45 < float(np.max(np.abs(samples))) < 0.55
+
+
+def test_pcm_mixer_places_segments_at_offsets() -> None:
+    mixer = PcmMixer(1.0, sample_rate=1000, channels=2)
+    seg = np.full((100, 2), 0.25, dtype=np.float32)
+    mixer.add(seg, offset_sec=0.2)
+    mixer.add(seg, offset_sec=0.25)
+    mixer.add(seg, offset_sec=0.95)  # truncated at total length
+    assert mixer.buffer[199, 0] == 0.0
+    assert mixer.buffer[220, 0] == 0.25
+    assert mixer.buffer[260, 0] == 0.5
+    assert mixer.buffer[999, 0] == 0.25
+
+
+def test_fade_envelope_and_ducking() -> None:
+    env = fade_envelope(1000, sample_rate=1000, fade_in_sec=0.1, fade_out_sec=0.1)
+    assert env[0] == 0.0 and env[500] == 1.0 and env[-1] == 0.0
+
+    sidechain = np.zeros((48000, 2), dtype=np.float32)
+    sidechain[24000:] = 0.5
+    gain = ducking_gain(sidechain, sample_rate=48000, threshold=0.03, ratio=8.0)
+    assert gain[1000] == 1.0
+    assert gain[-1000] < 0.2
+
+
+def test_loudnorm_second_pass_filter_uses_measurements() -> None:
+    stderr = 'noise\n[Parsed_loudnorm_0 @ 0x1]\n' + json.dumps({
+        "input_i": "-23.10",
+        "input_tp": "-4.20",
+        "input_lra": "5.30",
+        "input_thresh": "-33.40",
+        "target_offset": "0.20",
+    })
+    measured = parse_loudnorm_json(stderr)
+    assert measured is not None
+    flt = calculate_loudnorm_filter(-14.0, -1.0, measured)
+    assert flt.startswith("loudnorm=I=-14.0:TP=-1.0:LRA=11")
+    assert "measured_I=-23.10" in flt and "offset=0.20" in flt and "linear=true" in flt
+    assert calculate_loudnorm_filter(-14.0, -1.0) == "loudnorm=I=-14.0:TP=-1.0:LRA=11"
+    assert parse_loudnorm_json(stderr.replace('"-23.10"', '"-inf"')) is None
+
+
+def test_measure_loudnorm_cached_per_input(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "mix.wav"
+    write_wav_s16(src, np.full((4800, 2), 0.1, dtype=np.float32))
+    payload = {"input_i": "-20", "input_tp": "-9", "input_lra": "1", "input_thresh": "-30", "target_offset": "0"}
+    calls: list[list[str]] = []
+
+    class _Result:
+        returncode = 0
+        stderr = json.dumps(payload)
+
+    monkeypatch.setattr(ffmpeg_utils, "run_command", lambda args, **kw: calls.append(args) or _Result())
+    with track_media_passes() as passes:
+        first = ffmpeg_utils.measure_loudnorm(src, target_lufs=-14.0, truepeak_db=-1.0, cache_dir=tmp_path / "c")
+        second = ffmpeg_utils.measure_loudnorm(src, target_lufs=-14.0, truepeak_db=-1.0, cache_dir=tmp_path / "c")
+    assert first == second == payload
+    assert len(calls) == 1
+    assert passes.decode == 1
+
+
+def test_media_pass_stats_totals_replace_rerun_steps() -> None:
+    state = RunState(project_slug="demo", run_id="r1")
+    with track_media_passes() as passes:
+        count_media_pass(decode=2, encode=1)
+    state.media_passes.record("a3_probe", passes.as_dict())
+    state.media_passes.record("a9_finalize", {"decode": 1, "encode": 1, "probe": 0})
+    state.media_passes.record("a9_finalize", {"decode": 2, "encode": 2, "probe": 0})
+    assert (state.media_passes.decode, state.media_passes.encode) == (4, 3)
+    dumped = state.model_dump(mode="json")
+    assert dumped["media_passes"]["by_step"]["a3_probe"]["decode"] == 2
+
+
+def test_step_a8_mix_narration_only_in_process(tmp_path: Path, monkeypatch) -> None:
+    paths = PipelinePaths(repo_root=tmp_path, project_slug="demo", run_id="run1")
+    paths.ensure_runtime_dirs()
+    shot_list = ShotList.model_validate(
+        {
+            "schema_version": "1.0.0",
+            "project_slug": "demo",
+            "settings": {
+                "fps": 24,
+                "resolution": {"width": 1920, "height": 1080},
+                "voicevox": {"base_url": "http://127.0.0.1:50021", "speaker": 1},
+                "bgm": {"path": None, "bpm": 120, "offset_sec": 0},
+                "look": {},
+                "export": {},
+                "subtitle_max_chars": 12,
+                "beat_snap_max_frames": 8,
+            },
+            "shots": [
+                {"id": "s001", "narration": "a", "timing": {"min_sec": 1.0, "max_sec": 4.0, "post_pad_sec": 0.3}},
+                {"id": "s002", "narration": "b", "timing": {"min_sec": 1.0, "max_sec": 4.0, "post_pad_sec": 0.3}},
+            ],
+        }
+    )
+    paths.normalized_shot_list_path.write_text(shot_list.model_dump_json(indent=2), encoding="utf-8")
+    n1 = paths.narration_dir / "s001.wav"
+    _write_tone(n1, seconds=0.5)
+    timeline = Timeline(
+        project_slug="demo",
+        run_id="run1",
+        fps=24,
+        width=1920,
+        height=1080,
+        total_frames=48,
+        total_duration_sec=2.0,
+        shots=[
+            TimelineShot(shot_id="s001", start_frame=0, end_frame=24, duration_frames=24, duration_sec=1.0,
+                         video_src="a.mp4", narration_src=str(n1), narration_duration_sec=0.5),
+            TimelineShot(shot_id="s002", start_frame=24, end_frame=48, duration_frames=24, duration_sec=1.0,
+                         video_src="b.mp4", narration_src=str(n1), narration_duration_sec=0.5),
+        ],
+    )
+    paths.timeline_path.write_text(timeline.model_dump_json(indent=2), encoding="utf-8")
+    monkeypatch.setattr(steps, "measure_loudnorm", lambda *a, **kw: {"input_i": "-20"})
+
+    with track_media_passes() as passes:
+        result = steps.step_a8_mix(paths)
+    assert result.warnings == []
+    assert passes.as_dict() == {"decode": 0, "encode": 0, "probe": 0}
+
+    mixed = read_audio(paths.mix_path)
+    assert mixed.shape == (96000, 2)
+    assert not is_buffer_effectively_empty(mixed[:24000])
+    assert is_buffer_effectively_empty(mixed[30000:48000])
+    assert not is_buffer_effectively_empty(mixed[48000:72000])
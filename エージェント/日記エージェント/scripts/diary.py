@@ -13,12 +13,15 @@ import string
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
+from diary_store import DiaryStore
+
 # --- 定数 ---
 JST = timezone(timedelta(hours=9))
 # _data/diary/ をデータディレクトリとして使用
 BASE_DIR = Path(__file__).resolve().parents[3]  # antigravity/
 DATA_DIR = BASE_DIR / "_data" / "diary"
-INDEX_FILE = DATA_DIR / "index.json"
+# 一覧・全文検索用インデックス（sqlite + FTS5）。正本は各Markdownファイル
+STORE_FILE = DATA_DIR / "index.sqlite"
 VALID_TYPES = ("diary", "task", "note")
 VALID_STATUSES = ("active", "done", "archived")
 
@@ -41,18 +44,30 @@ def ensure_dirs():
         (DATA_DIR / t).mkdir(parents=True, exist_ok=True)
 
 
-def load_index() -> list:
-    """index.jsonを読み込む"""
-    if INDEX_FILE.exists():
-        with open(INDEX_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return []
+def open_store() -> DiaryStore:
+    """インデックスを開く（未作成・旧スキーマならMarkdownファイルから自動で再構築）"""
+    store = DiaryStore(STORE_FILE)
+    if store.created:
+        store.rebuild(iter_entry_files())
+    return store
 
 
-def save_index(index: list):
-    """index.jsonを保存"""
-    with open(INDEX_FILE, "w", encoding="utf-8") as f:
-        json.dump(index, f, ensure_ascii=False, indent=2)
+def iter_entry_files():
+    """全Markdownファイルを (meta, body, file) で列挙"""
+    for entry_type in VALID_TYPES:
+        type_dir = DATA_DIR / entry_type
+        if not type_dir.exists():
+            continue
+        for md_file in sorted(type_dir.glob("*.md")):
+            meta, body = parse_frontmatter(md_file)
+            if not meta.get("id"):
+                # idが無い場合はファイル名から推定
+                meta["id"] = md_file.stem
+            if not meta.get("type"):
+                meta["type"] = entry_type
+            if not meta.get("title"):
+                meta["title"] = md_file.stem
+            yield meta, body, f"{entry_type}/{md_file.name}"
 
 
 def parse_frontmatter(filepath: Path) -> tuple:
@@ -116,23 +131,27 @@ def write_entry(entry_id: str, entry_type: str, meta: dict, body: str):
     return filepath
 
 
-def update_index_entry(index: list, meta: dict, entry_type: str, entry_id: str) -> list:
-    """index内のエントリーを追加/更新"""
-    # 既存エントリーを削除
-    index = [e for e in index if e.get("id") != entry_id]
-    # 新しいエントリーを追加
-    index_entry = {
-        "id": meta["id"],
-        "type": meta["type"],
-        "title": meta["title"],
-        "tags": meta.get("tags", []),
-        "created": meta["created"],
-        "updated": meta.get("updated", meta["created"]),
-        "status": meta.get("status", "active"),
-        "file": f"{entry_type}/{entry_id}.md"
-    }
-    index.append(index_entry)
-    return index
+def update_index_entry(store: DiaryStore, meta: dict, entry_type: str, entry_id: str, body: str):
+    """インデックス内のエントリーを追加/更新"""
+    store.upsert(meta, body, f"{entry_type}/{entry_id}.md")
+
+
+def find_entry(store: DiaryStore, entry_id: str, action: str) -> dict:
+    """IDでエントリーを取得（無ければエラーを出力して終了）"""
+    entry = store.get(entry_id)
+    if not entry:
+        print(json.dumps({
+            "status": "error",
+            "action": action,
+            "message": f"ID '{entry_id}' のエントリーが見つかりません"
+        }, ensure_ascii=False, indent=2))
+        sys.exit(1)
+    return entry
+
+
+def split_tags(tags: str) -> list:
+    """カンマ区切りのタグ文字列をリストに変換"""
+    return [t.strip() for t in tags.split(",") if t.strip()] if tags else []
 
 
 # ============================================================
@@ -172,9 +191,7 @@ def cmd_add(args):
     filepath = write_entry(entry_id, entry_type, meta, body)
 
     # インデックス更新
-    index = load_index()
-    index = update_index_entry(index, meta, entry_type, entry_id)
-    save_index(index)
+    update_index_entry(open_store(), meta, entry_type, entry_id, body)
 
     result = {
         "status": "ok",
@@ -188,49 +205,16 @@ def cmd_add(args):
 
 
 def cmd_search(args):
-    """キーワード検索"""
-    keyword = args.keyword.lower()
-    index = load_index()
-
-    results = []
-    for entry in index:
-        # タイプフィルタ
-        if args.type and entry["type"] != args.type:
-            continue
-        # タグフィルタ
-        if args.tags:
-            filter_tags = [t.strip() for t in args.tags.split(",")]
-            if not any(t in entry.get("tags", []) for t in filter_tags):
-                continue
-
-        # タイトル・タグ検索
-        title_match = keyword in entry.get("title", "").lower()
-        tag_match = any(keyword in t.lower() for t in entry.get("tags", []))
-
-        # 本文検索
-        body_match = False
-        filepath = DATA_DIR / entry["file"]
-        if filepath.exists():
-            _, body = parse_frontmatter(filepath)
-            body_match = keyword in body.lower()
-
-        if title_match or tag_match or body_match:
-            match_info = {
-                "id": entry["id"],
-                "type": entry["type"],
-                "title": entry["title"],
-                "tags": entry.get("tags", []),
-                "created": entry["created"],
-                "status": entry.get("status", "active"),
-                "match_in": [],
-            }
-            if title_match:
-                match_info["match_in"].append("title")
-            if tag_match:
-                match_info["match_in"].append("tags")
-            if body_match:
-                match_info["match_in"].append("body")
-            results.append(match_info)
+    """全文検索（タイトル・タグ・本文、関連度順）
+
+    クエリ内の `tag:xxx` / `#xxx` / `type:task` / `status:done` はフィルタとして扱う。
+    """
+    results = open_store().search(
+        args.keyword,
+        types=[args.type] if args.type else None,
+        tags=split_tags(args.tags),
+        limit=args.limit,
+    )
 
     output = {
         "status": "ok",
@@ -244,27 +228,13 @@ def cmd_search(args):
 
 def cmd_list(args):
     """フィルタ付き一覧表示"""
-    index = load_index()
-
-    # フィルタ適用
-    filtered = index
-    if args.type:
-        filtered = [e for e in filtered if e["type"] == args.type]
-    if args.status:
-        filtered = [e for e in filtered if e.get("status") == args.status]
-    if args.tags:
-        filter_tags = [t.strip() for t in args.tags.split(",")]
-        filtered = [
-            e for e in filtered
-            if any(t in e.get("tags", []) for t in filter_tags)
-        ]
-
-    # 日付の新しい順でソート
-    filtered.sort(key=lambda e: e.get("created", ""), reverse=True)
-
-    # リミット適用
-    limit = args.limit or 20
-    filtered = filtered[:limit]
+    # 日付の新しい順・リミット適用はインデックス側で行う
+    filtered = open_store().list_entries(
+        types=[args.type] if args.type else None,
+        statuses=[args.status] if args.status else None,
+        tags=split_tags(args.tags),
+        limit=args.limit or 20,
+    )
 
     output = {
         "status": "ok",
@@ -277,16 +247,7 @@ def cmd_list(args):
 
 def cmd_get(args):
     """特定エントリーの内容取得"""
-    index = load_index()
-    entry = next((e for e in index if e["id"] == args.id), None)
-
-    if not entry:
-        print(json.dumps({
-            "status": "error",
-            "action": "get",
-            "message": f"ID '{args.id}' のエントリーが見つかりません"
-        }, ensure_ascii=False, indent=2))
-        sys.exit(1)
+    entry = find_entry(open_store(), args.id, "get")
 
     filepath = DATA_DIR / entry["file"]
     if not filepath.exists():
@@ -310,16 +271,8 @@ def cmd_get(args):
 
 def cmd_edit(args):
     """エントリーの内容更新"""
-    index = load_index()
-    entry = next((e for e in index if e["id"] == args.id), None)
-
-    if not entry:
-        print(json.dumps({
-            "status": "error",
-            "action": "edit",
-            "message": f"ID '{args.id}' のエントリーが見つかりません"
-        }, ensure_ascii=False, indent=2))
-        sys.exit(1)
+    store = open_store()
+    entry = find_entry(store, args.id, "edit")
 
     filepath = DATA_DIR / entry["file"]
     meta, body = parse_frontmatter(filepath)
@@ -327,11 +280,8 @@ def cmd_edit(args):
     # 更新対象のフィールドを適用
     if args.title:
         meta["title"] = args.title
-        entry["title"] = args.title
     if args.tags is not None:
-        new_tags = [t.strip() for t in args.tags.split(",")]
-        meta["tags"] = new_tags
-        entry["tags"] = new_tags
+        meta["tags"] = split_tags(args.tags)
     if args.body:
         body = args.body
     elif args.body_file:
@@ -340,13 +290,11 @@ def cmd_edit(args):
         body = body + "\n\n" + args.append
 
     meta["updated"] = now_jst().isoformat()
-    entry["updated"] = meta["updated"]
 
     write_entry(args.id, entry["type"], meta, body)
 
     # インデックス更新
-    index = update_index_entry(index, meta, entry["type"], args.id)
-    save_index(index)
+    update_index_entry(store, meta, entry["type"], args.id, body)
 
     output = {
         "status": "ok",
@@ -359,16 +307,8 @@ def cmd_edit(args):
 
 def cmd_done(args):
     """タスクを完了に変更"""
-    index = load_index()
-    entry = next((e for e in index if e["id"] == args.id), None)
-
-    if not entry:
-        print(json.dumps({
-            "status": "error",
-            "action": "done",
-            "message": f"ID '{args.id}' のエントリーが見つかりません"
-        }, ensure_ascii=False, indent=2))
-        sys.exit(1)
+    store = open_store()
+    entry = find_entry(store, args.id, "done")
 
     filepath = DATA_DIR / entry["file"]
     meta, body = parse_frontmatter(filepath)
@@ -379,10 +319,7 @@ def cmd_done(args):
     write_entry(args.id, entry["type"], meta, body)
 
     # インデックス更新
-    entry["status"] = "done"
-    entry["updated"] = meta["updated"]
-    index = update_index_entry(index, meta, entry["type"], args.id)
-    save_index(index)
+    update_index_entry(store, meta, entry["type"], args.id, body)
 
     output = {
         "status": "ok",
@@ -395,19 +332,12 @@ def cmd_done(args):
 
 def cmd_today(args):
     """今日のエントリー一覧"""
-    index = load_index()
     today_str = now_jst().strftime("%Y-%m-%d")
 
-    todays = [
-        e for e in index
-        if e.get("created", "").startswith(today_str)
-    ]
-
-    # フィルタ
-    if args.type:
-        todays = [e for e in todays if e["type"] == args.type]
-
-    todays.sort(key=lambda e: e.get("created", ""), reverse=True)
+    todays = open_store().list_entries(
+        types=[args.type] if args.type else None,
+        created_prefix=today_str,
+    )
 
     output = {
         "status": "ok",
@@ -421,28 +351,20 @@ def cmd_today(args):
 
 def cmd_summary(args):
     """最近のエントリー要約出力"""
-    index = load_index()
     days = args.days or 7
     cutoff = (now_jst() - timedelta(days=days)).isoformat()
 
-    recent = [
-        e for e in index
-        if e.get("created", "") >= cutoff
-    ]
-
-    if args.type:
-        recent = [e for e in recent if e["type"] == args.type]
+    recent = open_store().list_entries(
+        types=[args.type] if args.type else None,
+        since=cutoff,
+        with_body=True,
+    )
 
-    recent.sort(key=lambda e: e.get("created", ""), reverse=True)
-
-    # サマリー用に本文のプレビュー（先頭100文字）を追加
+    # サマリー用に本文のプレビュー（先頭100文字）を追加（本文はインデックスから取得）
     summary_entries = []
     for e in recent:
-        filepath = DATA_DIR / e["file"]
-        preview = ""
-        if filepath.exists():
-            _, body = parse_frontmatter(filepath)
-            preview = body[:100].replace("\n", " ") + ("..." if len(body) > 100 else "")
+        body = e["body"]
+        preview = body[:100].replace("\n", " ") + ("..." if len(body) > 100 else "")
 
         summary_entries.append({
             "id": e["id"],
@@ -466,16 +388,8 @@ def cmd_summary(args):
 
 def cmd_delete(args):
     """エントリー削除（archivedに変更）"""
-    index = load_index()
-    entry = next((e for e in index if e["id"] == args.id), None)
-
-    if not entry:
-        print(json.dumps({
-            "status": "error",
-            "action": "delete",
-            "message": f"ID '{args.id}' のエントリーが見つかりません"
-        }, ensure_ascii=False, indent=2))
-        sys.exit(1)
+    store = open_store()
+    entry = find_entry(store, args.id, "delete")
 
     filepath = DATA_DIR / entry["file"]
     meta, body = parse_frontmatter(filepath)
@@ -485,10 +399,7 @@ def cmd_delete(args):
 
     write_entry(args.id, entry["type"], meta, body)
 
-    entry["status"] = "archived"
-    entry["updated"] = meta["updated"]
-    index = update_index_entry(index, meta, entry["type"], args.id)
-    save_index(index)
+    update_index_entry(store, meta, entry["type"], args.id, body)
 
     output = {
         "status": "ok",
@@ -501,43 +412,14 @@ def cmd_delete(args):
 
 
 def cmd_rebuild_index(args):
-    """index.jsonを全ファイルから再構築"""
+    """インデックスを全ファイルから再構築（1トランザクションで一括投入）"""
     ensure_dirs()
-    index = []
-
-    for entry_type in VALID_TYPES:
-        type_dir = DATA_DIR / entry_type
-        if not type_dir.exists():
-            continue
-        for md_file in type_dir.glob("*.md"):
-            meta, _ = parse_frontmatter(md_file)
-            if not meta.get("id"):
-                # idが無い場合はファイル名から推定
-                meta["id"] = md_file.stem
-            if not meta.get("type"):
-                meta["type"] = entry_type
-            if not meta.get("title"):
-                meta["title"] = md_file.stem
-
-            index_entry = {
-                "id": meta["id"],
-                "type": meta.get("type", entry_type),
-                "title": meta.get("title", ""),
-                "tags": meta.get("tags", []),
-                "created": meta.get("created", ""),
-                "updated": meta.get("updated", ""),
-                "status": meta.get("status", "active"),
-                "file": f"{entry_type}/{md_file.name}"
-            }
-            index.append(index_entry)
-
-    index.sort(key=lambda e: e.get("created", ""), reverse=True)
-    save_index(index)
+    count = DiaryStore(STORE_FILE).rebuild(iter_entry_files())
 
     output = {
         "status": "ok",
         "action": "rebuild-index",
-        "count": len(index),
+        "count": count,
     }
     print(json.dumps(output, ensure_ascii=False, indent=2))
 
@@ -560,10 +442,11 @@ def main():
     p_add.set_defaults(func=cmd_add)
 
     # --- search ---
-    p_search = subparsers.add_parser("search", help="キーワード検索")
-    p_search.add_argument("keyword", help="検索キーワード")
+    p_search = subparsers.add_parser("search", help="全文検索（関連度順）")
+    p_search.add_argument("keyword", help="検索クエリ（空白区切りでAND、tag:/type:/status: でフィルタ）")
     p_search.add_argument("--type", choices=VALID_TYPES, help="タイプフィルタ")
     p_search.add_argument("--tags", default="", help="タグフィルタ")
+    p_search.add_argument("--limit", type=int, default=20, help="最大表示件数")
     p_search.set_defaults(func=cmd_search)
 
     # --- list ---
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+日記エージェント 検索インデックス（sqlite + FTS5）
+
+Markdownファイルが正本で、このストアは一覧・検索用のインデックス。
+- entries: frontmatter + 本文 + ファイルパス（一覧/summary はファイルを開かずにここから返す）
+- entry_tags: タグ絞り込み用
+- entries_fts: タイトル・タグ・本文の文字bigram（日本語は分かち書きせず部分一致で引く）。
+  bigram 列自体は保持しない contentless テーブルで、更新時は entries の旧値から削除用の行を作る
+
+文字bigram化: 英数字・かな漢字の連続（\\w+）ごとに「隣接2文字」+「末尾1文字」を語として並べる。
+  "議事録" -> "議事 事録 録"
+検索語も同じ規則で bigram の phrase にするので、2文字以上は部分一致、1文字は前方一致で引ける。
+"""
+
+import json
+import re
+import sqlite3
+from pathlib import Path
+
+BUSY_TIMEOUT_S = 30.0
+SCHEMA_VERSION = "1"
+# bm25 の列重み（title, tags, body）
+RANK_WEIGHTS = (10.0, 5.0, 1.0)
+SNIPPET_BEFORE = 30
+SNIPPET_AFTER = 70
+ENTRY_FIELDS = ("id", "type", "title", "tags", "created", "updated", "status", "file")
+QUERY_FILTER_KEYS = ("tag", "type", "status")
+
+_WORD_RE = re.compile(r"\w+")
+_FILTER_RE = re.compile(r"^(tag|type|status):(.+)$|^#(.+)$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+  rowid INTEGER PRIMARY KEY,
+  id TEXT NOT NULL UNIQUE,
+  type TEXT NOT NULL,
+  title TEXT NOT NULL,
+  tags_json TEXT NOT NULL,
+  created TEXT NOT NULL,
+  updated TEXT NOT NULL,
+  status TEXT NOT NULL,
+  file TEXT NOT NULL,
+  body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_created ON entries(created);
+CREATE INDEX IF NOT EXISTS entries_type_created ON entries(type, created);
+CREATE TABLE IF NOT EXISTS entry_tags (
+  tag TEXT NOT NULL,
+  entry_rowid INTEGER NOT NULL,
+  PRIMARY KEY (tag, entry_rowid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entry_tags_rowid ON entry_tags(entry_rowid);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+  title, tags, body, content = '', tokenize = "unicode61 remove_diacritics 0 tokenchars '_'"
+);
+"""
+
+
+def to_ngrams(text: str) -> str:
+    """テキストを文字bigram列（空白区切り）に変換"""
+    grams = []
+    for run in _WORD_RE.findall(text.lower()):
+        grams.extend(run[i:i + 2] for i in range(len(run) - 1))
+        grams.append(run[-1])
+    return " ".join(grams)
+
+
+def parse_query(query: str) -> tuple:
+    """検索クエリを (検索語リスト, フィルタ辞書) に分解
+
+    `tag:xxx` / `#xxx` / `type:task` / `status:done` はフィルタ、それ以外は検索語（AND）。
+    同じキーを複数指定した場合はいずれかに一致（--tags と同じ）。
+    """
+    terms = []
+    filters = {key: [] for key in QUERY_FILTER_KEYS}
+    for token in query.split():
+        m = _FILTER_RE.match(token)
+        if m:
+            if m.group(3):
+                filters["tag"].append(m.group(3))
+            else:
+                filters[m.group(1)].append(m.group(2))
+        else:
+            terms.append(token)
+    return terms, filters
+
+
+def _match_expression(terms: list) -> str:
+    """検索語を FTS5 の MATCH 式に変換（語ごとに AND、語内は bigram の phrase）"""
+    clauses = []
+    for term in terms:
+        for run in _WORD_RE.findall(term.lower()):
+            if len(run) == 1:
+                clauses.append(f'"{run}"*')
+            else:
+                clauses.append('"' + " ".join(run[i:i + 2] for i in range(len(run) - 1)) + '"')
+    return " AND ".join(clauses)
+
+
+def _needles(terms: list) -> list:
+    return [run for term in terms for run in _WORD_RE.findall(term.lower())]
+
+
+def make_snippet(body: str, needles: list) -> str:
+    """本文から最初にヒットした箇所の前後を切り出す（ヒット箇所は **...** で囲む）"""
+    lower = body.lower()
+    hits = [(pos, n) for n in needles if (pos := lower.find(n)) >= 0]
+    if not hits:
+        snippet = body[:SNIPPET_BEFORE + SNIPPET_AFTER]
+        return snippet.replace("\n", " ") + ("..." if len(body) > len(snippet) else "")
+    pos, needle = min(hits)
+    start = max(0, pos - SNIPPET_BEFORE)
+    end = min(len(body), pos + len(needle) + SNIPPET_AFTER)
+    snippet = (
+        body[start:pos] + "**" + body[pos:pos + len(needle)] + "**" + body[pos + len(needle):end]
+    ).replace("\n", " ")
+    return ("..." if start > 0 else "") + snippet + ("..." if end < len(body) else "")
+
+
+class DiaryStore:
+    """日記エントリーの検索インデックス"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.created = not self.path.exists()
+        self._con = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT_S, isolation_level=None)
+        self._con.row_factory = sqlite3.Row
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        row = None
+        if not self.created:
+            try:
+                row = self._con.execute("SELECT value FROM meta WHERE key='schema_version'").fetchone()
+            except sqlite3.OperationalError:
+                row = None
+        if row is None or row[0] != SCHEMA_VERSION:
+            # 未作成 or 旧スキーマ: 作り直して呼び出し側で rebuild させる
+            self._con.executescript(
+                "DROP TABLE IF EXISTS entries_fts; DROP TABLE IF EXISTS entry_tags;"
+                " DROP TABLE IF EXISTS entries; DROP TABLE IF EXISTS meta;"
+            )
+            self._con.executescript(_SCHEMA)
+            self._con.execute("INSERT INTO meta(key, value) VALUES('schema_version', ?)", (SCHEMA_VERSION,))
+            self.created = True
+
+    def close(self):
+        self._con.close()
+
+    # --- 書き込み ---
+
+    @staticmethod
+    def _fts_values(title: str, tags: list, body: str) -> tuple:
+        return to_ngrams(title), to_ngrams(" ".join(tags)), to_ngrams(body)
+
+    def _write(self, meta: dict, body: str, file: str):
+        tags = list(meta.get("tags") or [])
+        old = self._con.execute(
+            "SELECT rowid, title, tags_json, body FROM entries WHERE id=?", (meta["id"],)
+        ).fetchone()
+        if old:
+            # contentless FTS は挿入時と同じ値を渡して削除する
+            self._con.execute(
+                "INSERT INTO entries_fts(entries_fts, rowid, title, tags, body) VALUES('delete', ?, ?, ?, ?)",
+                (old["rowid"], *self._fts_values(old["title"], json.loads(old["tags_json"]), old["body"]))
+            )
+        row = (
+            meta["id"], meta.get("type", ""), meta.get("title", ""), json.dumps(tags, ensure_ascii=False),
+            meta.get("created", ""), meta.get("updated") or meta.get("created", ""),
+            meta.get("status", "active"), file, body,
+        )
+        rowid = self._con.execute(
+            "INSERT INTO entries(id, type, title, tags_json, created, updated, status, file, body)"
+            " VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(id) DO UPDATE SET type=excluded.type, title=excluded.title,"
+            " tags_json=excluded.tags_json, created=excluded.created, updated=excluded.updated,"
+            " status=excluded.status, file=excluded.file, body=excluded.body"
+            " RETURNING rowid",
+            row
+        ).fetchone()[0]
+        self._con.execute(
+            "INSERT INTO entries_fts(rowid, title, tags, body) VALUES(?, ?, ?, ?)",
+            (rowid, *self._fts_values(row[2], tags, body))
+        )
+        self._con.execute("DELETE FROM entry_tags WHERE entry_rowid=?", (rowid,))
+        self._con.executemany(
+            "INSERT OR IGNORE INTO entry_tags(tag, entry_rowid) VALUES(?, ?)", [(t, rowid) for t in tags]
+        )
+
+    def upsert(self, meta: dict, body: str, file: str):
+        """1エントリーを追加/更新（add/edit/done/delete から呼ぶ）"""
+        self._con.execute("BEGIN IMMEDIATE")
+        try:
+            self._write(meta, body, file)
+            self._con.execute("COMMIT")
+        except BaseException:
+            self._con.execute("ROLLBACK")
+            raise
+
+    def rebuild(self, rows) -> int:
+        """(meta, body, file) の列で全件を作り直す（1トランザクション）
+
+        rowid が作成日時順になるよう created でソートしてから投入する。
+        """
+        rows = sorted(rows, key=lambda r: r[0].get("created", ""))
+        count = 0
+        self._con.execute("BEGIN IMMEDIATE")
+        try:
+            self._con.execute("INSERT INTO entries_fts(entries_fts) VALUES('delete-all')")
+            for table in ("entry_tags", "entries"):
+                self._con.execute(f"DELETE FROM {table}")
+            for meta, body, file in rows:
+                self._write(meta, body, file)
+                count += 1
+            self._con.execute("COMMIT")
+        except BaseException:
+            self._con.execute("ROLLBACK")
+            raise
+        self._con.execute("INSERT INTO entries_fts(entries_fts) VALUES('optimize')")
+        self.created = False
+        return count
+
+    # --- 読み出し ---
+
+    @staticmethod
+    def _entry(row) -> dict:
+        entry = {key: row[key] for key in ENTRY_FIELDS if key != "tags"}
+        entry["tags"] = json.loads(row["tags_json"])
+        return {key: entry[key] for key in ENTRY_FIELDS}
+
+    @staticmethod
+    def _filter_sql(types=None, statuses=None, tags=None, created_prefix=None, since=None) -> tuple:
+        where, params = [], []
+        for column, values in (("e.type", types), ("e.status", statuses)):
+            if values:
+                where.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if tags:
+            # 候補行ごとに (tag, entry_rowid) の主キーで引く（タグ全件のリストを作らない）
+            where.append(
+                "EXISTS (SELECT 1 FROM entry_tags t WHERE t.entry_rowid = e.rowid"
+                f" AND t.tag IN ({', '.join('?' * len(tags))}))"
+            )
+            params.extend(tags)
+        if created_prefix:
+            # created は ISO8601 文字列なので範囲検索で前方一致（インデックスが効く）
+            where.append("e.created >= ? AND e.created < ?")
+            params.extend([created_prefix, created_prefix + "\uffff"])
+        if since:
+            where.append("e.created >= ?")
+            params.append(since)
+        return where, params
+
+    def get(self, entry_id: str):
+        row = self._con.execute("SELECT * FROM entries e WHERE id=?", (entry_id,)).fetchone()
+        return self._entry(row) if row else None
+
+    def list_entries(self, *, types=None, statuses=None, tags=None, created_prefix=None, since=None,
+                     limit=None, with_body=False) -> list:
+        """作成日時の新しい順に一覧（with_body=True で本文も返す）"""
+        where, params = self._filter_sql(types, statuses, tags, created_prefix, since)
+        sql = "SELECT * FROM entries e"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY e.created DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        entries = []
+        for row in self._con.execute(sql, params):
+            entry = self._entry(row)
+            if with_body:
+                entry["body"] = row["body"]
+            entries.append(entry)
+        return entries
+
+    def search(self, query: str, *, types=None, statuses=None, tags=None, limit: int = 20,
+               rank_candidates=None) -> list:
+        """全文検索（bm25 順）。クエリ内の tag:/type:/status: は引数のフィルタに追加される
+
+        既定ではヒット全件を順位付けする。rank_candidates を指定すると rowid の新しい側
+        rank_candidates 件だけを順位付けする（ヒットが多い語で速くなるが、古い良い一致は落ちる）。
+        検索語があっても単語文字を含まない（"!!" など）ときは何も返さない。
+        """
+        terms, filters = parse_query(query)
+        types = list(types or []) + filters["type"]
+        statuses = list(statuses or []) + filters["status"]
+        tags = list(tags or []) + filters["tag"]
+        where, params = self._filter_sql(types, statuses, tags)
+        expression = _match_expression(terms)
+        if terms and not expression:
+            return []
+        if expression:
+            # 順位付けは rowid とスコアだけで行い、本文を含む行は上位 limit 件だけ引く
+            candidates = (
+                "SELECT entries_fts.rowid AS rid, bm25(entries_fts, ?, ?, ?) AS score FROM entries_fts"
+                " JOIN entries e ON e.rowid = entries_fts.rowid WHERE entries_fts MATCH ?"
+            )
+            if where:
+                candidates += " AND " + " AND ".join(where)
+            params = [*RANK_WEIGHTS, expression, *params]
+            if rank_candidates:
+                candidates = f"SELECT * FROM ({candidates} ORDER BY entries_fts.rowid DESC LIMIT ?)"
+                params.append(int(rank_candidates))
+            sql = (
+                f"SELECT e.*, r.score FROM ({candidates} ORDER BY score, rid DESC LIMIT ?) r"
+                " JOIN entries e ON e.rowid = r.rid ORDER BY r.score, r.rid DESC"
+            )
+            params.append(limit)
+        else:
+            # フィルタのみ: 新しい順
+            sql = "SELECT e.*, 0.0 AS score FROM entries e"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += " ORDER BY e.created DESC LIMIT ?"
+            params = [*params, limit]
+
+        needles = _needles(terms)
+        results = []
+        for row in self._con.execute(sql, params):
+            entry = self._entry(row)
+            tags_text = " ".join(entry["tags"]).lower()
+            fields = (("title", row["title"].lower()), ("tags", tags_text), ("body", row["body"].lower()))
+            results.append({
+                "id": entry["id"],
+                "type": entry["type"],
+                "title": entry["title"],
+                "tags": entry["tags"],
+                "created": entry["created"],
+                "status": entry["status"],
+                "score": round(-row["score"], 4),
+                "match_in": [name for name, text in fields if any(n in text for n in needles)],
+                "snippet": make_snippet(row["body"], needles),
+            })
+        return results
+
+    def count(self) -> int:
+        return self._con.execute("SELECT COUNT(*) FROM entries").fetchone()[0]